@@ -0,0 +1,51 @@
+"""add position_snapshots rollup table
+
+Revision ID: e4f5a6b7c8d9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e4f5a6b7c8d9'
+down_revision = 'd3e4f5a6b7c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'position_snapshots',
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('position_id', sa.String(), nullable=False),
+        sa.Column('mode', sa.String(), nullable=False),
+        sa.Column('resolution', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('symbol', sa.String(), nullable=True),
+        sa.Column('first_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open_value', sa.Float(), nullable=False),
+        sa.Column('high_value', sa.Float(), nullable=False),
+        sa.Column('low_value', sa.Float(), nullable=False),
+        sa.Column('close_value', sa.Float(), nullable=False),
+        sa.Column('stock_value', sa.Float(), nullable=False),
+        sa.Column('cash', sa.Float(), nullable=False),
+        sa.Column('evaluation_count', sa.Integer(), nullable=False),
+        sa.Column('trade_count', sa.Integer(), nullable=False),
+        sa.Column('dividend_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            'tenant_id', 'portfolio_id', 'position_id', 'mode', 'resolution', 'bucket_start'
+        ),
+    )
+    op.create_index(
+        'ix_position_snapshots_portfolio',
+        'position_snapshots',
+        ['tenant_id', 'portfolio_id', 'mode', 'resolution', 'bucket_start'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_position_snapshots_portfolio', table_name='position_snapshots')
+    op.drop_table('position_snapshots')
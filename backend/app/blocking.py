@@ -0,0 +1,277 @@
+# =========================
+# backend/app/blocking.py
+# =========================
+"""
+Execution lanes for blocking route work.
+
+Most route handlers do synchronous work: SQLAlchemy queries, yfinance calls,
+workbook building. Declared ``async def`` they run on the event loop and stall
+every other request; declared ``def`` they share Starlette's one threadpool,
+so a burst of exports can still starve cockpit polling and health checks.
+
+Handlers instead run in a named lane. Each lane is a dedicated thread pool
+whose size is its concurrency limit (``BLOCKING_LIMIT_<LANE>`` overrides the
+defaults below); extra calls wait in the lane's queue, not on the loop::
+
+    @router.get("/trades/export")
+    @blocking("export")
+    def export_trades(...): ...
+
+``run_blocking`` does the same for a single call inside an async handler.
+``shutdown_lanes()`` stops every lane's threads at app shutdown.
+
+``LoopLagMonitor`` is the detector for handlers that still block the loop:
+it wakes every ``interval`` seconds and, when it wakes late by more than
+``threshold``, logs the requests that were in flight on the loop at the time
+and counts them per route. ``blocking_metrics()`` reports both.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from application.helpers.latency import latency_summary
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default worker threads per lane
+DEFAULT_LIMITS: Dict[str, int] = {
+    "default": 8,
+    # Workbook building is CPU and memory heavy; keep a couple at a time
+    "export": 2,
+    "analytics": 4,
+    "optimization": 4,
+    # Never queued behind the heavy lanes
+    "health": 2,
+}
+
+# Latency samples kept per lane for metrics
+_SAMPLES = 500
+
+
+class Lane:
+    """A dedicated thread pool with queue/latency counters."""
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = max(1, limit)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.limit, thread_name_prefix=f"blocking-{name}"
+        )
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+        self._run_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+        # Carry contextvars (request record, logging context) into the worker thread
+        ctx = contextvars.copy_context()
+
+        def call() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self.waiting -= 1
+                self.active += 1
+                self._wait_seconds.append(started - submitted)
+            ok = False
+            try:
+                result = ctx.run(fn, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self._run_seconds.append(time.perf_counter() - started)
+
+        record = _current_request.get()
+        if record is not None:
+            record["offloaded"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            if record is not None:
+                record["offloaded"] -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait_seconds": latency_summary(list(self._wait_seconds)),
+                "run_seconds": latency_summary(list(self._run_seconds)),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_lanes: Dict[str, Lane] = {}
+_lanes_lock = threading.Lock()
+
+
+def get_lane(name: str) -> Lane:
+    with _lanes_lock:
+        lane = _lanes.get(name)
+        if lane is None:
+            default = DEFAULT_LIMITS.get(name, DEFAULT_LIMITS["default"])
+            limit = int(os.getenv(f"BLOCKING_LIMIT_{name.upper()}", str(default)))
+            lane = _lanes[name] = Lane(name, limit)
+        return lane
+
+
+def shutdown_lanes() -> None:
+    """Shut down every lane's executor; lanes requested afterwards start fresh."""
+    with _lanes_lock:
+        lanes = list(_lanes.values())
+        _lanes.clear()
+    for lane in lanes:
+        lane.shutdown()
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, lane: str = "default", **kwargs: Any) -> T:
+    """Run a blocking call in ``lane`` and await its result."""
+    return await get_lane(lane).run(fn, *args, **kwargs)
+
+
+def blocking(lane: str = "default") -> Callable[[Callable[..., T]], Callable[..., Any]]:
+    """Turn a synchronous route handler into an async one that runs in ``lane``."""
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def endpoint(*args: Any, **kwargs: Any) -> T:
+            return await run_blocking(fn, *args, lane=lane, **kwargs)
+
+        # FastAPI reads parameters from the signature; resolve string annotations
+        # against the handler's module, since the wrapper lives in this one
+        endpoint.__signature__ = inspect.signature(fn, eval_str=True)  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Loop-lag detection
+# ----------------------------------------------------------------------
+_current_request: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "blocking_current_request", default=None
+)
+_in_flight: Dict[int, Dict[str, Any]] = {}
+
+
+class InFlightMiddleware:
+    """ASGI middleware that records which requests are in flight, for LoopLagMonitor."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = f"{scope.get('method')} {scope.get('path')}"
+        record = {"route": route, "started": time.monotonic(), "offloaded": 0}
+        key = id(record)
+        _in_flight[key] = record
+        token = _current_request.set(record)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            _in_flight.pop(key, None)
+
+
+class LoopLagMonitor:
+    """Detects event-loop stalls and blames the requests running on the loop."""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.suspects: Counter = Counter()
+        self._lags: Deque[float] = deque(maxlen=_SAMPLES)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - expected)
+
+    def record(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        self._lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag < self.threshold:
+            return
+        self.stalls += 1
+        # Requests whose work is in a lane were not the ones holding the loop
+        on_loop = [r["route"] for r in list(_in_flight.values()) if not r["offloaded"]]
+        self.suspects.update(on_loop)
+        logger.warning(
+            "Event loop blocked for %.0f ms; requests on the loop: %s",
+            lag * 1000,
+            ", ".join(on_loop) or "none (background task)",
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "threshold_seconds": self.threshold,
+            "stalls": self.stalls,
+            "max_lag_seconds": round(self.max_lag, 4),
+            "lag_seconds": latency_summary(list(self._lags)),
+            "suspect_routes": dict(self.suspects.most_common(20)),
+        }
+
+
+loop_monitor = LoopLagMonitor(
+    threshold=float(os.getenv("LOOP_LAG_THRESHOLD_SECONDS", "0.25")),
+)
+
+
+def blocking_metrics() -> Dict[str, Any]:
+    with _lanes_lock:
+        lanes = dict(_lanes)
+    return {
+        "lanes": {name: lane.metrics() for name, lane in lanes.items()},
+        "loop": loop_monitor.metrics(),
+    }
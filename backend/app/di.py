@@ -17,6 +17,7 @@ from domain.ports.dividend_repo import DividendRepo, DividendReceivableRepo
 from domain.ports.dividend_market_data import DividendMarketDataRepo
 from domain.ports.config_repo import ConfigRepo
 from domain.ports.evaluation_timeline_repo import EvaluationTimelineRepo
+from domain.ports.position_snapshot_repo import PositionSnapshotRepo
 from domain.ports.optimization_repo import (
     OptimizationConfigRepo,
     OptimizationResultRepo,
@@ -25,6 +26,7 @@ from domain.ports.optimization_repo import (
 from domain.ports.simulation_repo import SimulationRepo
 from domain.ports.alert_repo import AlertRepo
 from domain.ports.user_repo import UserRepo
+from domain.ports.job_store import JobStore
 
 from infrastructure.time.clock import Clock
 
@@ -39,6 +41,7 @@ from infrastructure.persistence.memory.dividend_repo import (
     InMemoryDividendReceivableRepo,
 )
 from infrastructure.persistence.memory.config_repo_mem import InMemoryConfigRepo
+from infrastructure.persistence.memory.job_store_mem import InMemoryJobStore
 from infrastructure.persistence.sql.config_repo_sql import SQLConfigRepo
 from infrastructure.market.yfinance_adapter import YFinanceAdapter
 from infrastructure.market.deterministic_market_data import DeterministicMarketDataAdapter
@@ -55,6 +58,9 @@ from infrastructure.persistence.sql.trades_repo_sql import SQLTradesRepo
 from infrastructure.persistence.sql.events_repo_sql import SQLEventsRepo
 from infrastructure.persistence.sql.portfolio_state_repo_sql import SQLPortfolioStateRepo
 from infrastructure.persistence.sql.evaluation_timeline_repo_sql import EvaluationTimelineRepoSQL
+from infrastructure.persistence.sql.position_snapshot_repo_sql import SQLPositionSnapshotRepo
+from infrastructure.persistence.sql.job_store_sql import SQLJobStore
+from infrastructure.persistence.buffered_timeline_repo import BufferedEvaluationTimelineRepo
 
 # Optimization repositories
 from infrastructure.persistence.memory.optimization_repo_mem import (
@@ -92,6 +98,8 @@ from domain.ports.broker_service import IBrokerService
 from infrastructure.adapters.stub_broker_adapter import StubBrokerAdapter
 from application.services.broker_integration_service import BrokerIntegrationService
 from application.services.order_status_worker import OrderStatusWorker
+from application.services.job_queue import JobQueue
+from application.services.benchmark_series_service import BenchmarkSeriesService
 from application.services.alert_checker import AlertChecker
 from application.services.webhook_service import WebhookService
 from application.services.system_status_service import SystemStatusService
@@ -115,6 +123,13 @@ def _truthy(envval: str | None) -> bool:
     return envval.strip().lower() not in ("0", "false", "no", "off", "")
 
 
+def _cache_dir(envval: str | None) -> str | None:
+    """Cache directory from env; empty or "off" disables the on-disk store."""
+    if not envval or envval.strip().lower() in ("off", "none", "false", "0"):
+        return None
+    return envval
+
+
 class _Container:
     positions: PositionsRepo
     portfolio_repo: PortfolioRepo
@@ -124,6 +139,7 @@ class _Container:
     events: EventsRepo
     idempotency: IdempotencyRepo
     market_data: MarketDataRepo
+    benchmark_series: BenchmarkSeriesService
     dividend: DividendRepo
     dividend_receivable: DividendReceivableRepo
     dividend_market_data: DividendMarketDataRepo
@@ -131,6 +147,7 @@ class _Container:
     portfolio_state: SQLPortfolioStateRepo
     evaluation_timeline: EvaluationTimelineRepo
     evaluation_timeline_repo: EvaluationTimelineRepo
+    position_snapshots: PositionSnapshotRepo
     clock: Clock
 
     # Optimization repositories (placeholder implementations)
@@ -187,18 +204,28 @@ class _Container:
     def evaluation_timeline(self, repo: EvaluationTimelineRepo) -> None:
         self._evaluation_timeline = repo
         self.evaluation_timeline_repo = repo
+        # Use cases wired at construction hold their own reference; point them at the new repo
         if hasattr(self, "evaluate_position_uc"):
             self.evaluate_position_uc.evaluation_timeline_repo = repo
         if hasattr(self, "simulation_uc"):
             self.simulation_uc.evaluation_timeline_repo = repo
+        if hasattr(self, "broker_integration"):
+            self.broker_integration.execute_order_uc.evaluation_timeline_repo = repo
 
     def __init__(self) -> None:
         self.clock = Clock()
         if _truthy(os.getenv("TICK_DETERMINISTIC")):
             self.market_data = DeterministicMarketDataAdapter()
         else:
-            self.market_data = YFinanceAdapter()
+            self.market_data = YFinanceAdapter(
+                quote_workers=int(os.getenv("QUOTE_FETCH_WORKERS", "8"))
+            )
         self.dividend_market_data = YFinanceDividendAdapter()
+        # Resolves market_data lazily so a swapped adapter is picked up
+        self.benchmark_series = BenchmarkSeriesService(
+            lambda: self.market_data,
+            cache_dir=_cache_dir(os.getenv("BENCHMARK_CACHE_DIR", ".benchmark_cache")),
+        )
         self.dividend = InMemoryDividendRepo()
         self.dividend_receivable = InMemoryDividendReceivableRepo()
         # ConfigRepo will be set based on persistence backend below
@@ -213,13 +240,15 @@ class _Container:
 
         sql_url = os.getenv("SQL_URL", "sqlite:///./vb.sqlite")
 
+        # One engine (and connection pool) per process for every SQL-backed repo
+        engine = get_engine(sql_url)
+        if auto_create:
+            create_all(engine)
         main_engine = None
 
         # --- Positions & Orders & Trades backend ---
         if persistence == "sql":
-            main_engine = get_engine(sql_url)
-            if auto_create:
-                create_all(main_engine)
+            main_engine = engine
             Session = sessionmaker(bind=main_engine, expire_on_commit=False, autoflush=False)
             self.positions = SQLPositionsRepo(Session)
             self.portfolio_repo = SQLPortfolioRepo(Session)
@@ -229,7 +258,11 @@ class _Container:
             # Use SQL simulation repository when SQL persistence is enabled
             self.simulation = SQLSimulationRepo(Session)
             # Use SQL ConfigRepo when SQL persistence is enabled
-            self.config = SQLConfigRepo(Session)
+            self.config = SQLConfigRepo(
+                Session,
+                change_log=_truthy(os.getenv("CONFIG_CHANGE_LOG")),
+                change_poll_seconds=float(os.getenv("CONFIG_CHANGE_POLL_SECONDS", "1")),
+            )
             # Use SQL optimization repositories
             self.optimization_config = SQLOptimizationConfigRepo(Session)
             self.optimization_result = SQLOptimizationResultRepo(Session)
@@ -237,13 +270,7 @@ class _Container:
         else:
             self.positions = InMemoryPositionsRepo()
             # For in-memory positions, we still use SQL portfolio repo for persistence
-            # Create a separate engine for portfolio persistence
-            portfolio_engine = get_engine(sql_url)
-            if auto_create:
-                create_all(portfolio_engine)
-            PortfolioSession = sessionmaker(
-                bind=portfolio_engine, expire_on_commit=False, autoflush=False
-            )
+            PortfolioSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
             self.portfolio_repo = SQLPortfolioRepo(PortfolioSession)
             self.portfolio_config_repo = InMemoryPortfolioConfigRepo()
             self.orders = InMemoryOrdersRepo()
@@ -258,11 +285,7 @@ class _Container:
 
         # --- Events backend (can be independent of positions/orders) ---
         if events_backend == "sql":
-            ev_engine = main_engine or get_engine(sql_url)
-            if auto_create and ev_engine is not main_engine:
-                # If we didn’t already create tables on the same engine, do it now.
-                create_all(ev_engine)
-            EvSession = sessionmaker(bind=ev_engine, expire_on_commit=False, autoflush=False)
+            EvSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
             self.events = SQLEventsRepo(EvSession)
         else:
             self.events = InMemoryEventsRepo()
@@ -295,24 +318,23 @@ class _Container:
 
             self.portfolio_state = InMemoryPortfolioStateRepo()
 
+        # --- Background jobs (simulations, optimization runs) ---
+        if main_engine:
+            Session = sessionmaker(bind=main_engine, expire_on_commit=False, autoflush=False)
+            job_store: JobStore = SQLJobStore(Session)
+        else:
+            job_store = InMemoryJobStore()
+        self.jobs = JobQueue(job_store, workers=int(os.getenv("JOB_WORKERS", "2")))
+
         # --- Evaluation Timeline (always SQL - new canonical table) ---
-        timeline_engine = main_engine or get_engine(sql_url)
-        if auto_create and timeline_engine is not main_engine:
-            create_all(timeline_engine)
-        TimelineSession = sessionmaker(
-            bind=timeline_engine, expire_on_commit=False, autoflush=False
-        )
+        TimelineSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
         self._timeline_session_factory = TimelineSession
-        self.evaluation_timeline = EvaluationTimelineRepoSQL(TimelineSession)
+        self.position_snapshots = SQLPositionSnapshotRepo(TimelineSession)
+        self.evaluation_timeline = self._build_evaluation_timeline()
         self.evaluation_timeline_repo = self.evaluation_timeline
 
         # --- Position Baseline (always SQL - canonical table) ---
-        baseline_engine = main_engine or get_engine(sql_url)
-        if auto_create and baseline_engine is not main_engine:
-            create_all(baseline_engine)
-        BaselineSession = sessionmaker(
-            bind=baseline_engine, expire_on_commit=False, autoflush=False
-        )
+        BaselineSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
         from infrastructure.persistence.sql.position_baseline_repo_sql import (
             PositionBaselineRepoSQL,
         )
@@ -320,10 +342,7 @@ class _Container:
         self.position_baseline = PositionBaselineRepoSQL(BaselineSession)
 
         # --- Position Event (always SQL - immutable log) ---
-        event_engine = main_engine or get_engine(sql_url)
-        if auto_create and event_engine is not main_engine:
-            create_all(event_engine)
-        EventSession = sessionmaker(bind=event_engine, expire_on_commit=False, autoflush=False)
+        EventSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
         from infrastructure.persistence.sql.position_event_repo_sql import PositionEventRepoSQL
 
         self.position_event = PositionEventRepoSQL(EventSession)
@@ -360,6 +379,11 @@ class _Container:
             result_repo=self.optimization_result,
             heatmap_repo=self.heatmap_data,
             simulation_uc=self.simulation_uc,
+            # Worker processes per optimization run (1 = in-process, 0 = one per CPU)
+            max_workers=int(os.getenv("OPTIMIZATION_WORKERS", "1")),
+            start_method=os.getenv("OPTIMIZATION_MP_START") or None,
+            # Combinations simulated together per pass over the price series (0 = off)
+            grid_batch_size=int(os.getenv("OPTIMIZATION_GRID_BATCH", "400")),
         )
 
         self.evaluate_position_uc = EvaluatePositionUC(
@@ -384,6 +408,9 @@ class _Container:
             self.positions,
             portfolio_repo=self.portfolio_repo,
             default_tenant_id="default",
+            config_repo=self.config,
+            orders_repo=self.orders,
+            clock=self.clock,
         )
         market_data_adapter = YFinanceMarketDataAdapter(self.market_data)
         historical_data_adapter = HistoricalDataAdapter(self.market_data)
@@ -442,8 +469,7 @@ class _Container:
         # --- User / Auth ---
         if persistence == "sql":
             from infrastructure.persistence.sql.user_repo_sql import SQLUserRepo
-            user_session_engine = main_engine or get_engine(sql_url)
-            UserSession = sessionmaker(bind=user_session_engine, expire_on_commit=False, autoflush=False)
+            UserSession = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
             self.user_repo = SQLUserRepo(UserSession)
         else:
             self.user_repo = InMemoryUserRepo()
@@ -561,6 +587,8 @@ class _Container:
             portfolio_repo=self.portfolio_repo,
             evaluate_position_uc=self.evaluate_position_uc,
             orders_repo=self.orders,
+            # Positions evaluated concurrently per trading cycle (1 = sequential)
+            max_workers=int(os.getenv("TRADING_CYCLE_WORKERS", "8")),
         )
 
         self.simulation_orchestrator = SimulationOrchestrator(
@@ -592,6 +620,21 @@ class _Container:
             evaluation_timeline_repo=self.evaluation_timeline_repo,
             dividend_market_data=self.dividend_market_data,
             config_repo=self.config,
+            workers=int(os.getenv("BACKFILL_WORKERS", "8")),
+        )
+
+    def _build_evaluation_timeline(self) -> EvaluationTimelineRepo:
+        repo = EvaluationTimelineRepoSQL(
+            self._timeline_session_factory, snapshots=self.position_snapshots
+        )
+        # Write-behind: evaluations enqueue timeline rows, a writer thread batches the INSERTs
+        if not _truthy(os.getenv("TIMELINE_WRITE_BEHIND", "true")):
+            return repo
+        return BufferedEvaluationTimelineRepo(
+            repo,
+            batch_size=int(os.getenv("TIMELINE_BATCH_SIZE", "200")),
+            flush_interval=float(os.getenv("TIMELINE_FLUSH_SECONDS", "1.0")),
+            max_queue=int(os.getenv("TIMELINE_MAX_QUEUE", "10000")),
         )
 
     def reset(self) -> None:
@@ -607,7 +650,11 @@ class _Container:
         if hasattr(self, "portfolio_config_repo") and hasattr(self.portfolio_config_repo, "clear"):
             self.portfolio_config_repo.clear()
         if hasattr(self, "_timeline_session_factory"):
-            self.evaluation_timeline = EvaluationTimelineRepoSQL(self._timeline_session_factory)
+            # Closing flushes the old buffer; anything still holding it writes directly
+            previous = self.evaluation_timeline
+            self.evaluation_timeline = self._build_evaluation_timeline()
+            if hasattr(previous, "close"):
+                previous.close()
         # Reset broker if it's a stub
         if hasattr(self, "broker") and hasattr(self.broker, "reset"):
             self.broker.reset()
@@ -16,6 +16,7 @@ if not os.getenv("SQL_URL"):
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.blocking import InFlightMiddleware, loop_monitor, shutdown_lanes
 from app.routes.health import router as health_router
 from app.routes.version import router as version_router
 from app.routes.positions import router as positions_router
@@ -39,6 +40,7 @@ from app.routes.auth import router as auth_router
 from app.routes.admin import router as admin_router
 from app.routes.position_performance import router as position_performance_router
 from application.services.trading_worker import start_trading_worker, stop_trading_worker
+from infrastructure.persistence.sql.engine import dispose_engines
 
 API_PREFIX = "/v1"
 
@@ -98,9 +100,22 @@ def create_app(enable_trading_worker: bool | None = None) -> FastAPI:
         worker_enabled = _resolve_worker_enabled(enable_trading_worker)
         if worker_enabled:
             start_trading_worker()
+
+        from app.di import container
+
+        # Resume simulations/optimizations queued before the last shutdown
+        container.jobs.start()
+        # Flag handlers that still run blocking work on the event loop
+        loop_monitor.start()
         yield
+        await loop_monitor.stop()
+        shutdown_lanes()
         if worker_enabled:
             stop_trading_worker()
+        container.jobs.stop()
+        # Write out buffered timeline rows before the process exits
+        container.evaluation_timeline.flush()
+        dispose_engines()
 
     app = FastAPI(title="Volatility Balancing API", version="v1", lifespan=lifespan)
     if os.getenv("VB_TIMING", "").lower() in {"1", "true", "yes", "on"}:
@@ -141,6 +156,7 @@ def create_app(enable_trading_worker: bool | None = None) -> FastAPI:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+    app.add_middleware(InFlightMiddleware)
     app.include_router(auth_router)
     app.include_router(admin_router)
     app.include_router(health_router, prefix=API_PREFIX)
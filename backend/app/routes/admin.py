@@ -131,31 +131,25 @@ def blackout_report(
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Could not list positions: {exc}")
 
-    uc = container.backfill_blackout_uc
+    positions = [p for p in positions if getattr(p, "asset_symbol", None) not in (None, "CASH")]
+    # One grouped timeline query for every position
+    blackouts_by_position = container.backfill_blackout_uc.find_all_blackouts(positions)
     for position in positions:
-        if getattr(position, "asset_symbol", None) in (None, "CASH"):
-            continue
-        try:
-            blackouts = uc._find_blackouts(position.id, position.asset_symbol)
-            results.append(
-                {
-                    "position_id": position.id,
-                    "ticker": position.asset_symbol,
-                    "blackouts": [
-                        {
-                            "start": b.start.isoformat(),
-                            "end": b.end.isoformat(),
-                            "calendar_days": b.calendar_days,
-                            "duration_hours": round(b.duration_hours, 1),
-                        }
-                        for b in blackouts
-                    ],
-                }
-            )
-        except Exception as exc:
-            results.append(
-                {"position_id": position.id, "ticker": position.asset_symbol, "error": str(exc)}
-            )
+        results.append(
+            {
+                "position_id": position.id,
+                "ticker": position.asset_symbol,
+                "blackouts": [
+                    {
+                        "start": b.start.isoformat(),
+                        "end": b.end.isoformat(),
+                        "calendar_days": b.calendar_days,
+                        "duration_hours": round(b.duration_hours, 1),
+                    }
+                    for b in blackouts_by_position.get(position.id, [])
+                ],
+            }
+        )
     return results
 
 
@@ -10,13 +10,15 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends
 
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking
 
 router = APIRouter(prefix="/v1/broker")
 logger = logging.getLogger(__name__)
 
 
 @router.get("/status")
-async def broker_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def broker_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Return current broker backend state.
 
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.di import container
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking
 from application.use_cases.process_dividend_uc import ProcessDividendUC
 
 
@@ -41,7 +42,8 @@ def get_dividend_uc() -> ProcessDividendUC:
 
 
 @router.post("/announce")
-async def announce_dividend(
+@blocking("default")
+def announce_dividend(
     request: DividendAnnouncementRequest, dividend_uc: ProcessDividendUC = Depends(get_dividend_uc), user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Announce a new dividend."""
@@ -72,7 +74,8 @@ async def announce_dividend(
 @router.post(
     "/tenants/{tenant_id}/portfolios/{portfolio_id}/positions/{position_id}/process-ex-dividend"
 )
-async def process_ex_dividend_date(
+@blocking("default")
+def process_ex_dividend_date(
     tenant_id: str,
     portfolio_id: str,
     position_id: str,
@@ -119,7 +122,8 @@ async def process_ex_dividend_date(
 @router.post(
     "/tenants/{tenant_id}/portfolios/{portfolio_id}/positions/{position_id}/process-payment"
 )
-async def process_dividend_payment(
+@blocking("default")
+def process_dividend_payment(
     tenant_id: str,
     portfolio_id: str,
     position_id: str,
@@ -152,7 +156,8 @@ async def process_dividend_payment(
 
 
 @router.get("/tenants/{tenant_id}/portfolios/{portfolio_id}/positions/{position_id}/status")
-async def get_dividend_status(
+@blocking("default")
+def get_dividend_status(
     tenant_id: str,
     portfolio_id: str,
     position_id: str,
@@ -176,7 +181,8 @@ async def get_dividend_status(
 
 
 @router.get("/market/{ticker}/info")
-async def get_dividend_info(
+@blocking("default")
+def get_dividend_info(
     ticker: str, dividend_uc: ProcessDividendUC = Depends(get_dividend_uc), user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Get dividend information for a ticker from market data."""
@@ -207,7 +213,8 @@ async def get_dividend_info(
 
 
 @router.get("/market/{ticker}/upcoming")
-async def get_upcoming_dividends(
+@blocking("default")
+def get_upcoming_dividends(
     ticker: str, dividend_uc: ProcessDividendUC = Depends(get_dividend_uc), user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Get upcoming dividends for a ticker."""
@@ -12,7 +12,10 @@ from datetime import datetime, timezone
 
 from app.di import container
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking
+from application.services.comprehensive_excel_export_service import transactions_from_trades
 from application.services.excel_export_service import ExcelExportService
+from application.services.streaming_xlsx import XLSX_MEDIA_TYPE
 from application.services.timeline_excel_export_service import TimelineExcelExportService
 from application.use_cases.parameter_optimization_uc import ParameterOptimizationUC
 from application.use_cases.simulation_unified_uc import SimulationUnifiedUC
@@ -121,7 +124,8 @@ def get_simulation_uc() -> SimulationUnifiedUC:
 
 
 @router.get("/optimization/{config_id}/export")
-async def export_optimization_results(
+@blocking("export")
+def export_optimization_results(
     config_id: str,
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     excel_service: ExcelExportService = Depends(get_excel_export_service),
@@ -178,7 +182,8 @@ async def export_optimization_results(
 
 
 @router.get("/simulation/{simulation_id}/export")
-async def export_simulation_results(
+@blocking("export")
+def export_simulation_results(
     simulation_id: str,
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     ticker: str = Query(None, description="Override ticker symbol (e.g., 'NVDA', 'BRK.A', 'SPY')"),
@@ -358,7 +363,8 @@ async def export_simulation_results(
 
 
 @router.get("/trading/export")
-async def export_trading_data(
+@blocking("export")
+def export_trading_data(
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     position_ids: Optional[List[str]] = Query(None, description="Specific position IDs to export"),
     start_date: Optional[str] = Query(None, description="Start date for data export (ISO format)"),
@@ -475,7 +481,8 @@ async def export_trading_data(
 
 
 @router.get("/positions/{position_id}/export")
-async def export_position_data(
+@blocking("export")
+def export_position_data(
     position_id: str,
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     ticker: str = Query(None, description="Override ticker symbol (e.g., 'NVDA', 'BRK.A', 'SPY')"),
@@ -502,10 +509,9 @@ async def export_position_data(
         except Exception:
             position = None
 
+        owned = position is not None
         if not position:
             # Create mock position data with real market data for demo/testing purposes
-            from datetime import datetime
-
             actual_ticker = get_ticker_for_position(position_id, ticker)
             market_data = get_real_market_data(actual_ticker)
 
@@ -565,44 +571,31 @@ async def export_position_data(
             }
         ]
 
-        # Get ticker for trades/orders (handle both real Position and mock)
-        position_ticker = getattr(position, "ticker", getattr(position, "asset_symbol", "UNKNOWN"))
-
-        # Get trades data for this position
-        trades_data = []
-        if include_trades:
-            # This would need to be implemented in the trades repository
-            # Return empty for now instead of mock AAPL data
-            trades_data = []
-
-        # Get orders data for this position
-        orders_data = []
-        if include_orders:
-            # This would need to be implemented in the orders repository
-            # Return empty for now instead of mock AAPL data
-            orders_data = []
+        # Trades and orders are read from repository cursors while the file is sent,
+        # and only for a position that resolved under the caller's tenant
+        trades_data = ()
+        if include_trades and owned:
+            trades_data = (
+                asdict(trade) for trade in container.trades.iter_for_position(str(position.id))
+            )
 
-        if format.lower() == "xlsx":
-            # Get ticker for filename (handle both real Position and mock)
-            position_ticker = getattr(
-                position, "ticker", getattr(position, "asset_symbol", "UNKNOWN")
+        orders_data = ()
+        if include_orders and owned:
+            orders_data = (
+                asdict(order) for order in container.orders.iter_for_position(str(position.id))
             )
 
-            # Export to Excel
-            excel_data = excel_service.export_trading_data(
+        if format.lower() == "xlsx":
+            chunks = excel_service.stream_trading_data(
                 positions_data,
                 trades_data,
                 orders_data,
                 f"Position Data - {position_ticker} - {position_id}",
             )
 
-            # Create streaming response
-            def generate():
-                yield excel_data
-
             return StreamingResponse(
-                generate(),
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                chunks,
+                media_type=XLSX_MEDIA_TYPE,
                 headers={
                     "Content-Disposition": f"attachment; filename=position_{position_ticker}_{position_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
                 },
@@ -619,7 +612,8 @@ async def export_position_data(
 
 
 @router.get("/dividends/export")
-async def export_dividend_data(
+@blocking("export")
+def export_dividend_data(
     tenant_id: str = Query(..., description="Tenant ID"),
     portfolio_id: str = Query(..., description="Portfolio ID"),
     position_id: str = Query(..., description="Position ID"),
@@ -732,7 +726,8 @@ async def get_export_formats(user: CurrentUser = Depends(get_current_user)):
 
 
 @router.get("/positions/export")
-async def export_positions(
+@blocking("export")
+def export_positions(
     excel_service: ExcelExportService = Depends(get_excel_export_service),
     user: CurrentUser = Depends(get_current_user),
 ):
@@ -885,7 +880,8 @@ async def export_positions(
 
 
 @router.get("/trades/export")
-async def export_trades(
+@blocking("export")
+def export_trades(
     excel_service: ExcelExportService = Depends(get_excel_export_service),
     user: CurrentUser = Depends(get_current_user),
 ):
@@ -948,7 +944,8 @@ async def export_trades(
 
 
 @router.get("/orders/export")
-async def export_orders(
+@blocking("export")
+def export_orders(
     excel_service: ExcelExportService = Depends(get_excel_export_service),
     user: CurrentUser = Depends(get_current_user),
 ):
@@ -1012,7 +1009,8 @@ async def export_orders(
 
 # Enhanced export endpoints with comprehensive data linking
 @router.get("/simulation/{simulation_id}/enhanced-export")
-async def export_enhanced_simulation_results(
+@blocking("export")
+def export_enhanced_simulation_results(
     simulation_id: str,
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     ticker: str = Query(None, description="Override ticker symbol (e.g., 'NVDA', 'BRK.A', 'SPY')"),
@@ -1206,7 +1204,8 @@ async def export_enhanced_simulation_results(
 
 
 @router.get("/trading/enhanced-export")
-async def export_enhanced_trading_data(
+@blocking("export")
+def export_enhanced_trading_data(
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     excel_service: ExcelExportService = Depends(get_excel_export_service),
     user: CurrentUser = Depends(get_current_user),
@@ -1403,7 +1402,8 @@ async def get_export_templates(user: CurrentUser = Depends(get_current_user)):
 
 
 @router.get("/positions/{position_id}/comprehensive-export")
-async def export_position_comprehensive_data(
+@blocking("export")
+def export_position_comprehensive_data(
     position_id: str,
     ticker: str = Query(None, description="Override ticker symbol (e.g., 'NVDA', 'BRK.A', 'SPY')"),
     include_simulation: bool = Query(False, description="Include simulation analysis if available"),
@@ -1489,11 +1489,32 @@ async def export_position_comprehensive_data(
             },
         )()
 
-        # Generate comprehensive Excel data
-        excel_data = excel_service.export_position_comprehensive_data(
+        # Trades are only read for a position that resolves under the caller's tenant
+        owned = False
+        try:
+            for portfolio in container.portfolio_repo.list_all(tenant_id=user.tenant_id):
+                if container.positions.get(
+                    tenant_id=user.tenant_id,
+                    portfolio_id=portfolio.id,
+                    position_id=position_id,
+                ):
+                    owned = True
+                    break
+        except Exception:
+            owned = False
+
+        # Rows are generated and written while the response is being sent;
+        # transactions come from the trades cursor (demo data when there are none)
+        transaction_data = None
+        if owned:
+            transaction_data = transactions_from_trades(
+                container.trades.iter_for_position(position_id)
+            )
+
+        chunks = excel_service.stream_position_comprehensive_data(
             position=compatible_position,
             market_data=None,  # Will generate mock data
-            transaction_data=None,  # Will generate mock data
+            transaction_data=transaction_data,
             simulation_data=None,  # Will be None unless include_simulation=True
         )
 
@@ -1501,10 +1522,9 @@ async def export_position_comprehensive_data(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"comprehensive_position_data_{mock_position.ticker}_{timestamp}.xlsx"
 
-        # Return Excel file as streaming response
         return StreamingResponse(
-            io.BytesIO(excel_data),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            chunks,
+            media_type=XLSX_MEDIA_TYPE,
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
 
@@ -1515,7 +1535,8 @@ async def export_position_comprehensive_data(
 
 
 @router.get("/trading/{position_id}/activity-export")
-async def export_activity_log(
+@blocking("export")
+def export_activity_log(
     position_id: str,
     excel_service: ExcelExportService = Depends(get_excel_export_service),
     user: CurrentUser = Depends(get_current_user),
@@ -1543,39 +1564,31 @@ async def export_activity_log(
         # Get ticker safely
         ticker = getattr(position, "ticker", getattr(position, "asset_symbol", "UNKNOWN"))
 
-        # Get all events for this position
-        position_events = list(container.events.list_for_position(position_id))
-
-        if not position_events:
+        if not list(container.events.list_for_position(position_id, limit=1)):
             raise HTTPException(status_code=404, detail="No events found for this position")
 
-        # Convert events to dict format
-        events_data = []
-        for event in position_events:
-            events_data.append(
-                {
-                    "id": event.id,
-                    "type": event.type,
-                    "ts": event.ts.isoformat() if event.ts else None,
-                    "message": event.message,
-                    "inputs": event.inputs if hasattr(event, "inputs") else {},
-                    "outputs": event.outputs if hasattr(event, "outputs") else {},
-                }
-            )
-
-        # Export to Excel
-        excel_data = excel_service.export_activity_log(events_data, position_id, ticker)
+        # All events, read from a repository cursor while the file is sent
+        events_data = (
+            {
+                "id": event.id,
+                "type": event.type,
+                "ts": event.ts.isoformat() if event.ts else None,
+                "message": event.message,
+                "inputs": event.inputs if hasattr(event, "inputs") else {},
+                "outputs": event.outputs if hasattr(event, "outputs") else {},
+            }
+            for event in container.events.iter_for_position(position_id)
+        )
 
-        def generate():
-            yield excel_data
+        chunks = excel_service.stream_activity_log(events_data, position_id, ticker)
 
         filename = (
             f"activity_log_{ticker}_{position_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
 
         return StreamingResponse(
-            generate(),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            chunks,
+            media_type=XLSX_MEDIA_TYPE,
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
 
@@ -1586,7 +1599,8 @@ async def export_activity_log(
 
 
 @router.get("/analytics/export")
-async def export_analytics_data(
+@blocking("analytics")
+def export_analytics_data(
     tenant_id: str = Query(..., description="Tenant ID"),
     portfolio_id: str = Query(..., description="Portfolio ID"),
     position_id: Optional[str] = Query(None, description="Optional position ID filter"),
@@ -1827,8 +1841,8 @@ def export_timeline_excel(
         # Create export service
         export_service = TimelineExcelExportService(container.evaluation_timeline)
 
-        # Generate Excel
-        excel_data = export_service.export_portfolio_timeline(
+        # Rows are read and written while the response is being sent
+        chunks = export_service.stream_portfolio_timeline(
             tenant_id=tenant_id,
             portfolio_id=portfolio_id,
             start_date=start_dt,
@@ -1837,8 +1851,8 @@ def export_timeline_excel(
         )
 
         return StreamingResponse(
-            io.BytesIO(excel_data),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            chunks,
+            media_type=XLSX_MEDIA_TYPE,
             headers={
                 "Content-Disposition": f'attachment; filename="timeline_export_{portfolio_id}_{datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")}.xlsx"'
             },
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from typing import Any, Dict
 from fastapi import APIRouter
+from app.blocking import blocking
 
 router = APIRouter()
 
 
 @router.get("/healthz")
-async def root_health() -> Dict[str, Any]:
+@blocking("health")
+def root_health() -> Dict[str, Any]:
     try:
         from app.di import container
         from application.services.trading_worker import get_trading_worker
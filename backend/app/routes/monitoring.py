@@ -6,6 +6,8 @@ from pydantic import BaseModel
 
 from app.di import container
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking, blocking_metrics
+from infrastructure.persistence.sql.engine import pool_metrics
 from application.services.trading_worker import get_trading_worker
 
 router = APIRouter(prefix="/v1", tags=["monitoring"])
@@ -58,7 +60,8 @@ def _alert_to_dict(alert) -> Dict[str, Any]:
 # --- Endpoints ---
 
 @router.get("/system/status")
-async def system_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def system_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     worker = get_trading_worker()
     svc = container.system_status_service
     return svc.get_full_status(
@@ -69,8 +72,21 @@ async def system_status(user: CurrentUser = Depends(get_current_user)) -> Dict[s
     )
 
 
+@router.get("/system/blocking")
+async def blocking_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+    """Per-lane concurrency/latency and event-loop stalls with the routes blamed for them."""
+    return blocking_metrics()
+
+
+@router.get("/system/db-pool")
+async def db_pool_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+    """Connection pool occupancy, checkouts, timeouts and checkout wait per database."""
+    return {"engines": pool_metrics()}
+
+
 @router.get("/alerts")
-async def list_alerts(status: Optional[str] = None, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def list_alerts(status: Optional[str] = None, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     from domain.entities.alert import AlertStatus
 
     repo = container.alert_repo
@@ -89,7 +105,8 @@ async def list_alerts(status: Optional[str] = None, user: CurrentUser = Depends(
 
 
 @router.post("/alerts/{alert_id}/acknowledge")
-async def acknowledge_alert(alert_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def acknowledge_alert(alert_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     from domain.entities.alert import AlertStatus
 
     repo = container.alert_repo
@@ -106,7 +123,8 @@ async def acknowledge_alert(alert_id: str, user: CurrentUser = Depends(get_curre
 
 
 @router.post("/alerts/{alert_id}/resolve")
-async def resolve_alert(alert_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def resolve_alert(alert_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     from domain.entities.alert import AlertStatus
 
     repo = container.alert_repo
@@ -121,7 +139,8 @@ async def resolve_alert(alert_id: str, user: CurrentUser = Depends(get_current_u
 
 
 @router.get("/alerts/webhook")
-async def get_webhook_config(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def get_webhook_config(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     svc = container.webhook_service
     return {
         "configured": svc.is_configured,
@@ -130,7 +149,8 @@ async def get_webhook_config(user: CurrentUser = Depends(get_current_user)) -> D
 
 
 @router.put("/alerts/webhook")
-async def set_webhook_config(req: WebhookUpdateRequest, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def set_webhook_config(req: WebhookUpdateRequest, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     svc = container.webhook_service
     svc.set_url(req.url)
     return {
@@ -153,7 +173,8 @@ class NotificationPrefsResponse(BaseModel):
 
 
 @router.get("/settings/notifications")
-async def get_notification_prefs(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def get_notification_prefs(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     prefs = container._notif_prefs.get(user.user_id, {})
     return {
         "email_alerts": prefs.get("email_alerts", False),
@@ -163,7 +184,8 @@ async def get_notification_prefs(user: CurrentUser = Depends(get_current_user))
 
 
 @router.put("/settings/notifications")
-async def set_notification_prefs(
+@blocking("default")
+def set_notification_prefs(
     req: NotificationPrefsRequest,
     user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
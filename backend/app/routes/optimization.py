@@ -5,7 +5,6 @@
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone
-import concurrent.futures
 import traceback
 
 from fastapi import APIRouter, HTTPException, Depends, Query
@@ -26,13 +25,12 @@ from domain.value_objects.optimization_criteria import (
     Constraint,
     ConstraintType,
 )
-from app.di import get_parameter_optimization_uc
+from app.di import container, get_parameter_optimization_uc
+from app.blocking import blocking
+from domain.entities.background_job import BackgroundJob, JobPriority
 
 router = APIRouter(prefix="/v1/optimization", tags=["optimization"])
 
-# Thread pool for background optimization runs
-_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
-
 
 # Pydantic models for API requests/responses
 
@@ -283,7 +281,8 @@ class OptimizationResultResponse(BaseModel):
 
 
 @router.post("/configs", response_model=OptimizationConfigResponse)
-async def create_optimization_config(
+@blocking("optimization")
+def create_optimization_config(
     request: CreateOptimizationRequestModel,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -299,7 +298,8 @@ async def create_optimization_config(
 
 
 @router.get("/configs", response_model=List[OptimizationConfigResponse])
-async def list_optimization_configs(
+@blocking("optimization")
+def list_optimization_configs(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
@@ -314,7 +314,8 @@ async def list_optimization_configs(
 
 
 @router.get("/configs/{config_id}", response_model=OptimizationConfigResponse)
-async def get_optimization_config(
+@blocking("optimization")
+def get_optimization_config(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -354,7 +355,8 @@ class UpdateOptimizationRequestModel(BaseModel):
 
 
 @router.put("/configs/{config_id}", response_model=OptimizationConfigResponse)
-async def update_optimization_config(
+@blocking("optimization")
+def update_optimization_config(
     config_id: str,
     request: UpdateOptimizationRequestModel,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
@@ -423,7 +425,8 @@ async def update_optimization_config(
 
 
 @router.delete("/configs/{config_id}")
-async def delete_optimization_config(
+@blocking("optimization")
+def delete_optimization_config(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -458,7 +461,8 @@ async def delete_optimization_config(
 
 
 @router.post("/configs/{config_id}/reset")
-async def reset_optimization_config(
+@blocking("optimization")
+def reset_optimization_config(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -497,10 +501,16 @@ async def reset_optimization_config(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-def _run_optimization_background(optimization_uc: ParameterOptimizationUC, config_id: UUID):
-    """Run optimization in background thread."""
+def _run_optimization_background(job: BackgroundJob) -> None:
+    """Job handler: run an optimization on the background job queue."""
+    optimization_uc = get_parameter_optimization_uc()
+    config_id = UUID(job.payload["config_id"])
     try:
-        optimization_uc.run_optimization(config_id)
+        # start_optimization already moved the config to RUNNING; a cancel request
+        # stops the run between batches and marks the config CANCELLED
+        optimization_uc.run_optimization(
+            config_id, claimed=True, should_stop=lambda: job.cancel_requested
+        )
     except Exception as e:
         print(f"[Optimization] Background run failed: {e}")
         traceback.print_exc()
@@ -509,10 +519,26 @@ def _run_optimization_background(optimization_uc: ParameterOptimizationUC, confi
             optimization_uc.config_repo.update_status(config_id, OptimizationStatus.FAILED.value)
         except Exception:
             pass
+        raise
+
+
+def _release_optimization(job: BackgroundJob) -> None:
+    """Job abandoned (restart or cancel): let its config be started again."""
+    optimization_uc = get_parameter_optimization_uc()
+    config_id = UUID(job.payload["config_id"])
+    config = optimization_uc.config_repo.get_by_id(config_id)
+    if config and config.is_running():
+        optimization_uc.config_repo.update_status(config_id, OptimizationStatus.FAILED.value)
+
+
+container.jobs.register(
+    "optimization", _run_optimization_background, on_abandoned=_release_optimization
+)
 
 
 @router.post("/configs/{config_id}/start")
-async def start_optimization(
+@blocking("optimization")
+def start_optimization(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -534,12 +560,23 @@ async def start_optimization(
                 detail=f"Cannot start optimization in status: {config.status.value}",
             )
 
-        # Submit to background thread pool
-        _executor.submit(_run_optimization_background, optimization_uc, config_uuid)
+        # RUNNING from now on, so a second start while the job waits is rejected
+        optimization_uc.claim_run(config_uuid)
+        try:
+            # Optimizations are long-running: queue behind interactive simulations
+            job = container.jobs.submit(
+                "optimization", {"config_id": str(config_uuid)}, priority=JobPriority.LOW
+            )
+        except Exception:
+            optimization_uc.config_repo.update_status(
+                config_uuid, OptimizationStatus.FAILED.value
+            )
+            raise
 
         return {
             "status": "running",
             "config_id": config_id,
+            "job_id": job.id,
             "message": "Optimization started in background",
         }
     except HTTPException:
@@ -551,7 +588,8 @@ async def start_optimization(
 
 
 @router.get("/configs/{config_id}/progress", response_model=OptimizationProgressResponse)
-async def get_optimization_progress(
+@blocking("optimization")
+def get_optimization_progress(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -567,7 +605,8 @@ async def get_optimization_progress(
 
 
 @router.get("/configs/{config_id}/results", response_model=List[OptimizationResultResponse])
-async def get_optimization_results(
+@blocking("optimization")
+def get_optimization_results(
     config_id: str,
     optimization_uc: ParameterOptimizationUC = Depends(get_parameter_optimization_uc),
     user: CurrentUser = Depends(get_current_user),
@@ -583,7 +622,8 @@ async def get_optimization_results(
 
 
 @router.get("/configs/{config_id}/heatmap")
-async def get_heatmap_data(
+@blocking("optimization")
+def get_heatmap_data(
     config_id: str,
     x_parameter: str = Query(..., description="X-axis parameter name"),
     y_parameter: str = Query(..., description="Y-axis parameter name"),
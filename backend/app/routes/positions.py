@@ -8,18 +8,17 @@ from typing import Any, Dict, List
 import logging
 import os
 import time
-import threading
 from fastapi import APIRouter, HTTPException, Query, Header, Depends
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from app.di import container
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking
 from datetime import datetime, timezone
 from uuid import uuid4
 
-# ── In-process simulation job store ──────────────────────────────────────────
-# Keyed by job_id. Each entry: {status, result, error, started_at}
-_sim_jobs: Dict[str, Dict[str, Any]] = {}
+from domain.entities.background_job import BackgroundJob, JobStatus
 
 router = APIRouter(prefix="/v1")
 logger = logging.getLogger(__name__)
@@ -561,7 +560,8 @@ def _tick_position_sync(position_id: str) -> Dict[str, Any]:
 
 
 @router.post("/positions/{position_id}/tick")
-async def tick_position(position_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+@blocking("default")
+def tick_position(position_id: str, user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
     return _tick_position_sync(position_id)
 
 
@@ -574,6 +574,7 @@ class SimulationRequest(BaseModel):
     include_after_hours: bool = False
     intraday_interval_minutes: int = 30
     position_config: Optional[Dict[str, Any]] = None
+    engine: str = "standard"  # "standard" | "fast"
 
 
 @router.post("/positions/{position_id}/simulation/run")
@@ -649,6 +650,7 @@ def run_simulation_for_position(
             include_after_hours=request.include_after_hours,
             intraday_interval_minutes=request.intraday_interval_minutes,
             simulation_id=simulation_id,
+            engine=request.engine,
         )
 
         # Convert result to dict for JSON response
@@ -703,6 +705,7 @@ class StandaloneSimulationRequest(BaseModel):
     include_after_hours: bool = False
     intraday_interval_minutes: int = 30
     position_config: Optional[Dict[str, Any]] = None
+    engine: str = "standard"  # "standard" | "fast"
 
 
 def _build_sim_result(result: Any, ticker: str, simulation_id: str) -> Dict[str, Any]:
@@ -759,39 +762,31 @@ def _build_sim_result(result: Any, ticker: str, simulation_id: str) -> Dict[str,
     }
 
 
-def _run_sim_job(job_id: str, ticker: str, start_date: datetime, end_date: datetime,
-                 initial_cash: float, position_config: dict,
-                 include_after_hours: bool, intraday_interval_minutes: int,
-                 initial_asset_value: Optional[float] = None) -> None:
-    """Run simulation in background thread and store result in _sim_jobs."""
-    import time
+def _run_sim_job(job: BackgroundJob) -> Dict[str, Any]:
+    """Job handler: run a standalone simulation and return the JSON response dict."""
+    params = job.payload
     t0 = time.monotonic()
-    try:
-        simulation_uc = container.simulation_uc
-        result = simulation_uc.run_simulation(
-            ticker=ticker.upper(),
-            start_date=start_date,
-            end_date=end_date,
-            initial_cash=initial_cash,
-            initial_asset_value=initial_asset_value,
-            position_config=position_config,
-            include_after_hours=include_after_hours,
-            intraday_interval_minutes=intraday_interval_minutes,
-            simulation_id=job_id,
-        )
-        elapsed = round(time.monotonic() - t0, 1)
-        built = _build_sim_result(result, ticker, job_id)
-        built["elapsed_seconds"] = elapsed
-        _sim_jobs[job_id]["status"] = "completed"
-        _sim_jobs[job_id]["result"] = built
-        _sim_jobs[job_id]["elapsed_seconds"] = elapsed
-        print(f"[sim:{job_id[:8]}] completed in {elapsed}s")
-    except Exception as exc:
-        import traceback
-        traceback.print_exc()
-        _sim_jobs[job_id]["status"] = "failed"
-        _sim_jobs[job_id]["error"] = str(exc)
-        _sim_jobs[job_id]["elapsed_seconds"] = round(time.monotonic() - t0, 1)
+    result = container.simulation_uc.run_simulation(
+        ticker=params["ticker"].upper(),
+        start_date=datetime.fromisoformat(params["start_date"]),
+        end_date=datetime.fromisoformat(params["end_date"]),
+        initial_cash=params["initial_cash"],
+        initial_asset_value=params.get("initial_asset_value"),
+        position_config=params["position_config"],
+        include_after_hours=params["include_after_hours"],
+        intraday_interval_minutes=params["intraday_interval_minutes"],
+        simulation_id=job.id,
+        engine=params.get("engine", "standard"),
+    )
+    elapsed = round(time.monotonic() - t0, 1)
+    built = _build_sim_result(result, params["ticker"], job.id)
+    built["elapsed_seconds"] = elapsed
+    logger.info("[sim:%s] completed in %ss", job.id[:8], elapsed)
+    # Stored as JSON in the job table
+    return jsonable_encoder(built)
+
+
+container.jobs.register("simulation", _run_sim_job)
 
 
 @router.post("/simulation/run")
@@ -823,21 +818,23 @@ def run_standalone_simulation(
                 },
             }
 
-        job_id = str(uuid4())
-        _sim_jobs[job_id] = {"status": "running", "result": None, "error": None,
-                              "started_at": datetime.now(timezone.utc).isoformat()}
-
-        t = threading.Thread(
-            target=_run_sim_job,
-            args=(job_id, request.ticker, start_date, end_date,
-                  request.initial_cash, position_config,
-                  request.include_after_hours, request.intraday_interval_minutes,
-                  request.initial_asset_value),
-            daemon=True,
+        job = container.jobs.submit(
+            "simulation",
+            {
+                "ticker": request.ticker,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "initial_cash": request.initial_cash,
+                "initial_asset_value": request.initial_asset_value,
+                "position_config": position_config,
+                "include_after_hours": request.include_after_hours,
+                "intraday_interval_minutes": request.intraday_interval_minutes,
+                "engine": request.engine,
+            },
         )
-        t.start()
 
-        return {"job_id": job_id, "status": "running"}
+        # The job may still be queued; pollers treat every unfinished status as running
+        return {"job_id": job.id, "status": "running"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting simulation: {str(e)}")
@@ -849,27 +846,44 @@ def get_simulation_status(
     user: CurrentUser = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Poll for simulation job status. Returns result when status == 'completed'."""
-    job = _sim_jobs.get(job_id)
-    if not job:
+    job = container.jobs.get(job_id)
+    if not job or job.kind != "simulation":
         raise HTTPException(status_code=404, detail="Simulation job not found")
 
     response: Dict[str, Any] = {
         "job_id": job_id,
-        "status": job["status"],
-        "started_at": job.get("started_at"),
-        "elapsed_seconds": job.get("elapsed_seconds"),
+        "status": job.status.value,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "elapsed_seconds": job.elapsed_seconds,
     }
-    if job["status"] == "completed":
-        response["result"] = job["result"]
+    if job.status == JobStatus.completed:
+        response["result"] = job.result
         # Clean up to free memory
-        del _sim_jobs[job_id]
-    elif job["status"] == "failed":
-        response["error"] = job.get("error", "Unknown error")
-        del _sim_jobs[job_id]
+        container.jobs.delete(job_id)
+    elif job.status.is_finished:
+        response["error"] = job.error or f"Simulation {job.status.value}"
+        container.jobs.delete(job_id)
 
     return response
 
 
+@router.delete("/simulation/jobs/{job_id}")
+def cancel_simulation_job(
+    job_id: str,
+    user: CurrentUser = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Cancel a queued simulation, or discard the result of a running one."""
+    job = container.jobs.get(job_id)
+    if not job or job.kind != "simulation":
+        raise HTTPException(status_code=404, detail="Simulation job not found")
+    job = container.jobs.cancel(job_id) or job
+    return {"job_id": job_id, "status": job.status.value, "cancel_requested": job.cancel_requested}
+
+
+@router.get("/jobs/metrics")
+def get_job_metrics(user: CurrentUser = Depends(get_current_user)) -> Dict[str, Any]:
+    """Background job queue depth, status counts and wait/run latencies."""
+    return container.jobs.metrics()
 
 
 @router.post("/positions/{position_id}/anchor")
@@ -937,7 +951,8 @@ def evaluate_position_with_market_data_legacy(position_id: str, user: CurrentUse
 
 
 @router.get("/positions/{position_id}/timeline")
-async def list_position_timeline_legacy(
+@blocking("default")
+def list_position_timeline_legacy(
     position_id: str,
     limit: int = Query(200, description="Maximum number of timeline rows"),
     start_date: Optional[str] = Query(None, description="Filter events from this date (ISO format)"),
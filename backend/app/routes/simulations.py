@@ -10,6 +10,7 @@ from uuid import UUID
 
 from app.di import container
 from app.auth import get_current_user, CurrentUser
+from app.blocking import blocking
 from application.services.excel_export_service import ExcelExportService
 from application.services.verbose_timeline_service import VerboseTimelineService
 
@@ -91,8 +92,42 @@ def get_simulation(simulation_id: str, user: CurrentUser = Depends(get_current_u
         raise HTTPException(status_code=500, detail=f"Error getting simulation: {str(e)}")
 
 
+@router.get("/{simulation_id}/series")
+def get_simulation_series(
+    simulation_id: str,
+    series: Optional[str] = Query(
+        None, description="Comma-separated series names (default: all), e.g. time_series_data,trade_log"
+    ),
+    columns: Optional[str] = Query(None, description="Comma-separated row keys to return"),
+    start: Optional[datetime] = Query(None, description="Only rows at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows at or before this time"),
+    user: CurrentUser = Depends(get_current_user),
+) -> dict:
+    """Get time series of a simulation, optionally limited to some columns and a time range."""
+    try:
+        data = container.simulation.get_simulation_series(
+            UUID(simulation_id),
+            series=_split(series),
+            columns=_split(columns),
+            start=start,
+            end=end,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Simulation not found")
+    return {"id": simulation_id, "series": data}
+
+
+def _split(value: Optional[str]) -> Optional[list]:
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
 @router.get("/{simulation_id}/export")
-async def export_simulation(
+@blocking("export")
+def export_simulation(
     simulation_id: str,
     format: str = Query("xlsx", description="Export format (xlsx, csv)"),
     excel_service: ExcelExportService = Depends(get_excel_export_service),
@@ -175,29 +210,15 @@ def get_verbose_timeline(
 ) -> dict:
     """Get verbose timeline view for a simulation."""
     try:
-        # Access the database model directly through the repository's session
-        from infrastructure.persistence.sql.models import SimulationResultModel
-
-        # Get the session from the simulation repo
-        sim_repo = container.simulation
-        if not hasattr(sim_repo, "session"):
-            raise HTTPException(status_code=500, detail="Cannot access database session")
-
-        model = (
-            sim_repo.session.query(SimulationResultModel)
-            .filter(SimulationResultModel.id == simulation_id)
-            .first()
-        )
-
-        if not model:
+        simulation = container.simulation.get_simulation_result(UUID(simulation_id))
+        if not simulation:
             raise HTTPException(status_code=404, detail="Simulation not found")
 
-        # Extract data directly from the model
-        time_series_data = model.time_series_data or []
-        trade_log = model.trade_log or []
-        dividend_analysis = model.dividend_analysis or {}
-        trigger_analysis = model.trigger_analysis or []
-        price_data = model.price_data or []
+        time_series_data = simulation.time_series_data or []
+        trade_log = simulation.trade_log or []
+        dividend_analysis = simulation.dividend_analysis or {}
+        trigger_analysis = simulation.trigger_analysis or []
+        price_data = simulation.price_data or []
 
         # Log for debugging
         import logging
@@ -225,9 +246,9 @@ def get_verbose_timeline(
 
         return {
             "simulation_id": simulation_id,
-            "ticker": model.ticker,
-            "start_date": model.start_date.isoformat() if model.start_date else "",
-            "end_date": model.end_date.isoformat() if model.end_date else "",
+            "ticker": simulation.ticker,
+            "start_date": simulation.start_date or "",
+            "end_date": simulation.end_date or "",
             "rows": timeline_rows,
             "total_rows": len(timeline_rows),
         }
@@ -321,6 +321,7 @@ def get_worker_status(user: CurrentUser = Depends(get_current_user)) -> Dict[str
             "running": worker.is_running(),
             "enabled": worker.enabled,
             "interval_seconds": worker.interval_seconds,
+            "last_cycle": worker.last_cycle_metrics,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting worker status: {str(e)}")
@@ -0,0 +1,85 @@
+# =========================
+# backend/application/dto/position_context.py
+# =========================
+"""Per-cycle view of one tradable position and the rows it depends on."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from domain.entities.market_data import PriceData
+from domain.entities.order import Order
+from domain.entities.portfolio import Portfolio
+from domain.entities.position import Position
+from domain.value_objects.configs import GuardrailConfig, OrderPolicyConfig, TriggerConfig
+
+
+@dataclass
+class SharedQuote:
+    """
+    One reference quote per ticker and cycle, shared by every position on it.
+
+    Validation depends only on the quote and the after-hours flag, so it is
+    computed at most once per flag.
+    """
+
+    ticker: str
+    price_data: Optional[PriceData]
+    _validations: Dict[bool, Dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    def validation(
+        self, validate: Callable[..., Dict[str, Any]], allow_after_hours: bool
+    ) -> Dict[str, Any]:
+        cached = self._validations.get(allow_after_hours)
+        if cached is None:
+            cached = validate(self.price_data, allow_after_hours=allow_after_hours)
+            self._validations[allow_after_hours] = cached
+        return dict(cached)
+
+
+@dataclass
+class PositionContext:
+    """
+    Everything a live trading cycle needs to locate and evaluate a position.
+
+    Built in bulk once per cycle (see IPositionRepository.get_trading_contexts)
+    so that evaluating N positions does not rescan portfolios N times.
+    ``position``/``portfolio`` are None when the repository cannot provide
+    them; consumers then load them as before. Configs are None when no saved
+    per-position config exists (or configs were not preloaded).
+
+    ``open_orders`` and ``orders_today`` (the order count on ``orders_day``)
+    are None when orders were not preloaded. Consumers fall back to querying
+    when they are missing or ``orders_day`` is not the day they check.
+
+    The preloaded rows can go stale while the cycle runs, so they only back
+    evaluations that end without an order: before placing one the cycle
+    reloads them (IPositionRepository.refresh_trading_context).
+    """
+
+    position_id: str
+    ticker: str
+    tenant_id: str = "default"
+    portfolio_id: Optional[str] = None
+    position: Optional[Position] = None
+    portfolio: Optional[Portfolio] = None
+    trigger_config: Optional[TriggerConfig] = None
+    guardrail_config: Optional[GuardrailConfig] = None
+    order_policy_config: Optional[OrderPolicyConfig] = None
+    open_orders: Optional[List[Order]] = None
+    orders_today: Optional[int] = None
+    orders_day: Optional[date] = None
+    # Set by EvaluatePositionUC.prepare_cycle: the ticker's quote, and whether the
+    # bulk screen ruled out triggers, auto-rebalancing and anchor resets
+    quote: Optional[SharedQuote] = None
+    quiet: bool = False
+
+    @property
+    def trading_hours_policy(self) -> Optional[str]:
+        return self.portfolio.trading_hours_policy if self.portfolio else None
+
+    def order_count_on(self, day: date) -> Optional[int]:
+        """Preloaded order count for ``day``, or None if it must be queried."""
+        return self.orders_today if self.orders_day == day else None
@@ -0,0 +1,226 @@
+# =========================
+# backend/application/helpers/grid_simulation_kernel.py
+# =========================
+"""
+Batched grid evaluation on top of SimulationKernel.
+
+A parameter sweep runs the same price series once per configuration. This
+kernel carries N positions side by side instead: the bars are loaded once,
+each window of bars is screened for all configurations in a single (N x w)
+NumPy pass, and only configurations with candidate bars drop into the scalar
+step. Per-configuration results are identical to ``SimulationKernel`` runs
+with ``collect_series=False``.
+
+Per-bar state is kept as change points (bar index, qty, cash) per lane, so
+memory grows with the number of trades rather than N x bars.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.dividend import Dividend
+from domain.entities.market_data import SimulationData
+from domain.entities.position import Position
+from application.helpers.simulation_kernel import (
+    ANOMALY_THRESHOLD_PCT,
+    SimulationKernel,
+    load_bars,
+)
+
+# Bars screened per pass across all lanes
+_GRID_WINDOW = 512
+
+
+class GridSimulationKernel:
+    """Run one backtest per Position over a shared SimulationData price series."""
+
+    def __init__(
+        self,
+        positions: List[Position],
+        sim_data: SimulationData,
+        dividend_history: Optional[List[Dividend]] = None,
+        window: int = _GRID_WINDOW,
+    ) -> None:
+        self.sim_data = sim_data
+        self.bars = sim_data.price_data
+        self.n = len(self.bars)
+        self.window = window
+        self.prices, self.times = load_bars(self.bars)
+        self.day_ord = (
+            np.fromiter((t.toordinal() for t in self.times), dtype=np.int64, count=self.n)
+            if dividend_history
+            else None
+        )
+
+        self.lanes = [_GridLane(position, self, dividend_history) for position in positions]
+        self.errors: List[Optional[Exception]] = [None] * len(self.lanes)
+
+        self._up_screen = np.array([lane._up_screen for lane in self.lanes])[:, None]
+        self._down_screen = np.array([lane._down_screen for lane in self.lanes])[:, None]
+        self._min_alloc = np.array([lane.min_alloc for lane in self.lanes])[:, None]
+        self._max_alloc = np.array([lane.max_alloc for lane in self.lanes])[:, None]
+        self._drift_slack = np.array([lane._drift_slack for lane in self.lanes])[:, None]
+        self._drift_min_qty = np.array([lane._drift_min_qty for lane in self.lanes])[:, None]
+        self._drift_min_notional = np.array(
+            [lane._drift_min_notional for lane in self.lanes]
+        )[:, None]
+
+        # Bars on any ex-dividend day; lanes track which of them are still pending
+        self._dividend_bars = None
+        if self.day_ord is not None:
+            days = {d.ex_date.date().toordinal() for d in dividend_history}
+            self._dividend_bars = np.isin(self.day_ord, np.fromiter(days, dtype=np.int64))
+
+    def run(self) -> None:
+        """Walk the price series once, advancing every lane."""
+        if self.n == 0:
+            return
+        for r, lane in enumerate(self.lanes):
+            self._guard(r, lane._start)
+
+        i = 1
+        while i < self.n:
+            j = min(self.n, i + self.window)
+            mask = self._candidates(i, j)
+            for r in np.flatnonzero(mask.any(axis=1)):
+                r = int(r)
+                self._guard(r, self.lanes[r]._run_window, i, j, np.flatnonzero(mask[r]))
+            i = j
+
+    def results(
+        self, initial_cash: float
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Yield (index, result dict, error) per lane, releasing each lane afterwards.
+
+        Result dicts have the same keys as SimulationKernel.run.
+        """
+        for r, lane in enumerate(self.lanes):
+            error = self.errors[r]
+            result = None
+            if error is None:
+                try:
+                    result = lane._build_result(initial_cash)
+                except Exception as e:
+                    error = e
+            self.lanes[r] = None
+            yield r, result, error
+
+    def _guard(self, r: int, fn, *args) -> None:
+        # A failing configuration is dropped from the sweep; the others continue
+        try:
+            fn(*args)
+        except Exception as e:
+            self.errors[r] = e
+
+    def _candidates(self, i: int, j: int) -> np.ndarray:
+        """(lanes x bars) mask of bars in [i, j) that may not be a plain HOLD.
+
+        Same screen as SimulationKernel._candidates, broadcast over lanes.
+        Lanes with a degenerate anchor get a full row (stepped bar by bar);
+        failed lanes get an empty one.
+        """
+        lanes = self.lanes
+        anchor = np.array(
+            [lane.position.anchor_price or 0.0 for lane in lanes], dtype=np.float64
+        )[:, None]
+        qty = np.array([lane.position.qty for lane in lanes], dtype=np.float64)[:, None]
+        cash = np.array([lane.position.cash for lane in lanes], dtype=np.float64)[:, None]
+        prices = self.prices[i:j][None, :]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel = (prices - anchor) / anchor
+            pct = rel * 100
+            mask = np.abs(rel) * 100 > ANOMALY_THRESHOLD_PCT
+            mask |= pct >= self._up_screen
+            mask |= pct <= self._down_screen
+
+            asset_value = qty * prices
+            total_value = asset_value + cash
+            alloc = np.where(total_value > 0, asset_value / total_value, 0.0)
+            below = alloc < self._min_alloc
+            buy_gap = (self._min_alloc * total_value) / prices - qty
+            mask |= below & (buy_gap > 0.001) & self._executable(buy_gap, prices)
+            sell_gap = (self._max_alloc * total_value) / prices - qty
+            mask |= (
+                ~below
+                & (alloc > self._max_alloc)
+                & (sell_gap < -0.001)
+                & self._executable(-sell_gap, prices)
+            )
+
+        if self._dividend_bars is not None and self._dividend_bars[i:j].any():
+            day_ord = self.day_ord[i:j]
+            for r, lane in enumerate(lanes):
+                if lane._pending:
+                    pending_days = np.fromiter(
+                        (d.toordinal() for d in lane._pending),
+                        dtype=np.int64,
+                        count=len(lane._pending),
+                    )
+                    mask[r] |= np.isin(day_ord, pending_days)
+
+        mask[~(anchor[:, 0] > 0)] = True
+        for r, error in enumerate(self.errors):
+            if error is not None:
+                mask[r] = False
+        return mask
+
+    def _executable(self, gap: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        qty = gap + self._drift_slack
+        return (qty >= self._drift_min_qty) & (qty * prices >= self._drift_min_notional)
+
+
+class _GridLane(SimulationKernel):
+    """SimulationKernel over the grid's shared bars, recording state change points only."""
+
+    def __init__(
+        self,
+        position: Position,
+        grid: GridSimulationKernel,
+        dividend_history: Optional[List[Dividend]],
+    ) -> None:
+        self._grid = grid
+        super().__init__(position, grid.sim_data, dividend_history, collect_series=False)
+
+    def _load_bars(self) -> Tuple[np.ndarray, List[Any]]:
+        return self._grid.prices, self._grid.times
+
+    def _day_ordinals(self) -> np.ndarray:
+        return self._grid.day_ord
+
+    def _init_state(self) -> None:
+        self._marks: List[int] = []
+        self._mark_qty: List[float] = []
+        self._mark_cash: List[float] = []
+
+    def _hold(self, i: int, j: int, anchor: float, qty: float, cash: float) -> None:
+        pass  # state is unchanged since the last mark
+
+    def _record(self, k: int, pre_anchor: Optional[float], delta_pct: float) -> None:
+        pos = self.position
+        if self._marks and self._mark_qty[-1] == pos.qty and self._mark_cash[-1] == pos.cash:
+            return
+        if self._marks and self._marks[-1] == k:
+            self._mark_qty[-1] = pos.qty
+            self._mark_cash[-1] = pos.cash
+            return
+        self._marks.append(k)
+        self._mark_qty.append(pos.qty)
+        self._mark_cash.append(pos.cash)
+
+    def _build_result(self, initial_cash: float) -> Dict[str, Any]:
+        # Expand the change points into per-bar qty / cash for the metrics
+        if self._marks:
+            idx = np.searchsorted(self._marks, np.arange(self.n), side="right") - 1
+            self.qty = np.asarray(self._mark_qty)[idx]
+            self.cash = np.asarray(self._mark_cash)[idx]
+        else:
+            self.qty = np.zeros(self.n)
+            self.cash = np.zeros(self.n)
+        try:
+            return super()._build_result(initial_cash)
+        finally:
+            self.qty = self.cash = None
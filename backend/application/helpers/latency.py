@@ -0,0 +1,21 @@
+# =========================
+# backend/application/helpers/latency.py
+# =========================
+"""Percentile summaries of latency samples for the metrics endpoints."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """p50/p95/max of latency samples in seconds, rounded to 0.1 ms (zeros when empty)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[round(0.50 * last)], 4),
+        "p95": round(ordered[round(0.95 * last)], 4),
+        "max": round(ordered[-1], 4),
+    }
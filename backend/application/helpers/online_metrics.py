@@ -0,0 +1,253 @@
+# =========================
+# backend/application/helpers/online_metrics.py
+# =========================
+"""
+Streaming performance metrics for simulations.
+
+A backtest used to keep every portfolio value and a ``daily_returns`` row per
+bar only so that volatility, Sharpe and max drawdown could be computed at the
+end, and the optimizer then walked the same rows again for Sortino, win rate
+and profit factor. ``OnlineMetrics`` folds each value into a fixed set of
+running statistics instead: Welford mean / variance of the step returns, the
+same over the negative returns (downside deviation), running peak and max
+drawdown, gain / loss sums and trade counters. Memory is O(1) in the number
+of bars.
+
+Definitions are the ones the simulation and optimization code always used:
+
+- step return: ``value / previous - 1``, or 0.0 when the previous value <= 0
+- volatility: sample standard deviation of step returns x sqrt(252)
+- Sharpe: mean x 252 / (sample std x sqrt(252)), no risk-free rate
+- Sortino: mean x 252 / (sample std of negative returns x sqrt(252))
+- max drawdown: largest (peak - value) / peak, in percent
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+TRADING_DAYS = 252
+_ANNUALIZE = TRADING_DAYS**0.5
+
+
+class OnlineMetrics:
+    """Running return / drawdown / trade statistics over a stream of portfolio values."""
+
+    __slots__ = (
+        "values",
+        "first_value",
+        "last_value",
+        "peak",
+        "_max_drawdown",
+        "count",
+        "last_return",
+        "mean",
+        "_m2",
+        "downside_count",
+        "_downside_mean",
+        "_downside_m2",
+        "positive_returns",
+        "negative_returns",
+        "gross_gain",
+        "gross_loss",
+        "trades",
+        "total_commission",
+    )
+
+    def __init__(self) -> None:
+        self.values = 0
+        self.first_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.peak = 0.0
+        self._max_drawdown = 0.0
+        # Step returns (Welford)
+        self.count = 0
+        self.last_return = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        # Negative step returns (Welford)
+        self.downside_count = 0
+        self._downside_mean = 0.0
+        self._downside_m2 = 0.0
+        self.positive_returns = 0
+        self.negative_returns = 0
+        self.gross_gain = 0.0
+        self.gross_loss = 0.0
+        self.trades = 0
+        self.total_commission = 0.0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update(self, value: float) -> None:
+        """Fold in the next portfolio value."""
+        last = self.last_value
+        if last is None:
+            self.first_value = value
+            self.peak = value
+        else:
+            self.add_return(0.0 if last <= 0 else value / last - 1)
+            if value > self.peak:
+                self.peak = value
+        self.last_value = value
+        self.values += 1
+        if self.peak > 0:
+            drawdown = (self.peak - value) / self.peak
+            if drawdown > self._max_drawdown:
+                self._max_drawdown = drawdown
+
+    def add_return(self, ret: float) -> None:
+        """Fold in one step return (``update`` calls this for every value after the first)."""
+        self.count += 1
+        self.last_return = ret
+        delta = ret - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (ret - self.mean)
+        if ret > 0:
+            self.positive_returns += 1
+            self.gross_gain += ret
+        elif ret < 0:
+            self.negative_returns += 1
+            self.gross_loss += ret
+            self.downside_count += 1
+            delta = ret - self._downside_mean
+            self._downside_mean += delta / self.downside_count
+            self._downside_m2 += delta * (ret - self._downside_mean)
+
+    def update_many(self, values: np.ndarray) -> None:
+        """Fold in a block of portfolio values; same result as ``update`` on each."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        first = float(values[0])
+        if self.last_value is None:
+            self.first_value = first
+            self.peak = first
+            returns = step_returns(values)
+        else:
+            returns = step_returns(np.concatenate(([self.last_value], values)))
+
+        peaks = np.maximum.accumulate(np.concatenate(([self.peak], values)))[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = np.where(peaks > 0, (peaks - values) / peaks, 0.0)
+        self._max_drawdown = max(self._max_drawdown, float(np.max(drawdowns)))
+        self.peak = float(peaks[-1])
+        self.last_value = float(values[-1])
+        self.values += values.size
+
+        if returns.size:
+            self.count, self.mean, self._m2 = _merge(self.count, self.mean, self._m2, returns)
+            self.last_return = float(returns[-1])
+            gains = returns[returns > 0]
+            losses = returns[returns < 0]
+            self.positive_returns += gains.size
+            self.negative_returns += losses.size
+            self.gross_gain += float(gains.sum())
+            self.gross_loss += float(losses.sum())
+            if losses.size:
+                self.downside_count, self._downside_mean, self._downside_m2 = _merge(
+                    self.downside_count, self._downside_mean, self._downside_m2, losses
+                )
+
+    def record_trade(self, commission: float = 0.0) -> None:
+        self.trades += 1
+        self.total_commission += commission
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the step returns (0.0 below two returns)."""
+        if self.count < 2:
+            return 0.0
+        return (max(self._m2, 0.0) / (self.count - 1)) ** 0.5
+
+    @property
+    def downside_std(self) -> float:
+        """Sample standard deviation of the negative step returns."""
+        if self.downside_count < 2:
+            return 0.0
+        return (max(self._downside_m2, 0.0) / (self.downside_count - 1)) ** 0.5
+
+    @property
+    def volatility(self) -> float:
+        return self.std * _ANNUALIZE
+
+    @property
+    def sharpe_ratio(self) -> float:
+        std = self.std
+        if std == 0:
+            return 0.0
+        return (self.mean * TRADING_DAYS) / (std * _ANNUALIZE)
+
+    @property
+    def sortino_ratio(self) -> float:
+        downside_dev = self.downside_std * _ANNUALIZE
+        if self.count < 2 or downside_dev == 0:
+            return 0.0
+        return (self.mean * TRADING_DAYS) / downside_dev
+
+    @property
+    def max_drawdown_pct(self) -> float:
+        return self._max_drawdown * 100
+
+    @property
+    def win_rate(self) -> float:
+        """Share of step returns that were positive."""
+        return self.positive_returns / self.count if self.count else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        """Sum of positive returns over the absolute sum of negative ones."""
+        if self.gross_loss < 0:
+            return self.gross_gain / abs(self.gross_loss)
+        return float("inf") if self.gross_gain > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "returns": self.count,
+            "mean_return": self.mean,
+            "volatility": self.volatility,
+            "sharpe_ratio": self.sharpe_ratio,
+            "sortino_ratio": self.sortino_ratio,
+            "max_drawdown": self.max_drawdown_pct,
+            "win_rate": self.win_rate,
+            "profit_factor": self.profit_factor,
+            "positive_returns": self.positive_returns,
+            "negative_returns": self.negative_returns,
+            "trades": self.trades,
+            "total_commission": self.total_commission,
+        }
+
+
+def step_returns(values: np.ndarray) -> np.ndarray:
+    """Per-step returns of a value series (0.0 after a non-positive value)."""
+    if values.size < 2:
+        return np.zeros(0)
+    prev = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(prev <= 0, 0.0, values[1:] / prev - 1)
+
+
+def _merge(count: int, mean: float, m2: float, block: np.ndarray):
+    """Combine running (count, mean, M2) with a block of samples (Chan et al.)."""
+    n = block.size
+    first = block[0]
+    if np.all(block == first):
+        # Constant block: exact mean, zero spread (as the scalar update gives)
+        block_mean, block_m2 = float(first), 0.0
+    else:
+        block_mean = float(np.mean(block))
+        block_m2 = float(np.sum((block - block_mean) ** 2))
+    if count == 0:
+        return n, block_mean, block_m2
+    total = count + n
+    delta = block_mean - mean
+    return (
+        total,
+        mean + delta * n / total,
+        m2 + block_m2 + delta * delta * count * n / total,
+    )
@@ -0,0 +1,1018 @@
+# =========================
+# backend/application/helpers/simulation_kernel.py
+# =========================
+"""
+Array-based backtest kernel ("fast engine") for SimulationUnifiedUC.
+
+The standard engine drives every bar through EvaluatePositionUC ->
+SubmitOrderUC -> ExecuteOrderUC against in-memory repositories. Most bars are
+HOLDs that leave qty, cash and anchor untouched, so this kernel screens the
+price array in bulk for the bars that *can* change state (trigger crossings,
+allocation drift outside the guardrails, anchor anomalies, ex-dividend days)
+and runs the scalar decision logic only on those. HOLD stretches are filled
+in with NumPy.
+
+The scalar step applies the same anchor / trigger / sizing / guardrail /
+commission / dividend rules as the use cases (same float expressions, same
+Decimal PriceTrigger and GuardrailEvaluator calls), so results match the
+standard engine. Differences:
+
+- Order validation checks the bar's ``is_market_hours`` flag instead of the
+  wall clock; validation is informational only in simulation.
+- No per-bar events, orders or trades are persisted.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.entities.dividend import Dividend
+from domain.entities.market_data import SimulationData
+from domain.entities.position import Position
+from domain.entities.price_series import PriceSeries
+from domain.services.guardrail_evaluator import GuardrailEvaluator
+from domain.services.price_trigger import PriceTrigger
+from application.helpers.online_metrics import OnlineMetrics, step_returns
+from infrastructure.adapters.converters import (
+    guardrail_policy_to_guardrail_config,
+    order_policy_to_order_policy_config,
+    order_policy_to_trigger_config,
+    position_to_position_state,
+)
+
+# Same constant as EvaluatePositionUC._check_and_reset_anchor_if_anomalous
+ANOMALY_THRESHOLD_PCT = 50.0
+
+# Screening window bounds (bars). The window doubles across quiet stretches
+# and shrinks back after every state change.
+_MIN_WINDOW = 64
+_MAX_WINDOW = 65536
+
+# Slack on the float trigger screen; candidates are confirmed with Decimal.
+_SCREEN_TOLERANCE = 1e-9
+
+TriggerHook = Callable[[Position, Any, Dict[str, Any]], None]
+FillHook = Callable[[Position, Any, Dict[str, Any]], None]
+
+
+class SimulationKernel:
+    """Run one volatility-balancing backtest over a SimulationData price series.
+
+    The caller owns the Position (initial qty/cash, order policy, guardrails);
+    the kernel mutates it in place exactly like the use-case chain would.
+    """
+
+    def __init__(
+        self,
+        position: Position,
+        sim_data: SimulationData,
+        dividend_history: Optional[List[Dividend]] = None,
+        detailed_trigger_analysis: bool = False,
+        collect_series: bool = True,
+        report_progress: Optional[Callable[[str, float], None]] = None,
+        on_trigger: Optional[TriggerHook] = None,
+        on_fill: Optional[FillHook] = None,
+    ) -> None:
+        self.position = position
+        self.bars = sim_data.price_data
+        self.detailed = detailed_trigger_analysis
+        self.collect_series = collect_series
+        self.report_progress = report_progress
+        self.on_trigger = on_trigger
+        self.on_fill = on_fill
+
+        policy = position.order_policy
+        self.policy = policy
+        self.trigger_config = order_policy_to_trigger_config(policy)
+        self.guardrail_config = guardrail_policy_to_guardrail_config(position.guardrails)
+        self.order_policy_config = order_policy_to_order_policy_config(policy)
+        self.min_alloc = float(self.guardrail_config.min_stock_pct)
+        self.max_alloc = float(self.guardrail_config.max_stock_pct)
+        self.max_trade_pct = (
+            float(self.guardrail_config.max_trade_pct_of_position)
+            if self.guardrail_config.max_trade_pct_of_position
+            else 1.0
+        )
+        self.threshold_pct = policy.trigger_threshold_pct * 100
+
+        # Metrics-only runs (no series, no hooks) also skip allocation-drift
+        # bars whose rebalance order ExecuteOrderUC would drop below
+        # min_qty / min_notional: those bars cannot change the state. The
+        # slack covers qty_step / lot_size rounding.
+        self._drift_slack = 0.0
+        self._drift_min_qty = 0.0
+        self._drift_min_notional = 0.0
+        if not collect_series and on_trigger is None and on_fill is None:
+            self._drift_slack = (policy.qty_step or 0.0) / 2 + (policy.lot_size or 0.0) / 2
+            self._drift_min_qty = float(self.order_policy_config.min_qty) * (1 - _SCREEN_TOLERANCE)
+            self._drift_min_notional = float(self.order_policy_config.min_notional) * (
+                1 - _SCREEN_TOLERANCE
+            )
+
+        up = float(self.trigger_config.up_threshold_pct)
+        down = float(self.trigger_config.down_threshold_pct)
+        self._up_screen = up - _SCREEN_TOLERANCE * max(1.0, abs(up))
+        self._down_screen = -down + _SCREEN_TOLERANCE * max(1.0, abs(down))
+
+        self.n = len(self.bars)
+        self.prices, self.times = self._load_bars()
+        self._init_state()
+
+        # Sparse per-bar records for bars that went through the scalar step
+        # (only kept when collect_series is set)
+        self.evaluations: Dict[int, Dict[str, Any]] = {}
+        self.outcomes: Dict[int, Dict[str, Any]] = {}
+        self.pre_trade: Dict[int, Tuple[float, float]] = {}
+
+        self.trade_log: List[Dict[str, Any]] = []
+        self.dividend_events: List[Dict[str, Any]] = []
+        self.dividend_rows: Dict[int, Dict[str, Any]] = {}
+        self.total_dividends_received = 0.0
+
+        # Pending dividends by ex-date, first occurrence of each (date, dps) key
+        self._pending: Dict[Any, List[Dividend]] = {}
+        seen = set()
+        for dividend in dividend_history or []:
+            key = (dividend.ex_date.date(), float(dividend.dps))
+            if key in seen:
+                continue
+            seen.add(key)
+            self._pending.setdefault(key[0], []).append(dividend)
+        self._day_ord = self._day_ordinals() if self._pending else None
+
+    def _load_bars(self) -> Tuple[np.ndarray, List[Any]]:
+        return load_bars(self.bars)
+
+    def _day_ordinals(self) -> np.ndarray:
+        return np.fromiter((t.toordinal() for t in self.times), dtype=np.int64, count=self.n)
+
+    def _init_state(self) -> None:
+        # Per-bar state after the bar has been processed
+        n = self.n
+        self.qty = np.zeros(n)
+        self.cash = np.zeros(n)
+        self.pre_anchor = np.zeros(n)
+        self.post_anchor = np.zeros(n)
+        self.delta_pct = np.zeros(n)
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+    def run(self, initial_cash: float) -> Dict[str, Any]:
+        """Run the backtest and return the same dict as _simulate_algorithm_unified."""
+        if self.n == 0:
+            return self._build_result(initial_cash)
+
+        self._start()
+
+        update_every = max(50, self.n // 10)
+        next_report = update_every
+        window = _MIN_WINDOW
+        i = 1
+        while i < self.n:
+            anchor = self.position.anchor_price
+            if not anchor or anchor <= 0:
+                # Degenerate anchor (e.g. dividend-adjusted to zero): go bar by bar
+                self._step(i)
+                i += 1
+                continue
+
+            j = min(self.n, i + window)
+            pos = self.position
+            hits = np.flatnonzero(self._candidates(i, j, anchor, pos.qty, pos.cash))
+            if hits.size == 0:
+                self._hold(i, j, anchor, pos.qty, pos.cash)
+                window = min(window * 2, _MAX_WINDOW)
+            else:
+                self._run_window(i, j, hits)
+                window = _MIN_WINDOW
+            i = j
+
+            if self.report_progress and (i >= next_report or i >= self.n):
+                progress_pct = 20.0 + (i / self.n) * 70.0
+                self.report_progress(
+                    f"Processing data point {i}/{self.n} ({progress_pct:.1f}%)...", progress_pct
+                )
+                next_report = i + update_every
+
+        return self._build_result(initial_cash)
+
+    def _start(self) -> None:
+        """Bar 0 only sets the anchor."""
+        pos = self.position
+        pos.set_anchor_price(self.bars[0].price)
+        self._record(0, pos.anchor_price, 0.0)
+
+    def _run_window(self, i: int, j: int, hits: Optional[np.ndarray]) -> None:
+        """Process bars [i, j) given candidate offsets screened at the current state.
+
+        Candidates are walked while the state is unchanged. After a state
+        change the rest of the window is screened again in growing chunks,
+        so busy stretches do not rescreen the whole window per trade.
+        """
+        pos = self.position
+        end = j
+        width = _MIN_WINDOW
+        while i < j:
+            anchor = pos.anchor_price
+            if not anchor or anchor <= 0:
+                # Degenerate anchor (e.g. dividend-adjusted to zero): go bar by bar
+                self._step(i)
+                i += 1
+                hits = None
+                continue
+            if hits is None:
+                end = min(j, i + width)
+                hits = np.flatnonzero(self._candidates(i, end, anchor, pos.qty, pos.cash))
+
+            state = (pos.qty, pos.cash, anchor)
+            start = i
+            changed = False
+            for offset in hits:
+                k = i + int(offset)
+                if k > start:
+                    self._hold(start, k, anchor, pos.qty, pos.cash)
+                self._step(k)
+                start = k + 1
+                if (pos.qty, pos.cash, pos.anchor_price) != state:
+                    changed = True
+                    break
+            if changed:
+                i = start
+                width = _MIN_WINDOW
+            else:
+                if start < end:
+                    self._hold(start, end, anchor, pos.qty, pos.cash)
+                i = end
+                width = min(width * 2, _MAX_WINDOW)
+            hits = None
+
+    # ------------------------------------------------------------------
+    # Vectorised screening
+    # ------------------------------------------------------------------
+    def _candidates(self, i: int, j: int, anchor: float, qty: float, cash: float) -> np.ndarray:
+        """Mask of bars in [i, j) that may not be a plain HOLD at the given state."""
+        prices = self.prices[i:j]
+        rel = (prices - anchor) / anchor
+        pct = rel * 100
+        mask = np.abs(rel) * 100 > ANOMALY_THRESHOLD_PCT
+        mask |= pct >= self._up_screen
+        mask |= pct <= self._down_screen
+
+        asset_value = qty * prices
+        total_value = asset_value + cash
+        with np.errstate(divide="ignore", invalid="ignore"):
+            alloc = np.where(total_value > 0, asset_value / total_value, 0.0)
+            below = alloc < self.min_alloc
+            buy_gap = (self.min_alloc * total_value) / prices - qty
+            mask |= below & (buy_gap > 0.001) & self._executable(buy_gap, prices)
+            sell_gap = (self.max_alloc * total_value) / prices - qty
+            mask |= (
+                ~below
+                & (alloc > self.max_alloc)
+                & (sell_gap < -0.001)
+                & self._executable(-sell_gap, prices)
+            )
+
+        if self._pending:
+            pending_days = np.fromiter(
+                (d.toordinal() for d in self._pending), dtype=np.int64, count=len(self._pending)
+            )
+            mask |= np.isin(self._day_ord[i:j], pending_days)
+        return mask
+
+    def _executable(self, gap: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Rebalance gaps (shares) that can clear the execution minimums."""
+        qty = gap + self._drift_slack
+        return (qty >= self._drift_min_qty) & (qty * prices >= self._drift_min_notional)
+
+    def _hold(self, i: int, j: int, anchor: float, qty: float, cash: float) -> None:
+        """Record bars [i, j) as HOLDs at a fixed state."""
+        self.qty[i:j] = qty
+        self.cash[i:j] = cash
+        self.pre_anchor[i:j] = anchor
+        self.post_anchor[i:j] = anchor
+        self.delta_pct[i:j] = ((self.prices[i:j] - anchor) / anchor) * 100
+
+    def _record(self, k: int, pre_anchor: Optional[float], delta_pct: float) -> None:
+        pos = self.position
+        self.qty[k] = pos.qty
+        self.cash[k] = pos.cash
+        self.pre_anchor[k] = pre_anchor if pre_anchor is not None else np.nan
+        self.post_anchor[k] = pos.anchor_price if pos.anchor_price is not None else np.nan
+        self.delta_pct[k] = delta_pct
+
+    # ------------------------------------------------------------------
+    # Scalar step (mirrors the use-case chain for one bar)
+    # ------------------------------------------------------------------
+    def _step(self, k: int) -> None:
+        pos = self.position
+        bar = self.bars[k]
+        price = bar.price
+
+        if self._pending:
+            self._process_dividends(k)
+
+        pre_anchor = pos.anchor_price
+        collect = self.collect_series
+        if collect:
+            self.pre_trade[k] = (pos.qty, pos.cash)
+        try:
+            evaluation = self._evaluate(price, bar)
+        except Exception as e:
+            if collect:
+                self.evaluations[k] = {}
+                self.outcomes[k] = {
+                    "triggered": False,
+                    "side": None,
+                    "qty": 0,
+                    "executed": False,
+                    "execution_error": f"Evaluation failed: {e}",
+                }
+            self._record(k, pre_anchor, 0.0)
+            return
+
+        if collect:
+            self.evaluations[k] = evaluation
+        if evaluation["trigger_detected"]:
+            if self.on_trigger:
+                self.on_trigger(pos, bar, evaluation)
+            outcome = {
+                "triggered": True,
+                "side": evaluation.get("trigger_type"),
+                "reason": evaluation.get("reasoning", "Trigger condition met"),
+                "qty": 0,
+                "executed": False,
+                "execution_error": None,
+            }
+            proposal = evaluation["order_proposal"]
+            if proposal:
+                outcome["side"] = proposal["side"]
+                outcome["qty"] = proposal["trimmed_qty"]
+                executed, error = self._execute(price, proposal)
+                if executed:
+                    self.trade_log.append(
+                        {
+                            "timestamp": self.times[k].isoformat(),
+                            "side": proposal["side"],
+                            "qty": proposal["trimmed_qty"],
+                            "price": price,
+                            "commission": proposal["commission"],
+                            "cash_after": pos.cash,
+                            "shares_after": pos.qty,
+                        }
+                    )
+                    outcome.update(
+                        {
+                            "executed": True,
+                            "commission": proposal["commission"],
+                            "cash_after": pos.cash,
+                            "shares_after": pos.qty,
+                        }
+                    )
+                    if self.on_fill:
+                        self.on_fill(pos, bar, proposal)
+                elif error:
+                    outcome["execution_error"] = error
+            else:
+                outcome["execution_error"] = "Order blocked by guardrails (no valid order proposal)"
+            if collect:
+                self.outcomes[k] = outcome
+
+        self._record(k, pre_anchor, evaluation.get("delta_pct", 0))
+
+    def _process_dividends(self, k: int) -> None:
+        pos = self.position
+        current_date = self.times[k].date()
+        dividends = self._pending.get(current_date)
+        if not dividends or not pos.qty > 0:
+            return
+        del self._pending[current_date]
+
+        for dividend in dividends:
+            old_anchor = pos.anchor_price
+            pos.adjust_anchor_for_dividend(float(dividend.dps))
+
+            gross_amount = dividend.calculate_gross_amount(pos.qty)
+            net_amount = dividend.calculate_net_amount(pos.qty)
+            withholding = dividend.calculate_withholding_tax(pos.qty)
+
+            pos.cash += float(net_amount)
+            self.total_dividends_received += float(net_amount)
+
+            self.dividend_events.append(
+                {
+                    "date": current_date.isoformat(),
+                    "ex_date": dividend.ex_date.isoformat(),
+                    "pay_date": dividend.pay_date.isoformat(),
+                    "dps": float(dividend.dps),
+                    "shares": pos.qty,
+                    "gross_amount": float(gross_amount),
+                    "net_amount": float(net_amount),
+                    "withholding_tax": float(withholding),
+                    "old_anchor": old_anchor,
+                    "new_anchor": pos.anchor_price,
+                }
+            )
+            # The standard engine marks the previous bar's time-series row
+            self.dividend_rows[k - 1] = {
+                "dividend_event": True,
+                "dividend_dps": float(dividend.dps),
+                "dividend_gross": float(gross_amount),
+                "dividend_net": float(net_amount),
+                "dividend_withholding": float(withholding),
+            }
+
+    def _evaluate(self, price: float, bar: Any) -> Dict[str, Any]:
+        """EvaluatePositionUC.evaluate without repositories or event logging."""
+        pos = self.position
+        if not pos.anchor_price:
+            return {
+                "current_price": price,
+                "anchor_price": None,
+                "trigger_detected": False,
+                "reasoning": "No anchor price set - cannot evaluate triggers",
+            }
+
+        anchor_reset = None
+        if pos.anchor_price > 0:
+            anchor_float = float(pos.anchor_price)
+            price_diff_pct = abs((price - anchor_float) / anchor_float) * 100
+            if price_diff_pct > ANOMALY_THRESHOLD_PCT:
+                anchor_reset = {
+                    "reset": True,
+                    "old_anchor_price": pos.anchor_price,
+                    "new_anchor_price": price,
+                    "price_difference_pct": price_diff_pct,
+                }
+                pos.set_anchor_price(price)
+
+        decision = PriceTrigger.evaluate(
+            anchor_price=Decimal(str(pos.anchor_price)) if pos.anchor_price else None,
+            current_price=Decimal(str(price)),
+            config=self.trigger_config,
+        )
+        side = None
+        if decision.fired:
+            side = decision.direction.upper() if decision.direction else None
+            reasoning = decision.reason or f"Trigger fired: {side}"
+            order_proposal = self._order_proposal(price, side, bar)
+            triggered = True
+        else:
+            reasoning = decision.reason or f"Price ${price:.2f} within threshold range"
+            order_proposal = self._rebalance_proposal(price, bar)
+            triggered = order_proposal is not None
+            if order_proposal:
+                side = order_proposal["side"]
+                reasoning = order_proposal["reasoning"]
+
+        delta_pct = 0.0
+        if pos.anchor_price and float(pos.anchor_price) > 0:
+            anchor_float = float(pos.anchor_price)
+            delta_pct = ((float(price) - anchor_float) / anchor_float) * 100
+
+        result = {
+            "current_price": price,
+            "anchor_price": pos.anchor_price,
+            "delta_pct": delta_pct,
+            "trigger_detected": triggered,
+            "trigger_type": side,
+            "order_proposal": order_proposal,
+            "reasoning": reasoning,
+        }
+        if anchor_reset:
+            result["anchor_reset"] = anchor_reset
+        return result
+
+    def _order_proposal(self, price: float, side: str, bar: Any) -> Dict[str, Any]:
+        """Order sizing plus guardrail trimming, as in EvaluatePositionUC."""
+        pos = self.position
+        commission_rate = self.policy.commission_rate
+        max_pct = self.max_trade_pct
+
+        total_value = pos.qty * price + pos.cash
+        anchor_float = float(pos.anchor_price) if pos.anchor_price else 0.0
+        raw_qty = (anchor_float / price - 1) * self.policy.rebalance_ratio * (total_value / price)
+
+        if side == "SELL":
+            if raw_qty > 0:
+                raw_qty = -raw_qty
+            if abs(raw_qty) > pos.qty:
+                raw_qty = -pos.qty
+            max_pct_sellable = min(pos.qty, (total_value * max_pct) / price)
+            if abs(raw_qty) > max_pct_sellable:
+                raw_qty = -max_pct_sellable
+        else:
+            if raw_qty < 0:
+                raw_qty = -raw_qty
+            max_buy_qty = min(pos.cash, total_value * max_pct) / price
+            if raw_qty > max_buy_qty:
+                raw_qty = max_buy_qty
+
+        trimmed_qty, trimming_reason = self._trim(raw_qty, price, side)
+
+        notional = abs(trimmed_qty) * price
+        commission = notional * commission_rate
+        return {
+            "side": side,
+            "raw_qty": raw_qty,
+            "trimmed_qty": trimmed_qty,
+            "notional": notional,
+            "commission": commission,
+            "trimming_reason": trimming_reason,
+            "validation": self._validate(trimmed_qty, price, side, notional, commission, bar),
+            "post_trade_asset_pct": self._post_trade_allocation(trimmed_qty, price),
+        }
+
+    def _trim(self, raw_qty: float, price: float, side: str) -> Tuple[float, str]:
+        """EvaluatePositionUC._apply_guardrail_trimming."""
+        pos = self.position
+        min_alloc = self.min_alloc
+        max_alloc = self.max_alloc
+        max_pct = self.max_trade_pct
+
+        if side == "SELL" and raw_qty < 0 and abs(raw_qty) > pos.qty:
+            raw_qty = -pos.qty
+
+        post_asset_value = (pos.qty + raw_qty) * price
+        cash_delta = -(raw_qty * price) - (abs(raw_qty) * price * self.policy.commission_rate)
+        post_total_value = post_asset_value + (pos.cash + cash_delta)
+        post_asset_pct = post_asset_value / post_total_value if post_total_value > 0 else 0
+
+        if post_asset_pct < min_alloc:
+            trimmed_qty = (min_alloc * post_total_value) / price - pos.qty
+            reason = f"Trimmed to reach minimum allocation {min_alloc:.1%} (was {post_asset_pct:.1%})"
+        elif post_asset_pct > max_alloc:
+            trimmed_qty = (max_alloc * post_total_value) / price - pos.qty
+            reason = f"Trimmed to reach maximum allocation {max_alloc:.1%} (was {post_asset_pct:.1%})"
+            if trimmed_qty < 0:
+                total_value = (pos.qty * price) + pos.cash
+                max_allowed = min(pos.qty, min(pos.qty, (total_value * max_pct) / price))
+                if abs(trimmed_qty) > max_allowed:
+                    trimmed_qty = -max_allowed
+                    reason = (
+                        f"Trimmed to max allocation {max_alloc:.1%} but capped to {max_allowed:.2f} shares "
+                        f"(max {max_pct:.1%} per trade)"
+                    )
+        else:
+            trimmed_qty = raw_qty
+            reason = "No trimming needed - within guardrail bounds"
+            total_value = (pos.qty * price) + pos.cash
+            if side == "SELL" and trimmed_qty < 0:
+                max_allowed = min(pos.qty, min(pos.qty, (total_value * max_pct) / price))
+                if abs(trimmed_qty) > max_allowed:
+                    trimmed_qty = -max_allowed
+                    reason = f"Capped to {max_allowed:.2f} shares (max {max_pct:.1%} per trade, raw was {abs(raw_qty):.2f})"
+            elif side == "BUY" and trimmed_qty > 0:
+                max_buy_qty = min(pos.cash, total_value * max_pct) / price
+                if trimmed_qty > max_buy_qty:
+                    trimmed_qty = max_buy_qty
+                    reason = f"Capped to {max_buy_qty:.2f} shares (max {max_pct:.1%} of cash per trade, raw was {raw_qty:.2f})"
+
+        return trimmed_qty, reason
+
+    def _rebalance_proposal(self, price: float, bar: Any) -> Optional[Dict[str, Any]]:
+        """EvaluatePositionUC._check_auto_rebalancing."""
+        pos = self.position
+        commission_rate = self.policy.commission_rate
+        current_asset_value = pos.qty * price
+        current_total_value = current_asset_value + pos.cash
+        current_asset_pct = (
+            current_asset_value / current_total_value if current_total_value > 0 else 0
+        )
+
+        if current_asset_pct < self.min_alloc:
+            rebalance_qty = (self.min_alloc * current_total_value) / price - pos.qty
+            if rebalance_qty > 0.001:
+                notional = rebalance_qty * price
+                commission = rebalance_qty * price * commission_rate
+                return {
+                    "side": "BUY",
+                    "reasoning": f"Auto-rebalance: Asset allocation {current_asset_pct:.1%} below minimum {self.min_alloc:.1%}",
+                    "raw_qty": rebalance_qty,
+                    "trimmed_qty": rebalance_qty,
+                    "notional": notional,
+                    "commission": commission,
+                    "trimming_reason": "Auto-rebalance to minimum allocation",
+                    "validation": self._validate(
+                        rebalance_qty, price, "BUY", notional, commission, bar
+                    ),
+                    "post_trade_asset_pct": self.min_alloc,
+                }
+        elif current_asset_pct > self.max_alloc:
+            rebalance_qty = (self.max_alloc * current_total_value) / price - pos.qty
+            if rebalance_qty < -0.001:
+                abs_qty = abs(rebalance_qty)
+                notional = abs_qty * price
+                commission = abs_qty * price * commission_rate
+                return {
+                    "side": "SELL",
+                    "reasoning": f"Auto-rebalance: Asset allocation {current_asset_pct:.1%} above maximum {self.max_alloc:.1%}",
+                    "raw_qty": rebalance_qty,
+                    "trimmed_qty": rebalance_qty,
+                    "notional": notional,
+                    "commission": commission,
+                    "trimming_reason": "Auto-rebalance to maximum allocation",
+                    "validation": self._validate(
+                        rebalance_qty, price, "SELL", notional, commission, bar
+                    ),
+                    "post_trade_asset_pct": self.max_alloc,
+                }
+        return None
+
+    def _validate(
+        self, qty: float, price: float, side: str, notional: float, commission: float, bar: Any
+    ) -> Dict[str, Any]:
+        """Order validation without pending-order / daily-limit lookups."""
+        pos = self.position
+        result = {"valid": True, "rejections": [], "warnings": []}
+        min_notional = self.policy.min_notional
+        if notional < min_notional:
+            result["valid"] = False
+            result["rejections"].append(
+                f"Notional ${notional:.2f} below minimum ${min_notional:.2f}"
+            )
+        if side == "BUY":
+            required_cash = (qty * price) + commission
+            if required_cash > pos.cash:
+                result["valid"] = False
+                result["rejections"].append(
+                    f"Insufficient cash: need ${required_cash:.2f}, have ${pos.cash:.2f}"
+                )
+        if side == "SELL" and abs(qty) > pos.qty:
+            result["valid"] = False
+            result["rejections"].append(
+                f"Insufficient shares: trying to sell {abs(qty):.2f}, have {pos.qty:.2f}"
+            )
+        if abs(qty) < 0.001:
+            result["valid"] = False
+            result["rejections"].append("Order quantity too small (less than 0.001 shares)")
+        if not getattr(bar, "is_market_hours", True):
+            if not self.policy.allow_after_hours:
+                result["valid"] = False
+                result["rejections"].append("Market is closed - after-hours trading disabled")
+            else:
+                result["warnings"].append("Trading after market hours")
+        return result
+
+    def _post_trade_allocation(self, qty: float, price: float) -> float:
+        pos = self.position
+        post_asset_value = (pos.qty + qty) * price
+        cash_delta = -(qty * price) - (abs(qty) * price * self.policy.commission_rate)
+        post_total_value = post_asset_value + (pos.cash + cash_delta)
+        return post_asset_value / post_total_value if post_total_value > 0 else 0
+
+    def _execute(self, price: float, proposal: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """SubmitOrderUC + ExecuteOrderUC fill. Returns (filled, execution_error)."""
+        pos = self.position
+        side = proposal["side"]
+        q_req = self.policy.clamp_to_lot(self.policy.round_qty(abs(proposal["trimmed_qty"])))
+        commission = proposal["commission"] or 0.0
+
+        notional = q_req * price
+        min_qty = float(self.order_policy_config.min_qty)
+        min_notional = float(self.order_policy_config.min_notional)
+        if (min_qty > 0 and q_req < min_qty) or (min_notional > 0 and notional < min_notional):
+            return False, None  # skipped / rejected below minimum; position untouched
+
+        if side == "SELL" and q_req > pos.qty:
+            return False, "Execution failed: insufficient_qty"
+
+        ok, why = GuardrailEvaluator.validate_after_fill(
+            position_state=position_to_position_state(position=pos, cash=pos.cash),
+            side=side,
+            fill_qty=Decimal(str(q_req)),
+            price=Decimal(str(price)),
+            commission=Decimal(str(commission)),
+            config=self.guardrail_config,
+        )
+        if not ok:
+            return False, f"Execution failed: {why}"
+
+        if side == "BUY":
+            pos.qty += q_req
+            pos.cash -= (q_req * price) + commission
+        else:
+            pos.qty -= q_req
+            pos.cash += (q_req * price) - commission
+        pos.total_commission_paid += commission
+        pos.set_anchor_price(price)
+        return True, None
+
+    # ------------------------------------------------------------------
+    # Result assembly
+    # ------------------------------------------------------------------
+    def _build_result(self, initial_cash: float) -> Dict[str, Any]:
+        n = self.n
+        # Bar 0 only sets the anchor; portfolio values start at bar 1
+        portfolio_values = self.cash[1:] + self.qty[1:] * self.prices[1:]
+        metrics = OnlineMetrics()
+        metrics.update_many(portfolio_values)
+        for trade in self.trade_log:
+            metrics.record_trade(trade["commission"])
+
+        daily_returns: List[Dict[str, Any]] = []
+        if self.collect_series and n > 2:
+            dates = self._return_dates()
+            qty = self.qty[2:]
+            prices = self.prices[2:]
+            daily_returns = [
+                {
+                    "date": date,
+                    "return": ret,
+                    "portfolio_value": value,
+                    "cash": cash,
+                    "shares": shares,
+                    "stock_value": stock_value,
+                    "price": price,
+                }
+                for date, ret, value, cash, shares, stock_value, price in zip(
+                    dates,
+                    step_returns(portfolio_values).tolist(),
+                    portfolio_values[1:].tolist(),
+                    self.cash[2:].tolist(),
+                    qty.tolist(),
+                    (qty * prices).tolist(),
+                    prices.tolist(),
+                )
+            ]
+
+        if initial_cash <= 0:
+            raise ValueError(f"Invalid initial cash: {initial_cash}")
+        final_value = float(portfolio_values[-1]) if portfolio_values.size else initial_cash
+        total_return = (final_value - initial_cash) / initial_cash
+
+        trigger_analysis: List[Dict[str, Any]] = []
+        time_series_data: List[Dict[str, Any]] = []
+        debug_info: List[Dict[str, Any]] = []
+        if self.collect_series and n:
+            time_series_data, trigger_analysis, debug_info = self._build_series(
+                initial_cash, portfolio_values
+            )
+
+        return {
+            "algorithm_trades": len(self.trade_log),
+            "algorithm_pnl": final_value - initial_cash,
+            "algorithm_return_pct": total_return * 100,
+            "algorithm_volatility": metrics.volatility,
+            "algorithm_sharpe_ratio": metrics.sharpe_ratio,
+            "algorithm_max_drawdown": metrics.max_drawdown_pct,
+            "trade_log": self.trade_log,
+            "daily_returns": daily_returns,
+            "return_stats": metrics.summary(),
+            "total_dividends_received": self.total_dividends_received,
+            "dividend_events": self.dividend_events,
+            "trigger_analysis": trigger_analysis,
+            "time_series_data": time_series_data,
+            "debug_info": debug_info,
+        }
+
+    def _return_dates(self) -> List[str]:
+        """ISO dates of the daily_returns rows (bars 2..n-1)."""
+        date_cache: Dict[Any, str] = {}
+        dates = []
+        for t in self.times[2:]:
+            day = t.date()
+            iso = date_cache.get(day)
+            if iso is None:
+                iso = date_cache[day] = day.isoformat()
+            dates.append(iso)
+        return dates
+
+    def _build_series(
+        self, initial_cash: float, portfolio_values: np.ndarray
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Per-bar time_series_data / trigger_analysis / debug_info rows."""
+        bars = self.bars
+        times = self.times
+        prices = self.prices.tolist()
+        qty = self.qty.tolist()
+        cash = self.cash.tolist()
+        pre_anchor = self.pre_anchor.tolist()
+        post_anchor = self.post_anchor.tolist()
+        delta = self.delta_pct.tolist()
+        values = [None] + portfolio_values.tolist()
+        threshold = self.threshold_pct
+        bh_shares = initial_cash / prices[0] if prices[0] > 0 else 0.0
+        low_guardrail = self.position.guardrails.min_stock_alloc_pct
+        high_guardrail = self.position.guardrails.max_stock_alloc_pct
+
+        first = bars[0]
+        t0 = times[0]
+        total0 = cash[0] + (qty[0] * prices[0])
+        time_series = [
+            {
+                "timestamp": t0.isoformat(),
+                "date": t0.strftime("%Y-%m-%d"),
+                "time": t0.strftime("%H:%M:%S"),
+                "price": prices[0],
+                "volume": getattr(first, "volume", 0),
+                "is_market_hours": getattr(first, "is_market_hours", True),
+                "anchor_price": post_anchor[0],
+                "shares": qty[0],
+                "cash": cash[0],
+                "asset_value": qty[0] * prices[0],
+                "total_value": total0,
+                "asset_allocation_pct": (qty[0] * prices[0]) / total0 * 100 if total0 > 0 else 0,
+                "price_change_pct": 0.0,
+                "trigger_threshold_pct": threshold,
+                "triggered": False,
+                "side": None,
+                "executed": False,
+                "commission": 0.0,
+                "trade_qty": 0.0,
+                "trade_notional": 0.0,
+                "dividend_event": False,
+                "dividend_dps": 0.0,
+                "dividend_gross": 0.0,
+                "dividend_net": 0.0,
+                "dividend_withholding": 0.0,
+            }
+        ]
+        trigger_analysis: List[Dict[str, Any]] = []
+        debug_info = [{"iteration": 0, "price": prices[0], "timestamp": t0.isoformat()}]
+
+        for k in range(1, self.n):
+            bar = bars[k]
+            t = times[k]
+            price = prices[k]
+            timestamp = t.isoformat()
+            if not trigger_analysis:
+                debug_info.append({"iteration": 0, "price": price, "timestamp": timestamp})
+
+            anchor = _none_if_nan(pre_anchor[k])
+            new_anchor = _none_if_nan(post_anchor[k])
+            evaluation = self.evaluations.get(k)
+            outcome = self.outcomes.get(k)
+            qty_before, cash_before = self.pre_trade.get(k, (qty[k], cash[k]))
+            price_change_pct = ((price / anchor) - 1) * 100 if anchor else 0
+
+            triggered = bool(outcome and outcome["triggered"])
+            if triggered:
+                reason = outcome["reason"]
+            elif outcome and outcome["execution_error"]:
+                reason = "No trigger"
+            elif abs(price_change_pct) < threshold:
+                reason = f"Price change {price_change_pct:.2f}% below threshold {threshold:.2f}%"
+            else:
+                reason = "Other evaluation conditions not met"
+
+            if self.detailed or triggered:
+                if self.detailed:
+                    info = {
+                        "timestamp": timestamp,
+                        "date": t.strftime("%Y-%m-%d"),
+                        "time": t.strftime("%H:%M:%S"),
+                        "price": price,
+                        "anchor_price": anchor,
+                        "price_change_pct": price_change_pct,
+                        "trigger_threshold": threshold,
+                        "triggered": False,
+                        "side": None,
+                        "qty": 0,
+                        "reason": reason,
+                        "executed": False,
+                        "execution_error": None,
+                        "cash_after": cash_before,
+                        "shares_after": qty_before,
+                        "dividend": 0.0,
+                        "bid": price - price * 0.0005,
+                        "ask": price + price * 0.0005,
+                        "open": getattr(bar, "open", price),
+                        "high": getattr(bar, "high", price),
+                        "low": getattr(bar, "low", price),
+                        "close": getattr(bar, "close", price),
+                        "volume": getattr(bar, "volume", 0),
+                    }
+                else:
+                    info = {
+                        "timestamp": timestamp,
+                        "price": price,
+                        "anchor_price": anchor,
+                        "price_change_pct": price_change_pct,
+                        "triggered": False,
+                        "side": None,
+                        "qty": 0,
+                        "reason": reason,
+                        "executed": False,
+                        "execution_error": None,
+                    }
+                if outcome:
+                    info.update({key: value for key, value in outcome.items() if key != "reason"})
+                trigger_analysis.append(info)
+
+            if evaluation is None:
+                # Plain HOLD: the reasoning text comes from the Decimal trigger check
+                eval_reason = PriceTrigger.evaluate(
+                    Decimal(str(anchor)), Decimal(str(price)), self.trigger_config
+                ).reason
+            elif evaluation:
+                eval_reason = evaluation.get("reasoning", reason)
+            else:
+                eval_reason = "No evaluation"
+
+            value = values[k]
+            trade_qty = outcome["qty"] if outcome else 0
+            execution_error = outcome["execution_error"] if outcome else None
+            executed = bool(outcome and outcome["executed"])
+            row = {
+                "timestamp": timestamp,
+                "date": t.strftime("%Y-%m-%d"),
+                "time": t.strftime("%H:%M:%S"),
+                "price": price,
+                "volume": getattr(bar, "volume", 0),
+                "is_market_hours": getattr(bar, "is_market_hours", True),
+                "anchor_price": anchor,
+                "shares": qty[k],
+                "cash": cash[k],
+                "asset_value": qty[k] * price,
+                "total_value": value,
+                "asset_allocation_pct": (qty[k] * price) / value * 100 if value > 0 else 0,
+                "price_change_pct": delta[k],
+                "trigger_threshold_pct": threshold,
+                "triggered": triggered,
+                "side": outcome["side"] if outcome else None,
+                "executed": executed,
+                "commission": outcome.get("commission", 0.0) if outcome else 0.0,
+                "trade_qty": trade_qty,
+                "trade_notional": trade_qty * price if trade_qty != 0 else 0.0,
+                "dividend_event": False,
+                "dividend_dps": 0.0,
+                "dividend_gross": 0.0,
+                "dividend_net": 0.0,
+                "dividend_withholding": 0.0,
+                "execution_error": execution_error,
+                "reason": eval_reason,
+                "new_anchor_price": new_anchor if new_anchor != anchor else None,
+                "buy_hold_value": bh_shares * price,
+                "guardrail_hit": (
+                    triggered
+                    and not executed
+                    and (execution_error or "").startswith("Order blocked by guardrails")
+                ),
+                "low_guardrail_pct": low_guardrail,
+                "high_guardrail_pct": high_guardrail,
+            }
+            time_series.append(row)
+
+        for k, fields in self.dividend_rows.items():
+            time_series[k].update(fields)
+
+        return time_series, trigger_analysis, debug_info
+
+
+def simulate_buy_hold(prices: np.ndarray, initial_cash: float) -> Dict[str, Any]:
+    """Vectorised SimulationUnifiedUC._simulate_buy_hold."""
+    if prices.size == 0:
+        return {
+            "buy_hold_trades": 0,
+            "buy_hold_pnl": 0.0,
+            "buy_hold_return_pct": 0.0,
+            "buy_hold_volatility": 0.0,
+            "buy_hold_sharpe_ratio": 0.0,
+            "buy_hold_max_drawdown": 0.0,
+        }
+    first_price = float(prices[0])
+    if first_price <= 0:
+        raise ValueError(f"Invalid first price for buy-hold: {first_price}")
+    if initial_cash <= 0:
+        raise ValueError(f"Invalid initial cash for buy-hold: {initial_cash}")
+
+    values = 0.0 + (initial_cash / first_price) * prices
+    metrics = OnlineMetrics()
+    metrics.update_many(values)
+    final_value = float(values[-1])
+    return {
+        "buy_hold_pnl": final_value - initial_cash,
+        "buy_hold_return_pct": (final_value - initial_cash) / initial_cash * 100,
+        "buy_hold_volatility": metrics.volatility,
+        "buy_hold_sharpe_ratio": metrics.sharpe_ratio,
+        "buy_hold_max_drawdown": metrics.max_drawdown_pct,
+    }
+
+
+def bar_prices(bars: Sequence[Any]) -> np.ndarray:
+    """Price array of the bars; a PriceSeries hands over its price column."""
+    if isinstance(bars, PriceSeries):
+        return bars.prices
+    return np.fromiter((b.price for b in bars), dtype=np.float64, count=len(bars))
+
+
+def load_bars(bars: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Price array and bar times, without building PriceData for a PriceSeries."""
+    if isinstance(bars, PriceSeries):
+        return bars.prices, bars.datetimes()
+    return bar_prices(bars), [_to_datetime(b.timestamp) for b in bars]
+
+
+def _to_datetime(timestamp: Any) -> Any:
+    if hasattr(timestamp, "to_pydatetime"):
+        return timestamp.to_pydatetime()
+    return timestamp
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if value != value else value
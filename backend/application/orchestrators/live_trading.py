@@ -1,9 +1,17 @@
 # =========================
 # backend/application/orchestrators/live_trading.py
 # =========================
-from typing import Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+import threading
+import time
 import uuid
+import weakref
 
+from application.dto.position_context import PositionContext
+from application.helpers.latency import latency_summary
+from domain.entities.order import OPEN_ORDER_STATUSES
 from application.ports.market_data import IMarketDataProvider
 from application.ports.orders import IOrderService
 from application.ports.repos import IPositionRepository
@@ -24,6 +32,7 @@ class LiveTradingOrchestrator:
         portfolio_repo: Optional[PortfolioRepo] = None,
         evaluate_position_uc: Optional["EvaluatePositionUC"] = None,
         orders_repo=None,
+        max_workers: int = 1,
     ):
         self.market_data = market_data
         self.order_service = order_service
@@ -31,52 +40,136 @@ class LiveTradingOrchestrator:
         self.portfolio_repo = portfolio_repo
         self.evaluate_position_uc = evaluate_position_uc
         self.orders_repo = orders_repo
+        # Positions evaluated concurrently per cycle (1 = one after another)
+        self.max_workers = max(1, max_workers)
+        self.last_cycle_metrics: Optional[Dict[str, Any]] = None
+        # One lock per position: evaluate -> open-order check -> submit never overlaps
+        # for the same position (worker threads and manual API runs alike). Weak values:
+        # a lock lives only while some run holds or waits on it, so the map stays small
+        self._position_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._position_locks_guard = threading.Lock()
 
-    def run_cycle(self, source: str = "worker") -> None:
+    def run_cycle(self, source: str = "worker") -> Dict[str, Any]:
         """
         One trading cycle for all active positions.
 
+        Positions are evaluated on up to ``max_workers`` threads; a failure in
+        one position is logged and does not affect the others.
+
         Args:
             source: Source of the cycle trigger ("worker", "api/manual", etc.)
+
+        Returns:
+            Cycle metrics (also kept as ``last_cycle_metrics``)
         """
         import logging
         logger = logging.getLogger(__name__)
 
-        positions_evaluated = 0
-        errors_count = 0
+        started_at = datetime.now(timezone.utc)
+        cycle_start = time.perf_counter()
+
+        # One bulk load per cycle; every evaluation below reuses its context
+        contexts = self.position_repo.get_trading_contexts()
+        logger.info("Trading cycle starting: %d active positions to evaluate", len(contexts))
+        load_seconds = time.perf_counter() - cycle_start
 
-        active_positions = list(self.position_repo.get_active_positions_for_trading())
-        logger.info("Trading cycle starting: %d active positions to evaluate", len(active_positions))
+        if contexts:
+            self._prefetch_quotes((context.ticker for context in contexts), logger)
+        prefetch_seconds = time.perf_counter() - cycle_start - load_seconds
 
-        for position_id in active_positions:
-            result = self.run_cycle_for_position(position_id, source=source)
-            positions_evaluated += 1
-            if result is None:
-                errors_count += 1
+        screen_start = time.perf_counter()
+        quiet_positions = self._screen_cycle(contexts, logger) if contexts else 0
+        screen_seconds = time.perf_counter() - screen_start
+
+        def evaluate(context: PositionContext):
+            position_start = time.perf_counter()
+            result = self.run_cycle_for_position(
+                context.position_id, source=source, context=context
+            )
+            return result, time.perf_counter() - position_start
+
+        workers = min(self.max_workers, len(contexts))
+        if workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="trading-cycle"
+            ) as executor:
+                outcomes = list(executor.map(evaluate, contexts))
+        else:
+            outcomes = [evaluate(context) for context in contexts]
+
+        errors_count = sum(1 for result, _ in outcomes if result is None)
+        metrics = {
+            "started_at": started_at.isoformat(),
+            "positions": len(outcomes),
+            "errors": errors_count,
+            "workers": max(workers, 1),
+            "duration_seconds": time.perf_counter() - cycle_start,
+            "load_seconds": load_seconds,
+            "prefetch_seconds": prefetch_seconds,
+            "screen_seconds": screen_seconds,
+            "quiet_positions": quiet_positions,
+            "position_seconds": latency_summary([seconds for _, seconds in outcomes]),
+        }
+        self.last_cycle_metrics = metrics
 
         logger.info(
-            "Trading cycle complete: %d positions evaluated, %d errors",
-            positions_evaluated, errors_count
+            "Trading cycle complete: %d positions evaluated, %d errors in %.2fs "
+            "(%d workers, position p50=%.3fs p95=%.3fs max=%.3fs)",
+            metrics["positions"], errors_count, metrics["duration_seconds"], metrics["workers"],
+            metrics["position_seconds"]["p50"], metrics["position_seconds"]["p95"],
+            metrics["position_seconds"]["max"],
         )
+        return metrics
 
-    def run_cycle_for_position(self, position_id: str, source: str = "worker") -> Optional[str]:
+    def run_cycle_for_position(
+        self,
+        position_id: str,
+        source: str = "worker",
+        context: Optional[PositionContext] = None,
+    ) -> Optional[str]:
         """
         Run one trading cycle for a single position.
 
         Args:
             position_id: ID of the position to evaluate
             source: Source of the cycle trigger ("worker", "api/manual", etc.)
+            context: Context from this cycle's get_trading_contexts(); looked up when omitted
 
         Returns:
             trace_id if cycle was executed, None if position not found or inactive
         """
+        with self._position_lock(position_id):
+            return self._run_cycle_for_position(position_id, source, context)
+
+    def _position_lock(self, position_id: str) -> threading.Lock:
+        with self._position_locks_guard:
+            lock = self._position_locks.get(position_id)
+            if lock is None:
+                lock = self._position_locks[position_id] = threading.Lock()
+            return lock
+
+    def _run_cycle_for_position(
+        self, position_id: str, source: str, context: Optional[PositionContext]
+    ) -> Optional[str]:
         import logging
         logger = logging.getLogger(__name__)
 
         try:
+            # A context from the cycle's bulk load may be stale by the time this runs
+            preloaded = context is not None
             # Check if position is active
-            active_positions = list(self.position_repo.get_active_positions_for_trading())
-            if position_id not in active_positions:
+            if context is None:
+                context = next(
+                    (
+                        candidate
+                        for candidate in self.position_repo.get_trading_contexts()
+                        if candidate.position_id == position_id
+                    ),
+                    None,
+                )
+            if context is None:
                 self._log_inactive_position(position_id, logger)
                 return None
 
@@ -87,7 +180,9 @@ class LiveTradingOrchestrator:
                 return None
 
             # Find tenant_id and portfolio_id for this position
-            tenant_id, portfolio_id = self._find_position_context(position_id, logger)
+            tenant_id, portfolio_id = context.tenant_id, context.portfolio_id
+            if not portfolio_id:
+                tenant_id, portfolio_id = self._find_position_context(position_id, logger)
             if not portfolio_id:
                 logger.warning(
                     "Could not find portfolio_id for position %s, skipping", position_id
@@ -101,11 +196,25 @@ class LiveTradingOrchestrator:
                 portfolio_id=portfolio_id,
                 position_id=position_id,
                 source=source,
+                context=context,
             )
 
             trigger_detected = evaluation_result.get("trigger_detected", False)
             order_proposal = evaluation_result.get("order_proposal")
 
+            if preloaded and trigger_detected and order_proposal:
+                # Another run may have submitted or filled since the bulk load: reload
+                # the position and its orders under the lock and size the order on them
+                # (the evaluation and its audit rows are not repeated)
+                self.position_repo.refresh_trading_context(context)
+                order_proposal = self.evaluate_position_uc.recheck_order_proposal(
+                    tenant_id=tenant_id,
+                    portfolio_id=portfolio_id,
+                    position_id=position_id,
+                    evaluation_result=evaluation_result,
+                    context=context,
+                )
+
             logger.info(
                 "Evaluation result for position %s: trigger_detected=%s, has_order_proposal=%s",
                 position_id, trigger_detected, order_proposal is not None,
@@ -127,20 +236,22 @@ class LiveTradingOrchestrator:
                 return trace_id
 
             # Check for pending/unfilled orders before submitting
-            if self.orders_repo:
-                open_statuses = {"created", "submitted", "pending", "working", "partial"}
+            if context.open_orders is not None:
+                existing_orders = context.open_orders
+            elif self.orders_repo:
                 existing_orders = self.orders_repo.list_for_position(position_id, limit=20)
-                for existing_order in existing_orders:
-                    if existing_order.status in open_statuses:
-                        logger.warning(
-                            "Skipping order for position %s: pending order %s is still %s",
-                            position_id, existing_order.id, existing_order.status,
-                        )
-                        return trace_id
+            else:
+                existing_orders = []
+            for existing_order in existing_orders:
+                if existing_order.status in OPEN_ORDER_STATUSES:
+                    logger.warning(
+                        "Skipping order for position %s: pending order %s is still %s",
+                        position_id, existing_order.id, existing_order.status,
+                    )
+                    return trace_id
 
             # Fetch quote for order submission
-            state = self.position_repo.load_position_state(position_id)
-            quote = self.market_data.get_latest_quote(state.ticker)
+            quote = self.market_data.get_latest_quote(context.ticker)
 
             # Submit order
             self._submit_and_execute_order(
@@ -150,6 +261,7 @@ class LiveTradingOrchestrator:
                 order_proposal=order_proposal,
                 quote=quote,
                 logger=logger,
+                context=context,
             )
 
             return trace_id
@@ -167,6 +279,33 @@ class LiveTradingOrchestrator:
             )
             return None
 
+    def _prefetch_quotes(self, tickers: Iterable[str], logger) -> None:
+        """Warm the quote cache once per distinct ticker before evaluating positions."""
+        try:
+            tickers = list(dict.fromkeys(tickers))
+            if tickers:
+                self.market_data.prefetch_quotes(tickers)
+                logger.info("Prefetched quotes for %d tickers", len(tickers))
+        except Exception as e:
+            # Evaluations fall back to per-position fetches
+            logger.warning("Quote prefetch failed: %s", e)
+
+    def _screen_cycle(self, contexts: List[PositionContext], logger) -> int:
+        """Share one quote per ticker and mark positions the bulk screen rules out."""
+        if not self.evaluate_position_uc:
+            return 0
+        try:
+            quiet = self.evaluate_position_uc.prepare_cycle(contexts)
+            logger.info("Cycle screen: %d of %d positions quiet", quiet, len(contexts))
+            return quiet
+        except Exception as e:
+            # Every position is then evaluated in full
+            logger.warning("Cycle screen failed: %s", e)
+            for context in contexts:
+                context.quote = None
+                context.quiet = False
+            return 0
+
     def _find_position_context(self, position_id: str, logger):
         """Find tenant_id and portfolio_id for a position."""
         tenant_id = "default"
@@ -226,7 +365,7 @@ class LiveTradingOrchestrator:
             logger.warning("Error checking position status for %s: %s", position_id, e)
 
     def _submit_and_execute_order(
-        self, position_id, portfolio_id, tenant_id, order_proposal, quote, logger
+        self, position_id, portfolio_id, tenant_id, order_proposal, quote, logger, context=None
     ):
         """Submit and auto-execute an order from an order proposal."""
         from domain.value_objects.trade_intent import TradeIntent
@@ -253,6 +392,7 @@ class LiveTradingOrchestrator:
             tenant_id=tenant_id,
             trade_intent=trade_intent,
             quote=quote,
+            context=context,
         )
 
         logger.info("Order submitted successfully: order_id=%s", order_id)
@@ -280,7 +420,7 @@ class LiveTradingOrchestrator:
                 commission=order_proposal.get("commission", 0.0),
             )
 
-            fill_response = execute_uc.execute(order_id, fill_request)
+            fill_response = execute_uc.execute(order_id, fill_request, context=context)
 
             logger.info(
                 "Order executed successfully: order_id=%s, filled_qty=%s, status=%s",
@@ -3,6 +3,7 @@
 # =========================
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import Iterable
 
 from domain.value_objects.market import MarketQuote
 
@@ -15,6 +16,10 @@ class IMarketDataProvider(ABC):
         """Get the latest market quote for a ticker."""
         ...
 
+    def prefetch_quotes(self, tickers: Iterable[str]) -> None:
+        """Warm quotes for several tickers ahead of per-ticker calls (optional)."""
+        return None
+
 
 class IHistoricalPriceProvider(ABC):
     """Port for historical market data."""
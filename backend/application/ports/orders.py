@@ -2,7 +2,9 @@
 # backend/application/ports/orders.py
 # =========================
 from abc import ABC, abstractmethod
+from typing import Optional
 
+from application.dto.position_context import PositionContext
 from domain.value_objects.trade_intent import TradeIntent
 from domain.value_objects.market import MarketQuote
 
@@ -18,11 +20,13 @@ class IOrderService(ABC):
         tenant_id: str,
         trade_intent: TradeIntent,
         quote: MarketQuote,
+        context: Optional[PositionContext] = None,
     ) -> str:
         """
         Live trading.
         Creates order record, calls broker, returns order_id.
         Must be idempotent for repeated calls with same trade intent.
+        ``context`` is the trading cycle's preloaded view of the position.
         """
         ...
 
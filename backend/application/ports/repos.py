@@ -2,8 +2,9 @@
 # backend/application/ports/repos.py
 # =========================
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import Iterable, List
 
+from application.dto.position_context import PositionContext
 from domain.value_objects.position_state import PositionState
 
 
@@ -20,6 +21,31 @@ class IPositionRepository(ABC):
         """Load position state for a position."""
         ...
 
+    def get_trading_contexts(self) -> List[PositionContext]:
+        """Return a context for each position considered in live trading.
+
+        The default only knows ids and tickers; implementations that can load
+        positions, portfolios and configs in bulk should fill them in.
+        """
+        return [
+            PositionContext(
+                position_id=position_id,
+                ticker=self.load_position_state(position_id).ticker,
+            )
+            for position_id in self.get_active_positions_for_trading()
+        ]
+
+    def refresh_trading_context(self, context: PositionContext) -> None:
+        """Reload the rows of ``context`` that other runs may have changed since the bulk load.
+
+        Called under the position's lock before an order is placed. The default
+        drops the preloaded position and orders so that consumers query them.
+        """
+        context.position = None
+        context.open_orders = None
+        context.orders_today = None
+        context.orders_day = None
+
 
 class ISimulationPositionRepository(ABC):
     """Port for simulation position repository operations."""
@@ -5,7 +5,7 @@
 Activity Report Export Service
 
 Generates a unified Excel report consolidating:
-- Trades from TradesRepo
+- Trades from TradesRepo (with order status from OrdersRepo, when given)
 - Events from EventsRepo
 - Evaluation Timeline from EvaluationTimelineRepo
 
@@ -29,9 +29,11 @@ from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 
 from domain.entities.event import Event
+from domain.entities.order import Order
 from domain.entities.trade import Trade
 from domain.ports.events_repo import EventsRepo
 from domain.ports.evaluation_timeline_repo import EvaluationTimelineRepo
+from domain.ports.orders_repo import OrdersRepo
 from domain.ports.positions_repo import PositionsRepo
 from domain.ports.trades_repo import TradesRepo
 
@@ -45,11 +47,13 @@ class ActivityReportExportService:
         events_repo: EventsRepo,
         timeline_repo: EvaluationTimelineRepo,
         positions_repo: PositionsRepo,
+        orders_repo: Optional[OrdersRepo] = None,
     ):
         self.trades_repo = trades_repo
         self.events_repo = events_repo
         self.timeline_repo = timeline_repo
         self.positions_repo = positions_repo
+        self.orders_repo = orders_repo
 
     def export_activity_report(
         self,
@@ -81,8 +85,10 @@ class ActivityReportExportService:
             tenant_id, portfolio_id, position_id, start_date, end_date, mode
         )
 
+        orders = self._fetch_orders(trades)
+
         # Merge into unified activity log
-        activity_log = self._merge_to_activity_log(trades, events, timeline)
+        activity_log = self._merge_to_activity_log(trades, events, timeline, orders)
 
         # Filter dividends from timeline
         dividends = [t for t in timeline if t.get("dividend_applied", False)]
@@ -121,6 +127,12 @@ class ActivityReportExportService:
             trades = [t for t in trades if t.position_id == position_id]
         return trades
 
+    def _fetch_orders(self, trades: List[Trade]) -> Dict[str, Order]:
+        """Fetch the orders behind the trades in one batch."""
+        if not self.orders_repo or not trades:
+            return {}
+        return self.orders_repo.get_many({t.order_id for t in trades if t.order_id})
+
     def _fetch_events(
         self,
         tenant_id: str,
@@ -172,12 +184,15 @@ class ActivityReportExportService:
         trades: List[Trade],
         events: List[Event],
         timeline: List[Dict[str, Any]],
+        orders: Optional[Dict[str, Order]] = None,
     ) -> List[Dict[str, Any]]:
         """Merge all sources into a unified chronological activity log."""
         activity_log: List[Dict[str, Any]] = []
+        orders = orders or {}
 
         # Add trades
         for trade in trades:
+            order = orders.get(trade.order_id)
             activity_log.append(
                 {
                     "timestamp": trade.executed_at,
@@ -191,6 +206,8 @@ class ActivityReportExportService:
                         "price": trade.price,
                         "commission": trade.commission,
                         "order_id": trade.order_id,
+                        "order_status": order.status if order else None,
+                        "broker_order_id": order.broker_order_id if order else None,
                     },
                     "related_trade_id": trade.id,
                 }
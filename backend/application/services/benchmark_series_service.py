@@ -0,0 +1,365 @@
+# =========================
+# backend/application/services/benchmark_series_service.py
+# =========================
+"""
+Daily close series for analytics benchmarks (SPY, buy & hold, custom tickers).
+
+Benchmark closes only change once a day, but dashboards ask for them on every
+refresh. Closes are kept per ticker in an in-process LRU backed by one JSON
+file per ticker, together with the day range they cover:
+
+- a request only fetches the days outside the covered range, so a new day
+  appends one bar instead of refetching the whole window,
+- closes are split/dividend adjusted, so a corporate action rescales every
+  earlier close. Each fetch also covers the cached close next to the gap;
+  if that close moved, the cached series is dropped and the window is
+  fetched again instead of splicing two price scales together,
+- finished days (before today, UTC) are final and written to disk; today's
+  bar is kept in memory only and refreshed at most every ``live_ttl`` seconds,
+- a fetch that returns nothing leaves the coverage unchanged and is not
+  retried for the tail until ``live_ttl`` has passed.
+
+``closes_many`` fetches several tickers concurrently on a small pool that is
+shared between requests.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain.ports.market_data import MarketDataRepo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TICKERS = 32
+DEFAULT_LIVE_TTL_SECONDS = 900.0
+DEFAULT_WORKERS = 4
+# Relative change of an already cached close that counts as a re-adjustment
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+@dataclass
+class _Series:
+    closes: Dict[str, float] = field(default_factory=dict)
+    # Covered day range [first, through]; through never reaches today
+    first: Optional[date] = None
+    through: Optional[date] = None
+    # Monotonic time before which the tail is not fetched again
+    tail_fresh_until: float = 0.0
+
+
+class BenchmarkSeriesService:
+    """Day-granular, incrementally extended cache of daily closes per ticker."""
+
+    def __init__(
+        self,
+        market_data: Callable[[], MarketDataRepo],
+        cache_dir: Optional[str] = None,
+        max_tickers: int = DEFAULT_MAX_TICKERS,
+        live_ttl: float = DEFAULT_LIVE_TTL_SECONDS,
+        workers: int = DEFAULT_WORKERS,
+        today: Optional[Callable[[], date]] = None,
+    ) -> None:
+        self._market_data = market_data
+        self.cache_dir = cache_dir
+        self.max_tickers = max(1, max_tickers)
+        self.live_ttl = live_ttl
+        self._today = today or (lambda: datetime.now(timezone.utc).date())
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ticker_locks: Dict[str, threading.Lock] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="benchmark")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def closes(self, ticker: str, start: date, end: date) -> Dict[str, float]:
+        """Daily closes for days in [start, end] keyed by "YYYY-MM-DD", oldest first.
+
+        If a fetch fails, cached closes are returned; the error is raised only
+        when nothing is cached for the window.
+        """
+        ticker = ticker.upper()
+        today = self._today()
+        end = min(end, today)
+        if end < start:
+            return {}
+
+        with self._ticker_lock(ticker):
+            series = self._get(ticker)
+            changed = False
+            error: Optional[Exception] = None
+            # A second pass fills the rest of the window after a re-adjustment reset
+            for _ in range(2):
+                rescaled = False
+                for gap_start, gap_end in self._gaps(series, start, end, today):
+                    try:
+                        extended, rescaled = self._extend(
+                            ticker, series, gap_start, gap_end, today
+                        )
+                        changed |= extended
+                    except Exception as e:
+                        logger.warning(
+                            "Benchmark fetch failed for %s %s..%s: %s",
+                            ticker,
+                            gap_start,
+                            gap_end,
+                            e,
+                        )
+                        error = e
+                    if rescaled:
+                        break
+                if not rescaled:
+                    break
+            if changed:
+                self._save(ticker, series)
+
+            first, last = start.isoformat(), end.isoformat()
+            window = {d: c for d, c in sorted(series.closes.items()) if first <= d <= last}
+        if not window and error is not None:
+            raise error
+        return window
+
+    def closes_many(
+        self, tickers: Iterable[str], start: date, end: date, timeout: float = 15.0
+    ) -> Dict[str, Dict[str, float]]:
+        """``closes`` for several tickers fetched concurrently.
+
+        Tickers that fail or are still fetching after ``timeout`` seconds are
+        left out of the result.
+        """
+        futures = {
+            self._pool.submit(self.closes, ticker, start, end): ticker
+            for ticker in dict.fromkeys(t.upper() for t in tickers)
+        }
+        done, pending = wait(futures, timeout=timeout)
+        for fut in pending:
+            logger.warning("Benchmark fetch for %s timed out after %.0fs", futures[fut], timeout)
+        result: Dict[str, Dict[str, float]] = {}
+        for fut in done:
+            try:
+                result[futures[fut]] = fut.result()
+            except Exception as e:
+                logger.warning("Benchmark fetch failed for %s: %s", futures[fut], e)
+        return result
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """Drop cached closes (memory and disk) for one ticker or for all tickers."""
+        with self._lock:
+            names = [ticker.upper()] if ticker else list(self._series)
+            for name in names:
+                self._series.pop(name, None)
+        if not self.cache_dir:
+            return
+        if ticker:
+            try:
+                os.unlink(self._path(ticker.upper()))
+            except OSError:
+                pass
+        else:
+            import shutil
+
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Gaps and fetching
+    # ------------------------------------------------------------------
+    def _gaps(self, series: _Series, start: date, end: date, today: date) -> List[tuple]:
+        if series.first is None or series.through is None:
+            return [(start, end)]
+        # Each gap reaches into the nearest cached close so _extend can compare it
+        first, through = series.first.isoformat(), series.through.isoformat()
+        covered = [d for d in series.closes if first <= d <= through]
+        gaps = []
+        if start < series.first:
+            head_end = (
+                date.fromisoformat(min(covered)) if covered else series.first - timedelta(days=1)
+            )
+            gaps.append((start, head_end))
+        if end > series.through and time.monotonic() >= series.tail_fresh_until:
+            # Always from the end of the coverage so it stays one contiguous range
+            tail_start = (
+                date.fromisoformat(max(covered)) if covered else series.through + timedelta(days=1)
+            )
+            gaps.append((tail_start, end))
+        return gaps
+
+    def _extend(
+        self, ticker: str, series: _Series, first: date, last: date, today: date
+    ) -> Tuple[bool, bool]:
+        """Fetch [first, last] and fold it into ``series``.
+
+        Returns (disk state changed, cached series was dropped because a final
+        close in the fetch no longer matches the cached one).
+        """
+        is_tail = series.through is None or last > series.through
+        if is_tail:
+            series.tail_fresh_until = time.monotonic() + self.live_ttl
+
+        ts_start = datetime.combine(first, datetime.min.time(), tzinfo=timezone.utc)
+        ts_end = datetime.combine(last + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+        bars = self._market_data().fetch_historical_data(
+            ticker, ts_start, ts_end, intraday_interval_minutes=1440
+        )
+        closes = {
+            p.timestamp.strftime("%Y-%m-%d"): float(p.close or p.price)
+            for p in bars or []
+            if (p.close or p.price)
+        }
+        if not closes:
+            # No bars may just mean a provider hiccup; keep the coverage as it was
+            return False, False
+
+        rescaled = _rescaled(series, closes)
+        if rescaled:
+            logger.info("Benchmark closes for %s were re-adjusted; dropping the cache", ticker)
+            series.closes.clear()
+            series.first = series.through = None
+            if not is_tail:
+                series.tail_fresh_until = 0.0
+
+        series.closes.update(closes)
+        final = min(last, today - timedelta(days=1))
+        if final < first:
+            # only today's bar, which is not persisted (an emptied series still is)
+            return rescaled, rescaled
+        series.first = first if series.first is None else min(series.first, first)
+        series.through = final if series.through is None else max(series.through, final)
+        return True, rescaled
+
+    # ------------------------------------------------------------------
+    # LRU and disk store
+    # ------------------------------------------------------------------
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._lock:
+            return self._ticker_locks.setdefault(ticker, threading.Lock())
+
+    def _get(self, ticker: str) -> _Series:
+        with self._lock:
+            series = self._series.get(ticker)
+            if series is not None:
+                self._series.move_to_end(ticker)
+                return series
+        series = self._load(ticker) or _Series()
+        with self._lock:
+            self._series[ticker] = series
+            while len(self._series) > self.max_tickers:
+                self._series.popitem(last=False)
+        return series
+
+    def _path(self, ticker: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_.^=" else "_" for c in ticker)
+        return os.path.join(self.cache_dir or "", f"{safe}.json")
+
+    def _load(self, ticker: str) -> Optional[_Series]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(ticker), encoding="utf-8") as f:
+                data = json.load(f)
+            return _Series(
+                closes={d: float(c) for d, c in data["closes"].items()},
+                first=date.fromisoformat(data["first"]),
+                through=date.fromisoformat(data["through"]),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable benchmark cache for %s: %s", ticker, e)
+            return None
+
+    def _save(self, ticker: str, series: _Series) -> None:
+        if not self.cache_dir:
+            return
+        if series.first is None or series.through is None:
+            # Dropped after a re-adjustment with nothing final to write yet
+            try:
+                os.unlink(self._path(ticker))
+            except OSError:
+                pass
+            return
+        through = series.through.isoformat()
+        data = {
+            "ticker": ticker,
+            "first": series.first.isoformat(),
+            "through": through,
+            "closes": {d: c for d, c in sorted(series.closes.items()) if d <= through},
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self._path(ticker))
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning("Could not write benchmark cache for %s: %s", ticker, e)
+
+
+def _rescaled(series: _Series, closes: Dict[str, float]) -> bool:
+    """Whether a fetched close differs from a final close already in ``series``."""
+    if series.through is None:
+        return False
+    through = series.through.isoformat()
+    for day, close in closes.items():
+        old = series.closes.get(day)
+        if old is not None and day <= through:
+            if abs(close - old) > ADJUSTMENT_TOLERANCE * max(abs(old), 1e-12):
+                return True
+    return False
+
+
+def benchmark_result(
+    closes: Dict[str, float], end_str: str, normalize_from_str: str
+) -> Optional[Dict[str, Any]]:
+    """Return and chart series of a benchmark from its daily closes.
+
+    ``normalize_from_str`` anchors the normalised series at 100 (clamped to the
+    closest earlier trading day); ``raw_series`` covers every close. Returns
+    None with fewer than two closes.
+    """
+    if len(closes) < 2:
+        return None
+    sorted_dates = sorted(closes)
+    # Clamp to the closest trading day when today's close is not published yet
+    effective_from = normalize_from_str
+    if normalize_from_str not in closes:
+        candidates = [d for d in sorted_dates if d <= normalize_from_str]
+        effective_from = candidates[-1] if candidates else sorted_dates[0]
+    first_price = closes[effective_from]
+    last_price = closes.get(end_str) or closes[sorted_dates[-1]]
+    if not first_price:
+        return None
+
+    # Carry the last close forward so the line reaches a timeline that ends today
+    working = dict(closes)
+    if normalize_from_str > sorted_dates[-1]:
+        working[normalize_from_str] = closes[sorted_dates[-1]]
+    series = [
+        {"date": d, "value": (working[d] / first_price) * 100}
+        for d in sorted(working)
+        if d >= effective_from
+    ]
+    return {
+        "return_pct": round(((last_price - first_price) / first_price) * 100, 2),
+        "first_price": first_price,
+        "last_price": last_price,
+        "series": series,
+        "raw_series": [{"date": d, "price": round(closes[d], 4)} for d in sorted_dates],
+    }
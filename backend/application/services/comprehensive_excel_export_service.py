@@ -4,12 +4,69 @@ Implements detailed per-position export with all data categories as specified in
 """
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
+from application.services.streaming_xlsx import XlsxSheet, stream_xlsx
 from domain.entities.position import Position
 from domain.entities.simulation_result import SimulationResult
+from domain.entities.trade import Trade
+
+# (header, record key) per column of the per-data-point sheets
+MARKET_DATA_COLUMNS = [
+    ("Date & Time", "date_time"),
+    ("Date", "date"),
+    ("Time", "time"),
+    ("Open", "open"),
+    ("Close", "close"),
+    ("Close (Prev)", "close_prev"),
+    ("High", "high"),
+    ("Low", "low"),
+    ("Volume", "volume"),
+    ("Bid", "bid"),
+    ("Ask", "ask"),
+    ("Dividend Rate", "dividend_rate"),
+    ("Dividend Value", "dividend_value"),
+]
+POSITION_DATA_COLUMNS = [
+    ("Date & Time", "date_time"),
+    ("Anchor Price", "anchor_price"),
+    ("Asset Qty", "asset_qty"),
+    ("Asset Value", "asset_value"),
+    ("Cash", "cash"),
+    ("Total Value", "total_value"),
+    ("% Asset of Position", "asset_percentage"),
+]
+ALGO_DATA_COLUMNS = [
+    ("Date & Time", "date_time"),
+    ("Current Price", "current_price"),
+    ("Buy Trigger Price", "buy_trigger_price"),
+    ("Sell Trigger Price", "sell_trigger_price"),
+    ("High Guardrail Price", "high_guardrail_price"),
+    ("Low Guardrail Price", "low_guardrail_price"),
+    ("Trigger Threshold %", "trigger_threshold_pct"),
+    ("Rebalance Ratio", "rebalance_ratio"),
+    ("Min Quantity", "min_quantity"),
+]
+ADDITIONAL_DATA_COLUMNS = [
+    ("Date & Time", "date_time"),
+    ("Position Performance %", "position_performance"),
+    ("Asset Performance %", "asset_performance"),
+    ("Commission Value", "commission_value"),
+    ("Volatility %", "volatility"),
+    ("Volume", "volume"),
+]
+TRANSACTION_DATA_COLUMNS = [
+    ("Date & Time", "date_time"),
+    ("Action", "action"),
+    ("Qty", "qty"),
+    ("Price", "price"),
+    ("Value ($)", "value"),
+    ("Commission", "commission"),
+    ("Reason", "reason"),
+]
 
 
 class ComprehensiveExcelExportService:
@@ -88,6 +145,116 @@ class ComprehensiveExcelExportService:
         output.seek(0)
         return output.getvalue()
 
+    def stream_position_comprehensive_data(
+        self,
+        position: Position,
+        market_data: Optional[List[Dict[str, Any]]] = None,
+        transaction_data: Optional[Iterable[Dict[str, Any]]] = None,
+        simulation_data: Optional[SimulationResult] = None,
+    ) -> Iterator[bytes]:
+        """
+        Streamed variant of export_position_comprehensive_data
+
+        The per-data-point sheets are generated row by row while the file is
+        written, and transaction_data may be a repository cursor (see
+        transactions_from_trades). Additional Data spreads the transactions'
+        commission over the data points, so it follows Transaction Data, and
+        the Summary sheet, which counts everything, comes last.
+        """
+        if not market_data:
+            market_data = self._generate_real_market_data(position)
+
+        transactions = iter(transaction_data or ())
+        first = next(transactions, None)
+        if first is None:
+            # Nothing recorded for the position; fall back to demo transactions
+            transactions = iter(self._generate_real_transaction_data(position))
+        else:
+            transactions = chain([first], transactions)
+
+        totals = {"transactions": 0, "commission": 0.0}
+
+        def transaction_rows():
+            for record in transactions:
+                totals["transactions"] += 1
+                totals["commission"] += record.get("commission", 0)
+                yield _values(record, TRANSACTION_DATA_COLUMNS)
+
+        def rows(records, columns):
+            return (_values(record, columns) for record in records)
+
+        def summary_rows():
+            data_points = len(market_data)
+            sections = [
+                ("Position Overview", self._position_overview(position)),
+                ("Trade Configuration", self._trade_configuration(position)),
+                (
+                    "Data Summary",
+                    [
+                        ["Market Data Points", data_points],
+                        ["Position Data Points", data_points],
+                        ["Algorithm Data Points", data_points],
+                        ["Transaction Records", totals["transactions"]],
+                        ["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+                    ],
+                ),
+            ]
+            for title, section in sections:
+                yield []
+                yield [title]
+                yield from section
+
+        def sheets():
+            yield XlsxSheet(
+                "Market Data",
+                rows(market_data, MARKET_DATA_COLUMNS),
+                header=[h for h, _ in MARKET_DATA_COLUMNS],
+            )
+            yield XlsxSheet(
+                "Position Data",
+                rows(self._iter_position_data(position, market_data), POSITION_DATA_COLUMNS),
+                header=[h for h, _ in POSITION_DATA_COLUMNS],
+            )
+            yield XlsxSheet(
+                "Algorithm Data",
+                rows(self._iter_algo_data(position, market_data), ALGO_DATA_COLUMNS),
+                header=[h for h, _ in ALGO_DATA_COLUMNS],
+            )
+            yield XlsxSheet(
+                "Transaction Data",
+                transaction_rows(),
+                header=[h for h, _ in TRANSACTION_DATA_COLUMNS],
+            )
+            # Built once Transaction Data has been written
+            yield XlsxSheet(
+                "Additional Data",
+                rows(
+                    self._iter_additional_data(position, market_data, totals["commission"]),
+                    ADDITIONAL_DATA_COLUMNS,
+                ),
+                header=[h for h, _ in ADDITIONAL_DATA_COLUMNS],
+            )
+            if simulation_data:
+                yield XlsxSheet(
+                    "Simulation Analysis",
+                    _simulation_results(simulation_data),
+                    preamble=[
+                        [f"Simulation Analysis - {simulation_data.ticker}"],
+                        [],
+                        ["Simulation Results"],
+                    ],
+                    column_width=[25, 20],
+                )
+            ticker = getattr(position, "ticker", "UNKNOWN")
+            yield XlsxSheet(
+                "Summary",
+                summary_rows(),
+                preamble=[[f"Comprehensive Data Export - {ticker}"]],
+                column_width=[25, 20],
+            )
+
+        return stream_xlsx(sheets())
+
     def _generate_comprehensive_data(
         self,
         position: Position,
@@ -285,7 +452,7 @@ class ComprehensiveExcelExportService:
             # Random transaction type
             action = random.choice(["BUY", "SELL"])
             qty = (
-                random.randint(1, min(10, current_qty // 2))
+                random.randint(1, max(1, min(10, int(current_qty // 2))))
                 if current_qty > 0
                 else random.randint(1, 10)
             )
@@ -334,42 +501,71 @@ class ComprehensiveExcelExportService:
         self, position: Position, market_data: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Generate position data for each market data point"""
-        position_data = []
+        return list(self._iter_position_data(position, market_data))
+
+    def _iter_position_data(
+        self, position: Position, market_data: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        # Handle both domain entity and frontend-style attributes
+        qty = getattr(position, "qty", None) or getattr(position, "units", None) or 0.0
+        cash = getattr(position, "cash", None) or getattr(position, "cashAmount", None) or 0.0
+        anchor_price = (
+            getattr(position, "anchor_price", None) or getattr(position, "anchorPrice", None) or 0.0
+        )
 
         for market_point in market_data:
             current_price = market_point["close"]
-            # Handle both domain entity and frontend-style attributes
-            qty = getattr(position, "qty", None) or getattr(position, "units", None) or 0.0
-            cash = getattr(position, "cash", None) or getattr(position, "cashAmount", None) or 0.0
-            anchor_price = (
-                getattr(position, "anchor_price", None)
-                or getattr(position, "anchorPrice", None)
-                or 0.0
-            )
-
             asset_value = qty * current_price
             total_value = cash + asset_value
             asset_percentage = (asset_value / total_value * 100) if total_value > 0 else 0
 
-            position_data.append(
-                {
-                    "date_time": market_point["date_time"],
-                    "anchor_price": anchor_price,
-                    "asset_qty": qty,
-                    "asset_value": round(asset_value, 2),
-                    "cash": cash,
-                    "total_value": round(total_value, 2),
-                    "asset_percentage": round(asset_percentage, 2),
-                }
-            )
-
-        return position_data
+            yield {
+                "date_time": market_point["date_time"],
+                "anchor_price": anchor_price,
+                "asset_qty": qty,
+                "asset_value": round(asset_value, 2),
+                "cash": cash,
+                "total_value": round(total_value, 2),
+                "asset_percentage": round(asset_percentage, 2),
+            }
 
     def _generate_algo_data(
         self, position: Position, market_data: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Generate algorithm data for each market data point"""
-        algo_data = []
+        return list(self._iter_algo_data(position, market_data))
+
+    def _iter_algo_data(
+        self, position: Position, market_data: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        order_policy = getattr(position, "order_policy", None)
+        config = getattr(position, "config", None)
+        guardrails = getattr(position, "guardrails", None)
+
+        if order_policy:
+            trigger_threshold = order_policy.trigger_threshold_pct
+            rebalance_ratio = order_policy.rebalance_ratio
+            min_qty = order_policy.min_qty
+        elif config:
+            trigger_threshold = abs(config.buyTrigger) if hasattr(config, "buyTrigger") else 0.03
+            rebalance_ratio = (
+                config.rebalanceRatio if hasattr(config, "rebalanceRatio") else 1.66667
+            )
+            min_qty = config.minQuantity if hasattr(config, "minQuantity") else 1.0
+        else:
+            trigger_threshold = 0.03
+            rebalance_ratio = 1.66667
+            min_qty = 1.0
+
+        if guardrails:
+            max_stock_alloc = guardrails.max_stock_alloc_pct
+            min_stock_alloc = guardrails.min_stock_alloc_pct
+        elif config:
+            max_stock_alloc = config.highGuardrail if hasattr(config, "highGuardrail") else 0.75
+            min_stock_alloc = config.lowGuardrail if hasattr(config, "lowGuardrail") else 0.25
+        else:
+            max_stock_alloc = 0.75
+            min_stock_alloc = 0.25
 
         for market_point in market_data:
             current_price = market_point["close"]
@@ -380,57 +576,22 @@ class ComprehensiveExcelExportService:
                 or current_price
             )
 
-            order_policy = getattr(position, "order_policy", None)
-            config = getattr(position, "config", None)
-            guardrails = getattr(position, "guardrails", None)
-
-            if order_policy:
-                trigger_threshold = order_policy.trigger_threshold_pct
-                rebalance_ratio = order_policy.rebalance_ratio
-                min_qty = order_policy.min_qty
-            elif config:
-                trigger_threshold = (
-                    abs(config.buyTrigger) if hasattr(config, "buyTrigger") else 0.03
-                )
-                rebalance_ratio = (
-                    config.rebalanceRatio if hasattr(config, "rebalanceRatio") else 1.66667
-                )
-                min_qty = config.minQuantity if hasattr(config, "minQuantity") else 1.0
-            else:
-                trigger_threshold = 0.03
-                rebalance_ratio = 1.66667
-                min_qty = 1.0
-
-            if guardrails:
-                max_stock_alloc = guardrails.max_stock_alloc_pct
-                min_stock_alloc = guardrails.min_stock_alloc_pct
-            elif config:
-                max_stock_alloc = config.highGuardrail if hasattr(config, "highGuardrail") else 0.75
-                min_stock_alloc = config.lowGuardrail if hasattr(config, "lowGuardrail") else 0.25
-            else:
-                max_stock_alloc = 0.75
-                min_stock_alloc = 0.25
-
             buy_trigger_price = anchor * (1 - trigger_threshold)  # Buy when price drops
             sell_trigger_price = anchor * (1 + trigger_threshold)  # Sell when price rises
             high_guardrail_price = anchor * (1 + max_stock_alloc)
             low_guardrail_price = anchor * (1 - min_stock_alloc)
 
-            algo_data.append(
-                {
-                    "date_time": market_point["date_time"],
-                    "current_price": round(current_price, 2),
-                    "buy_trigger_price": round(buy_trigger_price, 2),
-                    "sell_trigger_price": round(sell_trigger_price, 2),
-                    "high_guardrail_price": round(high_guardrail_price, 2),
-                    "low_guardrail_price": round(low_guardrail_price, 2),
-                    "trigger_threshold_pct": trigger_threshold * 100,
-                    "rebalance_ratio": rebalance_ratio,
-                    "min_quantity": min_qty,
-                }
-            )
-
-        return algo_data
+            yield {
+                "date_time": market_point["date_time"],
+                "current_price": round(current_price, 2),
+                "buy_trigger_price": round(buy_trigger_price, 2),
+                "sell_trigger_price": round(sell_trigger_price, 2),
+                "high_guardrail_price": round(high_guardrail_price, 2),
+                "low_guardrail_price": round(low_guardrail_price, 2),
+                "trigger_threshold_pct": trigger_threshold * 100,
+                "rebalance_ratio": rebalance_ratio,
+                "min_quantity": min_qty,
+            }
 
     def _generate_additional_data(
         self,
@@ -439,9 +600,19 @@ class ComprehensiveExcelExportService:
         transaction_data: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
         """Generate additional performance and analysis data"""
-        additional_data = []
+        total_commission = sum(t.get("commission", 0) for t in transaction_data)
+        return list(self._iter_additional_data(position, market_data, total_commission))
+
+    def _iter_additional_data(
+        self,
+        position: Position,
+        market_data: List[Dict[str, Any]],
+        total_commission: float,
+    ) -> Iterator[Dict[str, Any]]:
+        # Commission value (simplified): total commission spread over the data points
+        daily_commission = total_commission / len(market_data) if market_data else 0
 
-        for i, market_point in enumerate(market_data):
+        for market_point in market_data:
             current_price = market_point["close"]
 
             # Calculate performance metrics
@@ -455,22 +626,14 @@ class ComprehensiveExcelExportService:
                 position_performance  # Same as position performance for individual position
             )
 
-            # Calculate commission value (simplified)
-            total_commission = sum(t.get("commission", 0) for t in transaction_data)
-            daily_commission = total_commission / len(market_data) if market_data else 0
-
-            additional_data.append(
-                {
-                    "date_time": market_point["date_time"],
-                    "position_performance": round(position_performance, 2),
-                    "asset_performance": round(asset_performance, 2),
-                    "commission_value": round(daily_commission, 2),
-                    "volatility": round(market_point.get("volatility", 0), 2),
-                    "volume": market_point.get("volume", 0),
-                }
-            )
-
-        return additional_data
+            yield {
+                "date_time": market_point["date_time"],
+                "position_performance": round(position_performance, 2),
+                "asset_performance": round(asset_performance, 2),
+                "commission_value": round(daily_commission, 2),
+                "volatility": round(market_point.get("volatility", 0), 2),
+                "volume": market_point.get("volume", 0),
+            }
 
     def _create_summary_sheet(self, position: Position, comprehensive_data: Dict[str, Any]):
         """Create summary sheet with key metrics"""
@@ -482,10 +645,28 @@ class ComprehensiveExcelExportService:
         ws["A1"] = f"Comprehensive Data Export - {ticker}"
         ws["A1"].font = Font(size=16, bold=True)
 
-        # Position Overview
-        ws["A3"] = "Position Overview"
-        ws["A3"].font = Font(size=14, bold=True)
-
+        data_summary = [
+            ["Market Data Points", len(comprehensive_data["market_data"])],
+            ["Position Data Points", len(comprehensive_data["position_data"])],
+            ["Algorithm Data Points", len(comprehensive_data["algo_data"])],
+            ["Transaction Records", len(comprehensive_data["transaction_data"])],
+            ["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+        ]
+        sections = [
+            (3, "Position Overview", self._position_overview(position)),
+            (16, "Trade Configuration", self._trade_configuration(position)),
+            (27, "Data Summary", data_summary),
+        ]
+        for title_row, title, rows in sections:
+            ws[f"A{title_row}"] = title
+            ws[f"A{title_row}"].font = Font(size=14, bold=True)
+            for i, (label, value) in enumerate(rows, start=title_row + 1):
+                ws[f"A{i}"] = label
+                ws[f"B{i}"] = value
+                ws[f"A{i}"].font = Font(bold=True)
+
+    def _position_overview(self, position: Position) -> List[List[Any]]:
+        """Label/value rows of the Summary sheet's Position Overview section"""
         # Handle both domain entity and frontend-style attributes
         ticker = getattr(position, "ticker", "UNKNOWN")
         anchor_price = (
@@ -504,7 +685,7 @@ class ComprehensiveExcelExportService:
             pnl_percent = (pnl / total_value * 100) if total_value > 0 else 0.0
         is_active = getattr(position, "isActive", True)
 
-        summary_data = [
+        return [
             ["Ticker", ticker],
             ["Company Name", getattr(position, "name", ticker)],  # Fallback to ticker
             ["Current Price", f"${current_price:.2f}"],
@@ -518,15 +699,8 @@ class ComprehensiveExcelExportService:
             ["Status", "Active" if is_active else "Inactive"],
         ]
 
-        for i, (label, value) in enumerate(summary_data, start=4):
-            ws[f"A{i}"] = label
-            ws[f"B{i}"] = value
-            ws[f"A{i}"].font = Font(bold=True)
-
-        # Trade Configuration
-        ws["A16"] = "Trade Configuration"
-        ws["A16"].font = Font(size=14, bold=True)
-
+    def _trade_configuration(self, position: Position) -> List[List[Any]]:
+        """Label/value rows of the Summary sheet's Trade Configuration section"""
         # Handle both domain entity and frontend-style config
         order_policy = getattr(position, "order_policy", None)
         config = getattr(position, "config", None)
@@ -564,7 +738,7 @@ class ComprehensiveExcelExportService:
             max_stock_alloc = 0.75
             withholding_tax = 0.25
 
-        config_data = [
+        return [
             ["Buy Trigger", f"{-trigger_threshold * 100:.2f}%"],  # Negative for buy
             ["Sell Trigger", f"{trigger_threshold * 100:.2f}%"],  # Positive for sell
             ["Low Guardrail", f"{min_stock_alloc * 100:.2f}%"],
@@ -576,203 +750,52 @@ class ComprehensiveExcelExportService:
             ["Trade After Hours", "Yes" if allow_after_hours else "No"],
         ]
 
-        for i, (label, value) in enumerate(config_data, start=17):
-            ws[f"A{i}"] = label
-            ws[f"B{i}"] = value
-            ws[f"A{i}"].font = Font(bold=True)
-
-        # Data Summary
-        ws["A27"] = "Data Summary"
-        ws["A27"].font = Font(size=14, bold=True)
-
-        data_summary = [
-            ["Market Data Points", len(comprehensive_data["market_data"])],
-            ["Position Data Points", len(comprehensive_data["position_data"])],
-            ["Algorithm Data Points", len(comprehensive_data["algo_data"])],
-            ["Transaction Records", len(comprehensive_data["transaction_data"])],
-            ["Export Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-        ]
-
-        for i, (label, value) in enumerate(data_summary, start=28):
-            ws[f"A{i}"] = label
-            ws[f"B{i}"] = value
-            ws[f"A{i}"].font = Font(bold=True)
-
-    def _create_market_data_sheet(self, market_data: List[Dict[str, Any]]):
-        """Create market data sheet with OHLCV, bid/ask, dividend data"""
-        ws = self.workbook.create_sheet("Market Data")
-
-        # Headers
-        headers = [
-            "Date & Time",
-            "Date",
-            "Time",
-            "Open",
-            "Close",
-            "Close (Prev)",
-            "High",
-            "Low",
-            "Volume",
-            "Bid",
-            "Ask",
-            "Dividend Rate",
-            "Dividend Value",
-        ]
-
-        for col, header in enumerate(headers, 1):
+    def _create_table_sheet(
+        self,
+        title: str,
+        columns: List[Tuple[str, str]],
+        rows: List[Dict[str, Any]],
+        color: str,
+    ):
+        """Create a sheet with one colored header row and one row per record"""
+        ws = self.workbook.create_sheet(title)
+
+        for col, (header, _) in enumerate(columns, 1):
             cell = ws.cell(row=1, column=col, value=header)
             cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
             cell.alignment = Alignment(horizontal="center")
 
-        # Data
-        for row, data in enumerate(market_data, 2):
-            ws.cell(row=row, column=1, value=data["date_time"])
-            ws.cell(row=row, column=2, value=data["date"])
-            ws.cell(row=row, column=3, value=data["time"])
-            ws.cell(row=row, column=4, value=data["open"])
-            ws.cell(row=row, column=5, value=data["close"])
-            ws.cell(row=row, column=6, value=data["close_prev"])
-            ws.cell(row=row, column=7, value=data["high"])
-            ws.cell(row=row, column=8, value=data["low"])
-            ws.cell(row=row, column=9, value=data["volume"])
-            ws.cell(row=row, column=10, value=data["bid"])
-            ws.cell(row=row, column=11, value=data["ask"])
-            ws.cell(row=row, column=12, value=data["dividend_rate"])
-            ws.cell(row=row, column=13, value=data["dividend_value"])
+        for row, data in enumerate(rows, 2):
+            for col, (_, key) in enumerate(columns, 1):
+                ws.cell(row=row, column=col, value=data[key])
 
         # Auto-fit columns safely
         self._safe_auto_fit_columns(ws)
 
+    def _create_market_data_sheet(self, market_data: List[Dict[str, Any]]):
+        """Create market data sheet with OHLCV, bid/ask, dividend data"""
+        self._create_table_sheet("Market Data", MARKET_DATA_COLUMNS, market_data, "366092")
+
     def _create_position_data_sheet(self, position_data: List[Dict[str, Any]]):
         """Create position data sheet with anchor price, asset qty, values"""
-        ws = self.workbook.create_sheet("Position Data")
-
-        # Headers
-        headers = [
-            "Date & Time",
-            "Anchor Price",
-            "Asset Qty",
-            "Asset Value",
-            "Cash",
-            "Total Value",
-            "% Asset of Position",
-        ]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="70AD47", end_color="70AD47", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data
-        for row, data in enumerate(position_data, 2):
-            ws.cell(row=row, column=1, value=data["date_time"])
-            ws.cell(row=row, column=2, value=data["anchor_price"])
-            ws.cell(row=row, column=3, value=data["asset_qty"])
-            ws.cell(row=row, column=4, value=data["asset_value"])
-            ws.cell(row=row, column=5, value=data["cash"])
-            ws.cell(row=row, column=6, value=data["total_value"])
-            ws.cell(row=row, column=7, value=data["asset_percentage"])
-
-        # Auto-fit columns safely
-        self._safe_auto_fit_columns(ws)
+        self._create_table_sheet("Position Data", POSITION_DATA_COLUMNS, position_data, "70AD47")
 
     def _create_algo_data_sheet(self, algo_data: List[Dict[str, Any]]):
         """Create algorithm data sheet with triggers, guardrails, config"""
-        ws = self.workbook.create_sheet("Algorithm Data")
-
-        # Headers
-        headers = [
-            "Date & Time",
-            "Current Price",
-            "Buy Trigger Price",
-            "Sell Trigger Price",
-            "High Guardrail Price",
-            "Low Guardrail Price",
-            "Trigger Threshold %",
-            "Rebalance Ratio",
-            "Min Quantity",
-        ]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data
-        for row, data in enumerate(algo_data, 2):
-            ws.cell(row=row, column=1, value=data["date_time"])
-            ws.cell(row=row, column=2, value=data["current_price"])
-            ws.cell(row=row, column=3, value=data["buy_trigger_price"])
-            ws.cell(row=row, column=4, value=data["sell_trigger_price"])
-            ws.cell(row=row, column=5, value=data["high_guardrail_price"])
-            ws.cell(row=row, column=6, value=data["low_guardrail_price"])
-            ws.cell(row=row, column=7, value=data["trigger_threshold_pct"])
-            ws.cell(row=row, column=8, value=data["rebalance_ratio"])
-            ws.cell(row=row, column=9, value=data["min_quantity"])
-
-        # Auto-fit columns safely
-        self._safe_auto_fit_columns(ws)
+        self._create_table_sheet("Algorithm Data", ALGO_DATA_COLUMNS, algo_data, "FFC000")
 
     def _create_additional_data_sheet(self, additional_data: List[Dict[str, Any]]):
         """Create additional data sheet with performance metrics"""
-        ws = self.workbook.create_sheet("Additional Data")
-
-        # Headers
-        headers = [
-            "Date & Time",
-            "Position Performance %",
-            "Asset Performance %",
-            "Commission Value",
-            "Volatility %",
-            "Volume",
-        ]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="C55A5A", end_color="C55A5A", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data
-        for row, data in enumerate(additional_data, 2):
-            ws.cell(row=row, column=1, value=data["date_time"])
-            ws.cell(row=row, column=2, value=data["position_performance"])
-            ws.cell(row=row, column=3, value=data["asset_performance"])
-            ws.cell(row=row, column=4, value=data["commission_value"])
-            ws.cell(row=row, column=5, value=data["volatility"])
-            ws.cell(row=row, column=6, value=data["volume"])
-
-        # Auto-fit columns safely
-        self._safe_auto_fit_columns(ws)
+        self._create_table_sheet(
+            "Additional Data", ADDITIONAL_DATA_COLUMNS, additional_data, "C55A5A"
+        )
 
     def _create_transaction_data_sheet(self, transaction_data: List[Dict[str, Any]]):
         """Create transaction data sheet with action, qty, $, commission, reason"""
-        ws = self.workbook.create_sheet("Transaction Data")
-
-        # Headers
-        headers = ["Date & Time", "Action", "Qty", "Price", "Value ($)", "Commission", "Reason"]
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="8B4513", end_color="8B4513", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data
-        for row, data in enumerate(transaction_data, 2):
-            ws.cell(row=row, column=1, value=data["date_time"])
-            ws.cell(row=row, column=2, value=data["action"])
-            ws.cell(row=row, column=3, value=data["qty"])
-            ws.cell(row=row, column=4, value=data["price"])
-            ws.cell(row=row, column=5, value=data["value"])
-            ws.cell(row=row, column=6, value=data["commission"])
-            ws.cell(row=row, column=7, value=data["reason"])
-
-        # Auto-fit columns safely
-        self._safe_auto_fit_columns(ws)
+        self._create_table_sheet(
+            "Transaction Data", TRANSACTION_DATA_COLUMNS, transaction_data, "8B4513"
+        )
 
     def _create_simulation_analysis_sheet(self, simulation_data: SimulationResult):
         """Create simulation analysis sheet if simulation data is provided"""
@@ -786,27 +809,47 @@ class ComprehensiveExcelExportService:
         ws["A3"] = "Simulation Results"
         ws["A3"].font = Font(size=14, bold=True)
 
-        sim_data = [
-            ["Start Date", simulation_data.start_date.strftime("%Y-%m-%d")],
-            ["End Date", simulation_data.end_date.strftime("%Y-%m-%d")],
-            ["Trading Days", simulation_data.total_trading_days],
-            ["Initial Cash", f"${simulation_data.initial_cash:,.2f}"],
-            ["Algorithm Trades", simulation_data.algorithm_trades],
-            ["Algorithm P&L", f"${simulation_data.algorithm_pnl:,.2f}"],
-            ["Algorithm Return", f"{simulation_data.algorithm_return_pct:.2f}%"],
-            ["Algorithm Volatility", f"{simulation_data.algorithm_volatility:.2f}%"],
-            ["Algorithm Sharpe", f"{simulation_data.algorithm_sharpe_ratio:.4f}"],
-            ["Algorithm Max Drawdown", f"{simulation_data.algorithm_max_drawdown:.2f}%"],
-            ["Buy & Hold P&L", f"${simulation_data.buy_hold_pnl:,.2f}"],
-            ["Buy & Hold Return", f"{simulation_data.buy_hold_return_pct:.2f}%"],
-            ["Excess Return", f"{simulation_data.excess_return:.2f}%"],
-            ["Alpha", f"{simulation_data.alpha:.4f}"],
-            ["Beta", f"{simulation_data.beta:.4f}"],
-            ["Information Ratio", f"{simulation_data.information_ratio:.4f}"],
-            ["Total Dividends", f"${simulation_data.total_dividends_received:,.2f}"],
-        ]
-
-        for i, (label, value) in enumerate(sim_data, start=4):
+        for i, (label, value) in enumerate(_simulation_results(simulation_data), start=4):
             ws[f"A{i}"] = label
             ws[f"B{i}"] = value
             ws[f"A{i}"].font = Font(bold=True)
+
+
+def _simulation_results(simulation_data: SimulationResult) -> List[List[Any]]:
+    return [
+        ["Start Date", simulation_data.start_date.strftime("%Y-%m-%d")],
+        ["End Date", simulation_data.end_date.strftime("%Y-%m-%d")],
+        ["Trading Days", simulation_data.total_trading_days],
+        ["Initial Cash", f"${simulation_data.initial_cash:,.2f}"],
+        ["Algorithm Trades", simulation_data.algorithm_trades],
+        ["Algorithm P&L", f"${simulation_data.algorithm_pnl:,.2f}"],
+        ["Algorithm Return", f"{simulation_data.algorithm_return_pct:.2f}%"],
+        ["Algorithm Volatility", f"{simulation_data.algorithm_volatility:.2f}%"],
+        ["Algorithm Sharpe", f"{simulation_data.algorithm_sharpe_ratio:.4f}"],
+        ["Algorithm Max Drawdown", f"{simulation_data.algorithm_max_drawdown:.2f}%"],
+        ["Buy & Hold P&L", f"${simulation_data.buy_hold_pnl:,.2f}"],
+        ["Buy & Hold Return", f"{simulation_data.buy_hold_return_pct:.2f}%"],
+        ["Excess Return", f"{simulation_data.excess_return:.2f}%"],
+        ["Alpha", f"{simulation_data.alpha:.4f}"],
+        ["Beta", f"{simulation_data.beta:.4f}"],
+        ["Information Ratio", f"{simulation_data.information_ratio:.4f}"],
+        ["Total Dividends", f"${simulation_data.total_dividends_received:,.2f}"],
+    ]
+
+
+def transactions_from_trades(trades: Iterable[Trade]) -> Iterator[Dict[str, Any]]:
+    """Map executed trades to Transaction Data records, lazily."""
+    for trade in trades:
+        yield {
+            "date_time": trade.executed_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "action": trade.side,
+            "qty": trade.qty,
+            "price": round(trade.price, 2),
+            "value": round(trade.qty * trade.price, 2),
+            "commission": round(trade.commission, 2),
+            "reason": f"Order {trade.order_id} {trade.status}",
+        }
+
+
+def _values(record: Dict[str, Any], columns: List[Tuple[str, str]]) -> List[Any]:
+    return [record[key] for _, key in columns]
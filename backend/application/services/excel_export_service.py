@@ -3,7 +3,7 @@
 # =========================
 
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 import pandas as pd
 from openpyxl.styles import Font, PatternFill
 
@@ -53,6 +53,19 @@ class ExcelExportService:
             positions_data, trades_data, orders_data, title
         )
 
+    def stream_trading_data(
+        self,
+        positions_data: Iterable[Dict[str, Any]],
+        trades_data: Iterable[Dict[str, Any]],
+        orders_data: Iterable[Dict[str, Any]],
+        title: str = "Trading Data Export",
+    ) -> Iterator[bytes]:
+        """Stream trading data (positions, trades, orders) to Excel as rows are read."""
+        template_service = ExcelTemplateService()
+        return template_service.stream_trading_audit_report(
+            positions_data, trades_data, orders_data, title
+        )
+
     def export_activity_log(
         self,
         events: List[Dict[str, Any]],
@@ -63,6 +76,16 @@ class ExcelExportService:
         template_service = ExcelTemplateService()
         return template_service.create_activity_log_report(events, position_id, ticker)
 
+    def stream_activity_log(
+        self,
+        events: Iterable[Dict[str, Any]],
+        position_id: str,
+        ticker: str = "UNKNOWN",
+    ) -> Iterator[bytes]:
+        """Stream activity log (events) to Excel as events are read."""
+        template_service = ExcelTemplateService()
+        return template_service.stream_activity_log_report(events, position_id, ticker)
+
     def export_comprehensive_simulation_report(
         self, simulation_result: SimulationResult, ticker: str = "UNKNOWN"
     ) -> bytes:
@@ -97,6 +120,19 @@ class ExcelExportService:
             position, market_data, transaction_data, simulation_data
         )
 
+    def stream_position_comprehensive_data(
+        self,
+        position: Position,
+        market_data: List[Dict[str, Any]] = None,
+        transaction_data: Iterable[Dict[str, Any]] = None,
+        simulation_data: Optional[SimulationResult] = None,
+    ) -> Iterator[bytes]:
+        """Stream comprehensive per-position data to Excel."""
+        comprehensive_service = ComprehensiveExcelExportService()
+        return comprehensive_service.stream_position_comprehensive_data(
+            position, market_data, transaction_data, simulation_data
+        )
+
     def export_dividend_data(
         self,
         receivables: List[Dict[str, Any]],
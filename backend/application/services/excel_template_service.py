@@ -5,7 +5,7 @@
 import io
 import json
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, List, Any
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
@@ -14,8 +14,34 @@ from openpyxl.utils import get_column_letter
 
 from domain.entities.optimization_result import OptimizationResults
 from domain.entities.simulation_result import SimulationResult
+from application.services.streaming_xlsx import XlsxSheet, stream_xlsx
 from application.services.verbose_timeline_service import VerboseTimelineService
 
+POSITION_HEADERS = ["Position ID", "Ticker", "Shares", "Cash Balance", "Created At", "Updated At"]
+TRADE_HEADERS = [
+    "Trade ID",
+    "Order ID",
+    "Position ID",
+    "Side",
+    "Qty",
+    "Price",
+    "Commission",
+    "Status",
+    "Executed At",
+]
+ORDER_HEADERS = [
+    "Order ID",
+    "Position ID",
+    "Side",
+    "Qty",
+    "Status",
+    "Filled Qty",
+    "Avg Fill Price",
+    "Commission",
+    "Created At",
+]
+ACTIVITY_LOG_HEADERS = ["Timestamp", "Type", "Message", "Inputs", "Outputs"]
+
 
 class ExcelTemplateService:
     """Service for creating professional Excel templates with advanced formatting."""
@@ -132,6 +158,65 @@ class ExcelTemplateService:
         excel_buffer.seek(0)
         return excel_buffer.getvalue()
 
+    def stream_trading_audit_report(
+        self,
+        positions_data: Iterable[Dict[str, Any]],
+        trades_data: Iterable[Dict[str, Any]],
+        orders_data: Iterable[Dict[str, Any]],
+        title: str = "Trading Audit Report",
+    ) -> Iterator[bytes]:
+        """Streamed variant of create_trading_audit_report.
+
+        Positions, trades and orders are written as they are read from the
+        iterables (typically repository cursors). The Executive Summary counts
+        them on the way, so it is the last sheet rather than the first.
+        """
+        counts = {"positions": 0, "trades": 0, "orders": 0}
+
+        def counted(kind, rows, to_values, empty_message):
+            for row in rows:
+                counts[kind] += 1
+                yield to_values(row)
+            if not counts[kind]:
+                yield [empty_message]
+
+        def summary_rows():
+            yield ["Summary Statistics"]
+            yield ["Total Positions:", counts["positions"]]
+            yield ["Total Trades:", counts["trades"]]
+            yield ["Total Orders:", counts["orders"]]
+
+        sheets = [
+            XlsxSheet(
+                "Positions Analysis",
+                counted("positions", positions_data, _position_row, "No positions data available."),
+                header=POSITION_HEADERS,
+                preamble=[["Positions Analysis"]],
+                column_width=18,
+            ),
+            XlsxSheet(
+                "Trades Analysis",
+                counted("trades", trades_data, _trade_row, "No trades data available."),
+                header=TRADE_HEADERS,
+                preamble=[["Trades Analysis"]],
+                column_width=18,
+            ),
+            XlsxSheet(
+                "Orders Analysis",
+                counted("orders", orders_data, _order_row, "No orders data available."),
+                header=ORDER_HEADERS,
+                preamble=[["Orders Analysis"]],
+                column_width=18,
+            ),
+            XlsxSheet(
+                "Executive Summary",
+                summary_rows(),
+                preamble=[[title], [_generated_line()], []],
+                column_width=[20, 15],
+            ),
+        ]
+        return stream_xlsx(sheets)
+
     def _define_styles(self):
         """Define custom styles for the workbook."""
         # Header style
@@ -750,7 +835,7 @@ class ExcelTemplateService:
             ws["A3"] = "No trades data available."
             return
 
-        headers = ["Trade ID", "Order ID", "Position ID", "Side", "Qty", "Price", "Commission", "Status", "Executed At"]
+        headers = TRADE_HEADERS
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=3, column=col, value=header)
             cell.font = Font(bold=True, color="FFFFFF", size=11)
@@ -758,18 +843,8 @@ class ExcelTemplateService:
             cell.alignment = Alignment(horizontal="center", vertical="center")
 
         for row_idx, trade in enumerate(trades_data, 4):
-            executed_at = trade.get("executed_at", "")
-            if hasattr(executed_at, "isoformat"):
-                executed_at = executed_at.isoformat()
-            ws.cell(row=row_idx, column=1, value=trade.get("id", ""))
-            ws.cell(row=row_idx, column=2, value=trade.get("order_id", ""))
-            ws.cell(row=row_idx, column=3, value=trade.get("position_id", ""))
-            ws.cell(row=row_idx, column=4, value=trade.get("side", ""))
-            ws.cell(row=row_idx, column=5, value=trade.get("qty", 0))
-            ws.cell(row=row_idx, column=6, value=trade.get("price", 0))
-            ws.cell(row=row_idx, column=7, value=trade.get("commission", 0))
-            ws.cell(row=row_idx, column=8, value=trade.get("status", ""))
-            ws.cell(row=row_idx, column=9, value=str(executed_at))
+            for col, value in enumerate(_trade_row(trade), 1):
+                ws.cell(row=row_idx, column=col, value=value)
 
         for col in range(1, len(headers) + 1):
             ws.column_dimensions[ws.cell(row=3, column=col).column_letter].width = 18
@@ -786,7 +861,7 @@ class ExcelTemplateService:
             ws["A3"] = "No orders data available."
             return
 
-        headers = ["Order ID", "Position ID", "Side", "Qty", "Status", "Filled Qty", "Avg Fill Price", "Commission", "Created At"]
+        headers = ORDER_HEADERS
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=3, column=col, value=header)
             cell.font = Font(bold=True, color="FFFFFF", size=11)
@@ -794,18 +869,8 @@ class ExcelTemplateService:
             cell.alignment = Alignment(horizontal="center", vertical="center")
 
         for row_idx, order in enumerate(orders_data, 4):
-            created_at = order.get("created_at", "")
-            if hasattr(created_at, "isoformat"):
-                created_at = created_at.isoformat()
-            ws.cell(row=row_idx, column=1, value=order.get("id", ""))
-            ws.cell(row=row_idx, column=2, value=order.get("position_id", ""))
-            ws.cell(row=row_idx, column=3, value=order.get("side", ""))
-            ws.cell(row=row_idx, column=4, value=order.get("qty", 0))
-            ws.cell(row=row_idx, column=5, value=order.get("status", ""))
-            ws.cell(row=row_idx, column=6, value=order.get("filled_qty", 0))
-            ws.cell(row=row_idx, column=7, value=order.get("avg_fill_price", ""))
-            ws.cell(row=row_idx, column=8, value=order.get("total_commission", 0))
-            ws.cell(row=row_idx, column=9, value=str(created_at))
+            for col, value in enumerate(_order_row(order), 1):
+                ws.cell(row=row_idx, column=col, value=value)
 
         for col in range(1, len(headers) + 1):
             ws.column_dimensions[ws.cell(row=3, column=col).column_letter].width = 18
@@ -1528,28 +1593,14 @@ class ExcelTemplateService:
             return excel_buffer.getvalue()
 
         # Headers
-        headers = ["Timestamp", "Type", "Message", "Inputs", "Outputs"]
-        for col, header in enumerate(headers, 1):
+        for col, header in enumerate(ACTIVITY_LOG_HEADERS, 1):
             cell = ws.cell(row=4, column=col, value=header)
             cell.style = self.styles["header"]
 
         # Event data
         for row, event in enumerate(events, 5):
-            ws.cell(row=row, column=1, value=event.get("ts", ""))
-            ws.cell(row=row, column=2, value=event.get("type", ""))
-            ws.cell(row=row, column=3, value=event.get("message", ""))
-            ws.cell(
-                row=row,
-                column=4,
-                value=json.dumps(event.get("inputs", {}), indent=2) if event.get("inputs") else "",
-            )
-            ws.cell(
-                row=row,
-                column=5,
-                value=(
-                    json.dumps(event.get("outputs", {}), indent=2) if event.get("outputs") else ""
-                ),
-            )
+            for col, value in enumerate(_event_row(event), 1):
+                ws.cell(row=row, column=col, value=value)
 
         # Auto-adjust column widths safely
         self._safe_auto_fit_columns(ws)
@@ -1560,6 +1611,35 @@ class ExcelTemplateService:
         excel_buffer.seek(0)
         return excel_buffer.getvalue()
 
+    def stream_activity_log_report(
+        self,
+        events: Iterable[Dict[str, Any]],
+        position_id: str,
+        ticker: str = "UNKNOWN",
+    ) -> Iterator[bytes]:
+        """Streamed variant of create_activity_log_report; events are written as they are read."""
+
+        def rows():
+            empty = True
+            for event in events:
+                empty = False
+                yield _event_row(event)
+            if empty:
+                yield ["No events found for this position"]
+
+        sheet = XlsxSheet(
+            "Activity Log",
+            rows(),
+            header=ACTIVITY_LOG_HEADERS,
+            preamble=[
+                [f"Activity Log - {ticker} (Position: {position_id})"],
+                [_generated_line()],
+                [],
+            ],
+            column_width=[28, 18, 50, 40, 40],
+        )
+        return stream_xlsx([sheet])
+
     def create_dividend_report(
         self,
         receivables: List[Dict[str, Any]],
@@ -1635,3 +1715,62 @@ class ExcelTemplateService:
         self.workbook.save(excel_buffer)
         excel_buffer.seek(0)
         return excel_buffer.getvalue()
+
+
+def _generated_line() -> str:
+    return f"Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}"
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _position_row(position: Dict[str, Any]) -> List[Any]:
+    return [
+        position.get("id", ""),
+        position.get("ticker", ""),
+        position.get("shares", 0),
+        position.get("cash_balance", 0),
+        position.get("created_at"),
+        position.get("updated_at"),
+    ]
+
+
+def _trade_row(trade: Dict[str, Any]) -> List[Any]:
+    return [
+        trade.get("id", ""),
+        trade.get("order_id", ""),
+        trade.get("position_id", ""),
+        trade.get("side", ""),
+        trade.get("qty", 0),
+        trade.get("price", 0),
+        trade.get("commission", 0),
+        trade.get("status", ""),
+        _isoformat(trade.get("executed_at", "")),
+    ]
+
+
+def _order_row(order: Dict[str, Any]) -> List[Any]:
+    return [
+        order.get("id", ""),
+        order.get("position_id", ""),
+        order.get("side", ""),
+        order.get("qty", 0),
+        order.get("status", ""),
+        order.get("filled_qty", 0),
+        order.get("avg_fill_price", ""),
+        order.get("total_commission", 0),
+        _isoformat(order.get("created_at", "")),
+    ]
+
+
+def _event_row(event: Dict[str, Any]) -> List[Any]:
+    inputs = event.get("inputs")
+    outputs = event.get("outputs")
+    return [
+        event.get("ts", ""),
+        event.get("type", ""),
+        event.get("message", ""),
+        json.dumps(inputs, indent=2) if inputs else "",
+        json.dumps(outputs, indent=2) if outputs else "",
+    ]
@@ -80,8 +80,8 @@ class ExplainabilityTimelineService:
         """
         Enrich explainability rows with Order and Trade entity data.
 
-        Batch-fetches all referenced orders and their trades, then populates
-        Group 6 (Order Status) and Group 7 (Execution Details) fields.
+        Batch-fetches all referenced orders and their trades (one query each),
+        then populates Group 6 (Order Status) and Group 7 (Execution Details) fields.
 
         Args:
             rows: List of ExplainabilityRow objects with order_id populated
@@ -97,25 +97,19 @@ class ExplainabilityTimelineService:
         if not order_ids:
             return rows
 
-        # Batch-fetch orders
-        orders_by_id: Dict[str, Any] = {}
-        for order_id in order_ids:
-            try:
-                order = self._orders_repo.get(order_id)
-                if order:
-                    orders_by_id[order_id] = order
-            except Exception as e:
-                logger.warning(f"Failed to fetch order {order_id}: {e}")
+        # Batch-fetch orders and their trades: two queries however many rows
+        try:
+            orders_by_id: Dict[str, Any] = self._orders_repo.get_many(order_ids)
+        except Exception as e:
+            logger.warning(f"Failed to fetch {len(order_ids)} orders: {e}")
+            return rows
 
-        # Batch-fetch trades for each order
         trades_by_order: Dict[str, List[Any]] = {}
-        for order_id in orders_by_id:
+        if orders_by_id:
             try:
-                trades = self._trades_repo.list_for_order(order_id)
-                if trades:
-                    trades_by_order[order_id] = trades
+                trades_by_order = self._trades_repo.list_for_orders(orders_by_id)
             except Exception as e:
-                logger.warning(f"Failed to fetch trades for order {order_id}: {e}")
+                logger.warning(f"Failed to fetch trades for {len(orders_by_id)} orders: {e}")
 
         # Enrich each row
         for row in rows:
@@ -0,0 +1,276 @@
+# =========================
+# backend/application/services/job_queue.py
+# =========================
+"""
+Local background job queue for simulations and optimization runs.
+
+A fixed pool of worker threads runs jobs in priority order (lower first,
+FIFO within a priority). Job state is kept in a JobStore so status survives
+the request that submitted it, and after a restart queued jobs are picked up
+again while jobs that were running are marked failed. A kind can register an
+``on_abandoned`` callback to undo state it set up at submit time when one of
+its jobs ends without its handler finishing (interrupted by a restart or
+cancelled while queued).
+
+Live trading comes first: while a trading cycle holds ``live_trading_first()``
+workers do not start new jobs (jobs already running continue).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from application.helpers.latency import latency_summary
+from domain.entities.background_job import BackgroundJob, JobPriority, JobStatus
+from domain.ports.job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[BackgroundJob], Any]
+AbandonHook = Callable[[BackgroundJob], None]
+
+# Latency samples kept for metrics
+_SAMPLES = 500
+
+
+class JobQueue:
+    """Bounded worker pool over a persistent, prioritised job store."""
+
+    def __init__(self, store: JobStore, workers: int = 2) -> None:
+        self.store = store
+        self.workers = max(1, workers)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._abandon_hooks: Dict[str, AbandonHook] = {}
+        self._queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._running: Dict[str, BackgroundJob] = {}
+        # Set while no live trading cycle is in progress
+        self._live_idle = threading.Event()
+        self._live_idle.set()
+        self._live_holds = 0
+        self._counts: Counter = Counter()
+        self._wait_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+        self._run_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+
+    def register(
+        self, kind: str, handler: JobHandler, on_abandoned: Optional[AbandonHook] = None
+    ) -> None:
+        """Register the function that runs jobs of ``kind``; it receives the job, returns its result.
+
+        ``on_abandoned`` is called with a job of this kind that was interrupted by
+        a restart or cancelled before it started.
+        """
+        self._handlers[kind] = handler
+        if on_abandoned is not None:
+            self._abandon_hooks[kind] = on_abandoned
+
+    def start(self) -> None:
+        """Re-queue persisted jobs and start the workers (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            self._recover()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True, name=f"JobWorker-{i}")
+                thread.start()
+                self._threads.append(thread)
+        logger.info("Job queue started with %d workers", self.workers)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop taking jobs; running jobs finish in their daemon threads."""
+        self._stop.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def submit(
+        self, kind: str, payload: Dict[str, Any], priority: int = JobPriority.NORMAL
+    ) -> BackgroundJob:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job = BackgroundJob.new(kind, payload, priority)
+        self.store.save(job)
+        self._enqueue(job)
+        with self._lock:
+            self._counts["submitted"] += 1
+        self.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        with self._lock:
+            running = self._running.get(job_id)
+        return running or self.store.get(job_id)
+
+    def delete(self, job_id: str) -> None:
+        self.store.delete(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BackgroundJob]:
+        """Cancel a queued job, or ask a running one to stop (its result is discarded).
+
+        A running job is only flagged (``cancel_requested``); handlers that can
+        stop early poll the flag and undo their own state when they do.
+        """
+        # Under the lock so a worker cannot claim or finish the job in between
+        with self._lock:
+            job = self._running.get(job_id)
+            abandoned = job is None
+            if job is not None:
+                job.cancel_requested = True
+            else:
+                job = self.store.get(job_id)
+                if job is None or job.status.is_finished:
+                    return job
+                job.status = JobStatus.cancelled
+                job.finished_at = datetime.now(timezone.utc)
+                self._counts[JobStatus.cancelled.value] += 1
+            self.store.save(job)
+        if abandoned:
+            self._abandoned(job)
+        return job
+
+    @contextmanager
+    def live_trading_first(self) -> Iterator[None]:
+        """Hold back new jobs for the duration of a live trading cycle."""
+        with self._lock:
+            self._live_holds += 1
+            self._live_idle.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._live_holds -= 1
+                if self._live_holds == 0:
+                    self._live_idle.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            running = len(self._running)
+            wait = list(self._wait_seconds)
+            run = list(self._run_seconds)
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "running": running,
+            "paused_for_live_trading": not self._live_idle.is_set(),
+            "counts": counts,
+            "wait_seconds": latency_summary(wait),
+            "run_seconds": latency_summary(run),
+        }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _enqueue(self, job: BackgroundJob) -> None:
+        self._queue.put((job.priority, next(self._seq), job.id))
+
+    def _recover(self) -> None:
+        for job in self.store.list_unfinished():
+            if job.status == JobStatus.running:
+                job.status = JobStatus.failed
+                job.error = "Interrupted by a server restart"
+                job.finished_at = datetime.now(timezone.utc)
+                self.store.save(job)
+                self._abandoned(job)
+            elif job.kind in self._handlers:
+                self._enqueue(job)
+        if self._queue.qsize():
+            logger.info("Re-queued %d persisted jobs", self._queue.qsize())
+
+    def _abandoned(self, job: BackgroundJob) -> None:
+        hook = self._abandon_hooks.get(job.kind)
+        if hook is None:
+            return
+        try:
+            hook(job)
+        except Exception as e:
+            logger.error("Cleanup for abandoned job %s (%s) failed: %s", job.id, job.kind, e)
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            self._live_idle.wait()
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if not self._live_idle.is_set():
+                # A trading cycle started while we were waiting; put the job back
+                self._queue.put(item)
+                continue
+            try:
+                job = self._claim(item[2])
+                if job is not None:
+                    self._run(job)
+            except Exception as e:
+                # A store outage must not take the worker thread down with it
+                logger.error("Job %s could not be run: %s", item[2], e, exc_info=True)
+
+    def _claim(self, job_id: str) -> Optional[BackgroundJob]:
+        """Mark a queued job running; None if it was cancelled or deleted while queued."""
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None or job.status != JobStatus.queued:
+                return None
+            job.status = JobStatus.running
+            job.started_at = datetime.now(timezone.utc)
+            self.store.save(job)
+            self._running[job.id] = job
+            self._wait_seconds.append((job.started_at - job.created_at).total_seconds())
+        return job
+
+    def _run(self, job: BackgroundJob) -> None:
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            result = self._handlers[job.kind](job)
+        except Exception as e:
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, e, exc_info=True)
+            error = str(e)
+
+        with self._lock:
+            if error is not None:
+                status = JobStatus.failed
+            elif job.cancel_requested:
+                status, result = JobStatus.cancelled, None
+            else:
+                status = JobStatus.completed
+            # get() keeps returning the running job until the outcome is stored
+            finished = replace(
+                job,
+                status=status,
+                result=result,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+            )
+            try:
+                self.store.save(finished)
+            except Exception as e:
+                logger.error("Could not save job %s result: %s", job.id, e, exc_info=True)
+                finished = replace(finished, status=JobStatus.failed, result=None, error=str(e))
+                try:
+                    self.store.save(finished)
+                except Exception as e2:
+                    # Left running in the store; the next start marks it failed
+                    logger.error("Could not mark job %s failed: %s", job.id, e2)
+            finally:
+                self._running.pop(job.id, None)
+                self._counts[finished.status.value] += 1
+                self._run_seconds.append(time.perf_counter() - started)
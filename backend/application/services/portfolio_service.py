@@ -10,7 +10,7 @@ capabilities, complementing the Position service which handles individual positi
 
 from __future__ import annotations
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 
 from domain.entities.portfolio import Portfolio
 from domain.entities.portfolio_config import PortfolioConfig
@@ -18,6 +18,7 @@ from domain.ports.portfolio_repo import PortfolioRepo
 from domain.ports.positions_repo import PositionsRepo
 from domain.ports.portfolio_config_repo import PortfolioConfigRepo
 from domain.ports.position_baseline_repo import PositionBaselineRepo
+from application.services.benchmark_series_service import benchmark_result
 
 
 class PortfolioService:
@@ -127,7 +128,7 @@ class PortfolioService:
                 cash_per_position = remaining_cash / len(positions_created)
                 for position in positions_created:
                     position.cash += cash_per_position
-                    self._positions_repo.save(position)
+                self._positions_repo.save_many(positions_created)
             elif remaining_cash > 0 and not positions_created:
                 # No positions yet - create a special "CASH" position to hold the cash
                 # This ensures cash is not lost and can be distributed when real positions are added
@@ -665,8 +666,11 @@ class PortfolioService:
             from app.di import container
             from collections import defaultdict
 
-            if hasattr(container, "evaluation_timeline"):
-                rows = container.evaluation_timeline.list_snapshots_by_resolution(
+            if hasattr(container, "position_snapshots"):
+                # Pre-aggregated per-position buckets, kept current by timeline writes;
+                # flush so rows still in the write-behind buffer are rolled up
+                container.evaluation_timeline.flush()
+                snapshots = container.position_snapshots.list_snapshots(
                     tenant_id=tenant_id,
                     portfolio_id=portfolio_id,
                     resolution=resolution,
@@ -681,21 +685,16 @@ class PortfolioService:
                     else f"{effective_start.strftime('%Y-%m-%d')} to {effective_end.strftime('%Y-%m-%d')}"
                 )
                 print(
-                    f"📊 Analytics: Found {len(rows)} timeline rows for portfolio {portfolio_id} "
+                    f"📊 Analytics: Found {len(snapshots)} snapshots for portfolio {portfolio_id} "
                     f"({date_range_desc}, resolution={resolution})"
                     + (f", filtered to position {position_id}" if position_id else "")
                 )
 
-                # Group by bucket (day/week/hour) and position, keeping the latest per bucket
-                # Structure: {bucket_key: {position_id: {timestamp, values...}}}
+                # Structure: {bucket_key: {position_id: {total_value, stock_value, cash}}}
                 bucket_data: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
 
-                for row in rows:
-                    dt = row.get("timestamp")
-                    if not dt:
-                        continue
-                    if isinstance(dt, str):
-                        dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
+                for snap in snapshots:
+                    dt = snap["bucket_start"]
 
                     # Skip weekend entries for daily resolution. The market is closed
                     # on Sat/Sun; prices are stale repeats of Friday's close, and
@@ -705,35 +704,21 @@ class PortfolioService:
                         continue
 
                     if resolution == "weekly":
-                        # ISO week key: "2024-W03"
-                        bucket_key = f"{dt.year}-W{dt.strftime('%W')}"
+                        # ISO week key: "2024-W03" (the ISO year, which differs from
+                        # the calendar year around New Year)
+                        iso_year, iso_week, _ = dt.isocalendar()
+                        bucket_key = f"{iso_year}-W{iso_week:02d}"
                     elif resolution == "hourly":
                         bucket_key = dt.strftime("%Y-%m-%dT%H:00")
                     else:
                         # daily (default)
                         bucket_key = dt.strftime("%Y-%m-%d")
 
-                    row_position_id = row.get("position_id", "unknown")
-
-                    # Keep only the latest evaluation per position per bucket
-                    existing = bucket_data[bucket_key].get(row_position_id)
-                    if existing is None or dt > existing.get("timestamp", dt):
-                        total_val = row.get("position_total_value_after")
-                        if total_val is None or total_val == 0:
-                            total_val = row.get("position_total_value_before") or 0.0
-                        stock_val = row.get("position_stock_value_after")
-                        if stock_val is None:
-                            stock_val = row.get("position_stock_value_before") or 0.0
-                        cash_val = row.get("position_cash_after")
-                        if cash_val is None:
-                            cash_val = row.get("position_cash_before") or 0.0
-
-                        bucket_data[bucket_key][row_position_id] = {
-                            "timestamp": dt,
-                            "total_value": total_val,
-                            "stock_value": stock_val,
-                            "cash": cash_val,
-                        }
+                    bucket_data[bucket_key][snap["position_id"]] = {
+                        "total_value": snap["close_value"],
+                        "stock_value": snap["stock_value"],
+                        "cash": snap["cash"],
+                    }
 
                 # Aggregate across positions for each bucket
                 for bucket_key in sorted(bucket_data.keys()):
@@ -1131,84 +1116,12 @@ class PortfolioService:
         benchmarks_result: Dict[str, Any] = {}
         active_benchmarks = benchmarks or ["buy_hold", "spy"]  # defaults for backward compat
 
-        def _fetch_ticker_series(
-            ticker_sym: str,
-            fetch_start_str: str,
-            fetch_end_str: str,
-            normalize_from_str: str,
-        ) -> Optional[Dict[str, Any]]:
-            """Fetch historical price series for a ticker and compute scalar return.
-
-            fetch_start_str / fetch_end_str – full date window to request from yfinance
-              (should equal the user-requested analytics range so raw_series covers the
-              whole period the user is looking at).
-            normalize_from_str – date used to anchor the normalised benchmark series to
-              100; should be the first date in the evaluation timeline so the % comparison
-              chart stays aligned with the portfolio chart.
-            """
-            try:
-                from app.di import container as _ct
-                ts_start = datetime.strptime(fetch_start_str[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                ts_end = datetime.strptime(fetch_end_str[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
-                hist = _ct.market_data.fetch_historical_data(ticker_sym, ts_start, ts_end, intraday_interval_minutes=1440)
-                if not hist or len(hist) < 2:
-                    print(f"⚠️ B&H fetch for {ticker_sym}: got {len(hist) if hist else 0} bars (need ≥2), skipping")
-                    return None
-                by_date: Dict[str, float] = {p.timestamp.strftime("%Y-%m-%d"): (p.close or p.price) for p in hist}
-                sorted_dates = sorted(by_date.keys())
-                # Clamp normalize_from_str to the closest available trading day when
-                # yfinance hasn't published today's close yet (pre-market or holiday).
-                effective_normalize_from = normalize_from_str
-                if normalize_from_str not in by_date:
-                    candidates = [d for d in sorted_dates if d <= normalize_from_str]
-                    effective_normalize_from = candidates[-1] if candidates else sorted_dates[0]
-                    print(f"📊 {ticker_sym}: normalize date {normalize_from_str} not in yfinance data, clamped to {effective_normalize_from}")
-                # Normalise from the evaluation-timeline start; fall back to earliest fetched price
-                first_price = by_date.get(effective_normalize_from) or (hist[0].close or hist[0].price)
-                last_price = by_date.get(fetch_end_str) or (hist[-1].close or hist[-1].price)
-                if not first_price or first_price == 0:
-                    return None
-                ret = ((last_price - first_price) / first_price) * 100
-                # Normalised series: only dates at or after effective_normalize_from so it
-                # aligns with the portfolio time-series on the comparison chart.
-                # Forward-fill today's price with the last known close when the market hasn't
-                # published today's data yet (pre-market, intraday, or holiday gap).
-                working_by_date = dict(by_date)
-                last_yf_date = sorted_dates[-1]
-                if normalize_from_str > last_yf_date:
-                    # Portfolio has an evaluation today but yfinance doesn't have today yet —
-                    # carry forward the last close so the B&H line extends to the chart edge.
-                    working_by_date[normalize_from_str] = by_date[last_yf_date]
-                    sorted_dates = sorted(working_by_date.keys())
-                series = [
-                    {"date": d, "value": (working_by_date[d] / first_price) * 100}
-                    for d in sorted_dates
-                    if d >= effective_normalize_from
-                ]
-                # Raw price series: full fetched range for the stock price chart
-                raw_series = [{"date": d, "price": round(by_date[d], 4)} for d in sorted_dates if d in by_date]
-                print(f"📊 {ticker_sym}: {len(series)} normalized points, {len(raw_series)} raw points, normalize_from={effective_normalize_from}")
-                return {
-                    "return_pct": round(ret, 2),
-                    "first_price": first_price,
-                    "last_price": last_price,
-                    "series": series,
-                    "raw_series": raw_series,
-                }
-            except Exception as _e:
-                print(f"⚠️ Failed to fetch benchmark data for {ticker_sym}: {_e}")
-                import traceback
-                traceback.print_exc()
-                return None
-
         try:
             if time_series and len(time_series) >= 2:
                 first_date_str = time_series[0].get("date")
                 last_date_str = time_series[-1].get("date")
 
                 if first_date_str and last_date_str:
-                    from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
-
                     position_tickers: list = []
 
                     if "buy_hold" in active_benchmarks:
@@ -1230,52 +1143,51 @@ class PortfolioService:
                     # so both series share the same x-axis anchor on the comparison chart.
                     normalize_from_str = first_date_str[:10]
 
-                    # Build task map: key → (fetch_start, fetch_end, normalize_from)
-                    task_defs: Dict[str, tuple] = {}
+                    # Build task map: key → ticker
+                    task_defs: Dict[str, str] = {}
                     if "buy_hold" in active_benchmarks and len(position_tickers) == 1:
-                        task_defs["buy_hold"] = (position_tickers[0], fetch_start_str, fetch_end_str, normalize_from_str)
+                        task_defs["buy_hold"] = position_tickers[0].upper()
                     if "spy" in active_benchmarks:
-                        task_defs["spy"] = ("SPY", fetch_start_str, fetch_end_str, normalize_from_str)
+                        task_defs["spy"] = "SPY"
                     if "custom" in active_benchmarks and custom_ticker:
-                        task_defs["custom"] = (custom_ticker.upper(), fetch_start_str, fetch_end_str, normalize_from_str)
+                        task_defs["custom"] = custom_ticker.upper()
 
                     if task_defs:
-                        with ThreadPoolExecutor(max_workers=len(task_defs)) as pool:
-                            futures = {
-                                pool.submit(_fetch_ticker_series, *args): key
-                                for key, args in task_defs.items()
-                            }
-                            try:
-                                for fut in as_completed(futures, timeout=15):
-                                    key = futures[fut]
-                                    try:
-                                        result = fut.result(timeout=0)
-                                    except Exception as _fe:
-                                        print(f"⚠️ Benchmark fetch failed for {key}: {_fe}")
-                                        continue
-                                    if not result:
-                                        continue
-                                    if key == "buy_hold":
-                                        ticker_sym = task_defs["buy_hold"][0]
-                                        benchmarks_result["buy_hold"] = {**result, "ticker": ticker_sym}
-                                        performance["benchmark_return_pct"] = result["return_pct"]
-                                        performance["alpha"] = round(
-                                            performance["portfolio_return_pct"] - result["return_pct"], 2
-                                        )
-                                        print(f"📊 Buy & Hold ({ticker_sym}): return={result['return_pct']:.2f}%")
-                                    elif key == "spy":
-                                        performance["spy_return_pct"] = result["return_pct"]
-                                        performance["spy_alpha"] = round(
-                                            performance["portfolio_return_pct"] - result["return_pct"], 2
-                                        )
-                                        benchmarks_result["spy"] = result
-                                        print(f"📊 SPY benchmark: return={result['return_pct']:.2f}%, alpha={performance['spy_alpha']:.2f}%")
-                                    elif key == "custom":
-                                        ticker_sym = task_defs["custom"][0]
-                                        benchmarks_result["custom"] = {**result, "ticker": ticker_sym}
-                                        print(f"📊 Custom benchmark {ticker_sym}: return={result['return_pct']:.2f}%")
-                            except FuturesTimeoutError:
-                                print("⚠️ Benchmark fetches timed out after 15s — continuing without some benchmarks")
+                        from app.di import container
+
+                        # Served from the day-granular benchmark cache; tickers fetched concurrently
+                        closes_by_ticker = container.benchmark_series.closes_many(
+                            set(task_defs.values()),
+                            date.fromisoformat(fetch_start_str),
+                            date.fromisoformat(fetch_end_str),
+                            timeout=15,
+                        )
+                        for key, ticker_sym in task_defs.items():
+                            closes = closes_by_ticker.get(ticker_sym)
+                            if closes is None:
+                                print(f"⚠️ Benchmark data unavailable for {key} ({ticker_sym})")
+                                continue
+                            result = benchmark_result(closes, fetch_end_str, normalize_from_str)
+                            if not result:
+                                print(f"⚠️ Benchmark {ticker_sym}: got {len(closes)} closes (need ≥2), skipping")
+                                continue
+                            if key == "buy_hold":
+                                benchmarks_result["buy_hold"] = {**result, "ticker": ticker_sym}
+                                performance["benchmark_return_pct"] = result["return_pct"]
+                                performance["alpha"] = round(
+                                    performance["portfolio_return_pct"] - result["return_pct"], 2
+                                )
+                                print(f"📊 Buy & Hold ({ticker_sym}): return={result['return_pct']:.2f}%")
+                            elif key == "spy":
+                                performance["spy_return_pct"] = result["return_pct"]
+                                performance["spy_alpha"] = round(
+                                    performance["portfolio_return_pct"] - result["return_pct"], 2
+                                )
+                                benchmarks_result["spy"] = result
+                                print(f"📊 SPY benchmark: return={result['return_pct']:.2f}%, alpha={performance['spy_alpha']:.2f}%")
+                            elif key == "custom":
+                                benchmarks_result["custom"] = {**result, "ticker": ticker_sym}
+                                print(f"📊 Custom benchmark {ticker_sym}: return={result['return_pct']:.2f}%")
 
         except Exception as e:
             print(f"⚠️ Failed to fetch benchmark data: {e}")
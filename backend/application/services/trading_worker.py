@@ -53,6 +53,7 @@ class TradingWorker:
         self._stop_event = threading.Event()
         self._lock = threading.Lock()
         self.last_cycle_time: Optional[datetime] = None
+        self.last_cycle_metrics: Optional[Dict[str, Any]] = None
         self._last_backfill_date: Optional[date] = None
 
     def start(self) -> None:
@@ -187,10 +188,13 @@ class TradingWorker:
             orchestrator = container.live_trading_orchestrator
 
             # Run cycle for all active positions
-            # Source is "worker" to distinguish from manual API calls
-            orchestrator.run_cycle(source="worker")
+            # Source is "worker" to distinguish from manual API calls.
+            # Background jobs (simulations, optimizations) wait while it runs.
+            with container.jobs.live_trading_first():
+                metrics = dict(orchestrator.run_cycle(source="worker") or {})
 
             # Order status reconciliation — sync pending orders with broker
+            sync_start = time.perf_counter()
             try:
                 order_status_worker = container.order_status_worker
                 synced = order_status_worker.poll_now()
@@ -198,11 +202,19 @@ class TradingWorker:
                     logger.info(f"Order sync: reconciled {synced} order(s)")
             except Exception as e:
                 logger.error(f"Error in order status sync: {e}", exc_info=True)
+            metrics["order_sync_seconds"] = time.perf_counter() - sync_start
 
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             logger.debug(f"✅ Trading cycle completed in {duration:.2f}s")
+            if duration > self.interval_seconds:
+                logger.warning(
+                    f"Trading cycle took {duration:.2f}s, longer than the "
+                    f"{self.interval_seconds}s interval"
+                )
 
             self.last_cycle_time = datetime.now(timezone.utc)
+            metrics["cycle_seconds"] = duration
+            self.last_cycle_metrics = metrics
 
             # Run alert checks
             try:
@@ -14,16 +14,24 @@ on a business day.  When a blackout is detected this UC:
 
   2. Applies any dividends whose ex-date fell inside the gap — these ARE
      credited to position cash because missing them changes the account balance.
+
+backfill_all_positions runs in bulk: one grouped query returns the recorded
+days of every position, gaps are found with numpy over all rows at once,
+prices and dividends are fetched once per ticker for the union of its gap
+windows, and positions are replayed concurrently.
 """
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
+import numpy as np
+
 from domain.services.guardrail_evaluator import GuardrailEvaluator
 from domain.services.price_trigger import PriceTrigger
 from domain.value_objects.configs import GuardrailConfig, TriggerConfig
@@ -35,6 +43,10 @@ logger = logging.getLogger(__name__)
 BLACKOUT_MIN_CALENDAR_DAYS = 2
 # Maximum look-back when searching for gaps
 DEFAULT_LOOK_BACK_DAYS = 90
+# Positions replayed (and tickers fetched) in parallel by backfill_all_positions
+DEFAULT_WORKERS = 8
+# Position IDs per IN (...) clause when querying recorded days
+_IN_CHUNK = 500
 
 
 # ─── data transfer objects ────────────────────────────────────────────────────
@@ -113,6 +125,66 @@ class BackfillResult:
         }
 
 
+@dataclass
+class _TickerData:
+    """Daily bars and dividends of one ticker over the union of its gap windows."""
+
+    prices: List[Dict[str, Any]] = field(default_factory=list)
+    dividends: List[Any] = field(default_factory=list)
+    dividend_error: Optional[Exception] = None
+
+
+@dataclass
+class _PositionRef:
+    id: str
+    asset_symbol: str
+
+
+# ─── gap detection ────────────────────────────────────────────────────────────
+
+def detect_gaps(
+    rows: List[Tuple[str, str]], now: datetime
+) -> List[Tuple[str, datetime, datetime]]:
+    """Blackout windows from (position_id, "YYYY-MM-DD") rows sorted by position and day.
+
+    A gap is two consecutive recorded days at least BLACKOUT_MIN_CALENDAR_DAYS
+    apart with a weekday strictly between them, or the same between a
+    position's last recorded day and today (that window ends at ``now``).
+    Returns (position_id, start, end) in row order.
+    """
+    if not rows:
+        return []
+    pids = np.array([r[0] for r in rows], dtype=object)
+    days = np.array([r[1] for r in rows], dtype="datetime64[D]")
+    today = np.datetime64(now.date(), "D")
+    one = np.timedelta64(1, "D")
+    min_gap = np.timedelta64(BLACKOUT_MIN_CALENDAR_DAYS, "D")
+
+    same = pids[1:] == pids[:-1]
+    inner = (
+        same
+        & ((days[1:] - days[:-1]) >= min_gap)
+        & (np.busday_count(days[:-1] + one, days[1:]) > 0)
+    )
+    last = np.append(~same, True)
+    trailing = (
+        last
+        & ((today - days) >= min_gap)
+        & (np.busday_count(days + one, today) > 0)
+    )
+
+    gaps: List[Tuple[str, datetime, datetime]] = []
+    for i in np.flatnonzero(np.append(inner, False) | trailing):
+        start = _midnight(days[i])
+        end = _midnight(days[i + 1]) if not last[i] else now
+        gaps.append((pids[i], start, end))
+    return gaps
+
+
+def _midnight(day: np.datetime64) -> datetime:
+    return datetime.combine(day.astype(date), datetime.min.time()).replace(tzinfo=timezone.utc)
+
+
 # ─── main use case ────────────────────────────────────────────────────────────
 
 class BackfillBlackoutUC:
@@ -125,46 +197,92 @@ class BackfillBlackoutUC:
         dividend_market_data: Any,
         config_repo: Any,
         look_back_days: int = DEFAULT_LOOK_BACK_DAYS,
+        workers: int = DEFAULT_WORKERS,
     ) -> None:
         self.positions_repo = positions_repo
         self.evaluation_timeline_repo = evaluation_timeline_repo
         self.dividend_market_data = dividend_market_data
         self.config_repo = config_repo
         self.look_back_days = look_back_days
+        self.workers = max(1, workers)
 
     # ── public API ────────────────────────────────────────────────────────────
 
     def backfill_all_positions(self) -> List[BackfillResult]:
         """Run backfill for every live position.  Safe to call on schedule."""
-        results: List[BackfillResult] = []
         try:
             positions = self._list_all_positions()
         except Exception as exc:
             logger.error("BackfillBlackout: could not list positions: %s", exc)
-            return results
-
-        for position in positions:
-            if getattr(position, "asset_symbol", None) in (None, "CASH"):
-                continue
-            try:
-                result = self.backfill_position(position)
-                results.append(result)
-            except Exception as exc:
-                logger.error(
-                    "BackfillBlackout: unhandled error for %s: %s",
-                    getattr(position, "id", "?"),
-                    exc,
-                    exc_info=True,
-                )
-        return results
+            return []
+        positions = [
+            p for p in positions if getattr(p, "asset_symbol", None) not in (None, "CASH")
+        ]
+
+        blackouts = self.find_all_blackouts(positions)
+        # One price and dividend fetch per ticker, covering all of its gaps
+        windows: Dict[str, Tuple[datetime, datetime]] = {}
+        for periods in blackouts.values():
+            for period in periods:
+                start, end = windows.get(period.ticker, (period.start, period.end))
+                windows[period.ticker] = (min(start, period.start), max(end, period.end))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            ticker_data = dict(
+                zip(windows, pool.map(lambda t: self._fetch_ticker_data(t, *windows[t]), windows))
+            )
+            futures = [
+                pool.submit(self._backfill_safely, p, blackouts.get(p.id, []), ticker_data)
+                for p in positions
+            ]
+            results = [f.result() for f in futures]
+        return [r for r in results if r is not None]
 
     def backfill_position(self, position: Any) -> BackfillResult:
         """Detect and address blackouts for one position."""
+        return self._backfill(position, self._find_blackouts(position.id, position.asset_symbol))
+
+    def find_all_blackouts(self, positions: Iterable[Any]) -> Dict[str, List[BlackoutPeriod]]:
+        """Blackouts per position ID for all ``positions``, from one grouped query."""
+        tickers = {p.id: p.asset_symbol for p in positions}
+        if not tickers:
+            return {}
+        try:
+            rows = self._recorded_days(None if len(tickers) > _IN_CHUNK else list(tickers))
+        except Exception as exc:
+            logger.error("BackfillBlackout: DB query failed: %s", exc)
+            return {}
+        rows = [r for r in rows if r[0] in tickers]
+        blackouts: Dict[str, List[BlackoutPeriod]] = {}
+        for pid, start, end in detect_gaps(rows, datetime.now(timezone.utc)):
+            blackouts.setdefault(pid, []).append(
+                BlackoutPeriod(position_id=pid, ticker=tickers[pid], start=start, end=end)
+            )
+        return blackouts
+
+    def _backfill_safely(
+        self, position: Any, blackouts: List[BlackoutPeriod], ticker_data: Dict[str, _TickerData]
+    ) -> Optional[BackfillResult]:
+        try:
+            return self._backfill(position, blackouts, ticker_data)
+        except Exception as exc:
+            logger.error(
+                "BackfillBlackout: unhandled error for %s: %s",
+                getattr(position, "id", "?"),
+                exc,
+                exc_info=True,
+            )
+            return None
+
+    def _backfill(
+        self,
+        position: Any,
+        blackouts: List[BlackoutPeriod],
+        ticker_data: Optional[Dict[str, _TickerData]] = None,
+    ) -> BackfillResult:
         pid = position.id
         ticker = position.asset_symbol
         result = BackfillResult(position_id=pid, ticker=ticker)
-
-        blackouts = self._find_blackouts(pid, ticker)
         result.blackouts = blackouts
 
         if not blackouts:
@@ -179,9 +297,10 @@ class BackfillBlackoutUC:
 
         trigger_cfg = self._get_trigger_config(pid)
         guardrail_cfg = self._get_guardrail_config(pid)
+        data = (ticker_data or {}).get(ticker)
 
         for period in blackouts:
-            self._process_period(position, period, trigger_cfg, guardrail_cfg, result)
+            self._process_period(position, period, trigger_cfg, guardrail_cfg, result, data)
 
         return result
 
@@ -189,86 +308,42 @@ class BackfillBlackoutUC:
 
     def _find_blackouts(self, position_id: str, ticker: str) -> List[BlackoutPeriod]:
         """Return gaps in position_evaluation_timeline larger than the minimum threshold."""
-        since = datetime.now(timezone.utc) - timedelta(days=self.look_back_days)
-        gaps: List[BlackoutPeriod] = []
+        position = _PositionRef(id=position_id, asset_symbol=ticker)
+        return self.find_all_blackouts([position]).get(position_id, [])
 
-        try:
-            from infrastructure.persistence.sql.models import get_engine
-            from sqlalchemy import text
-            import os
-
-            sql_url = os.getenv("SQL_URL", "sqlite:///./vb.sqlite")
-            engine = get_engine(sql_url)
-            with engine.connect() as conn:
-                rows = conn.execute(
-                    text(
-                        """
-                        SELECT DATE(timestamp) as day
-                        FROM position_evaluation_timeline
-                        WHERE position_id = :pid
-                          AND timestamp >= :since
-                        GROUP BY DATE(timestamp)
-                        ORDER BY day
-                        """
-                    ),
-                    {"pid": position_id, "since": since.isoformat()},
-                ).fetchall()
-        except Exception as exc:
-            logger.error("BackfillBlackout: DB query failed for %s: %s", ticker, exc)
-            return gaps
-
-        if not rows:
-            return gaps
-
-        # Build list of dates that have ticks
-        recorded_days = [datetime.strptime(str(r[0]), "%Y-%m-%d").date() for r in rows]
-
-        # Walk consecutive pairs and flag multi-day gaps that include weekdays
-        prev_day = recorded_days[0]
-        for cur_day in recorded_days[1:]:
-            gap_days = (cur_day - prev_day).days
-            if gap_days >= BLACKOUT_MIN_CALENDAR_DAYS and self._has_weekday(prev_day, cur_day):
-                gaps.append(
-                    BlackoutPeriod(
-                        position_id=position_id,
-                        ticker=ticker,
-                        start=datetime.combine(prev_day, datetime.min.time()).replace(
-                            tzinfo=timezone.utc
-                        ),
-                        end=datetime.combine(cur_day, datetime.min.time()).replace(
-                            tzinfo=timezone.utc
-                        ),
-                    )
-                )
-            prev_day = cur_day
-
-        # Also check for a trailing gap from last recorded tick to now
-        now_date = datetime.now(timezone.utc).date()
-        if (now_date - prev_day).days >= BLACKOUT_MIN_CALENDAR_DAYS and self._has_weekday(
-            prev_day, now_date
-        ):
-            gaps.append(
-                BlackoutPeriod(
-                    position_id=position_id,
-                    ticker=ticker,
-                    start=datetime.combine(prev_day, datetime.min.time()).replace(
-                        tzinfo=timezone.utc
-                    ),
-                    end=datetime.now(timezone.utc),
-                )
-            )
+    def _recorded_days(self, position_ids: Optional[List[str]]) -> List[Tuple[str, str]]:
+        """(position_id, day) pairs with at least one timeline row, ordered by position and day.
 
-        return gaps
+        ``None`` reads every position in one query; otherwise IDs are chunked.
+        """
+        from sqlalchemy import bindparam, text
 
-    @staticmethod
-    def _has_weekday(start: date, end: date) -> bool:
-        """Return True if there is at least one weekday (Mon-Fri) strictly between start and end."""
-        cur = start + timedelta(days=1)
-        while cur < end:
-            if cur.weekday() < 5:
-                return True
-            cur += timedelta(days=1)
-        return False
+        since = datetime.now(timezone.utc) - timedelta(days=self.look_back_days)
+        where = "timestamp >= :since"
+        if position_ids is not None:
+            where += " AND position_id IN :pids"
+        stmt = text(
+            f"""
+            SELECT position_id, DATE(timestamp) as day
+            FROM position_evaluation_timeline
+            WHERE {where}
+            GROUP BY position_id, DATE(timestamp)
+            ORDER BY position_id, day
+            """
+        )
+        if position_ids is None:
+            chunks: List[Dict[str, Any]] = [{"since": since.isoformat()}]
+        else:
+            stmt = stmt.bindparams(bindparam("pids", expanding=True))
+            chunks = [
+                {"since": since.isoformat(), "pids": position_ids[i : i + _IN_CHUNK]}
+                for i in range(0, len(position_ids), _IN_CHUNK)
+            ]
+        rows: List[Tuple[str, str]] = []
+        with self._engine().connect() as conn:
+            for params in chunks:
+                rows.extend((r[0], str(r[1])[:10]) for r in conn.execute(stmt, params))
+        return rows
 
     # ── period processing ─────────────────────────────────────────────────────
 
@@ -279,34 +354,55 @@ class BackfillBlackoutUC:
         trigger_cfg: Optional[TriggerConfig],
         guardrail_cfg: Optional[GuardrailConfig],
         result: BackfillResult,
+        data: Optional[_TickerData] = None,
     ) -> None:
         ticker = period.ticker
 
-        # 1. Fetch daily prices for the gap
-        daily_prices = self._fetch_daily_prices(ticker, period.start, period.end)
+        # 1. Daily prices for the gap (sliced from the ticker's prefetched window in bulk mode)
+        if data is None:
+            daily_prices = self._fetch_daily_prices(ticker, period.start, period.end)
+        else:
+            first, end = period.start.date(), period.end.date()
+            daily_prices = [bar for bar in data.prices if first <= bar["date"] < end]
 
         # 2. Replay evaluations
         if daily_prices and trigger_cfg:
             self._replay_ticks(position, period, daily_prices, trigger_cfg, guardrail_cfg, result)
 
         # 3. Backfill dividends
-        self._backfill_dividends(position, period, result)
+        self._backfill_dividends(position, period, result, data)
+
+    def _fetch_ticker_data(self, ticker: str, start: datetime, end: datetime) -> _TickerData:
+        data = _TickerData(prices=self._fetch_daily_prices(ticker, start, end))
+        if self.dividend_market_data:
+            try:
+                data.dividends = self.dividend_market_data.get_dividend_history(ticker, start, end)
+            except Exception as exc:
+                data.dividend_error = exc
+        return data
 
     # ── price replay ──────────────────────────────────────────────────────────
 
     def _fetch_daily_prices(
         self, ticker: str, start: datetime, end: datetime
     ) -> List[Dict[str, Any]]:
-        """Fetch daily OHLCV from yfinance for the gap window."""
+        """Fetch daily OHLCV from yfinance for the gap window (via the on-disk bar cache)."""
         try:
             import yfinance as yf
+            from infrastructure.market.bar_cache import default_bar_cache
 
-            df = yf.Ticker(ticker).history(
-                start=start.strftime("%Y-%m-%d"),
-                end=end.strftime("%Y-%m-%d"),
-                interval="1d",
-                auto_adjust=True,
-            )
+            def fetch(fetch_start: str, fetch_end: str):
+                return yf.Ticker(ticker).history(
+                    start=fetch_start, end=fetch_end, interval="1d", auto_adjust=True
+                )
+
+            start_str = start.strftime("%Y-%m-%d")
+            end_str = end.strftime("%Y-%m-%d")
+            bar_cache = default_bar_cache()
+            if bar_cache is None:
+                df = fetch(start_str, end_str)
+            else:
+                df = bar_cache.history(ticker, start_str, end_str, "1d", fetch)
             if df.empty:
                 return []
             return [
@@ -454,6 +550,7 @@ class BackfillBlackoutUC:
         position: Any,
         period: BlackoutPeriod,
         result: BackfillResult,
+        data: Optional[_TickerData] = None,
     ) -> None:
         if not self.dividend_market_data:
             return
@@ -462,9 +559,14 @@ class BackfillBlackoutUC:
         pid = position.id
 
         try:
-            dividends = self.dividend_market_data.get_dividend_history(
-                ticker, period.start, period.end
-            )
+            if data is None:
+                dividends = self.dividend_market_data.get_dividend_history(
+                    ticker, period.start, period.end
+                )
+            elif data.dividend_error is not None:
+                raise data.dividend_error
+            else:
+                dividends = [d for d in data.dividends if period.start <= d.ex_date <= period.end]
         except Exception as exc:
             msg = f"Dividend fetch failed for {ticker}: {exc}"
             logger.warning("BackfillBlackout: %s", msg)
@@ -565,15 +667,19 @@ class BackfillBlackoutUC:
         except Exception:
             return None
 
-    def _list_all_positions(self) -> List[Any]:
-        """Fetch all positions across all tenants/portfolios via raw SQL fallback."""
+    @staticmethod
+    def _engine():
+        """The process-wide engine for SQL_URL (shared pool, not one per call)."""
         import os
         from infrastructure.persistence.sql.models import get_engine
+
+        return get_engine(os.getenv("SQL_URL", "sqlite:///./vb.sqlite"))
+
+    def _list_all_positions(self) -> List[Any]:
+        """Fetch all positions across all tenants/portfolios via raw SQL fallback."""
         from sqlalchemy import text
 
-        sql_url = os.getenv("SQL_URL", "sqlite:///./vb.sqlite")
-        engine = get_engine(sql_url)
-        with engine.connect() as conn:
+        with self._engine().connect() as conn:
             rows = conn.execute(
                 text("SELECT DISTINCT tenant_id, portfolio_id FROM positions")
             ).fetchall()
@@ -2,11 +2,13 @@
 # backend/application/use_cases/evaluate_position_uc.py
 # =========================
 from __future__ import annotations
-from typing import Dict, Any, Optional, Tuple, Callable
+from typing import Dict, Any, List, Optional, Tuple, Callable
 import logging
 from decimal import Decimal
 from datetime import datetime
 
+import numpy as np
+
 from domain.ports.positions_repo import PositionsRepo
 from domain.ports.portfolio_repo import PortfolioRepo
 from domain.ports.events_repo import EventsRepo
@@ -15,8 +17,10 @@ from domain.ports.evaluation_timeline_repo import EvaluationTimelineRepo
 from domain.ports.config_repo import ConfigRepo
 from domain.ports.orders_repo import OrdersRepo
 from domain.entities.event import Event
+from domain.entities.order import OPEN_ORDER_STATUSES
 from domain.services.price_trigger import PriceTrigger
 from domain.value_objects.configs import TriggerConfig, GuardrailConfig, OrderPolicyConfig
+from application.dto.position_context import PositionContext, SharedQuote
 from infrastructure.time.clock import Clock
 from infrastructure.adapters.converters import (
     order_policy_to_trigger_config,
@@ -24,6 +28,12 @@ from infrastructure.adapters.converters import (
 )
 from uuid import uuid4
 
+# Anchors further than this from the market price are reset to it
+ANOMALY_THRESHOLD_PCT = 50.0
+
+# Slack on the float cycle screen; anything this close to a threshold is evaluated in full
+_SCREEN_TOLERANCE = 1e-9
+
 
 class EvaluatePositionUC:
     """Advanced volatility trading evaluation with order sizing and guardrails."""
@@ -223,16 +233,58 @@ class EvaluatePositionUC:
 
         return result
 
+    def prepare_cycle(self, contexts: List[PositionContext]) -> int:
+        """Fetch one quote per ticker and screen every position on it in bulk.
+
+        Each context gets its ticker's SharedQuote. Positions whose anchor
+        delta is inside both trigger thresholds, whose allocation is inside
+        the guardrail band and whose anchor is not anomalous are marked
+        ``quiet``: their evaluation skips the anchor-reset, auto-rebalance and
+        commission lookups. Returns the number of quiet positions.
+        """
+        by_ticker: Dict[str, List[PositionContext]] = {}
+        for context in contexts:
+            by_ticker.setdefault(context.ticker, []).append(context)
+        screen = self.trigger_config_provider is not None and self.guardrail_config_provider is not None
+
+        quiet = 0
+        for ticker, group in by_ticker.items():
+            try:
+                price_data = self.market_data.get_reference_price(ticker)
+            except Exception as e:
+                # Positions on this ticker fetch their own quote during evaluation
+                self._logger.warning("Cycle quote fetch failed for %s: %s", ticker, e)
+                continue
+            if not price_data:
+                continue
+            quote = SharedQuote(ticker=ticker, price_data=price_data)
+            for context in group:
+                context.quote = quote
+            if screen:
+                mask = _quiet_mask(group, float(price_data.price))
+                for context, is_quiet in zip(group, mask):
+                    context.quiet = bool(is_quiet)
+                quiet += int(mask.sum())
+        return quiet
+
     def evaluate_with_market_data(
         self, tenant_id: str, portfolio_id: str, position_id: str,
         source: str = "api/manual",
+        context: Optional[PositionContext] = None,
     ) -> Dict[str, Any]:
-        """Evaluate position using real-time market data with after-hours support."""
+        """Evaluate position using real-time market data with after-hours support.
+
+        ``context`` carries the position, portfolio and configs preloaded for a
+        trading cycle; they are used instead of loading them again here.
+        """
 
         # Get position
-        position = self.positions.get(
-            tenant_id=tenant_id, portfolio_id=portfolio_id, position_id=position_id
-        )
+        if context is not None and context.position is not None:
+            position = context.position
+        else:
+            position = self.positions.get(
+                tenant_id=tenant_id, portfolio_id=portfolio_id, position_id=position_id
+            )
         if not position:
             raise KeyError("position_not_found")
 
@@ -250,8 +302,12 @@ class EvaluatePositionUC:
                 "market_data": None,
             }
 
-        # Get real-time market data
-        price_data = self.market_data.get_reference_price(position.asset_symbol)
+        # Get real-time market data (shared per ticker when prepared by the cycle)
+        quote = context.quote if context is not None else None
+        if quote is not None:
+            price_data = quote.price_data
+        else:
+            price_data = self.market_data.get_reference_price(position.asset_symbol)
         if not price_data:
             return {
                 "position_id": position_id,
@@ -271,15 +327,16 @@ class EvaluatePositionUC:
 
         # Apply config store override if available
         if self.order_policy_config_provider:
-            order_policy_config = self.order_policy_config_provider(
-                tenant_id, portfolio_id, position_id
+            order_policy_config = self._order_policy_config(
+                tenant_id, portfolio_id, position_id, context
             )
             if order_policy_config is not None:
                 allow_after_hours = order_policy_config.allow_after_hours
 
         # Apply portfolio-level trading_hours_policy if portfolio_repo is available
+        portfolio = None
         if self.portfolio_repo is not None:
-            portfolio = self.portfolio_repo.get(tenant_id=tenant_id, portfolio_id=portfolio_id)
+            portfolio = self._portfolio(tenant_id, portfolio_id, context)
             if portfolio is not None:
                 if portfolio.trading_hours_policy == "OPEN_ONLY":
                     # Master off switch – force after-hours off
@@ -289,9 +346,12 @@ class EvaluatePositionUC:
                     allow_after_hours = True
 
         # Validate price data with after-hours setting
-        validation = self.market_data.validate_price(
-            price_data, allow_after_hours=allow_after_hours
-        )
+        if quote is not None:
+            validation = quote.validation(self.market_data.validate_price, allow_after_hours)
+        else:
+            validation = self.market_data.validate_price(
+                price_data, allow_after_hours=allow_after_hours
+            )
 
         # If validation fails, return early
         if not validation["valid"]:
@@ -310,19 +370,26 @@ class EvaluatePositionUC:
                 },
             }
 
+        # The cycle screen already ruled out anchor resets and rebalancing for quiet positions
+        quiet = context is not None and context.quiet
+
         # Check for anchor price anomaly and auto-reset if needed
-        anchor_reset_info = self._check_and_reset_anchor_if_anomalous(
-            tenant_id, portfolio_id, position, price_data.price
-        )
+        anchor_reset_info = None
+        if not quiet:
+            anchor_reset_info = self._check_and_reset_anchor_if_anomalous(
+                tenant_id, portfolio_id, position, price_data.price
+            )
 
         # Check triggers with real market price
-        trigger_result = self._check_triggers(tenant_id, portfolio_id, position, price_data.price)
+        trigger_result = self._check_triggers(
+            tenant_id, portfolio_id, position, price_data.price, context=context
+        )
 
         # Check for auto-rebalancing needs (if no trigger detected)
         rebalance_proposal = None
-        if not trigger_result["triggered"]:
+        if not trigger_result["triggered"] and not quiet:
             rebalance_proposal = self._check_auto_rebalancing(
-                tenant_id, portfolio_id, position, price_data.price
+                tenant_id, portfolio_id, position, price_data.price, context=context
             )
             if rebalance_proposal:
                 trigger_result["triggered"] = True
@@ -340,12 +407,13 @@ class EvaluatePositionUC:
                 price_data.price,
                 trigger_result["side"],
                 price_timestamp=price_data.timestamp,
+                context=context,
             )
             trigger_result["order_proposal"] = order_proposal
 
         # Log event
         self._log_evaluation_event(
-            tenant_id, portfolio_id, position, price_data.price, trigger_result
+            tenant_id, portfolio_id, position, price_data.price, trigger_result, context=context
         )
 
         result = {
@@ -390,10 +458,99 @@ class EvaluatePositionUC:
                 trigger_result, order_proposal or rebalance_proposal
             ),
             source=source,
+            context=context,
         )
 
         return result
 
+    def recheck_order_proposal(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position_id: str,
+        evaluation_result: Dict[str, Any],
+        context: Optional[PositionContext] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Size and validate an evaluation's order again on the current position and orders.
+
+        The trading cycle calls this under the position's lock after reloading
+        ``context`` (IPositionRepository.refresh_trading_context). The price and
+        side of ``evaluation_result`` are kept; nothing is logged or written.
+        """
+        proposal = evaluation_result.get("order_proposal")
+        if not proposal:
+            return None
+
+        if context is not None and context.position is not None:
+            position = context.position
+        else:
+            position = self.positions.get(
+                tenant_id=tenant_id, portfolio_id=portfolio_id, position_id=position_id
+            )
+        if not position:
+            return None
+
+        timestamp = (evaluation_result.get("market_data") or {}).get("timestamp")
+        return self._calculate_order_proposal(
+            tenant_id,
+            portfolio_id,
+            position,
+            evaluation_result["current_price"],
+            proposal["side"],
+            price_timestamp=datetime.fromisoformat(timestamp) if timestamp else None,
+            context=context,
+        )
+
+    def _portfolio(
+        self, tenant_id: str, portfolio_id: str, context: Optional[PositionContext] = None
+    ):
+        if context is not None and context.portfolio is not None:
+            return context.portfolio
+        return self.portfolio_repo.get(tenant_id=tenant_id, portfolio_id=portfolio_id)
+
+    # Config provider lookups; a cycle context supplies configs it already loaded
+    def _trigger_config(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position_id: str,
+        context: Optional[PositionContext] = None,
+    ) -> TriggerConfig:
+        if context is not None and context.trigger_config is not None:
+            return context.trigger_config
+        return self.trigger_config_provider(tenant_id, portfolio_id, position_id)
+
+    def _guardrail_config(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position_id: str,
+        context: Optional[PositionContext] = None,
+    ) -> GuardrailConfig:
+        if context is not None and context.guardrail_config is not None:
+            return context.guardrail_config
+        return self.guardrail_config_provider(tenant_id, portfolio_id, position_id)
+
+    def _order_policy_config(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position_id: str,
+        context: Optional[PositionContext] = None,
+    ) -> OrderPolicyConfig:
+        if context is not None and context.order_policy_config is not None:
+            return context.order_policy_config
+        return self.order_policy_config_provider(tenant_id, portfolio_id, position_id)
+
+    def _commission_rate(self, tenant_id: str, position) -> float:
+        """Commission rate from ConfigRepo (preferred) or the position's order policy."""
+        if self.config_repo:
+            return self.config_repo.get_commission_rate(
+                tenant_id=tenant_id,
+                asset_id=position.asset_symbol,  # Use asset_symbol instead of ticker
+            )
+        return position.order_policy.commission_rate
+
     def _check_and_reset_anchor_if_anomalous(
         self, tenant_id: str, portfolio_id: str, position, current_price: float
     ) -> Optional[Dict[str, Any]]:
@@ -414,8 +571,6 @@ class EvaluatePositionUC:
 
         # Threshold: if anchor differs by >50% from market, it's likely wrong
         # This handles cases like anchor=$50, market=$21 (58% difference)
-        ANOMALY_THRESHOLD_PCT = 50.0
-
         if price_diff_pct > ANOMALY_THRESHOLD_PCT:
             old_anchor = position.anchor_price
             new_anchor = current_price
@@ -463,12 +618,17 @@ class EvaluatePositionUC:
         return None
 
     def _check_triggers(
-        self, tenant_id: str, portfolio_id: str, position, current_price: float
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position,
+        current_price: float,
+        context: Optional[PositionContext] = None,
     ) -> Dict[str, Any]:
         """Check if current price triggers buy or sell using domain service."""
         # Get trigger config from provider or fall back to extracting from Position (backward compat)
         if self.trigger_config_provider:
-            trigger_config = self.trigger_config_provider(tenant_id, portfolio_id, position.id)
+            trigger_config = self._trigger_config(tenant_id, portfolio_id, position.id, context)
         else:
             # Fallback: extract from Position entity (for backward compatibility)
             trigger_config = order_policy_to_trigger_config(position.order_policy)
@@ -507,25 +667,20 @@ class EvaluatePositionUC:
         current_price: float,
         side: str,
         price_timestamp: Optional[datetime] = None,
+        context: Optional[PositionContext] = None,
     ) -> Dict[str, Any]:
         """Calculate order size using the specification formula with guardrail trimming."""
 
         # Get configs from provider or fall back to extracting from Position (backward compat)
-        if self.trigger_config_provider:
-            self.trigger_config_provider(tenant_id, portfolio_id, position.id)
-        else:
-            # Fallback: extract from Position entity (for backward compatibility)
-            order_policy_to_trigger_config(position.order_policy)
-
         if self.guardrail_config_provider:
-            guardrail_config = self.guardrail_config_provider(tenant_id, portfolio_id, position.id)
+            guardrail_config = self._guardrail_config(tenant_id, portfolio_id, position.id, context)
         else:
             # Fallback: extract from Position entity (for backward compatibility)
             guardrail_config = guardrail_policy_to_guardrail_config(position.guardrails)
 
         if self.order_policy_config_provider:
-            order_policy_config = self.order_policy_config_provider(
-                tenant_id, portfolio_id, position.id
+            order_policy_config = self._order_policy_config(
+                tenant_id, portfolio_id, position.id, context
             )
             rebalance_ratio = (
                 float(order_policy_config.rebalance_ratio)
@@ -537,14 +692,7 @@ class EvaluatePositionUC:
             order_policy_config = None
             rebalance_ratio = position.order_policy.rebalance_ratio
 
-        # Get commission_rate from ConfigRepo (preferred) or fallback to position
-        if self.config_repo:
-            commission_rate = self.config_repo.get_commission_rate(
-                tenant_id=tenant_id,
-                asset_id=position.asset_symbol,  # Use asset_symbol instead of ticker
-            )
-        else:
-            commission_rate = position.order_policy.commission_rate
+        commission_rate = self._commission_rate(tenant_id, position)
 
         # Apply order sizing formula: ΔQ_raw = (P_anchor / P - 1) × r × ((A + C) / P)
         # Calculate portfolio values
@@ -634,6 +782,7 @@ class EvaluatePositionUC:
             current_price_float,
             side,
             guardrail_config,
+            commission_rate=commission_rate,
         )
 
         # Calculate order details
@@ -652,6 +801,7 @@ class EvaluatePositionUC:
             notional,
             commission,
             price_timestamp=price_timestamp,
+            context=context,
         )
 
         return {
@@ -663,7 +813,7 @@ class EvaluatePositionUC:
             "trimming_reason": trimming_reason,
             "validation": validation_result,
             "post_trade_asset_pct": self._calculate_post_trade_allocation(
-                position, trimmed_qty, float(current_price)
+                position, trimmed_qty, float(current_price), commission_rate=commission_rate
             ),
         }
 
@@ -676,6 +826,7 @@ class EvaluatePositionUC:
         current_price: float,
         side: str,
         guardrail_config: GuardrailConfig,
+        commission_rate: Optional[float] = None,
     ) -> Tuple[float, str]:
         """Apply guardrail trimming to ensure Asset% within guardrail bounds post-trade."""
 
@@ -690,14 +841,11 @@ class EvaluatePositionUC:
                 )
                 raw_qty = -max_sellable  # Cap to maximum sellable (negative for sell)
 
-        # Get commission_rate from ConfigRepo (preferred) or fallback to position
-        if self.config_repo:
-            commission_rate_for_calc = self.config_repo.get_commission_rate(
-                tenant_id=tenant_id,
-                asset_id=position.asset_symbol,  # Use asset_symbol instead of ticker
-            )
-        else:
-            commission_rate_for_calc = position.order_policy.commission_rate
+        commission_rate_for_calc = (
+            commission_rate
+            if commission_rate is not None
+            else self._commission_rate(tenant_id, position)
+        )
 
         # Calculate post-trade allocation without trimming
         # Convert to float to avoid Decimal/float type mismatch
@@ -813,25 +961,23 @@ class EvaluatePositionUC:
         return trimmed_qty, reason
 
     def _check_auto_rebalancing(
-        self, tenant_id: str, portfolio_id: str, position, current_price: float
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position,
+        current_price: float,
+        context: Optional[PositionContext] = None,
     ) -> Optional[Dict[str, Any]]:
         """Check if position needs auto-rebalancing due to drift outside guardrails."""
 
         # Get guardrail config from provider or fall back to extracting from Position (backward compat)
         if self.guardrail_config_provider:
-            guardrail_config = self.guardrail_config_provider(tenant_id, portfolio_id, position.id)
+            guardrail_config = self._guardrail_config(tenant_id, portfolio_id, position.id, context)
         else:
             # Fallback: extract from Position entity (for backward compatibility)
             guardrail_config = guardrail_policy_to_guardrail_config(position.guardrails)
 
-        # Get commission_rate from ConfigRepo (preferred) or fallback to position
-        if self.config_repo:
-            commission_rate = self.config_repo.get_commission_rate(
-                tenant_id=tenant_id,
-                asset_id=position.asset_symbol,  # Use asset_symbol instead of ticker
-            )
-        else:
-            commission_rate = position.order_policy.commission_rate
+        commission_rate = self._commission_rate(tenant_id, position)
 
         # Calculate current allocation
         # Convert to float to avoid Decimal/float type mismatch
@@ -874,6 +1020,7 @@ class EvaluatePositionUC:
                         "BUY",
                         notional,
                         commission,
+                        context=context,
                     ),
                     "post_trade_asset_pct": min_alloc,
                 }
@@ -907,6 +1054,7 @@ class EvaluatePositionUC:
                         "SELL",
                         notional,
                         commission,
+                        context=context,
                     ),
                     "post_trade_asset_pct": max_alloc,
                 }
@@ -924,6 +1072,7 @@ class EvaluatePositionUC:
         notional: float,
         commission: float,
         price_timestamp: Optional[datetime] = None,
+        context: Optional[PositionContext] = None,
     ) -> Dict[str, Any]:
         """Validate order against business rules including market hours and duplicates."""
 
@@ -931,8 +1080,8 @@ class EvaluatePositionUC:
 
         # Get min_notional from order_policy_config or fallback to position
         if self.order_policy_config_provider:
-            order_policy_config = self.order_policy_config_provider(
-                tenant_id, portfolio_id, position.id
+            order_policy_config = self._order_policy_config(
+                tenant_id, portfolio_id, position.id, context
             )
             min_notional = (
                 float(order_policy_config.min_notional)
@@ -979,15 +1128,15 @@ class EvaluatePositionUC:
 
         # Apply config store override if available
         if self.order_policy_config_provider:
-            order_policy_config = self.order_policy_config_provider(
-                tenant_id, portfolio_id, position.id
+            order_policy_config = self._order_policy_config(
+                tenant_id, portfolio_id, position.id, context
             )
             if order_policy_config is not None:
                 allow_after_hours = order_policy_config.allow_after_hours
 
         # Apply portfolio-level trading_hours_policy if portfolio_repo is available
         if self.portfolio_repo is not None:
-            portfolio = self.portfolio_repo.get(tenant_id=tenant_id, portfolio_id=portfolio_id)
+            portfolio = self._portfolio(tenant_id, portfolio_id, context)
             if portfolio is not None:
                 if portfolio.trading_hours_policy == "OPEN_ONLY":
                     # Master off switch – force after-hours off
@@ -1007,7 +1156,7 @@ class EvaluatePositionUC:
                 validation_result["warnings"].append("Trading after market hours")
 
         # Check for pending orders - prevent new orders while one is in-flight
-        if self._has_recent_order(position.id):
+        if self._has_recent_order(position.id, context=context):
             validation_result["valid"] = False
             validation_result["rejections"].append(
                 "Pending order exists - wait for current order to be filled/rejected/cancelled"
@@ -1015,7 +1164,7 @@ class EvaluatePositionUC:
 
         # Check daily order limit
         max_orders_per_day = position.guardrails.max_orders_per_day or 10
-        if self._exceeds_daily_limit(position.id, max_orders_per_day):
+        if self._exceeds_daily_limit(position.id, max_orders_per_day, context=context):
             validation_result["valid"] = False
             validation_result["rejections"].append(
                 f"Daily order limit exceeded (max {max_orders_per_day} orders per day)"
@@ -1043,19 +1192,23 @@ class EvaluatePositionUC:
 
         return True
 
-    def _has_recent_order(self, position_id: str) -> bool:
+    def _has_recent_order(
+        self, position_id: str, context: Optional[PositionContext] = None
+    ) -> bool:
         """Check if there's a pending order for this position that hasn't been filled/rejected/cancelled."""
-        if not self.orders_repo:
+        if context is not None and context.open_orders is not None:
+            orders = context.open_orders
+        elif not self.orders_repo:
             return False
-
-        # Check for orders with status indicating they are still pending/in-flight
-        pending_statuses = {"created", "submitted", "pending", "working", "partial"}
+        else:
+            orders = None
 
         try:
             # Get recent orders for this position
-            orders = list(self.orders_repo.list_for_position(position_id, limit=10))
+            if orders is None:
+                orders = list(self.orders_repo.list_for_position(position_id, limit=10))
             for order in orders:
-                if order.status in pending_statuses:
+                if order.status in OPEN_ORDER_STATUSES:
                     self._logger.info(
                         "Position %s has pending order %s with status %s - blocking new order",
                         position_id, order.id, order.status
@@ -1068,14 +1221,21 @@ class EvaluatePositionUC:
 
         return False
 
-    def _exceeds_daily_limit(self, position_id: str, max_orders_per_day: int = 10) -> bool:
+    def _exceeds_daily_limit(
+        self,
+        position_id: str,
+        max_orders_per_day: int = 10,
+        context: Optional[PositionContext] = None,
+    ) -> bool:
         """Check if daily order limit has been exceeded."""
-        if not self.orders_repo:
+        today = self.clock.now().date()
+        count = context.order_count_on(today) if context is not None else None
+        if count is None and not self.orders_repo:
             return False
 
         try:
-            today = self.clock.now().date()
-            count = self.orders_repo.count_for_position_on_day(position_id, today)
+            if count is None:
+                count = self.orders_repo.count_for_position_on_day(position_id, today)
             if count >= max_orders_per_day:
                 self._logger.info(
                     "Position %s has %d orders today (limit: %d) - blocking new order",
@@ -1089,17 +1249,12 @@ class EvaluatePositionUC:
 
         return False
 
-    def _calculate_post_trade_allocation(self, position, qty: float, price: float) -> float:
+    def _calculate_post_trade_allocation(
+        self, position, qty: float, price: float, commission_rate: Optional[float] = None
+    ) -> float:
         """Calculate asset allocation percentage after the proposed trade."""
-        # Get commission_rate from ConfigRepo (preferred) or fallback to position
-        # Note: tenant_id and portfolio_id not available here, but we can get from position
-        if self.config_repo:
-            commission_rate = self.config_repo.get_commission_rate(
-                tenant_id=position.tenant_id,
-                asset_id=position.asset_symbol,  # Use asset_symbol instead of ticker
-            )
-        else:
-            commission_rate = position.order_policy.commission_rate
+        if commission_rate is None:
+            commission_rate = self._commission_rate(position.tenant_id, position)
 
         # Convert to float to avoid Decimal/float type mismatch
         price_float = float(price)
@@ -1119,6 +1274,7 @@ class EvaluatePositionUC:
         position,
         current_price: float,
         trigger_result: Dict[str, Any],
+        context: Optional[PositionContext] = None,
     ) -> None:
         """Log evaluation event with order proposal details."""
 
@@ -1179,8 +1335,8 @@ class EvaluatePositionUC:
                 float(trigger_config.up_threshold_pct) / 100
                 if self.trigger_config_provider
                 and (
-                    trigger_config := self.trigger_config_provider(
-                        tenant_id, portfolio_id, position.id
+                    trigger_config := self._trigger_config(
+                        tenant_id, portfolio_id, position.id, context
                     )
                 )
                 else position.order_policy.trigger_threshold_pct
@@ -1217,8 +1373,8 @@ class EvaluatePositionUC:
                         float(order_policy_config.rebalance_ratio)
                         if self.order_policy_config_provider
                         and (
-                            order_policy_config := self.order_policy_config_provider(
-                                tenant_id, portfolio_id, position.id
+                            order_policy_config := self._order_policy_config(
+                                tenant_id, portfolio_id, position.id, context
                             )
                         )
                         else position.order_policy.rebalance_ratio
@@ -1275,6 +1431,7 @@ class EvaluatePositionUC:
         execution_info: Optional[Dict[str, Any]] = None,
         position_qty_after: Optional[float] = None,
         position_cash_after: Optional[float] = None,
+        context: Optional[PositionContext] = None,
     ) -> Optional[str]:
         """
         Write a row to PositionEvaluationTimeline for this evaluation.
@@ -1290,7 +1447,7 @@ class EvaluatePositionUC:
             # Get portfolio name
             portfolio_name = None
             if self.portfolio_repo:
-                portfolio = self.portfolio_repo.get(tenant_id=tenant_id, portfolio_id=portfolio_id)
+                portfolio = self._portfolio(tenant_id, portfolio_id, context)
                 if portfolio:
                     portfolio_name = portfolio.name
 
@@ -1300,7 +1457,7 @@ class EvaluatePositionUC:
             order_policy_dict = None
 
             if self.trigger_config_provider:
-                trigger_config = self.trigger_config_provider(tenant_id, portfolio_id, position.id)
+                trigger_config = self._trigger_config(tenant_id, portfolio_id, position.id, context)
                 if trigger_config:
                     trigger_config_dict = {
                         "up_threshold_pct": float(trigger_config.up_threshold_pct),
@@ -1308,8 +1465,8 @@ class EvaluatePositionUC:
                     }
 
             if self.guardrail_config_provider:
-                guardrail_config = self.guardrail_config_provider(
-                    tenant_id, portfolio_id, position.id
+                guardrail_config = self._guardrail_config(
+                    tenant_id, portfolio_id, position.id, context
                 )
                 if guardrail_config:
                     guardrail_config_dict = {
@@ -1332,8 +1489,8 @@ class EvaluatePositionUC:
                     }
 
             if self.order_policy_config_provider:
-                order_policy_config = self.order_policy_config_provider(
-                    tenant_id, portfolio_id, position.id
+                order_policy_config = self._order_policy_config(
+                    tenant_id, portfolio_id, position.id, context
                 )
                 if order_policy_config:
                     commission_rate = (
@@ -1491,3 +1648,48 @@ class EvaluatePositionUC:
             # Don't fail evaluation if timeline write fails
             self._logger.warning("Failed to write timeline row: %s", e, exc_info=True)
         return None
+
+
+def _quiet_mask(contexts: List[PositionContext], price: float) -> np.ndarray:
+    """True where one price can neither fire a trigger, rebalance nor reset the anchor.
+
+    Mirrors _check_triggers, _check_auto_rebalancing and
+    _check_and_reset_anchor_if_anomalous with float arithmetic, shrunk by
+    _SCREEN_TOLERANCE; positions without preloaded configs are never quiet.
+    """
+    nan = float("nan")
+
+    def column(values) -> np.ndarray:
+        return np.array(list(values), dtype=float)
+
+    positions = [context.position for context in contexts]
+    anchor = column(float(p.anchor_price or 0) if p is not None else 0.0 for p in positions)
+    qty = column(float(p.qty or 0) if p is not None else nan for p in positions)
+    cash = column(float(p.cash or 0) if p is not None else nan for p in positions)
+    up = column(
+        float(c.trigger_config.up_threshold_pct) if c.trigger_config else nan for c in contexts
+    )
+    down = column(
+        float(c.trigger_config.down_threshold_pct) if c.trigger_config else nan for c in contexts
+    )
+    low = column(
+        float(c.guardrail_config.min_stock_pct) if c.guardrail_config else nan for c in contexts
+    )
+    high = column(
+        float(c.guardrail_config.max_stock_pct) if c.guardrail_config else nan for c in contexts
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = (price - anchor) / anchor * 100
+        value = qty * price
+        total = value + cash
+        allocation = np.where(total > 0, value / total, 0.0)
+    tol = _SCREEN_TOLERANCE
+    return (
+        (anchor > 0)
+        & (np.abs(pct) < ANOMALY_THRESHOLD_PCT - tol)
+        & (pct < up - tol * np.maximum(1.0, np.abs(up)))
+        & (pct > -down + tol * np.maximum(1.0, np.abs(down)))
+        & (allocation > low + tol)
+        & (allocation < high - tol)
+    )
@@ -7,6 +7,7 @@ from decimal import Decimal
 from uuid import uuid4
 
 from application.dto.orders import FillOrderRequest, FillOrderResponse
+from application.dto.position_context import PositionContext
 from domain.entities.event import Event
 from domain.errors import GuardrailBreach
 from domain.ports.events_repo import EventsRepo
@@ -65,7 +66,21 @@ class ExecuteOrderUC:
         self.order_policy_config_provider = order_policy_config_provider
         self.evaluation_timeline_repo = evaluation_timeline_repo
 
-    def execute(self, order_id: str, request: FillOrderRequest) -> FillOrderResponse:
+    def execute(
+        self,
+        order_id: str,
+        request: FillOrderRequest,
+        context: Optional[PositionContext] = None,
+    ) -> FillOrderResponse:
+        """
+        Apply a fill to the order's position.
+
+        ``context`` is the trading cycle's context for the order's position; its
+        position and configs are used instead of loading them again. It must
+        hold the current position: the cycle reloads it under the position's
+        lock before submitting (see IPositionRepository.refresh_trading_context).
+        It is ignored if it belongs to another position.
+        """
         order = self.orders.get(order_id)
         if not order:
             raise KeyError("order_not_found")
@@ -74,12 +89,18 @@ class ExecuteOrderUC:
         if order.status == "filled":
             return FillOrderResponse(order_id=order.id, status="filled", filled_qty=0.0)
 
+        if context is not None and context.position_id != order.position_id:
+            context = None
+
         # Get position with tenant_id and portfolio_id from order
-        pos = self.positions.get(
-            tenant_id=order.tenant_id,
-            portfolio_id=order.portfolio_id,
-            position_id=order.position_id,
-        )
+        if context is not None and context.position is not None:
+            pos = context.position
+        else:
+            pos = self.positions.get(
+                tenant_id=order.tenant_id,
+                portfolio_id=order.portfolio_id,
+                position_id=order.position_id,
+            )
         if not pos:
             raise KeyError("position_not_found")
 
@@ -87,8 +108,12 @@ class ExecuteOrderUC:
 
         # Get order policy config for validation (utility methods still use pos.order_policy)
         if self.order_policy_config_provider:
-            order_policy_config = self.order_policy_config_provider(
-                order.tenant_id, order.portfolio_id, order.position_id
+            order_policy_config = (
+                context.order_policy_config
+                if context is not None and context.order_policy_config is not None
+                else self.order_policy_config_provider(
+                    order.tenant_id, order.portfolio_id, order.position_id
+                )
             )
         else:
             # Fallback: extract from Position entity (for backward compatibility)
@@ -171,8 +196,12 @@ class ExecuteOrderUC:
         # Validate after-fill guardrails using domain service
         # Get guardrail config from provider or fall back to extracting from Position (backward compat)
         if self.guardrail_config_provider:
-            guardrail_config = self.guardrail_config_provider(
-                order.tenant_id, order.portfolio_id, order.position_id
+            guardrail_config = (
+                context.guardrail_config
+                if context is not None and context.guardrail_config is not None
+                else self.guardrail_config_provider(
+                    order.tenant_id, order.portfolio_id, order.position_id
+                )
             )
         else:
             # Fallback: extract from Position entity (for backward compatibility)
@@ -374,6 +403,7 @@ class ExecuteOrderUC:
             post_trade_qty=pos.qty,
             post_trade_cash=pos.cash,
             timestamp=now,
+            context=context,
         )
 
         return FillOrderResponse(
@@ -396,6 +426,7 @@ class ExecuteOrderUC:
         post_trade_qty: float,
         post_trade_cash: float,
         timestamp,
+        context: Optional[PositionContext] = None,
     ) -> Optional[str]:
         """Write order execution to evaluation timeline for cockpit visibility."""
         if not self.evaluation_timeline_repo:
@@ -425,16 +456,24 @@ class ExecuteOrderUC:
             guardrail_min_stock_pct = None
             guardrail_max_stock_pct = None
             try:
-                if self.trigger_config_provider:
+                if context is not None and context.trigger_config is not None:
+                    tc = context.trigger_config
+                elif self.trigger_config_provider:
                     tc = self.trigger_config_provider(tenant_id, portfolio_id, position.id)
-                    if tc:
-                        trigger_up_threshold = float(tc.up_threshold_pct)
-                        trigger_down_threshold = float(tc.down_threshold_pct)
-                if self.guardrail_config_provider:
+                else:
+                    tc = None
+                if tc:
+                    trigger_up_threshold = float(tc.up_threshold_pct)
+                    trigger_down_threshold = float(tc.down_threshold_pct)
+                if context is not None and context.guardrail_config is not None:
+                    gc = context.guardrail_config
+                elif self.guardrail_config_provider:
                     gc = self.guardrail_config_provider(tenant_id, portfolio_id, position.id)
-                    if gc:
-                        guardrail_min_stock_pct = float(gc.min_stock_pct) if gc.min_stock_pct else None
-                        guardrail_max_stock_pct = float(gc.max_stock_pct) if gc.max_stock_pct else None
+                else:
+                    gc = None
+                if gc:
+                    guardrail_min_stock_pct = float(gc.min_stock_pct) if gc.min_stock_pct else None
+                    guardrail_max_stock_pct = float(gc.max_stock_pct) if gc.max_stock_pct else None
             except Exception:
                 pass  # Config lookup failures must not block timeline write
 
@@ -2,10 +2,13 @@
 # backend/application/use_cases/parameter_optimization_uc.py
 # =========================
 
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple, TYPE_CHECKING
 from uuid import UUID, uuid4
 from datetime import datetime, timezone, timedelta
-import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+import threading
 import time
 import traceback
 
@@ -23,11 +26,61 @@ from domain.ports.optimization_repo import (
 from domain.value_objects.parameter_range import ParameterRange
 from domain.value_objects.optimization_criteria import OptimizationCriteria, OptimizationMetric
 from domain.value_objects.heatmap_data import HeatmapData, HeatmapCell, HeatmapMetric
+from application.helpers.online_metrics import OnlineMetrics
 
 if TYPE_CHECKING:
     from application.use_cases.simulation_unified_uc import SimulationUnifiedUC
 
 
+# Per-process state for parallel optimization workers. Set once per worker by
+# _init_optimization_worker from the pickled prefetched inputs.
+_worker_uc: Optional["ParameterOptimizationUC"] = None
+_worker_inputs: Optional[Dict[str, Any]] = None
+
+
+def _init_optimization_worker(inputs: Dict[str, Any], grid_batch_size: int = 0) -> None:
+    """ProcessPoolExecutor initializer: build a simulation-only UC for this worker."""
+    global _worker_uc, _worker_inputs
+    from application.use_cases.simulation_unified_uc import SimulationUnifiedUC
+    from infrastructure.persistence.memory.positions_repo_mem import InMemoryPositionsRepo
+    from infrastructure.persistence.memory.events_repo_mem import InMemoryEventsRepo
+    from infrastructure.time.clock import Clock
+
+    simulation_uc = SimulationUnifiedUC(
+        market_data=inputs["market_storage"],
+        positions=InMemoryPositionsRepo(),
+        events=InMemoryEventsRepo(),
+        clock=Clock(),
+    )
+    _worker_uc = ParameterOptimizationUC(
+        config_repo=None,
+        result_repo=None,
+        heatmap_repo=None,
+        simulation_uc=simulation_uc,
+        grid_batch_size=grid_batch_size,
+    )
+    _worker_inputs = inputs
+
+
+def _default_start_method() -> str:
+    """Start method for the combination pool.
+
+    Optimizations run on a job-queue thread inside the API server, next to the
+    trading worker, timeline writer, executor lanes and quote pools. A plain
+    fork copies whatever locks those threads hold at that instant and can
+    deadlock the child, so workers start from a clean forkserver (or spawn)
+    process and receive the prefetched inputs through the initializer.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def _run_combinations_in_worker(parameter_sets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Evaluate a unit of parameter combinations inside a pool worker."""
+    return _worker_uc._evaluate_parameter_sets(_worker_inputs, parameter_sets)
+
+
 class CreateOptimizationRequest:
     """Request to create a new optimization configuration."""
 
@@ -107,11 +160,29 @@ class ParameterOptimizationUC:
         result_repo: OptimizationResultRepo,
         heatmap_repo: HeatmapDataRepo,
         simulation_uc: "SimulationUnifiedUC",
+        max_workers: int = 1,
+        start_method: Optional[str] = None,
+        grid_batch_size: int = 0,
     ):
+        """
+        max_workers: worker processes for combination runs. 1 runs in-process;
+            0 or less uses one worker per CPU.
+        start_method: multiprocessing start method for the pool. Defaults to
+            "forkserver" where available, else "spawn" (see _default_start_method).
+        grid_batch_size: when > 0, up to this many combinations are simulated
+            together in one pass over the price series
+            (SimulationUnifiedUC.iter_simulation_grid); 0 runs each
+            combination separately.
+        """
         self.config_repo = config_repo
         self.result_repo = result_repo
         self.heatmap_repo = heatmap_repo
         self.simulation_uc = simulation_uc
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.grid_batch_size = grid_batch_size
+        # Serialises the status check and RUNNING write of concurrent start requests
+        self._claim_lock = threading.Lock()
 
     def create_optimization_config(self, request: CreateOptimizationRequest) -> OptimizationConfig:
         """Create a new optimization configuration."""
@@ -140,18 +211,45 @@ class ParameterOptimizationUC:
 
         return config
 
-    def run_optimization(self, config_id: UUID) -> None:
-        """Start an optimization run."""
-        config = self.config_repo.get_by_id(config_id)
-        if not config:
-            raise ValueError(f"Optimization config not found: {config_id}")
+    def claim_run(self, config_id: UUID) -> OptimizationConfig:
+        """Move a DRAFT or FAILED config to RUNNING, e.g. before its run is queued.
 
-        if not config.can_start():
-            raise ValueError(f"Cannot start optimization in status: {config.status}")
+        Raises ValueError when the config does not exist or is already running,
+        so a second start request cannot queue a duplicate run.
+        """
+        with self._claim_lock:
+            config = self.config_repo.get_by_id(config_id)
+            if not config:
+                raise ValueError(f"Optimization config not found: {config_id}")
 
-        # Update status to running
-        config.update_status(OptimizationStatus.RUNNING)
-        self.config_repo.update_status(config_id, config.status.value)
+            if not config.can_start():
+                raise ValueError(f"Cannot start optimization in status: {config.status}")
+
+            config.update_status(OptimizationStatus.RUNNING)
+            self.config_repo.update_status(config_id, config.status.value)
+        return config
+
+    def run_optimization(
+        self,
+        config_id: UUID,
+        claimed: bool = False,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Start an optimization run.
+
+        ``claimed``: the config was already moved to RUNNING by ``claim_run``.
+        The run is then skipped if the config is no longer RUNNING (reset or
+        deleted in the meantime).
+        ``should_stop``: checked after each batch of combinations; once it
+        returns True the run stops and the config is marked CANCELLED.
+        """
+        if claimed:
+            config = self.config_repo.get_by_id(config_id)
+            if not config or not config.is_running():
+                print(f"[Optimization] {config_id} is no longer queued to run; skipping")
+                return
+        else:
+            config = self.claim_run(config_id)
 
         try:
             # Generate parameter combinations
@@ -171,7 +269,7 @@ class ParameterOptimizationUC:
             self.result_repo.bulk_save_results(initial_results)
 
             # Process each combination with real simulation
-            self._process_parameter_combinations(config, combinations)
+            self._process_parameter_combinations(config, combinations, should_stop)
         except Exception as e:
             print(f"Optimization failed: {e}")
             traceback.print_exc()
@@ -363,8 +461,7 @@ class ParameterOptimizationUC:
 
         # Build MarketDataStorage and sim_data
         market_storage = MarketDataStorage()
-        for price_data in historical_data:
-            market_storage.store_price_data(config.ticker, price_data)
+        market_storage.store_many(config.ticker, historical_data)
 
         sim_data = market_storage.get_simulation_data(
             config.ticker, fetch_start, fetch_end, config.include_after_hours
@@ -450,11 +547,18 @@ class ParameterOptimizationUC:
         # Buy & Hold return (also percentage → fraction)
         metrics[OptimizationMetric.BUY_HOLD_RETURN] = sim_result.buy_hold_return_pct / 100.0
 
-        # Total commissions from trade log
-        trade_log = sim_result.trade_log
-        metrics[OptimizationMetric.TOTAL_COMMISSIONS] = sum(
-            t.get("commission", 0) for t in trade_log
-        )
+        # Return / trade statistics accumulated during the run; results
+        # without them (older callers) are folded from daily_returns here
+        stats = getattr(sim_result, "return_stats", None)
+        if not isinstance(stats, dict):
+            accumulator = OnlineMetrics()
+            for row in sim_result.daily_returns:
+                accumulator.add_return(row["return"])
+            for trade in sim_result.trade_log:
+                accumulator.record_trade(trade.get("commission", 0))
+            stats = accumulator.summary()
+
+        metrics[OptimizationMetric.TOTAL_COMMISSIONS] = stats["total_commission"]
 
         # Total dividends received (net of withholding tax)
         metrics[OptimizationMetric.TOTAL_DIVIDENDS] = getattr(
@@ -469,41 +573,14 @@ class ParameterOptimizationUC:
         else:
             metrics[OptimizationMetric.CALMAR_RATIO] = 0.0
 
-        # Sortino Ratio: (mean_return - rf) / downside_deviation
-        daily_returns_list = [r["return"] for r in sim_result.daily_returns]
-        if len(daily_returns_list) >= 2:
-            mean_ret = statistics.mean(daily_returns_list)
-            downside = [r for r in daily_returns_list if r < 0]
-            if len(downside) >= 2:
-                downside_dev = statistics.stdev(downside) * (252 ** 0.5)
-                if downside_dev > 0:
-                    metrics[OptimizationMetric.SORTINO_RATIO] = (mean_ret * 252) / downside_dev
-                else:
-                    metrics[OptimizationMetric.SORTINO_RATIO] = 0.0
-            else:
-                metrics[OptimizationMetric.SORTINO_RATIO] = 0.0
-        else:
-            metrics[OptimizationMetric.SORTINO_RATIO] = 0.0
-
-        # Win Rate: profitable_trades / total_trades from trade_log
-        trade_log = sim_result.trade_log
-        if trade_log:
-            # Use daily_returns positive days as proxy for win rate
-            positive_days = sum(1 for r in daily_returns_list if r > 0)
-            total_days = len(daily_returns_list)
-            metrics[OptimizationMetric.WIN_RATE] = (
-                positive_days / total_days if total_days > 0 else 0.0
-            )
-        else:
-            metrics[OptimizationMetric.WIN_RATE] = 0.0
+        # Sortino Ratio: annualised mean return / downside deviation
+        metrics[OptimizationMetric.SORTINO_RATIO] = stats["sortino_ratio"]
 
-        # Profit Factor: sum(gains) / abs(sum(losses)) from daily_returns
-        gains = sum(r for r in daily_returns_list if r > 0)
-        losses = sum(r for r in daily_returns_list if r < 0)
-        if losses < 0:
-            metrics[OptimizationMetric.PROFIT_FACTOR] = gains / abs(losses)
-        else:
-            metrics[OptimizationMetric.PROFIT_FACTOR] = float("inf") if gains > 0 else 0.0
+        # Win Rate: share of positive return days (0 when nothing traded)
+        metrics[OptimizationMetric.WIN_RATE] = stats["win_rate"] if sim_result.trade_log else 0.0
+
+        # Profit Factor: sum(gains) / abs(sum(losses)) over the returns
+        metrics[OptimizationMetric.PROFIT_FACTOR] = stats["profit_factor"]
 
         # Avg Trade Duration: total_trading_days / trade_count
         if sim_result.algorithm_trades > 0:
@@ -515,10 +592,193 @@ class ParameterOptimizationUC:
 
         return metrics
 
+    def _evaluate_combination(
+        self, inputs: Dict[str, Any], parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run one combination against prefetched market data.
+
+        Returns a picklable outcome dict (metrics, simulation_result,
+        execution_time, error) so it can cross a process boundary.
+        """
+        t0 = time.perf_counter()
+        try:
+            # Build position config from flat parameters
+            position_config = self._build_position_config(parameters)
+
+            # Run simulation with pre-fetched data and pre-built storage (no rebuild per combo)
+            sim_result = self.simulation_uc.run_simulation_with_data(
+                ticker=inputs["ticker"],
+                start_date=inputs["start_date"],
+                end_date=inputs["end_date"],
+                historical_data=inputs["historical_data"],
+                sim_data=inputs["sim_data"],
+                dividend_history=inputs["dividend_history"],
+                initial_cash=inputs["initial_cash"],
+                position_config=position_config,
+                lightweight=True,
+                market_storage=inputs["market_storage"],
+            )
+            return self._outcome_from_result(sim_result, time.perf_counter() - t0)
+        except Exception as e:
+            traceback.print_exc()
+            return {"error": str(e), "execution_time": time.perf_counter() - t0}
+
+    def _evaluate_grid(
+        self, inputs: Dict[str, Any], parameter_sets: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run a batch of combinations in one pass over the price series.
+
+        Outcomes are in parameter_sets order; execution_time is the batch
+        time split evenly across its combinations.
+        """
+        t0 = time.perf_counter()
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(parameter_sets)
+        position_configs = []
+        batch_index = []
+        for i, parameters in enumerate(parameter_sets):
+            try:
+                position_configs.append(self._build_position_config(parameters))
+                batch_index.append(i)
+            except Exception as e:
+                outcomes[i] = {"error": str(e)}
+
+        try:
+            if position_configs:
+                for index, sim_result, error in self.simulation_uc.iter_simulation_grid(
+                    ticker=inputs["ticker"],
+                    start_date=inputs["start_date"],
+                    end_date=inputs["end_date"],
+                    sim_data=inputs["sim_data"],
+                    dividend_history=inputs["dividend_history"],
+                    initial_cash=inputs["initial_cash"],
+                    position_configs=position_configs,
+                ):
+                    if error is not None:
+                        outcomes[batch_index[index]] = {"error": str(error)}
+                    else:
+                        outcomes[batch_index[index]] = self._outcome_from_result(sim_result, 0.0)
+        except Exception as e:
+            traceback.print_exc()
+            outcomes = [o if o is not None else {"error": str(e)} for o in outcomes]
+
+        # The grid can end early without raising (e.g. a broken worker); report what it skipped
+        outcomes = [
+            o if o is not None else {"error": "No result from the simulation grid"}
+            for o in outcomes
+        ]
+        elapsed = (time.perf_counter() - t0) / max(1, len(parameter_sets))
+        for outcome in outcomes:
+            outcome["execution_time"] = elapsed
+        return outcomes
+
+    def _evaluate_parameter_sets(
+        self, inputs: Dict[str, Any], parameter_sets: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        if self.grid_batch_size > 0:
+            return self._evaluate_grid(inputs, parameter_sets)
+        return [self._evaluate_combination(inputs, parameters) for parameters in parameter_sets]
+
+    def _outcome_from_result(self, sim_result, execution_time: float) -> Dict[str, Any]:
+        # Map simulation result to optimization metrics
+        return {
+            "metrics": self._map_simulation_result_to_metrics(sim_result),
+            "simulation_result": {
+                "trade_log": sim_result.trade_log,
+                "initial_cash": sim_result.initial_cash,
+                "algorithm_pnl": sim_result.algorithm_pnl,
+                "total_dividends_received": getattr(
+                    sim_result, "total_dividends_received", 0.0
+                ),
+                "dividend_events": getattr(sim_result, "dividend_events", []),
+            },
+            "execution_time": execution_time,
+            "error": None,
+        }
+
+    def _resolve_worker_count(self, task_count: int) -> int:
+        workers = self.max_workers if self.max_workers > 0 else (os.cpu_count() or 1)
+        return max(1, min(workers, task_count))
+
+    def _work_units(
+        self, tasks: List[Tuple[ParameterCombination, OptimizationResult]], workers: int
+    ) -> List[List[Tuple[ParameterCombination, OptimizationResult]]]:
+        """Split tasks into units evaluated together (grid batches, or singles)."""
+        if self.grid_batch_size <= 0:
+            return [[task] for task in tasks]
+        # Keep every worker busy: no more than an even share per batch
+        size = min(self.grid_batch_size, -(-len(tasks) // workers))
+        return [tasks[i:i + size] for i in range(0, len(tasks), size)]
+
+    def _iter_outcomes_sequential(
+        self, inputs: Dict[str, Any], tasks: List[Tuple[ParameterCombination, OptimizationResult]]
+    ) -> Iterator[Tuple[OptimizationResult, Dict[str, Any], bool]]:
+        """Yield (result, outcome, last of its unit) for each task, unit by unit."""
+        for unit in self._work_units(tasks, 1):
+            outcomes = self._evaluate_parameter_sets(
+                inputs, [combination.parameters for combination, _ in unit]
+            )
+            for i, ((_, result), outcome) in enumerate(zip(unit, outcomes), start=1):
+                yield result, outcome, i == len(unit)
+
+    def _iter_outcomes_parallel(
+        self,
+        inputs: Dict[str, Any],
+        tasks: List[Tuple[ParameterCombination, OptimizationResult]],
+        workers: int,
+    ) -> Iterator[Tuple[OptimizationResult, Dict[str, Any], bool]]:
+        """Fan work units out to a process pool; yield outcomes as they finish.
+
+        Yields (result, outcome, last of its unit). Closing the iterator early
+        cancels the units that have not started.
+        """
+        start_method = self.start_method or _default_start_method()
+        units = self._work_units(tasks, workers)
+        print(f"[Optimization] Running {len(tasks)} combinations in {len(units)} units on "
+              f"{workers} worker processes ({start_method})")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_optimization_worker,
+            initargs=(inputs, self.grid_batch_size),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _run_combinations_in_worker,
+                    [combination.parameters for combination, _ in unit],
+                ): unit
+                for unit in units
+            }
+            try:
+                for future in as_completed(futures):
+                    unit = futures[future]
+                    try:
+                        outcomes = future.result()
+                    except Exception as e:
+                        # Worker crashed or result could not be unpickled
+                        outcomes = [
+                            {"error": f"Worker failed: {e}", "execution_time": 0.0} for _ in unit
+                        ]
+                    for i, ((_, result), outcome) in enumerate(zip(unit, outcomes), start=1):
+                        yield result, outcome, i == len(unit)
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def _process_parameter_combinations(
-        self, config: OptimizationConfig, combinations: List[ParameterCombination]
+        self,
+        config: OptimizationConfig,
+        combinations: List[ParameterCombination],
+        should_stop: Optional[Callable[[], bool]] = None,
     ) -> None:
-        """Process parameter combinations using real simulation engine."""
+        """Process parameter combinations using real simulation engine.
+
+        Runs in-process when max_workers == 1, otherwise on a process pool;
+        with grid_batch_size > 0 combinations are simulated in grid batches.
+        Results are streamed into batch_update_results as they complete.
+        ``should_stop`` is checked between work units (grid batches or
+        single combinations); see run_optimization.
+        """
         # Prefetch market data once — reused across all combinations
         try:
             historical_data, sim_data, dividend_history, market_storage = (
@@ -531,75 +791,77 @@ class ParameterOptimizationUC:
             self.config_repo.update_status(config.id, config.status.value)
             return
 
-        total = len(combinations)
+        inputs = {
+            "ticker": config.ticker,
+            "start_date": config.start_date,
+            "end_date": config.end_date,
+            "initial_cash": config.initial_cash,
+            "historical_data": historical_data,
+            "sim_data": sim_data,
+            "dividend_history": dividend_history,
+            "market_storage": market_storage,
+        }
 
         # Build lookup dict once to avoid O(N²) DB fetches inside the loop
         existing_results = self.result_repo.get_by_config(config.id)
         result_by_combination_id = {
             r.parameter_combination.combination_id: r for r in existing_results
         }
+        tasks = [
+            (combination, result_by_combination_id[combination.combination_id])
+            for combination in combinations
+            if combination.combination_id in result_by_combination_id
+        ]
+        total = len(tasks)
+
+        workers = self._resolve_worker_count(total)
+        if workers > 1:
+            outcomes = self._iter_outcomes_parallel(inputs, tasks, workers)
+        else:
+            outcomes = self._iter_outcomes_sequential(inputs, tasks)
 
         # Batch saves: accumulate results and flush every BATCH_SIZE to reduce DB round-trips
         BATCH_SIZE = 5
         pending_saves: list = []
+        stopped = False
 
-        for i, combination in enumerate(combinations):
-            print(f"[Optimization] Processing combination {i + 1}/{total}: "
-                  f"{combination.parameters}")
-
-            result = result_by_combination_id.get(combination.combination_id)
-            if not result:
-                continue
-
-            t0 = time.perf_counter()
-            try:
-                # Build position config from flat parameters
-                position_config = self._build_position_config(combination.parameters)
-
-                # Run simulation with pre-fetched data and pre-built storage (no rebuild per combo)
-                sim_result = self.simulation_uc.run_simulation_with_data(
-                    ticker=config.ticker,
-                    start_date=config.start_date,
-                    end_date=config.end_date,
-                    historical_data=historical_data,
-                    sim_data=sim_data,
-                    dividend_history=dividend_history,
-                    initial_cash=config.initial_cash,
-                    position_config=position_config,
-                    lightweight=True,
-                    market_storage=market_storage,
-                )
-
-                # Map simulation result to optimization metrics
-                metrics = self._map_simulation_result_to_metrics(sim_result)
-                elapsed = time.perf_counter() - t0
-
+        for done, (result, outcome, unit_done) in enumerate(outcomes, start=1):
+            elapsed = outcome["execution_time"]
+            if outcome.get("error") is None:
+                metrics = outcome["metrics"]
                 result.metrics = metrics
-                result.simulation_result = {
-                    "trade_log": sim_result.trade_log,
-                    "initial_cash": sim_result.initial_cash,
-                    "algorithm_pnl": sim_result.algorithm_pnl,
-                    "total_dividends_received": getattr(sim_result, "total_dividends_received", 0.0),
-                    "dividend_events": getattr(sim_result, "dividend_events", []),
-                }
+                result.simulation_result = outcome["simulation_result"]
                 result.mark_completed(execution_time=elapsed)
-
-                print(f"[Optimization] Combination {i + 1}/{total} completed in {elapsed:.2f}s: "
+                print(f"[Optimization] Combination {done}/{total} completed in {elapsed:.2f}s: "
+                      f"{result.parameter_combination.parameters} "
                       f"return={metrics.get(OptimizationMetric.TOTAL_RETURN, 0):.2f}%, "
                       f"sharpe={metrics.get(OptimizationMetric.SHARPE_RATIO, 0):.3f}")
-
-            except Exception as e:
-                elapsed = time.perf_counter() - t0
-                print(f"[Optimization] Combination {i + 1}/{total} failed after {elapsed:.2f}s: {e}")
-                traceback.print_exc()
-                result.mark_failed(str(e))
+            else:
+                print(f"[Optimization] Combination {done}/{total} failed after {elapsed:.2f}s: "
+                      f"{outcome['error']}")
+                result.mark_failed(outcome["error"])
 
             pending_saves.append(result)
-            is_last = (i == total - 1)
-            if len(pending_saves) >= BATCH_SIZE or is_last:
+            if len(pending_saves) >= BATCH_SIZE:
                 self.result_repo.batch_update_results(pending_saves)
                 pending_saves = []
 
+            if unit_done and should_stop is not None and should_stop():
+                stopped = True
+                # Closing the iterator cancels units that have not started
+                outcomes.close()
+                break
+
+        if pending_saves:
+            self.result_repo.batch_update_results(pending_saves)
+
+        if stopped:
+            config.update_status(OptimizationStatus.CANCELLED)
+            self.config_repo.update_status(config.id, config.status.value)
+            print(f"[Optimization] Optimization cancelled for config {config.id} "
+                  f"after {done}/{total} combinations")
+            return
+
         # Update config status to completed
         config.update_status(OptimizationStatus.COMPLETED)
         self.config_repo.update_status(config.id, config.status.value)
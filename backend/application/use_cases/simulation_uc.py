@@ -263,8 +263,7 @@ class SimulationUC:
         from infrastructure.market.market_data_storage import MarketDataStorage
 
         market_storage = MarketDataStorage()
-        for price_data in historical_data:
-            market_storage.store_price_data(ticker, price_data)
+        market_storage.store_many(ticker, historical_data)
 
         # Get simulation data using the stored data
         print(f"Getting simulation data for {ticker} from {fetch_start} to {fetch_end}")
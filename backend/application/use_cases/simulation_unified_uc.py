@@ -3,7 +3,7 @@
 # =========================
 from __future__ import annotations
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from uuid import uuid4
 
@@ -28,8 +28,19 @@ from infrastructure.persistence.memory.trades_repo_mem import InMemoryTradesRepo
 from infrastructure.persistence.memory.config_repo_mem import InMemoryConfigRepo
 from infrastructure.time.clock import Clock
 from infrastructure.market.market_data_storage import MarketDataStorage
+from application.helpers.simulation_kernel import (
+    SimulationKernel,
+    bar_prices,
+    simulate_buy_hold,
+)
+from application.helpers.grid_simulation_kernel import GridSimulationKernel
+from application.helpers.online_metrics import OnlineMetrics
 from typing import Callable
 
+# "standard" drives every bar through the trading use cases; "fast" runs the
+# array-based SimulationKernel, which applies the same rules.
+SIMULATION_ENGINES = ("standard", "fast")
+
 
 @dataclass
 class SimulationResult:
@@ -87,6 +98,9 @@ class SimulationResult:
     # Dividend analysis
     dividend_analysis: Optional[Dict[str, Any]] = None
 
+    # Streaming return / drawdown / trade statistics (OnlineMetrics.summary())
+    return_stats: Optional[Dict[str, Any]] = None
+
 
 class SimulationUnifiedUC:
     """Use case for running trading simulations using the actual trading logic."""
@@ -124,8 +138,11 @@ class SimulationUnifiedUC:
         progress_callback: Optional[Callable[[str, float], None]] = None,
         simulation_id: Optional[str] = None,
         timeout_seconds: Optional[int] = None,
+        engine: str = "standard",
     ) -> SimulationResult:
         """Run a complete trading simulation using actual trading use cases."""
+        if engine not in SIMULATION_ENGINES:
+            raise ValueError(f"Unknown simulation engine: {engine}")
 
         # Progress tracking helper
         def report_progress(message: str, percentage: float):
@@ -245,8 +262,7 @@ class SimulationUnifiedUC:
         # Store the fetched data in market data storage for simulation
         _t0 = _time.monotonic()
         market_storage = MarketDataStorage()
-        for price_data in historical_data:
-            market_storage.store_price_data(ticker, price_data)
+        market_storage.store_many(ticker, historical_data)
 
         _timing["setup_s"] = round(_time.monotonic() - _t0, 2)
 
@@ -316,23 +332,38 @@ class SimulationUnifiedUC:
 
         # Run algorithm simulation using actual trading logic
         _t0 = _time.monotonic()
-        algo_result = self._simulate_algorithm_unified(
-            sim_data,
-            initial_cash,
-            position_config,
-            dividend_history,
-            market_storage,
-            detailed_trigger_analysis,
-            initial_asset_value,
-            initial_asset_units,
-            report_progress,
-            simulation_id=simulation_id,  # Pass simulation_id for timeline
-            ticker=ticker,  # Pass ticker for timeline
-        )
+        if engine == "fast":
+            algo_result = self._simulate_algorithm_fast(
+                sim_data,
+                initial_cash,
+                position_config,
+                dividend_history,
+                detailed_trigger_analysis,
+                initial_asset_value,
+                initial_asset_units,
+                report_progress,
+                simulation_id=simulation_id,
+                ticker=ticker,
+            )
+        else:
+            algo_result = self._simulate_algorithm_unified(
+                sim_data,
+                initial_cash,
+                position_config,
+                dividend_history,
+                market_storage,
+                detailed_trigger_analysis,
+                initial_asset_value,
+                initial_asset_units,
+                report_progress,
+                simulation_id=simulation_id,  # Pass simulation_id for timeline
+                ticker=ticker,  # Pass ticker for timeline
+            )
         _timing["loop_s"] = round(_time.monotonic() - _t0, 2)
+        _timing["engine"] = engine
 
         # Run buy & hold simulation
-        buy_hold_result = self._simulate_buy_hold(sim_data, initial_cash)
+        buy_hold_result = self._run_buy_hold(sim_data, initial_cash, engine)
 
         # Calculate comparison metrics
         excess_return = algo_result["algorithm_return_pct"] - buy_hold_result["buy_hold_return_pct"]
@@ -438,6 +469,7 @@ class SimulationUnifiedUC:
         position_config: Optional[Dict[str, Any]] = None,
         lightweight: bool = False,
         market_storage: Optional[MarketDataStorage] = None,
+        engine: str = "standard",
     ) -> SimulationResult:
         """Run simulation with pre-fetched market data.
 
@@ -445,8 +477,12 @@ class SimulationUnifiedUC:
         over the same date range (e.g., parameter optimization).
 
         When lightweight=True, skips heavy collections (time_series_data,
-        trigger_analysis, price_data, debug info) and does not save to repo.
+        daily_returns, trigger_analysis, price_data, debug info) and does not
+        save to repo; metrics come from return_stats.
+        engine="fast" uses the array-based kernel (see SIMULATION_ENGINES).
         """
+        if engine not in SIMULATION_ENGINES:
+            raise ValueError(f"Unknown simulation engine: {engine}")
         # Default position configuration
         if position_config is None:
             position_config = {
@@ -470,28 +506,100 @@ class SimulationUnifiedUC:
         if not sim_data.price_data:
             raise ValueError(f"No price data available for {ticker} in the specified date range")
 
-        # Use pre-built storage if provided (optimization reuses across combinations)
-        if market_storage is None:
-            market_storage = MarketDataStorage()
-            for price_point in historical_data:
-                market_storage.store_price_data(ticker, price_point)
+        if engine == "fast":
+            # The kernel reads bars straight from sim_data; no storage needed
+            algo_result = self._simulate_algorithm_fast(
+                sim_data,
+                initial_cash,
+                position_config,
+                dividend_history,
+                detailed_trigger_analysis=not lightweight,
+                ticker=ticker,
+                collect_series=not lightweight,
+            )
+        else:
+            # Use pre-built storage if provided (optimization reuses across combinations)
+            if market_storage is None:
+                market_storage = MarketDataStorage()
+                market_storage.store_many(ticker, historical_data)
+
+            # Run algorithm simulation
+            algo_result = self._simulate_algorithm_unified(
+                sim_data,
+                initial_cash,
+                position_config,
+                dividend_history,
+                market_storage,
+                detailed_trigger_analysis=not lightweight,
+                report_progress=None,
+                simulation_id=None,
+                ticker=ticker,
+                collect_series=not lightweight,
+            )
+
+        # Run buy & hold simulation
+        buy_hold_result = self._run_buy_hold(sim_data, initial_cash, engine)
 
-        # Run algorithm simulation
-        algo_result = self._simulate_algorithm_unified(
-            sim_data,
-            initial_cash,
-            position_config,
-            dividend_history,
-            market_storage,
-            detailed_trigger_analysis=not lightweight,
-            report_progress=None,
-            simulation_id=None,
-            ticker=ticker,
+        return self._assemble_result(
+            ticker, start_date, end_date, sim_data, initial_cash, algo_result, buy_hold_result,
+            lightweight,
         )
 
-        # Run buy & hold simulation
-        buy_hold_result = self._simulate_buy_hold(sim_data, initial_cash)
+    def iter_simulation_grid(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        sim_data: SimulationData,
+        dividend_history: list,
+        initial_cash: float,
+        position_configs: List[Dict[str, Any]],
+    ) -> Iterator[Tuple[int, Optional[SimulationResult], Optional[Exception]]]:
+        """Simulate many position configs in one pass over pre-fetched data.
+
+        Equivalent to run_simulation_with_data(lightweight=True, engine="fast")
+        per config, but the price series is walked once for the whole batch
+        (see GridSimulationKernel) and buy & hold is computed once. Yields
+        (index into position_configs, result, error) as each result is built,
+        so callers can persist and drop them one at a time.
+        """
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
+
+        if not sim_data.price_data:
+            raise ValueError(f"No price data available for {ticker} in the specified date range")
 
+        positions = [
+            self._build_simulation_position(sim_data, initial_cash, position_config)
+            for position_config in position_configs
+        ]
+        kernel = GridSimulationKernel(positions, sim_data, dividend_history)
+        kernel.run()
+        buy_hold_result = self._run_buy_hold(sim_data, initial_cash, "fast")
+
+        for index, algo_result, error in kernel.results(initial_cash):
+            if error is not None:
+                yield index, None, error
+                continue
+            yield index, self._assemble_result(
+                ticker, start_date, end_date, sim_data, initial_cash, algo_result,
+                buy_hold_result, lightweight=True,
+            ), None
+
+    def _assemble_result(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime,
+        sim_data: SimulationData,
+        initial_cash: float,
+        algo_result: Dict[str, Any],
+        buy_hold_result: Dict[str, Any],
+        lightweight: bool,
+    ) -> SimulationResult:
+        """SimulationResult for pre-fetched data runs (no price_data / dividend analysis)."""
         # Calculate comparison metrics
         excess_return = algo_result["algorithm_return_pct"] - buy_hold_result["buy_hold_return_pct"]
         alpha = excess_return
@@ -512,7 +620,7 @@ class SimulationUnifiedUC:
             time_series_data = []
             debug_info = []
 
-        result = SimulationResult(
+        return SimulationResult(
             ticker=ticker,
             start_date=start_date,
             end_date=end_date,
@@ -533,8 +641,6 @@ class SimulationUnifiedUC:
             dividend_analysis=None,  # Skip expensive dividend re-fetch
         )
 
-        return result
-
     def _simulate_algorithm_unified(
         self,
         sim_data: SimulationData,
@@ -548,8 +654,13 @@ class SimulationUnifiedUC:
         report_progress: Optional[Callable[[str, float], None]] = None,
         simulation_id: Optional[str] = None,
         ticker: Optional[str] = None,
+        collect_series: bool = True,
     ) -> Dict[str, Any]:
-        """Simulate the volatility balancing algorithm using the actual trading use cases."""
+        """Simulate the volatility balancing algorithm using the actual trading use cases.
+
+        Metrics are accumulated per bar (OnlineMetrics). With collect_series=False
+        no per-bar daily_returns / time_series_data rows are kept.
+        """
         from infrastructure.persistence.memory.positions_repo_mem import InMemoryPositionsRepo
         from infrastructure.persistence.memory.events_repo_mem import InMemoryEventsRepo
 
@@ -598,64 +709,16 @@ class SimulationUnifiedUC:
         )
 
         # Create a temporary position for simulation
-        position_id = f"sim_{uuid4().hex[:8]}"
-        order_policy = OrderPolicy(
-            trigger_threshold_pct=position_config["trigger_threshold_pct"],
-            rebalance_ratio=position_config["rebalance_ratio"],
-            commission_rate=position_config["commission_rate"],
-            min_notional=position_config["min_notional"],
-            allow_after_hours=position_config["allow_after_hours"],
-        )
-        _max_trade = position_config["guardrails"].get("max_trade_pct_of_position", 0.20)
-        guardrails = GuardrailPolicy(
-            min_stock_alloc_pct=position_config["guardrails"]["min_stock_alloc_pct"],
-            max_stock_alloc_pct=position_config["guardrails"]["max_stock_alloc_pct"],
-            max_orders_per_day=999999,  # Unlimited for simulation (clock uses real date, not sim date)
-            max_sell_pct_per_trade=_max_trade,
-            max_buy_pct_per_trade=_max_trade,
-        )
-
-        # Calculate initial position based on asset allocation
-        # Default to 50/50 split if no asset value/units specified
-        initial_qty = 0.0
-        initial_cash_after_asset = initial_cash
-
-        if sim_data.price_data:
-            first_price = sim_data.price_data[0].price
-            if first_price <= 0:
-                raise ValueError(f"Invalid first price: {first_price}")
-
-            if initial_asset_value is not None and initial_asset_value > 0:
-                # Use asset value to calculate shares at first price
-                initial_qty = initial_asset_value / first_price
-                initial_cash_after_asset = initial_cash
-            elif initial_asset_units is not None and initial_asset_units > 0:
-                # Use specified number of units
-                initial_qty = initial_asset_units
-                initial_cash_after_asset = initial_cash
-            else:
-                # Default: 50/50 split between cash and shares
-                # Total value = initial_cash, split equally
-                half_value = initial_cash / 2.0
-                initial_qty = half_value / first_price
-                initial_cash_after_asset = half_value
-                print(f"Using default 50/50 split: {initial_qty:.4f} shares @ ${first_price:.2f} + ${initial_cash_after_asset:.2f} cash")
-
-        position = Position(
-            id=position_id,
-            tenant_id="simulation",  # Simulation uses a synthetic tenant
-            portfolio_id="simulation",  # Simulation uses a synthetic portfolio
-            asset_symbol=sim_data.ticker,  # Use asset_symbol, not ticker
-            qty=initial_qty,
-            cash=initial_cash_after_asset,
-            order_policy=order_policy,
-            guardrails=guardrails,
+        position = self._build_simulation_position(
+            sim_data, initial_cash, position_config, initial_asset_value, initial_asset_units
         )
+        position_id = position.id
+        guardrails = position.guardrails
         temp_positions.save(position)
 
         # Track simulation state
         trade_log = []
-        portfolio_values = []
+        metrics = OnlineMetrics()
         daily_returns = []
         dividend_events = []
         total_dividends_received = 0.0
@@ -991,6 +1054,7 @@ class SimulationUnifiedUC:
                                                 "shares_after": position.qty,
                                             }
                                         )
+                                        metrics.record_trade(order_proposal["commission"])
 
                                         # Mark as executed
                                         trigger_info.update(
@@ -1067,7 +1131,16 @@ class SimulationUnifiedUC:
 
             # Calculate portfolio value
             portfolio_value = position.cash + (position.qty * current_price)
-            portfolio_values.append(portfolio_value)
+            metrics.update(portfolio_value)
+
+            # Debug logging - reduce frequency for better performance
+            if metrics.values % 100 == 0:  # Log every 100th data point instead of 10th
+                print(
+                    f"Progress: {metrics.values} data points processed, Portfolio=${portfolio_value:.2f}"
+                )
+
+            if not collect_series:
+                continue
 
             # Collect comprehensive time-series data for every time point
             # Use delta_pct from evaluation (more accurate than local calculation)
@@ -1126,22 +1199,12 @@ class SimulationUnifiedUC:
                 }
             )
 
-            # Debug logging - reduce frequency for better performance
-            if len(portfolio_values) % 100 == 0:  # Log every 100th data point instead of 10th
-                print(
-                    f"Progress: {len(portfolio_values)} data points processed, Portfolio=${portfolio_value:.2f}"
-                )
-
-            # Calculate daily returns
-            if len(portfolio_values) > 1:
-                if portfolio_values[-2] <= 0:
-                    daily_return = 0.0  # Avoid division by zero
-                else:
-                    daily_return = (portfolio_values[-1] / portfolio_values[-2]) - 1
+            # Daily returns rows (the accumulator already computed the return)
+            if metrics.values > 1:
                 daily_returns.append(
                     {
                         "date": current_time.date().isoformat(),
-                        "return": daily_return,
+                        "return": metrics.last_return,
                         "portfolio_value": portfolio_value,
                         "cash": position.cash,
                         "shares": position.qty,  # Use qty instead of shares
@@ -1151,7 +1214,7 @@ class SimulationUnifiedUC:
                 )
 
         # Calculate final metrics
-        final_value = portfolio_values[-1] if portfolio_values else initial_cash
+        final_value = metrics.last_value if metrics.values else initial_cash
         if initial_cash <= 0:
             raise ValueError(f"Invalid initial cash: {initial_cash}")
         total_return = (final_value - initial_cash) / initial_cash
@@ -1161,29 +1224,26 @@ class SimulationUnifiedUC:
         print(f"  Initial cash: ${initial_cash:.2f}")
         print(f"  Final value: ${final_value:.2f}")
         print(f"  Total return: {total_return * 100:.2f}%")
-        print(f"  Portfolio values count: {len(portfolio_values)}")
-        if portfolio_values:
-            print(f"  First portfolio value: ${portfolio_values[0]:.2f}")
-            print(f"  Last portfolio value: ${portfolio_values[-1]:.2f}")
+        print(f"  Portfolio values count: {metrics.values}")
+        if metrics.values:
+            print(f"  First portfolio value: ${metrics.first_value:.2f}")
+            print(f"  Last portfolio value: ${metrics.last_value:.2f}")
 
         # Debug: Count triggered events
         triggered_count = sum(1 for ts in time_series_data if ts.get("triggered", False))
         print(f"  Time series data points: {len(time_series_data)}")
         print(f"  Triggered events in time_series_data: {triggered_count}")
 
-        volatility = self._calculate_volatility([r["return"] for r in daily_returns])
-        sharpe_ratio = self._calculate_sharpe_ratio(daily_returns)
-        max_drawdown = self._calculate_max_drawdown(portfolio_values)
-
         return {
             "algorithm_trades": len(trade_log),
             "algorithm_pnl": final_value - initial_cash,
             "algorithm_return_pct": total_return * 100,
-            "algorithm_volatility": volatility,
-            "algorithm_sharpe_ratio": sharpe_ratio,
-            "algorithm_max_drawdown": max_drawdown,
+            "algorithm_volatility": metrics.volatility,
+            "algorithm_sharpe_ratio": metrics.sharpe_ratio,
+            "algorithm_max_drawdown": metrics.max_drawdown_pct,
             "trade_log": trade_log,
             "daily_returns": daily_returns,
+            "return_stats": metrics.summary(),
             "total_dividends_received": total_dividends_received,
             "dividend_events": dividend_events,
             "trigger_analysis": trigger_analysis,
@@ -1191,6 +1251,157 @@ class SimulationUnifiedUC:
             "debug_info": debug_info,  # Add debug information
         }
 
+    def _build_simulation_position(
+        self,
+        sim_data: SimulationData,
+        initial_cash: float,
+        position_config: Dict[str, Any],
+        initial_asset_value: Optional[float] = None,
+        initial_asset_units: Optional[float] = None,
+    ) -> Position:
+        """Create the synthetic position a simulation run trades."""
+        position_id = f"sim_{uuid4().hex[:8]}"
+        order_policy = OrderPolicy(
+            trigger_threshold_pct=position_config["trigger_threshold_pct"],
+            rebalance_ratio=position_config["rebalance_ratio"],
+            commission_rate=position_config["commission_rate"],
+            min_notional=position_config["min_notional"],
+            allow_after_hours=position_config["allow_after_hours"],
+        )
+        _max_trade = position_config["guardrails"].get("max_trade_pct_of_position", 0.20)
+        guardrails = GuardrailPolicy(
+            min_stock_alloc_pct=position_config["guardrails"]["min_stock_alloc_pct"],
+            max_stock_alloc_pct=position_config["guardrails"]["max_stock_alloc_pct"],
+            max_orders_per_day=999999,  # Unlimited for simulation (clock uses real date, not sim date)
+            max_sell_pct_per_trade=_max_trade,
+            max_buy_pct_per_trade=_max_trade,
+        )
+
+        # Calculate initial position based on asset allocation
+        # Default to 50/50 split if no asset value/units specified
+        initial_qty = 0.0
+        initial_cash_after_asset = initial_cash
+
+        if sim_data.price_data:
+            first_price = sim_data.price_data[0].price
+            if first_price <= 0:
+                raise ValueError(f"Invalid first price: {first_price}")
+
+            if initial_asset_value is not None and initial_asset_value > 0:
+                # Use asset value to calculate shares at first price
+                initial_qty = initial_asset_value / first_price
+                initial_cash_after_asset = initial_cash
+            elif initial_asset_units is not None and initial_asset_units > 0:
+                # Use specified number of units
+                initial_qty = initial_asset_units
+                initial_cash_after_asset = initial_cash
+            else:
+                # Default: 50/50 split between cash and shares
+                # Total value = initial_cash, split equally
+                half_value = initial_cash / 2.0
+                initial_qty = half_value / first_price
+                initial_cash_after_asset = half_value
+                print(f"Using default 50/50 split: {initial_qty:.4f} shares @ ${first_price:.2f} + ${initial_cash_after_asset:.2f} cash")
+
+        return Position(
+            id=position_id,
+            tenant_id="simulation",  # Simulation uses a synthetic tenant
+            portfolio_id="simulation",  # Simulation uses a synthetic portfolio
+            asset_symbol=sim_data.ticker,  # Use asset_symbol, not ticker
+            qty=initial_qty,
+            cash=initial_cash_after_asset,
+            order_policy=order_policy,
+            guardrails=guardrails,
+        )
+
+    def _simulate_algorithm_fast(
+        self,
+        sim_data: SimulationData,
+        initial_cash: float,
+        position_config: Dict[str, Any],
+        dividend_history: List[Dividend] = None,
+        detailed_trigger_analysis: bool = False,
+        initial_asset_value: Optional[float] = None,
+        initial_asset_units: Optional[float] = None,
+        report_progress: Optional[Callable[[str, float], None]] = None,
+        simulation_id: Optional[str] = None,
+        ticker: Optional[str] = None,
+        collect_series: bool = True,
+    ) -> Dict[str, Any]:
+        """Array-based equivalent of _simulate_algorithm_unified (engine="fast").
+
+        Returns the same result dict. With collect_series=False the per-bar
+        time_series_data / trigger_analysis / debug_info lists are left empty.
+        """
+
+        def safe_report_progress(message: str, percentage: float):
+            if report_progress:
+                try:
+                    report_progress(message, percentage)
+                except Exception:
+                    pass  # Ignore progress reporting errors
+
+        position = self._build_simulation_position(
+            sim_data, initial_cash, position_config, initial_asset_value, initial_asset_units
+        )
+
+        on_trigger = on_fill = None
+        if self.evaluation_timeline_repo and simulation_id:
+            timeline_ticker = ticker or sim_data.ticker
+            threshold_info = (
+                {"trigger_threshold": position.order_policy.trigger_threshold_pct * 100}
+                if detailed_trigger_analysis
+                else {}
+            )
+
+            def on_trigger(pos, price_data, evaluation):
+                self._write_simulation_timeline_row(
+                    position=pos,
+                    price_data=price_data,
+                    evaluation=evaluation,
+                    trigger_info=threshold_info,
+                    order_proposal=evaluation.get("order_proposal"),
+                    execution_info=None,
+                    simulation_id=simulation_id,
+                    ticker=timeline_ticker,
+                    timestamp=price_data.timestamp,
+                )
+
+            def on_fill(pos, price_data, order_proposal):
+                self._update_simulation_timeline_execution(
+                    position=pos,
+                    price_data=price_data,
+                    order_id=None,  # The kernel does not create order records
+                    trade_id=None,
+                    execution_price=price_data.price,
+                    execution_qty=order_proposal["trimmed_qty"],
+                    execution_commission=order_proposal["commission"],
+                    simulation_id=simulation_id,
+                    ticker=timeline_ticker,
+                    timestamp=price_data.timestamp,
+                )
+
+        safe_report_progress("Starting simulation loop...", 20.0)
+        kernel = SimulationKernel(
+            position,
+            sim_data,
+            dividend_history=dividend_history,
+            detailed_trigger_analysis=detailed_trigger_analysis,
+            collect_series=collect_series,
+            report_progress=safe_report_progress,
+            on_trigger=on_trigger,
+            on_fill=on_fill,
+        )
+        return kernel.run(initial_cash)
+
+    def _run_buy_hold(
+        self, sim_data: SimulationData, initial_cash: float, engine: str = "standard"
+    ) -> Dict[str, Any]:
+        """Buy & hold benchmark for the given engine."""
+        if engine == "fast":
+            return simulate_buy_hold(bar_prices(sim_data.price_data), initial_cash)
+        return self._simulate_buy_hold(sim_data, initial_cash)
+
     def _simulate_buy_hold(self, sim_data: SimulationData, initial_cash: float) -> Dict[str, Any]:
         """Simulate buy and hold strategy."""
         if not sim_data.price_data:
@@ -1212,91 +1423,22 @@ class SimulationUnifiedUC:
         shares = initial_cash / first_price
         cash = 0.0
 
-        # Track portfolio values
-        portfolio_values = []
-        daily_returns = []
-
+        metrics = OnlineMetrics()
         for price_data in sim_data.price_data:
-            current_price = price_data.price
-            portfolio_value = cash + (shares * current_price)
-            portfolio_values.append(portfolio_value)
-
-            # Calculate daily returns
-            if len(portfolio_values) > 1:
-                if portfolio_values[-2] <= 0:
-                    daily_return = 0.0  # Avoid division by zero
-                else:
-                    daily_return = (portfolio_values[-1] / portfolio_values[-2]) - 1
-                daily_returns.append(
-                    {
-                        "date": price_data.timestamp.date().isoformat(),
-                        "return": daily_return,
-                        "portfolio_value": portfolio_value,
-                    }
-                )
+            metrics.update(cash + (shares * price_data.price))
 
         # Calculate final metrics
-        final_value = portfolio_values[-1] if portfolio_values else initial_cash
-        if initial_cash <= 0:
-            raise ValueError(f"Invalid initial cash for buy-hold: {initial_cash}")
+        final_value = metrics.last_value
         total_return = (final_value - initial_cash) / initial_cash
-        volatility = self._calculate_volatility([r["return"] for r in daily_returns])
-        sharpe_ratio = self._calculate_sharpe_ratio(daily_returns)
-        max_drawdown = self._calculate_max_drawdown(portfolio_values)
 
         return {
             "buy_hold_pnl": final_value - initial_cash,
             "buy_hold_return_pct": total_return * 100,
-            "buy_hold_volatility": volatility,
-            "buy_hold_sharpe_ratio": sharpe_ratio,
-            "buy_hold_max_drawdown": max_drawdown,
+            "buy_hold_volatility": metrics.volatility,
+            "buy_hold_sharpe_ratio": metrics.sharpe_ratio,
+            "buy_hold_max_drawdown": metrics.max_drawdown_pct,
         }
 
-    def _calculate_volatility(self, returns: List[float]) -> float:
-        """Calculate volatility from returns."""
-        if len(returns) < 2:
-            return 0.0
-
-        import statistics
-
-        return statistics.stdev(returns) * (252**0.5)  # Annualized
-
-    def _calculate_sharpe_ratio(self, daily_returns: List[Dict[str, Any]]) -> float:
-        """Calculate Sharpe ratio."""
-        if not daily_returns:
-            return 0.0
-
-        returns = [r["return"] for r in daily_returns]
-        if len(returns) < 2:
-            return 0.0
-
-        import statistics
-
-        mean_return = statistics.mean(returns)
-        std_return = statistics.stdev(returns)
-
-        if std_return == 0:
-            return 0.0
-
-        # Annualized Sharpe ratio (assuming 252 trading days)
-        return (mean_return * 252) / (std_return * (252**0.5))
-
-    def _calculate_max_drawdown(self, portfolio_values: List[float]) -> float:
-        """Calculate maximum drawdown."""
-        if not portfolio_values:
-            return 0.0
-
-        peak = portfolio_values[0]
-        max_dd = 0.0
-
-        for value in portfolio_values:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            max_dd = max(max_dd, drawdown)
-
-        return max_dd * 100  # Return as percentage
-
     def _calculate_dividend_analysis(
         self,
         ticker: str,
@@ -8,6 +8,7 @@ from typing import Any, Dict
 from typing import Optional, Callable
 
 from application.dto.orders import CreateOrderRequest, CreateOrderResponse
+from application.dto.position_context import PositionContext
 from domain.entities.order import Order
 from domain.entities.event import Event
 from domain.errors import IdempotencyConflict
@@ -56,11 +57,19 @@ class SubmitOrderUC:
         position_id: str,
         request: CreateOrderRequest,
         idempotency_key: str,
+        context: Optional[PositionContext] = None,
     ) -> CreateOrderResponse:
+        # A trading cycle passes the position, configs and order count it already loaded
+        if context is not None and context.position_id != position_id:
+            context = None
+
         # 1) Validate position
-        pos = self.positions.get(
-            tenant_id=tenant_id, portfolio_id=portfolio_id, position_id=position_id
-        )
+        if context is not None and context.position is not None:
+            pos = context.position
+        else:
+            pos = self.positions.get(
+                tenant_id=tenant_id, portfolio_id=portfolio_id, position_id=position_id
+            )
         if not pos:
             from domain.errors import PositionNotFound
 
@@ -84,7 +93,12 @@ class SubmitOrderUC:
         # 3) Daily cap guardrail
         # Get guardrail config from provider or fall back to extracting from Position (backward compat)
         if self.guardrail_config_provider:
-            guardrail_config = self.guardrail_config_provider(tenant_id, portfolio_id, position_id)
+            if context is not None and context.guardrail_config is not None:
+                guardrail_config = context.guardrail_config
+            else:
+                guardrail_config = self.guardrail_config_provider(
+                    tenant_id, portfolio_id, position_id
+                )
         else:
             # Fallback: extract from Position entity (for backward compatibility)
             guardrail_config = guardrail_policy_to_guardrail_config(pos.guardrails)
@@ -97,7 +111,10 @@ class SubmitOrderUC:
         )
 
         today = self.clock.now().date()
-        if self.orders.count_for_position_on_day(position_id, today) >= max_orders_per_day:
+        orders_today = context.order_count_on(today) if context is not None else None
+        if orders_today is None:
+            orders_today = self.orders.count_for_position_on_day(position_id, today)
+        if orders_today >= max_orders_per_day:
             from domain.errors import GuardrailBreach
 
             raise GuardrailBreach("daily_order_cap_exceeded")
@@ -142,6 +159,12 @@ class SubmitOrderUC:
             commission_estimated=commission_estimated,
         )
         self.orders.save(order)
+        if context is not None:
+            # Keep the cycle's view in step with the order just created
+            if context.open_orders is not None:
+                context.open_orders.insert(0, order)
+            if context.orders_day == today and context.orders_today is not None:
+                context.orders_today += 1
 
         # Finalize idempotency outcome
         self.idempotency.put(scoped_key, order_id, sig)
@@ -8,6 +8,7 @@ import pytest
 os.environ.setdefault("APP_PERSISTENCE", "memory")
 os.environ.setdefault("APP_EVENTS", "memory")
 os.environ.setdefault("APP_IDEMPOTENCY", "memory")
+os.environ.setdefault("BAR_CACHE_DIR", "")  # no on-disk bar cache in tests
 os.environ.setdefault("SQL_URL", "sqlite:///./vb_test.sqlite")
 os.environ.setdefault("APP_AUTO_CREATE", "0")
 os.environ.setdefault("TRADING_WORKER_ENABLED", "false")
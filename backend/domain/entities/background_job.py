@@ -0,0 +1,57 @@
+# =========================
+# backend/domain/entities/background_job.py
+# =========================
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.completed, JobStatus.failed, JobStatus.cancelled)
+
+
+# Lower runs first
+class JobPriority:
+    HIGH = 0
+    NORMAL = 10
+    LOW = 20
+
+
+@dataclass
+class BackgroundJob:
+    """A unit of background work (simulation, optimization run) and its outcome."""
+
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    priority: int = JobPriority.NORMAL
+    status: JobStatus = JobStatus.queued
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+
+    @staticmethod
+    def new(kind: str, payload: Dict[str, Any], priority: int = JobPriority.NORMAL) -> BackgroundJob:
+        return BackgroundJob(id=str(uuid.uuid4()), kind=kind, payload=payload, priority=priority)
+
+    @property
+    def elapsed_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at or datetime.now(timezone.utc)
+        return round((end - self.started_at).total_seconds(), 1)
@@ -4,7 +4,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from enum import Enum
 
 
@@ -17,9 +17,13 @@ class PriceSource(Enum):
     ASK = "ask"
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceData:
-    """Market price data with metadata."""
+    """Market price data with metadata.
+
+    Slotted: simulations hold one per bar. Long series are better kept as a
+    PriceSeries, which stores the fields as columns.
+    """
 
     ticker: str
     price: float
@@ -81,14 +85,18 @@ class VolatilityData:
 
 @dataclass
 class SimulationData:
-    """Data structure for simulation and backtesting."""
+    """Data structure for simulation and backtesting.
+
+    The price sequences are PriceSeries when built by MarketDataStorage;
+    plain lists are accepted too.
+    """
 
     ticker: str
     start_date: datetime
     end_date: datetime
-    price_data: List[PriceData]
+    price_data: Sequence[PriceData]
     daily_summaries: List[DailySummary]
     volatility_data: List[VolatilityData]
     total_trading_days: int
-    market_hours_data: List[PriceData]
-    after_hours_data: List[PriceData]
+    market_hours_data: Sequence[PriceData]
+    after_hours_data: Sequence[PriceData]
@@ -19,6 +19,9 @@ OrderStatus = Literal[
     "cancelled",    # Cancelled by user or system
 ]
 
+# Orders that are still in flight and block a new order for the same position
+OPEN_ORDER_STATUSES = frozenset({"created", "submitted", "pending", "working", "partial"})
+
 
 @dataclass
 class Order:
@@ -0,0 +1,250 @@
+# =========================
+# backend/domain/entities/price_series.py
+# =========================
+"""
+Struct-of-arrays container for long PriceData series.
+
+Simulations, MarketDataStorage and the optimization prefetch hold hundreds of
+thousands of bars. As objects every bar costs two datetimes, an enum and up to
+eleven floats; a ``PriceSeries`` keeps each field as one NumPy column instead
+(float64 values with NaN for missing, int64 UTC epoch-ns times, bool flags,
+int8 source codes) and builds a PriceData only when an element is read. Built
+points are not kept, so iterating a series never holds more than the current
+bar. Slices share the columns with their parent.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from domain.entities.market_data import PriceData, PriceSource
+
+# Float columns; missing values are NaN. ``last_trade_price`` defaults to ``price``.
+COLUMNS = ("price", "bid", "ask", "open", "high", "low", "close", "volume")
+FLOAT_COLUMNS = COLUMNS + ("last_trade_price",)
+
+# ``last_trade_times`` value for a point without a last trade time
+NO_TIME = np.iinfo(np.int64).min
+
+_SOURCES = tuple(PriceSource)
+SOURCE_CODES = {source: code for code, source in enumerate(_SOURCES)}
+_LAST_TRADE = SOURCE_CODES[PriceSource.LAST_TRADE]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class PriceSeries(Sequence):
+    """Read-only, chronological sequence of PriceData backed by NumPy columns.
+
+    Only ``timestamps``, ``is_market_hours`` and the ``price`` column are
+    required. Omitted fields default to how history bars are built: a fresh,
+    inline LAST_TRADE point whose last trade is the bar itself.
+    """
+
+    __slots__ = (
+        "ticker",
+        "timestamps",
+        "is_market_hours",
+        "columns",
+        "is_fresh",
+        "is_inline",
+        "sources",
+        "last_trade_times",
+    )
+
+    def __init__(
+        self,
+        ticker: str,
+        timestamps: np.ndarray,
+        is_market_hours: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        is_fresh: Optional[np.ndarray] = None,
+        is_inline: Optional[np.ndarray] = None,
+        sources: Optional[np.ndarray] = None,
+        last_trade_times: Optional[np.ndarray] = None,
+    ) -> None:
+        self.ticker = ticker
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        n = len(self.timestamps)
+        self.is_market_hours = np.asarray(is_market_hours, dtype=bool)
+        self.columns = {
+            name: np.asarray(columns[name], dtype=np.float64)
+            if name in columns
+            else np.full(n, np.nan)
+            for name in COLUMNS
+        }
+        self.columns["last_trade_price"] = np.asarray(
+            columns.get("last_trade_price", self.columns["price"]), dtype=np.float64
+        )
+        self.is_fresh = _flags(is_fresh, n)
+        self.is_inline = _flags(is_inline, n)
+        self.sources = (
+            np.full(n, _LAST_TRADE, dtype=np.int8)
+            if sources is None
+            else np.asarray(sources, dtype=np.int8)
+        )
+        self.last_trade_times = (
+            self.timestamps
+            if last_trade_times is None
+            else np.asarray(last_trade_times, dtype=np.int64)
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_points(cls, ticker: str, points: Iterable[PriceData]) -> "PriceSeries":
+        """Columns of existing PriceData objects, in the given order."""
+        if isinstance(points, PriceSeries):
+            return points
+        points = list(points)
+        n = len(points)
+        return cls(
+            ticker,
+            np.fromiter((to_ns(p.timestamp) for p in points), dtype=np.int64, count=n),
+            np.fromiter((bool(p.is_market_hours) for p in points), dtype=bool, count=n),
+            # float64 conversion maps None to NaN
+            {
+                name: np.array([getattr(p, name) for p in points], dtype=np.float64)
+                for name in FLOAT_COLUMNS
+            },
+            is_fresh=np.fromiter((bool(p.is_fresh) for p in points), dtype=bool, count=n),
+            is_inline=np.fromiter((bool(p.is_inline) for p in points), dtype=bool, count=n),
+            sources=np.fromiter((SOURCE_CODES[p.source] for p in points), dtype=np.int8, count=n),
+            last_trade_times=np.fromiter(
+                (NO_TIME if p.last_trade_time is None else to_ns(p.last_trade_time)
+                 for p in points),
+                dtype=np.int64,
+                count=n,
+            ),
+        )
+
+    @classmethod
+    def concat(cls, ticker: str, parts: List["PriceSeries"]) -> "PriceSeries":
+        """Join series in order."""
+        parts = [part for part in parts if len(part)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return cls.empty(ticker)
+        return cls(
+            ticker,
+            np.concatenate([part.timestamps for part in parts]),
+            np.concatenate([part.is_market_hours for part in parts]),
+            {
+                name: np.concatenate([part.columns[name] for part in parts])
+                for name in FLOAT_COLUMNS
+            },
+            is_fresh=np.concatenate([part.is_fresh for part in parts]),
+            is_inline=np.concatenate([part.is_inline for part in parts]),
+            sources=np.concatenate([part.sources for part in parts]),
+            last_trade_times=np.concatenate([part.last_trade_times for part in parts]),
+        )
+
+    @classmethod
+    def empty(cls, ticker: str) -> "PriceSeries":
+        return cls(ticker, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool), {})
+
+    # ------------------------------------------------------------------
+    # Sequence
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(index)
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("PriceSeries index out of range")
+        return self.point(index)
+
+    def __iter__(self) -> Iterator[PriceData]:
+        for i in range(len(self)):
+            yield self.point(i)
+
+    def __repr__(self) -> str:
+        return f"PriceSeries(ticker={self.ticker!r}, bars={len(self)})"
+
+    # ------------------------------------------------------------------
+    # Columns and views
+    # ------------------------------------------------------------------
+    @property
+    def prices(self) -> np.ndarray:
+        return self.columns["price"]
+
+    def take(self, index) -> "PriceSeries":
+        """Sub-series for a slice (shares the columns), a bool mask or indices (copies)."""
+        return PriceSeries(
+            self.ticker,
+            self.timestamps[index],
+            self.is_market_hours[index],
+            {name: column[index] for name, column in self.columns.items()},
+            is_fresh=self.is_fresh[index],
+            is_inline=self.is_inline[index],
+            sources=self.sources[index],
+            last_trade_times=self.last_trade_times[index],
+        )
+
+    def datetimes(self) -> List[datetime]:
+        """Timestamps as UTC-aware datetimes."""
+        naive = (self.timestamps // 1_000).astype("datetime64[us]").tolist()
+        return [t.replace(tzinfo=timezone.utc) for t in naive]
+
+    def point(self, i: int) -> PriceData:
+        """PriceData for element ``i``; built on every call and not kept."""
+        columns = self.columns
+        ts = int(self.timestamps[i])
+        timestamp = from_ns(ts)
+        last_trade = int(self.last_trade_times[i])
+        volume = columns["volume"][i]
+        return PriceData(
+            ticker=self.ticker,
+            price=float(columns["price"][i]),
+            source=_SOURCES[self.sources[i]],
+            timestamp=timestamp,
+            bid=_optional(columns["bid"][i]),
+            ask=_optional(columns["ask"][i]),
+            volume=None if np.isnan(volume) else int(volume),
+            last_trade_price=_optional(columns["last_trade_price"][i]),
+            last_trade_time=(
+                timestamp
+                if last_trade == ts
+                else None
+                if last_trade == NO_TIME
+                else from_ns(last_trade)
+            ),
+            is_market_hours=bool(self.is_market_hours[i]),
+            is_fresh=bool(self.is_fresh[i]),
+            is_inline=bool(self.is_inline[i]),
+            open=_optional(columns["open"][i]),
+            high=_optional(columns["high"][i]),
+            low=_optional(columns["low"][i]),
+            close=_optional(columns["close"][i]),
+        )
+
+
+def to_ns(timestamp: datetime) -> int:
+    """UTC nanoseconds since the epoch; naive timestamps are treated as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+def from_ns(ts_ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ts_ns // 1_000)
+
+
+def _flags(values: Optional[np.ndarray], n: int) -> np.ndarray:
+    return np.ones(n, dtype=bool) if values is None else np.asarray(values, dtype=bool)
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
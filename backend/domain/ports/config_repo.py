@@ -4,7 +4,7 @@
 """Port for configuration repository."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from enum import Enum
 
 from domain.value_objects.configs import TriggerConfig, GuardrailConfig, OrderPolicyConfig
@@ -111,3 +111,22 @@ class ConfigRepo(ABC):
     ) -> None:
         """Set order policy configuration for a position."""
         pass
+
+    # Bulk reads. Positions without a saved config are left out of the result.
+    # Implementations backed by a database should override these with one query.
+    def get_trigger_configs(self, position_ids: Iterable[str]) -> Dict[str, TriggerConfig]:
+        """Get trigger configurations for several positions."""
+        configs = {pid: self.get_trigger_config(pid) for pid in position_ids}
+        return {pid: config for pid, config in configs.items() if config is not None}
+
+    def get_guardrail_configs(self, position_ids: Iterable[str]) -> Dict[str, GuardrailConfig]:
+        """Get guardrail configurations for several positions."""
+        configs = {pid: self.get_guardrail_config(pid) for pid in position_ids}
+        return {pid: config for pid, config in configs.items() if config is not None}
+
+    def get_order_policy_configs(
+        self, position_ids: Iterable[str]
+    ) -> Dict[str, OrderPolicyConfig]:
+        """Get order policy configurations for several positions."""
+        configs = {pid: self.get_order_policy_config(pid) for pid in position_ids}
+        return {pid: config for pid, config in configs.items() if config is not None}
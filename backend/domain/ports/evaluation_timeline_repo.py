@@ -4,7 +4,7 @@
 """Port for PositionEvaluationTimeline repository operations."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 
 
@@ -24,6 +24,17 @@ class EvaluationTimelineRepo(ABC):
         """
         ...
 
+    def save_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Save several evaluation records; returns their IDs in order.
+
+        Default implementation saves one at a time. SQL implementations
+        override it with a single multi-row insert.
+        """
+        return [self.save(row) for row in rows]
+
+    def flush(self) -> None:
+        """Write out any records buffered by save(); no-op for unbuffered repos."""
+
     @abstractmethod
     def get_by_id(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
         """Get an evaluation record by ID."""
@@ -72,6 +83,30 @@ class EvaluationTimelineRepo(ABC):
         """List evaluation records for a portfolio."""
         ...
 
+    def iter_by_portfolio(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        mode: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield a portfolio's evaluation records oldest first.
+
+        Default implementation sorts list_by_portfolio. SQL implementations
+        override it with a cursor that fetches ``batch_size`` rows at a time.
+        """
+        rows = self.list_by_portfolio(
+            tenant_id=tenant_id,
+            portfolio_id=portfolio_id,
+            mode=mode,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        rows.sort(key=lambda r: r.get("timestamp") or datetime.min)
+        yield from rows
+
     @abstractmethod
     def list_by_trace_id(self, trace_id: str) -> List[Dict[str, Any]]:
         """List all evaluation records for a trace_id."""
@@ -2,10 +2,12 @@
 # backend/domain/ports/events_repo.py
 # =========================
 
-from typing import Protocol, Iterable
+from typing import Protocol, Iterable, Iterator
 from domain.entities.event import Event
 
 class EventsRepo(Protocol):
     def append(self, event: Event) -> None: ...
     def list_for_position(self, position_id: str, limit: int = 100) -> Iterable[Event]: ...
+    # Every event of a position, newest first, fetched batch_size rows at a time
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Event]: ...
     def clear(self) -> None: ...
@@ -0,0 +1,27 @@
+# =========================
+# backend/domain/ports/job_store.py
+# =========================
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from domain.entities.background_job import BackgroundJob
+
+
+class JobStore(ABC):
+    """Persistent state of background jobs."""
+
+    @abstractmethod
+    def save(self, job: BackgroundJob) -> None: ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[BackgroundJob]: ...
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None: ...
+
+    @abstractmethod
+    def list_unfinished(self) -> List[BackgroundJob]:
+        """Queued and running jobs, oldest first."""
+        ...
@@ -1,18 +1,26 @@
 # =========================
 # backend/domain/ports/orders_repo.py
 # =========================
-from typing import Protocol, Iterable, Optional
+from typing import Dict, Iterator, List, Protocol, Iterable, Optional
 from datetime import date, datetime
 from domain.entities.order import Order
 
 
 class OrdersRepo(Protocol):
     def get(self, order_id: str) -> Optional[Order]: ...
+    def get_many(self, order_ids: Iterable[str]) -> Dict[str, Order]: ...
     def save(self, order: Order) -> None: ...
     def count_for_position_on_day(self, position_id: str, day: date) -> int: ...
     def list_for_position(self, position_id: str, limit: int = 100) -> Iterable[Order]: ...
+    # Every order of a position, newest first, fetched batch_size rows at a time
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Order]: ...
     def list_all(self) -> Iterable[Order]: ...
     def clear(self) -> None: ...
     def count_for_position_between(
         self, position_id: str, start: datetime, end: datetime
     ) -> int: ...
+    # Bulk reads for a trading cycle; positions without matches are omitted
+    def list_open_for_positions(self, position_ids: Iterable[str]) -> Dict[str, List[Order]]: ...
+    def count_for_positions_on_day(
+        self, position_ids: Iterable[str], day: date
+    ) -> Dict[str, int]: ...
@@ -0,0 +1,54 @@
+# =========================
+# backend/domain/ports/position_snapshot_repo.py
+# =========================
+"""
+Port for the per-position snapshot rollup of the evaluation timeline.
+
+Each snapshot summarises one position over one time bucket (hour, day or ISO
+week, UTC): the last total/stock/cash values, open/high/low/close of the
+total value, and how many evaluations, trades and dividends fell in it.
+Timeline writes fold their rows in as they are saved; ``rebuild`` recomputes
+the rollup from the timeline table (backfill, or repair after a failed fold).
+
+Snapshots are plain dicts keyed by the columns of the position_snapshots
+table.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class PositionSnapshotRepo(ABC):
+    """Repository interface for the position snapshot rollup."""
+
+    @abstractmethod
+    def record(self, rows: List[Dict[str, Any]]) -> None:
+        """Fold newly saved timeline rows into their hourly, daily and weekly snapshots."""
+        ...
+
+    @abstractmethod
+    def list_snapshots(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        resolution: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        position_id: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Snapshots whose bucket overlaps [start_date, end_date], oldest bucket first."""
+        ...
+
+    @abstractmethod
+    def rebuild(
+        self, tenant_id: Optional[str] = None, portfolio_id: Optional[str] = None
+    ) -> int:
+        """Recompute the rollup from the timeline (optionally one tenant/portfolio).
+
+        Returns the number of snapshots written.
+        """
+        ...
@@ -2,7 +2,7 @@
 # backend/domain/ports/positions_repo.py
 # =========================
 
-from typing import Protocol, Optional, List
+from typing import Iterable, List, Optional, Protocol
 from domain.entities.position import Position
 
 
@@ -29,6 +29,10 @@ class PositionsRepo(Protocol):
         """Save (create or update) a position."""
         ...
 
+    def save_many(self, positions: Iterable[Position]) -> None:
+        """Save (create or update) several positions at once."""
+        ...
+
     def delete(self, tenant_id: str, portfolio_id: str, position_id: str) -> bool:
         """Delete a position by ID, scoped to tenant and portfolio."""
         ...
@@ -3,11 +3,25 @@
 # =========================
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.simulation_result import SimulationResult
 
+# Per-bar/per-trade row lists of a SimulationResult
+SERIES_FIELDS = ("trade_log", "daily_returns", "price_data", "trigger_analysis", "time_series_data")
+
+
+def check_series_names(series: Optional[Sequence[str]]) -> Sequence[str]:
+    """Default to every series; raise ValueError for names that are not series."""
+    if not series:
+        return SERIES_FIELDS
+    unknown = [name for name in series if name not in SERIES_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown series: {', '.join(unknown)}")
+    return series
+
 
 class SimulationRepo(ABC):
     """Repository interface for simulation results."""
@@ -22,6 +36,18 @@ class SimulationRepo(ABC):
         """Get a simulation result by ID."""
         pass
 
+    @abstractmethod
+    def get_simulation_series(
+        self,
+        result_id: UUID,
+        series: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Get series of a result (all by default), limited to row keys and a time range."""
+        pass
+
     @abstractmethod
     def run_simulation(
         self, ticker: str, start_date: str, end_date: str, parameters: Dict[str, Any]
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from domain.entities.trade import Trade
 
@@ -27,11 +27,21 @@ class TradesRepo(ABC):
         """List trades for a position, ordered by execution time (newest first)."""
         pass
 
+    @abstractmethod
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Trade]:
+        """Yield every trade for a position (newest first), batch_size rows at a time."""
+        pass
+
     @abstractmethod
     def list_for_order(self, order_id: str) -> List[Trade]:
         """List trades for an order (typically 1 trade per order)."""
         pass
 
+    @abstractmethod
+    def list_for_orders(self, order_ids: Iterable[str]) -> Dict[str, List[Trade]]:
+        """List trades for several orders, keyed by order ID (orders without trades are omitted)."""
+        pass
+
     @abstractmethod
     def clear(self) -> None:
         """Clear all trades (test helper)."""
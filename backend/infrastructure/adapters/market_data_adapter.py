@@ -3,6 +3,8 @@
 # =========================
 """Adapter implementing IMarketDataProvider using existing MarketDataRepo."""
 
+from typing import Iterable
+
 from application.ports.market_data import IMarketDataProvider
 from domain.ports.market_data import MarketDataRepo
 from domain.value_objects.market import MarketQuote
@@ -29,3 +31,8 @@ class YFinanceMarketDataAdapter(IMarketDataProvider):
             raise ValueError(f"Could not fetch market data for {ticker}")
 
         return price_data_to_market_quote(price_data)
+
+    def prefetch_quotes(self, tickers: Iterable[str]) -> None:
+        """Fetch distinct tickers concurrently when the repository supports batching."""
+        if hasattr(self.market_data_repo, "get_reference_prices"):
+            self.market_data_repo.get_reference_prices(tickers)
@@ -7,6 +7,7 @@ from decimal import Decimal
 from typing import Optional
 import logging
 
+from application.dto.position_context import PositionContext
 from application.ports.orders import IOrderService
 from domain.value_objects.trade_intent import TradeIntent
 from domain.value_objects.market import MarketQuote
@@ -45,6 +46,7 @@ class LiveOrderServiceAdapter(IOrderService):
         tenant_id: str,
         trade_intent: TradeIntent,
         quote: MarketQuote,
+        context: Optional[PositionContext] = None,
     ) -> str:
         """
         Live trading.
@@ -76,6 +78,7 @@ class LiveOrderServiceAdapter(IOrderService):
             position_id=position_id,
             request=request,
             idempotency_key=idempotency_key,
+            context=context,
         )
 
         # If broker integration is configured, submit to broker
@@ -85,13 +88,16 @@ class LiveOrderServiceAdapter(IOrderService):
             if order:
                 logger.info(f"Order {order.id} found, submitting to broker")
                 try:
-                    # Get symbol from position (we need to look it up)
-                    position = self.submit_order_uc.positions.get(
-                        tenant_id=tenant_id,
-                        portfolio_id=portfolio_id,
-                        position_id=position_id,
-                    )
-                    symbol = position.asset_symbol if position else "UNKNOWN"
+                    # Get symbol from the cycle context or the position
+                    if context is not None and context.position_id == position_id:
+                        symbol = context.ticker
+                    else:
+                        position = self.submit_order_uc.positions.get(
+                            tenant_id=tenant_id,
+                            portfolio_id=portfolio_id,
+                            position_id=position_id,
+                        )
+                        symbol = position.asset_symbol if position else "UNKNOWN"
                     logger.info(f"Position found: {symbol}, calling broker.submit_order_to_broker")
 
                     broker_response = self.broker_integration.submit_order_to_broker(
@@ -3,13 +3,20 @@
 # =========================
 """Adapter implementing IPositionRepository using existing PositionsRepo."""
 
-from typing import Iterable, Optional
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+from application.dto.position_context import PositionContext
 from application.ports.repos import IPositionRepository
+from domain.entities.portfolio import Portfolio
+from domain.entities.position import Position
+from domain.ports.config_repo import ConfigRepo
+from domain.ports.orders_repo import OrdersRepo
 from domain.ports.positions_repo import PositionsRepo
 from domain.ports.portfolio_repo import PortfolioRepo
 from domain.value_objects.position_state import PositionState
 from infrastructure.adapters.converters import position_to_position_state
+from infrastructure.time.clock import Clock
 
 
 class PositionRepoAdapter(IPositionRepository):
@@ -20,6 +27,9 @@ class PositionRepoAdapter(IPositionRepository):
         positions_repo: PositionsRepo,
         portfolio_repo: Optional[PortfolioRepo] = None,
         default_tenant_id: str = "default",
+        config_repo: Optional[ConfigRepo] = None,
+        orders_repo: Optional[OrdersRepo] = None,
+        clock: Optional[Clock] = None,
     ):
         """
         Initialize adapter with existing positions repository.
@@ -28,41 +38,101 @@ class PositionRepoAdapter(IPositionRepository):
             positions_repo: Existing PositionsRepo implementation (SQL or Memory)
             portfolio_repo: Portfolio repository to get active portfolios (optional, for trading)
             default_tenant_id: Default tenant ID to use when portfolio_repo is not available
+            config_repo: Preloads per-position configs into trading contexts (optional)
+            orders_repo: Preloads open orders and today's order count (optional)
+            clock: Decides which day "today" is for the order count (defaults to UTC now)
         """
         self.positions_repo = positions_repo
         self.portfolio_repo = portfolio_repo
         self.default_tenant_id = default_tenant_id
+        self.config_repo = config_repo
+        self.orders_repo = orders_repo
+        self.clock = clock
 
     def get_active_positions_for_trading(self) -> Iterable[str]:
         """Return identifiers for positions that should be considered in live trading.
 
         Iterates over portfolios in RUNNING state and returns all positions with anchor_price set.
         """
-        position_ids = []
+        # Without a portfolio_repo we can't get portfolio-scoped positions (legacy mode)
+        return [position.id for _, position in self._active_positions()]
 
-        if self.portfolio_repo:
-            # Get all portfolios for default tenant (or iterate over all tenants if needed)
-            # For now, use default tenant. In production, this should iterate over all tenants
-            portfolios = self.portfolio_repo.list_all(tenant_id=self.default_tenant_id)
+    def get_trading_contexts(self) -> List[PositionContext]:
+        """Return contexts for the active positions with everything an evaluation reads.
 
-            # Filter to only RUNNING portfolios
-            running_portfolios = [p for p in portfolios if p.trading_state == "RUNNING"]
-
-            # Get positions for each running portfolio
-            for portfolio in running_portfolios:
-                positions = self.positions_repo.list_all(
-                    tenant_id=portfolio.tenant_id,
-                    portfolio_id=portfolio.id,
-                )
-                # Only include positions with anchor_price set
-                position_ids.extend([pos.id for pos in positions if pos.anchor_price is not None])
+        Costs one portfolio query, one positions query per RUNNING portfolio,
+        with a config_repo one query per config kind and with an orders_repo
+        one query each for open orders and today's order counts - independent
+        of how many positions are evaluated afterwards.
+        """
+        contexts = [
+            PositionContext(
+                position_id=position.id,
+                ticker=position.asset_symbol,
+                tenant_id=portfolio.tenant_id,
+                portfolio_id=portfolio.id,
+                position=position,
+                portfolio=portfolio,
+            )
+            for portfolio, position in self._active_positions()
+        ]
+        if self.config_repo and contexts:
+            position_ids = [context.position_id for context in contexts]
+            triggers = self.config_repo.get_trigger_configs(position_ids)
+            guardrails = self.config_repo.get_guardrail_configs(position_ids)
+            order_policies = self.config_repo.get_order_policy_configs(position_ids)
+            for context in contexts:
+                context.trigger_config = triggers.get(context.position_id)
+                context.guardrail_config = guardrails.get(context.position_id)
+                context.order_policy_config = order_policies.get(context.position_id)
+        if self.orders_repo and contexts:
+            position_ids = [context.position_id for context in contexts]
+            today = (self.clock.now() if self.clock else datetime.now(timezone.utc)).date()
+            open_orders = self.orders_repo.list_open_for_positions(position_ids)
+            counts = self.orders_repo.count_for_positions_on_day(position_ids, today)
+            for context in contexts:
+                context.open_orders = open_orders.get(context.position_id, [])
+                context.orders_today = counts.get(context.position_id, 0)
+                context.orders_day = today
+        return contexts
+
+    def refresh_trading_context(self, context: PositionContext) -> None:
+        """Reload the position, its open orders and today's order count for ``context``."""
+        context.position = self.positions_repo.get(
+            tenant_id=context.tenant_id,
+            portfolio_id=context.portfolio_id,
+            position_id=context.position_id,
+        )
+        if self.orders_repo:
+            today = (self.clock.now() if self.clock else datetime.now(timezone.utc)).date()
+            ids = [context.position_id]
+            context.open_orders = self.orders_repo.list_open_for_positions(ids).get(
+                context.position_id, []
+            )
+            context.orders_today = self.orders_repo.count_for_positions_on_day(ids, today).get(
+                context.position_id, 0
+            )
+            context.orders_day = today
         else:
-            # Fallback: if no portfolio_repo, we can't get portfolio-scoped positions
-            # This is a legacy mode that shouldn't be used in production
-            # Return empty list to avoid errors
-            return []
-
-        return position_ids
+            context.open_orders = None
+            context.orders_today = None
+            context.orders_day = None
+
+    def _active_positions(self) -> Iterator[Tuple[Portfolio, Position]]:
+        """Positions with anchor_price set in RUNNING portfolios of the default tenant."""
+        if not self.portfolio_repo:
+            return
+        # For now, use default tenant. In production, this should iterate over all tenants
+        for portfolio in self.portfolio_repo.list_all(tenant_id=self.default_tenant_id):
+            if portfolio.trading_state != "RUNNING":
+                continue
+            positions = self.positions_repo.list_all(
+                tenant_id=portfolio.tenant_id,
+                portfolio_id=portfolio.id,
+            )
+            for position in positions:
+                if position.anchor_price is not None:
+                    yield portfolio, position
 
     def load_position_state(self, position_id: str) -> PositionState:
         """Load position state for a position.
@@ -0,0 +1,420 @@
+# =========================
+# backend/infrastructure/market/bar_cache.py
+# =========================
+"""
+Persistent on-disk cache for historical OHLCV bars.
+
+Bars for a finished trading day are final apart from corporate actions: a
+split (and, for adjusted history, every dividend) rescales all earlier bars.
+Yfinance history calls for past days are served from disk, and every cache
+key keeps all of its bars on one adjustment scale. Bars are stored as
+uncompressed ``.npz`` column files, one per (ticker, interval, adjustment,
+month), and keyed by exchange-local trading day. Each file also records which days have been
+fetched, including days without bars (weekends, holidays), so:
+
+- a request only fetches the day ranges that are missing,
+- previously fetched ranges are served without network access,
+- today and later days are never marked complete and are fetched again,
+- before new bars are added, one cached reference bar is fetched again
+  (together with an adjacent missing range when there is one). If its close
+  moved, a split or dividend rescaled history since it was written: the
+  key's cached bars are dropped and the whole request is fetched fresh.
+
+Writes are atomic (temp file + rename). Concurrent writers in different
+processes may drop each other's coverage marks; those days are just fetched
+again on the next miss.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+DEFAULT_TZ = "America/New_York"
+
+# Missing ranges separated by fewer covered days than this are fetched in one call
+MERGE_GAP_DAYS = 3
+
+# Relative close difference on the reference bar that marks a rescaled history
+ADJUSTMENT_TOLERANCE = 1e-6
+
+_REFERENCE = "reference.npz"
+
+HistoryFetch = Callable[[str, str], pd.DataFrame]
+
+
+class HistoricalBarCache:
+    """Read-through day-keyed bar store for yfinance-style history frames."""
+
+    def __init__(self, root: str, merge_gap_days: int = MERGE_GAP_DAYS) -> None:
+        self.root = root
+        self.merge_gap_days = merge_gap_days
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def history(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        interval: str,
+        fetch: HistoryFetch,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        """Bars for days in [start, end) ("YYYY-MM-DD", end exclusive like yfinance).
+
+        ``fetch(start, end)`` is called only for missing day ranges and must
+        return a yfinance history frame. If a fetch fails, cached bars are
+        returned; the error is raised only when nothing is cached.
+        """
+        first = date.fromisoformat(start[:10])
+        last = date.fromisoformat(end[:10]) - timedelta(days=1)
+        if last < first:
+            return _empty_frame(DEFAULT_TZ)
+
+        key_dir = self._key_dir(ticker, interval, auto_adjust)
+        months = _months(first, last)
+        covered = set()
+        tz_name = None
+        for month in months:
+            stored = self._load(key_dir, month)
+            if stored is not None:
+                covered.update(stored["days"].tolist())
+                tz_name = tz_name or stored["tz"]
+
+        wanted = range(first.toordinal(), last.toordinal() + 1)
+        missing = [day for day in wanted if day not in covered]
+        ranges = self._ranges(missing)
+        if not ranges:
+            return self._read(key_dir, months, first, last, tz_name or DEFAULT_TZ)
+
+        reference = self._load_reference(key_dir)
+        probe = None
+        if reference is not None:
+            ranges, probe = self._attach_reference(ranges, int(reference["day"]))
+
+        fetched = []
+        error: Optional[Exception] = None
+        for range_start, range_end in ([probe] if probe else []) + ranges:
+            try:
+                frame = self._fetch(fetch, range_start, range_end)
+            except Exception as e:
+                logger.warning(
+                    "Bar fetch failed for %s %s %s..%s: %s",
+                    ticker, interval, date.fromordinal(range_start),
+                    date.fromordinal(range_end), e,
+                )
+                error = e
+                continue
+            fetched.append((range_start, range_end, frame))
+
+        if reference is not None:
+            matches = _matches_reference(reference, [frame for _, _, frame in fetched])
+            if matches is None and error is not None:
+                # The reference bar was not fetched: keep unverified bars out
+                fetched = []
+            elif not matches:
+                # History was rescaled (or can no longer be checked): start over
+                logger.info(
+                    "Cached %s %s bars no longer match the provider; refetching", ticker, interval
+                )
+                self._invalidate(key_dir)
+                fetched = [(wanted[0], wanted[-1], self._fetch(fetch, wanted[0], wanted[-1]))]
+                error = None
+
+        for range_start, range_end, frame in fetched:
+            tz_name = self._store(key_dir, frame, range_start, range_end) or tz_name
+
+        result = self._read(key_dir, months, first, last, tz_name or DEFAULT_TZ)
+        if result.empty and error is not None:
+            raise error
+        return result
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """Delete cached bars for one ticker or for all tickers."""
+        import shutil
+
+        target = os.path.join(self.root, _safe(ticker.upper())) if ticker else self.root
+        shutil.rmtree(target, ignore_errors=True)
+
+    @staticmethod
+    def _fetch(fetch: HistoryFetch, range_start: int, range_end: int) -> pd.DataFrame:
+        return fetch(
+            date.fromordinal(range_start).isoformat(),
+            date.fromordinal(range_end + 1).isoformat(),
+        )
+
+    # ------------------------------------------------------------------
+    # Gap detection
+    # ------------------------------------------------------------------
+    def _ranges(self, missing: List[int]) -> List[Tuple[int, int]]:
+        """Group missing day ordinals into inclusive ranges, bridging short covered gaps."""
+        ranges: List[Tuple[int, int]] = []
+        for day in missing:
+            if ranges and day - ranges[-1][1] <= self.merge_gap_days:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        return ranges
+
+    def _attach_reference(
+        self, ranges: List[Tuple[int, int]], day: int
+    ) -> Tuple[List[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        """Widen a missing range to cover the reference day, or return a separate probe."""
+        for i, (range_start, range_end) in enumerate(ranges):
+            if range_start - self.merge_gap_days <= day < range_start:
+                ranges[i] = (day, range_end)
+                return ranges, None
+            if range_end < day <= range_end + self.merge_gap_days:
+                ranges[i] = (range_start, day)
+                return ranges, None
+        return ranges, (day, day)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _key_dir(self, ticker: str, interval: str, auto_adjust: bool) -> str:
+        adjustment = "adj" if auto_adjust else "raw"
+        return os.path.join(self.root, _safe(ticker.upper()), f"{_safe(interval)}-{adjustment}")
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+    def _load(self, key_dir: str, month: str) -> Optional[Dict[str, np.ndarray]]:
+        path = os.path.join(key_dir, f"{month}.npz")
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                stored = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable bar cache file %s: %s", path, e)
+            return None
+        stored["tz"] = str(stored["tz"])
+        return stored
+
+    def _store(
+        self, key_dir: str, frame: Optional[pd.DataFrame], range_start: int, range_end: int
+    ) -> Optional[str]:
+        """Merge a fetched frame into the month files and mark completed days."""
+        has_bars = frame is not None and not frame.empty
+        tz_name = DEFAULT_TZ
+        if has_bars and isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is not None:
+            tz_name = str(frame.index.tz)
+
+        # Days before the exchange-local today are final. An empty answer for a
+        # range with weekdays may be a soft failure, so it is not recorded.
+        today = datetime.now(pytz.timezone(tz_name)).date().toordinal()
+        complete_to = min(range_end, today - 1)
+        if not has_bars and any(
+            date.fromordinal(day).weekday() < 5 for day in range(range_start, range_end + 1)
+        ):
+            return None
+
+        ts, days, columns = _columns(frame, tz_name) if has_bars else _no_columns()
+        for month in _months(date.fromordinal(range_start), date.fromordinal(range_end)):
+            month_first, month_last = _month_bounds(month)
+            lo = max(range_start, month_first)
+            hi = min(range_end, month_last)
+            path = os.path.join(key_dir, f"{month}.npz")
+            with self._lock(path):
+                stored = self._load(key_dir, month)
+                if stored is None:
+                    stored = {"ts": np.zeros(0, dtype=np.int64), "days": np.zeros(0, dtype=np.int64)}
+                    stored.update({name: np.zeros(0) for name in COLUMNS})
+                    stored["tz"] = tz_name
+                old_days = _bar_days(stored["ts"], stored["tz"])
+                keep = (old_days < lo) | (old_days > hi)
+                new = (days >= lo) & (days <= hi)
+
+                merged_ts = np.concatenate([stored["ts"][keep], ts[new]])
+                order = np.argsort(merged_ts, kind="stable")
+                out = {"ts": merged_ts[order], "tz": np.array(tz_name)}
+                for name in COLUMNS:
+                    out[name] = np.concatenate([stored[name][keep], columns[name][new]])[order]
+                marked = set(stored["days"].tolist())
+                marked.update(range(lo, min(hi, complete_to) + 1))
+                out["days"] = np.array(sorted(marked), dtype=np.int64)
+                _atomic_save(path, out)
+
+        # The newest final bar becomes the reference checked on the next miss
+        final = np.flatnonzero(days <= complete_to)
+        if final.size:
+            k = int(final[-1])
+            with self._lock(os.path.join(key_dir, _REFERENCE)):
+                reference = self._load_reference(key_dir)
+                if reference is None or int(days[k]) >= int(reference["day"]):
+                    _atomic_save(
+                        os.path.join(key_dir, _REFERENCE),
+                        {
+                            "ts": np.array(ts[k]),
+                            "day": np.array(days[k]),
+                            "close": np.array(columns["Close"][k]),
+                        },
+                    )
+        return tz_name
+
+    def _load_reference(self, key_dir: str) -> Optional[Dict[str, np.ndarray]]:
+        path = os.path.join(key_dir, _REFERENCE)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable bar cache reference %s: %s", path, e)
+            return None
+
+    def _invalidate(self, key_dir: str) -> None:
+        """Drop every cached month (and the reference) of one key."""
+        import shutil
+
+        shutil.rmtree(key_dir, ignore_errors=True)
+
+    def _read(
+        self, key_dir: str, months: List[str], first: date, last: date, tz_name: str
+    ) -> pd.DataFrame:
+        parts = [self._load(key_dir, month) for month in months]
+        parts = [part for part in parts if part is not None and part["ts"].size]
+        if not parts:
+            return _empty_frame(tz_name)
+        ts = np.concatenate([part["ts"] for part in parts])
+        days = _bar_days(ts, tz_name)
+        within = (days >= first.toordinal()) & (days <= last.toordinal())
+        index = pd.DatetimeIndex(ts[within], tz="UTC").tz_convert(tz_name)
+        data = {name: np.concatenate([part[name] for part in parts])[within] for name in COLUMNS}
+        return pd.DataFrame(data, index=index, columns=list(COLUMNS))
+
+
+# ----------------------------------------------------------------------
+# Process-wide default
+# ----------------------------------------------------------------------
+_default_cache: Optional[HistoricalBarCache] = None
+_default_lock = threading.Lock()
+
+
+def default_bar_cache() -> Optional[HistoricalBarCache]:
+    """Shared cache rooted at BAR_CACHE_DIR (default ./.bar_cache); empty or "off" disables it."""
+    global _default_cache
+    root = os.getenv("BAR_CACHE_DIR", ".bar_cache")
+    if not root or root.lower() in ("off", "none", "false", "0"):
+        return None
+    with _default_lock:
+        if _default_cache is None or _default_cache.root != root:
+            _default_cache = HistoricalBarCache(root)
+        return _default_cache
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_.^=" else "_" for c in name)
+
+
+def _months(first: date, last: date) -> List[str]:
+    months = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _month_bounds(month: str) -> Tuple[int, int]:
+    year, mon = int(month[:4]), int(month[5:7])
+    first = date(year, mon, 1)
+    following = date(year + 1, 1, 1) if mon == 12 else date(year, mon + 1, 1)
+    return first.toordinal(), following.toordinal() - 1
+
+
+def _bar_days(ts: np.ndarray, tz_name: str) -> np.ndarray:
+    """Exchange-local day ordinal of each UTC nanosecond timestamp."""
+    if ts.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    local = pd.DatetimeIndex(ts, tz="UTC").tz_convert(tz_name).tz_localize(None)
+    # Days since 0001-01-01 (date ordinal 1)
+    return (local.normalize().asi8 // 86_400_000_000_000) + date(1970, 1, 1).toordinal()
+
+
+def _columns(frame: pd.DataFrame, tz_name: str) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    index = frame.index
+    if index.tz is None:
+        index = index.tz_localize(tz_name)
+    ts = index.tz_convert("UTC").asi8.astype(np.int64)
+    columns = {}
+    for name in COLUMNS:
+        if name in frame.columns:
+            columns[name] = frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            columns[name] = np.full(len(frame), np.nan)
+    return ts, _bar_days(ts, tz_name), columns
+
+
+def _no_columns() -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    return (
+        np.zeros(0, dtype=np.int64),
+        np.zeros(0, dtype=np.int64),
+        {name: np.zeros(0) for name in COLUMNS},
+    )
+
+
+def _matches_reference(
+    reference: Dict[str, np.ndarray], frames: List[pd.DataFrame]
+) -> Optional[bool]:
+    """Whether the reference bar's close is unchanged; None if no frame holds the bar."""
+    ts = int(reference["ts"])
+    for frame in frames:
+        if frame is None or frame.empty or "Close" not in frame.columns:
+            continue
+        index = frame.index
+        if index.tz is None:
+            index = index.tz_localize(DEFAULT_TZ)
+        hits = np.flatnonzero(index.tz_convert("UTC").asi8 == ts)
+        if hits.size:
+            close = float(frame["Close"].iloc[int(hits[0])])
+            old = float(reference["close"])
+            return abs(close - old) <= ADJUSTMENT_TOLERANCE * max(abs(old), 1e-12)
+    return None
+
+
+def _empty_frame(tz_name: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {name: np.zeros(0) for name in COLUMNS},
+        index=pd.DatetimeIndex([], tz=tz_name),
+        columns=list(COLUMNS),
+    )
+
+
+def _atomic_save(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any, List
 
 from domain.ports.market_data import MarketDataRepo, MarketStatus
 from domain.entities.market_data import PriceData, PriceSource, SimulationData
+from domain.entities.price_series import PriceSeries
 
 
 class DeterministicMarketDataAdapter(MarketDataRepo):
@@ -152,7 +153,10 @@ class DeterministicMarketDataAdapter(MarketDataRepo):
         end_date: datetime,
         include_after_hours: bool = False,
     ) -> SimulationData:
-        price_data = self._generate_historical_data(ticker, start_date, end_date, interval_minutes=60)
+        price_data = PriceSeries.from_points(
+            ticker,
+            self._generate_historical_data(ticker, start_date, end_date, interval_minutes=60),
+        )
         return SimulationData(
             ticker=ticker,
             start_date=start_date,
@@ -161,8 +165,8 @@ class DeterministicMarketDataAdapter(MarketDataRepo):
             daily_summaries=[],
             volatility_data=[],
             total_trading_days=len(price_data) // 13 if price_data else 0,
-            market_hours_data=price_data if not include_after_hours else [],
-            after_hours_data=price_data if include_after_hours else [],
+            market_hours_data=price_data if not include_after_hours else PriceSeries.empty(ticker),
+            after_hours_data=price_data if include_after_hours else PriceSeries.empty(ticker),
         )
 
     def _generate_historical_data(
@@ -2,48 +2,249 @@
 # backend/infrastructure/market/market_data_storage.py
 # =========================
 from __future__ import annotations
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+import threading
 import pytz
 import statistics
 from collections import defaultdict
 
+import numpy as np
+
 from domain.entities.market_data import PriceData, SimulationData, DailySummary, VolatilityData
+from domain.entities.price_series import (
+    COLUMNS,
+    FLOAT_COLUMNS,
+    NO_TIME,
+    SOURCE_CODES,
+    PriceSeries,
+    to_ns as _to_ns,
+)
+
+_EPOCH_DAY = date(1970, 1, 1)
+_NS_PER_DAY = 86_400_000_000_000
+_NS_PER_MINUTE = 60_000_000_000
+
+
+class _TickerSeries:
+    """Timestamp-sorted columnar bars for one ticker.
+
+    Holds the PriceSeries columns in NumPy arrays with spare capacity, so
+    in-order appends are amortised O(1). Out-of-order points are appended as
+    well and the series is re-sorted (stable, so equal timestamps keep
+    insertion order) before the next read. No PriceData objects are kept;
+    reads build them from the columns.
+    """
+
+    def __init__(self, ticker: str, capacity: int = 256) -> None:
+        self.ticker = ticker
+        self.size = 0
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self.last_trade_ts = np.empty(capacity, dtype=np.int64)
+        self.sources = np.empty(capacity, dtype=np.int8)
+        self.flags = {name: np.empty(capacity, dtype=bool) for name in _FLAGS}
+        self.columns = {name: np.empty(capacity, dtype=np.float64) for name in FLOAT_COLUMNS}
+        self._sorted = True
+
+    def append(self, point: PriceData) -> None:
+        self._reserve(1)
+        k = self.size
+        ts = _to_ns(point.timestamp)
+        if k and ts < self.ts[k - 1]:
+            self._sorted = False
+        self.ts[k] = ts
+        self.last_trade_ts[k] = (
+            NO_TIME if point.last_trade_time is None else _to_ns(point.last_trade_time)
+        )
+        self.sources[k] = SOURCE_CODES[point.source]
+        for name in _FLAGS:
+            self.flags[name][k] = bool(getattr(point, name))
+        for name in FLOAT_COLUMNS:
+            value = getattr(point, name)
+            self.columns[name][k] = np.nan if value is None else value
+        self.size = k + 1
+
+    def extend(self, points: List[PriceData]) -> None:
+        self.extend_series(PriceSeries.from_points(self.ticker, points))
+
+    def extend_series(self, series: PriceSeries) -> None:
+        n = len(series)
+        if n == 0:
+            return
+        self._reserve(n)
+        k, end = self.size, self.size + n
+        ts = series.timestamps
+        if (k and ts[0] < self.ts[k - 1]) or (n > 1 and bool((ts[1:] < ts[:-1]).any())):
+            self._sorted = False
+        self.ts[k:end] = ts
+        self.last_trade_ts[k:end] = series.last_trade_times
+        self.sources[k:end] = series.sources
+        for name in _FLAGS:
+            self.flags[name][k:end] = getattr(series, name)
+        for name in FLOAT_COLUMNS:
+            self.columns[name][k:end] = series.columns[name]
+        self.size = end
+
+    @property
+    def market(self) -> np.ndarray:
+        return self.flags["is_market_hours"]
+
+    def view(self, index) -> PriceSeries:
+        """PriceSeries over ``index`` (a slice or positions); the arrays are copied.
+
+        Copies, because a later out-of-order append re-sorts the buffers in place.
+        """
+
+        def copy(array: np.ndarray) -> np.ndarray:
+            return array[index].copy()
+
+        return PriceSeries(
+            self.ticker,
+            copy(self.ts),
+            copy(self.flags["is_market_hours"]),
+            {name: copy(column) for name, column in self.columns.items()},
+            is_fresh=copy(self.flags["is_fresh"]),
+            is_inline=copy(self.flags["is_inline"]),
+            sources=copy(self.sources),
+            last_trade_times=copy(self.last_trade_ts),
+        )
+
+    def ensure_sorted(self) -> None:
+        if self._sorted:
+            return
+        n = self.size
+        order = np.argsort(self.ts[:n], kind="stable")
+        for array in self._arrays():
+            array[:n] = array[:n][order]
+        self._sorted = True
+
+    def span(self, start_ns: int, end_ns: int) -> slice:
+        """Index range of bars with start_ns <= ts <= end_ns (series must be sorted)."""
+        ts = self.ts[: self.size]
+        lo = int(np.searchsorted(ts, start_ns, side="left"))
+        hi = int(np.searchsorted(ts, end_ns, side="right"))
+        return slice(lo, max(lo, hi))
+
+    def _arrays(self) -> List[np.ndarray]:
+        return [
+            self.ts,
+            self.last_trade_ts,
+            self.sources,
+            *self.flags.values(),
+            *self.columns.values(),
+        ]
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        capacity = len(self.ts)
+        if needed <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        self.ts = _grow(self.ts, capacity)
+        self.last_trade_ts = _grow(self.last_trade_ts, capacity)
+        self.sources = _grow(self.sources, capacity)
+        self.flags = {name: _grow(flag, capacity) for name, flag in self.flags.items()}
+        self.columns = {name: _grow(column, capacity) for name, column in self.columns.items()}
+
+
+_FLAGS = ("is_market_hours", "is_fresh", "is_inline")
+
+
+def _by_day(price_data: Sequence[PriceData]) -> Iterator[Tuple[date, List[PriceData]]]:
+    """Points grouped by calendar day of their timestamp, oldest day first.
+
+    A PriceSeries is cut at UTC day boundaries (it is in timestamp order), so
+    only one day of PriceData is built at a time.
+    """
+    if isinstance(price_data, PriceSeries):
+        days = price_data.timestamps // _NS_PER_DAY
+        cuts = np.flatnonzero(days[1:] != days[:-1]) + 1
+        starts = [0, *cuts.tolist()]
+        ends = [*cuts.tolist(), len(days)]
+        for lo, hi in zip(starts, ends):
+            if hi > lo:
+                yield _EPOCH_DAY + timedelta(days=int(days[lo])), list(price_data[lo:hi])
+        return
+
+    daily_data = defaultdict(list)
+    for point in price_data:
+        daily_data[point.timestamp.date()].append(point)
+    yield from sorted(daily_data.items())
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
 
 
 class MarketDataStorage:
-    """In-memory storage for market data with caching and retrieval capabilities."""
+    """In-memory storage for market data with caching and retrieval capabilities.
+
+    Historical points are kept per ticker in a timestamp-sorted columnar
+    series; range queries are binary searches over the timestamp column.
+    """
 
     def __init__(self):
         self.price_cache: Dict[str, PriceData] = {}
-        self.historical_data: Dict[str, List[PriceData]] = defaultdict(list)
+        self._series: Dict[str, _TickerSeries] = {}
+        self._lock = threading.RLock()
         self.tz_eastern = pytz.timezone("US/Eastern")
         self.tz_utc = pytz.UTC
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Shipped to optimization pool workers; the lock is per process
+        with self._lock:
+            state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
     def store_price_data(self, ticker: str, price_data: PriceData) -> None:
         """Store price data for a ticker."""
-        # Update cache
-        self.price_cache[ticker] = price_data
+        with self._lock:
+            # Update cache
+            self.price_cache[ticker] = price_data
+            self._series_for(ticker).append(price_data)
 
-        # Store in historical data (sorted descending: most recent first)
-        historical = self.historical_data[ticker]
+    def store_many(self, ticker: str, price_data: Iterable[PriceData]) -> None:
+        """Store a batch of price points for a ticker.
 
-        # Fast path: new point is newest (chronological append from yfinance)
-        if not historical or price_data.timestamp >= historical[0].timestamp:
-            historical.insert(0, price_data)
+        Equivalent to calling store_price_data for each point in order (the
+        last point becomes the cached price), but ingests the batch in one pass.
+        """
+        if isinstance(price_data, PriceSeries):
+            if not len(price_data):
+                return
+            with self._lock:
+                self.price_cache[ticker] = price_data[-1]
+                self._series_for(ticker).extend_series(price_data)
             return
 
-        # Fast path: new point is oldest (unlikely but handle cleanly)
-        if price_data.timestamp <= historical[-1].timestamp:
-            historical.append(price_data)
+        points = list(price_data)
+        if not points:
             return
-
-        # Rare general case: linear scan insertion
-        for i, existing in enumerate(historical):
-            if price_data.timestamp >= existing.timestamp:
-                historical.insert(i, price_data)
-                return
-        historical.append(price_data)
+        with self._lock:
+            self.price_cache[ticker] = points[-1]
+            self._series_for(ticker).extend(points)
+
+    def _series_for(self, ticker: str) -> _TickerSeries:
+        series = self._series.get(ticker)
+        if series is None:
+            series = self._series[ticker] = _TickerSeries(ticker)
+        return series
+
+    def _sorted_series(self, ticker: str) -> Optional[_TickerSeries]:
+        series = self._series.get(ticker)
+        if series is None or series.size == 0:
+            return None
+        series.ensure_sorted()
+        return series
 
     def clear_price_cache(self, ticker: Optional[str] = None) -> None:
         """Clear cached price data for a ticker or all tickers."""
@@ -99,108 +300,86 @@ class MarketDataStorage:
         market_hours_only: bool = False,
     ) -> List[PriceData]:
         """Get historical price data for a ticker within a date range."""
-        if ticker not in self.historical_data:
-            return []
-
-        # Ensure dates are timezone-aware
-        if start_date.tzinfo is None:
-            start_date = start_date.replace(tzinfo=self.tz_utc)
-        if end_date.tzinfo is None:
-            end_date = end_date.replace(tzinfo=self.tz_utc)
-
-        historical = self.historical_data[ticker]
-        result = []
-
-        for price_data in historical:
-            # Check if within date range
-            if start_date <= price_data.timestamp <= end_date:
-                # Filter by market hours if requested
-                if market_hours_only and not price_data.is_market_hours:
-                    continue
-                result.append(price_data)
+        with self._lock:
+            series = self._sorted_series(ticker)
+            if series is None:
+                return []
+            span = series.span(_to_ns(start_date), _to_ns(end_date))
+            return self._points(series, span, market_hours_only)
+
+    def get_columns(
+        self,
+        ticker: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        market_hours_only: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """Columnar view of stored bars in chronological order.
 
-        # Return in chronological order (oldest first)
-        result.sort(key=lambda x: x.timestamp)
-        return result
+        Returns copies of the ``timestamp`` (UTC ns), ``is_market_hours``,
+        ``price``, ``bid``, ``ask``, ``open``, ``high``, ``low``, ``close``
+        and ``volume`` columns; missing values are NaN.
+        """
+        with self._lock:
+            series = self._sorted_series(ticker)
+            if series is None:
+                series = _TickerSeries(ticker, capacity=0)
+            start_ns = _to_ns(start_date) if start_date is not None else np.iinfo(np.int64).min
+            end_ns = _to_ns(end_date) if end_date is not None else np.iinfo(np.int64).max
+            span = series.span(start_ns, end_ns)
+            keep = series.market[span] if market_hours_only else slice(None)
+            columns = {
+                "timestamp": series.ts[span][keep].copy(),
+                "is_market_hours": series.market[span][keep].copy(),
+            }
+            for name in COLUMNS:
+                columns[name] = series.columns[name][span][keep].copy()
+            return columns
 
     def get_trading_day_data(
         self, ticker: str, days: int = 5, include_after_hours: bool = False
     ) -> List[PriceData]:
         """Get data for last N trading days."""
-        if ticker not in self.historical_data:
-            return []
-
-        historical = self.historical_data[ticker]
-        if not historical:
-            return []
+        with self._lock:
+            series = self._sorted_series(ticker)
+            if series is None:
+                return []
 
-        # Get most recent data
-        end_date = historical[0].timestamp
-        start_date = end_date - timedelta(days=days * 2)  # Get extra days to account for weekends
+            # Window ending at the most recent point; extra days account for weekends
+            end_ns = int(series.ts[series.size - 1])
+            span = series.span(end_ns - days * 2 * _NS_PER_DAY, end_ns)
+            result = self._points(series, span, market_hours_only=not include_after_hours)
 
-        result = self.get_historical_data(ticker, start_date, end_date, market_hours_only=False)
-
-        # Filter to only market hours if requested
-        if not include_after_hours:
-            result = [pd for pd in result if pd.is_market_hours]
-
-        # Group by trading day and take last N days
-        trading_days = {}
-        for price_data in result:
-            day_key = price_data.timestamp.date()
-            if day_key not in trading_days:
-                trading_days[day_key] = []
-            trading_days[day_key].append(price_data)
-
-        # Get last N trading days
-        sorted_days = sorted(trading_days.keys(), reverse=True)[:days]
-        final_result = []
-        for day in sorted_days:
-            final_result.extend(trading_days[day])
-
-        # Sort chronologically
-        final_result.sort(key=lambda x: x.timestamp)
-        return final_result
+        # Keep the last N trading days (already chronological)
+        day_keys = [price_data.timestamp.date() for price_data in result]
+        last_days = set(sorted(set(day_keys), reverse=True)[:days])
+        return [price_data for price_data, day in zip(result, day_keys) if day in last_days]
 
     def get_volatility(self, ticker: str, window_minutes: int = 60) -> float:
         """Get volatility for a ticker over a time window."""
-        if ticker not in self.historical_data:
-            return 0.0
+        with self._lock:
+            series = self._sorted_series(ticker)
+            if series is None or series.size < 2:
+                return 0.0
 
-        historical = self.historical_data[ticker]
-        if len(historical) < 2:
-            return 0.0
+            # Market-hours prices within the window ending at the most recent point
+            end_ns = int(series.ts[series.size - 1])
+            span = series.span(end_ns - window_minutes * _NS_PER_MINUTE, end_ns)
+            prices = series.columns["price"][span][series.market[span]]
 
-        # Get data within the window
-        end_time = historical[0].timestamp
-        start_time = end_time - timedelta(minutes=window_minutes)
-
-        window_data = [
-            pd for pd in historical if start_time <= pd.timestamp <= end_time and pd.is_market_hours
-        ]
-
-        if len(window_data) < 2:
+        if len(prices) < 2:
             return 0.0
 
-        # Calculate returns
-        returns = []
-        for i in range(1, len(window_data)):
-            prev_price = window_data[i - 1].price
-            curr_price = window_data[i].price
-            if prev_price > 0:
-                ret = (curr_price - prev_price) / prev_price
-                returns.append(ret)
-
-        if not returns:
-            return 0.0
+        # Chronological simple returns
+        prev = prices[:-1]
+        valid = prev > 0
+        returns = (prices[1:][valid] - prev[valid]) / prev[valid]
 
         # Calculate standard deviation of returns
         if len(returns) < 2:
             return 0.0
 
-        mean_return = statistics.mean(returns)
-        variance = statistics.variance(returns, mean_return) if len(returns) > 1 else 0.0
-        volatility = variance**0.5
+        volatility = float(np.std(returns, ddof=1))
 
         # Annualize (assuming 252 trading days, 390 minutes per day)
         minutes_per_year = 252 * 390
@@ -208,6 +387,18 @@ class MarketDataStorage:
 
         return annualized_volatility
 
+    @staticmethod
+    def _points(
+        series: _TickerSeries, span: slice, market_hours_only: bool
+    ) -> List[PriceData]:
+        return list(MarketDataStorage._view(series, span, market_hours_only))
+
+    @staticmethod
+    def _view(series: _TickerSeries, span: slice, market_hours_only: bool) -> PriceSeries:
+        if market_hours_only:
+            return series.view(np.flatnonzero(series.market[span]) + span.start)
+        return series.view(span)
+
     def get_simulation_data(
         self,
         ticker: str,
@@ -215,13 +406,21 @@ class MarketDataStorage:
         end_date: datetime,
         include_after_hours: bool = False,
     ) -> SimulationData:
-        """Get comprehensive data for simulation and backtesting."""
-        # Get price data
-        price_data = self.get_historical_data(ticker, start_date, end_date, market_hours_only=False)
+        """Get comprehensive data for simulation and backtesting.
+
+        The price sequences are PriceSeries (columns, not PriceData objects).
+        """
+        with self._lock:
+            series = self._sorted_series(ticker)
+            if series is None:
+                price_data = PriceSeries.empty(ticker)
+            else:
+                span = series.span(_to_ns(start_date), _to_ns(end_date))
+                price_data = self._view(series, span, market_hours_only=False)
 
         # Filter by market hours if needed
-        market_hours_data = [pd for pd in price_data if pd.is_market_hours]
-        after_hours_data = [pd for pd in price_data if not pd.is_market_hours]
+        market_hours_data = price_data.take(price_data.is_market_hours)
+        after_hours_data = price_data.take(~price_data.is_market_hours)
 
         if not include_after_hours:
             price_data = market_hours_data
@@ -232,8 +431,8 @@ class MarketDataStorage:
         # Calculate volatility data
         volatility_data = self._calculate_volatility_data(price_data)
 
-        # Count trading days
-        trading_days = len(set(pd.timestamp.date() for pd in market_hours_data))
+        # Count trading days (UTC calendar days with a market-hours bar)
+        trading_days = len(np.unique(market_hours_data.timestamps // _NS_PER_DAY))
 
         return SimulationData(
             ticker=ticker,
@@ -247,17 +446,10 @@ class MarketDataStorage:
             after_hours_data=after_hours_data,
         )
 
-    def _calculate_daily_summaries(self, price_data: List[PriceData]) -> List[DailySummary]:
+    def _calculate_daily_summaries(self, price_data: Sequence[PriceData]) -> List[DailySummary]:
         """Calculate daily summaries from price data."""
-        from collections import defaultdict
-
-        daily_data = defaultdict(list)
-        for pd in price_data:
-            day_key = pd.timestamp.date()
-            daily_data[day_key].append(pd)
-
         summaries = []
-        for day, data_points in sorted(daily_data.items()):
+        for day, data_points in _by_day(price_data):
             if not data_points:
                 continue
 
@@ -298,19 +490,13 @@ class MarketDataStorage:
 
         return summaries
 
-    def _calculate_volatility_data(self, price_data: List[PriceData]) -> List[VolatilityData]:
+    def _calculate_volatility_data(self, price_data: Sequence[PriceData]) -> List[VolatilityData]:
         """Calculate volatility data from price data."""
         if len(price_data) < 2:
             return []
 
-        # Group by day
-        daily_data = defaultdict(list)
-        for pd in price_data:
-            day_key = pd.timestamp.date()
-            daily_data[day_key].append(pd)
-
         volatility_list = []
-        for day, data_points in sorted(daily_data.items()):
+        for day, data_points in _by_day(price_data):
             if len(data_points) < 2:
                 continue
 
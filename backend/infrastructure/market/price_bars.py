@@ -0,0 +1,163 @@
+# =========================
+# backend/infrastructure/market/price_bars.py
+# =========================
+"""
+Columnar price bars built from yfinance history frames.
+
+History fetches return thousands of bars per call. Converting them row by
+row (timezone conversion, market-hours check and a PriceData per row) costs
+more than the network call, so the conversion runs on whole columns instead
+and the result is a ``PriceBars`` (a PriceSeries): it holds the columns and
+builds each PriceData on access. MarketDataStorage.store_many ingests the
+columns directly.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from domain.entities.price_series import PriceSeries
+
+EASTERN = "US/Eastern"
+
+_NS_PER_MINUTE = 60_000_000_000
+_MARKET_OPEN_NS = (9 * 60 + 30) * _NS_PER_MINUTE
+_MARKET_CLOSE_NS = 16 * 60 * _NS_PER_MINUTE
+
+
+# History bars are fresh, inline LAST_TRADE points whose last trade is the bar
+# itself, which is what a PriceSeries assumes for columns it is not given.
+PriceBars = PriceSeries
+
+
+def empty_bars(ticker: str) -> PriceBars:
+    return PriceSeries.empty(ticker)
+
+
+# ----------------------------------------------------------------------
+# Frame conversion
+# ----------------------------------------------------------------------
+def market_hours_mask(index: pd.DatetimeIndex) -> np.ndarray:
+    """Vectorised MarketDataStorage.is_market_hours: weekdays 9:30-16:00 ET inclusive."""
+    eastern = _as_utc(index).tz_convert(EASTERN)
+    local = eastern.tz_localize(None)
+    time_of_day = local.asi8 - local.normalize().asi8
+    return (
+        (np.asarray(local.weekday) < 5)
+        & (time_of_day >= _MARKET_OPEN_NS)
+        & (time_of_day <= _MARKET_CLOSE_NS)
+    )
+
+
+def bars_from_history(ticker: str, hist: pd.DataFrame, naive_tz: str = "UTC") -> PriceBars:
+    """One bar per history row, priced at the close (bid = ask = close).
+
+    A naive index is interpreted in ``naive_tz``.
+    """
+    index = _as_utc(hist.index, naive_tz)
+    close = _column(hist, "Close")
+    return PriceBars(
+        ticker,
+        index.asi8,
+        market_hours_mask(index),
+        {
+            "price": close,
+            "bid": close,
+            "ask": close,
+            "open": _column(hist, "Open"),
+            "high": _column(hist, "High"),
+            "low": _column(hist, "Low"),
+            "close": close,
+            "volume": _column(hist, "Volume"),
+        },
+    )
+
+
+def bars_from_daily(ticker: str, daily_hist: pd.DataFrame, interval_minutes: int = 30) -> PriceBars:
+    """Synthetic intraday bars from daily OHLC rows.
+
+    For intervals of a full session (>= 390 minutes) there is one bar per day
+    at the 16:00 ET close. Shorter intervals get bars from 9:30 to 16:00 ET
+    following Open -> High -> Low -> Close, with the day's volume split evenly.
+    Rows whose UTC date is a weekend are skipped; a naive index is UTC.
+    """
+    index = _as_utc(daily_hist.index)
+    keep = np.asarray(index.weekday) < 5
+    # Exchange-local calendar day of each row
+    days = index[keep].tz_convert(EASTERN).tz_localize(None).normalize()
+
+    open_ = _column(daily_hist, "Open")[keep]
+    high = _column(daily_hist, "High")[keep]
+    low = _column(daily_hist, "Low")[keep]
+    close = _column(daily_hist, "Close")[keep]
+    volume = np.nan_to_num(_column(daily_hist, "Volume")[keep], nan=0.0)
+
+    if interval_minutes >= 390:
+        timestamps = _local_times(days, np.array([16 * 60]))
+        n = len(timestamps)
+        return PriceBars(
+            ticker,
+            timestamps,
+            np.ones(n, dtype=bool),
+            {
+                "price": close,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": np.trunc(volume),
+            },
+        )
+
+    minutes = np.arange(9 * 60 + 30, 16 * 60 + 1, interval_minutes)
+    num_points = len(minutes)
+    progress = np.arange(num_points) / max(num_points - 1, 1)
+
+    o, h, lo, c = (column[:, None] for column in (open_, high, low, close))
+    segment = np.minimum((progress / 0.25).astype(int), 3)
+    t = (progress - segment * 0.25) / 0.25
+    price = np.select(
+        [segment == 0, segment == 1, segment == 2],
+        [o + t * (h - o), h - t * (h - lo) * 0.3, h - t * (h - lo)],
+        lo + t * (c - lo),
+    )
+
+    price = price.ravel()
+    return PriceBars(
+        ticker,
+        _local_times(days, minutes),
+        np.ones(price.size, dtype=bool),
+        {
+            "price": price,
+            "bid": price,
+            "ask": price,
+            "open": np.repeat(open_, num_points),
+            "high": np.repeat(high, num_points),
+            "low": np.repeat(low, num_points),
+            "close": np.repeat(close, num_points),
+            "volume": np.repeat(np.trunc(volume) // num_points, num_points),
+        },
+    )
+
+
+def _as_utc(index: pd.DatetimeIndex, naive_tz: str = "UTC") -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize(naive_tz)
+    return index.tz_convert("UTC")
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _local_times(days: pd.DatetimeIndex, minutes: np.ndarray) -> np.ndarray:
+    """UTC ns of ET wall-clock ``minutes`` after midnight on each day (day-major)."""
+    wall = days.asi8[:, None] + minutes[None, :] * _NS_PER_MINUTE
+    local = pd.DatetimeIndex(wall.ravel()).tz_localize(
+        EASTERN, ambiguous="NaT", nonexistent="shift_forward"
+    )
+    return local.tz_convert("UTC").asi8
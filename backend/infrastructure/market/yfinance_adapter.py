@@ -5,10 +5,12 @@ from __future__ import annotations
 import io
 import logging
 import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Sequence, Tuple
 
 import pandas as pd
 import pytz
@@ -19,6 +21,14 @@ from domain.ports.market_data import MarketDataRepo, MarketStatus
 from domain.entities.market_data import PriceData, PriceSource, SimulationData
 from infrastructure.market.market_data_storage import MarketDataStorage
 from infrastructure.market.data_validator import DataValidator
+from infrastructure.market.bar_cache import HistoricalBarCache, default_bar_cache
+from infrastructure.market.price_bars import (
+    EASTERN,
+    PriceBars,
+    bars_from_daily,
+    bars_from_history,
+    empty_bars,
+)
 
 
 class YFinanceAdapter(MarketDataRepo):
@@ -26,20 +36,59 @@ class YFinanceAdapter(MarketDataRepo):
 
     _print_once_patched = False
 
-    def __init__(self):
+    def __init__(
+        self, bar_cache: Optional[HistoricalBarCache] = None, quote_workers: int = 8
+    ):
         self.tz_eastern = pytz.timezone("US/Eastern")
         self.tz_utc = timezone.utc
         self.storage = MarketDataStorage()
         self.cache_ttl = 30  # 30 seconds cache TTL (reduced from 5 to allow more frequent updates)
-        self.last_error_kind: Optional[str] = None
-        self.last_error: Optional[Exception] = None
+        # last_error_kind / last_error describe the calling thread's last fetch
+        self._errors = threading.local()
         self._logger = logging.getLogger(__name__)
+        # Historical bars are read through the on-disk cache (None when BAR_CACHE_DIR is off)
+        self.bar_cache = bar_cache if bar_cache is not None else default_bar_cache()
+        # Concurrent quote fetches: bounded pool size, one in-flight fetch per ticker
+        self.quote_workers = max(1, quote_workers)
+        self._inflight: Dict[Tuple[str, bool], Future] = {}
+        self._inflight_lock = threading.Lock()
         self._patch_print_once()
 
+    @property
+    def last_error_kind(self) -> Optional[str]:
+        """Error kind ("not_found" / "provider_unavailable") of this thread's last fetch."""
+        return getattr(self._errors, "kind", None)
+
+    @last_error_kind.setter
+    def last_error_kind(self, kind: Optional[str]) -> None:
+        self._errors.kind = kind
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return getattr(self._errors, "error", None)
+
+    @last_error.setter
+    def last_error(self, error: Optional[Exception]) -> None:
+        self._errors.error = error
+
     def _ticker(self, symbol: str) -> yf.Ticker:
         """Return a yfinance Ticker. Let yfinance manage its own session (curl_cffi)."""
         return yf.Ticker(symbol)
 
+    def _history(
+        self, ticker: str, start: str, end: str, interval: str, auto_adjust: bool = True
+    ) -> pd.DataFrame:
+        """stock.history(start, end, interval) for past bars, read through the bar cache."""
+
+        def fetch(fetch_start: str, fetch_end: str) -> pd.DataFrame:
+            return self._ticker(ticker).history(
+                start=fetch_start, end=fetch_end, interval=interval, auto_adjust=auto_adjust
+            )
+
+        if self.bar_cache is None:
+            return fetch(start, end)
+        return self.bar_cache.history(ticker, start, end, interval, fetch, auto_adjust=auto_adjust)
+
     def _fetch_via_chart_api(self, ticker: str) -> Optional[PriceData]:
         """
         Direct HTTP call to Yahoo Finance chart API — bypasses yfinance entirely.
@@ -243,9 +292,68 @@ class YFinanceAdapter(MarketDataRepo):
         )
 
     def get_price(self, ticker: str, force_refresh: bool = False) -> Optional[PriceData]:
-        """Get current price data for a ticker with cache + retry backoff."""
+        """Get current price data for a ticker with cache + retry backoff.
+
+        Concurrent calls for the same ticker (and force_refresh) share one
+        fetch; each caller sees that fetch's last_error_kind.
+        """
         if self._deterministic_guard(ticker):
             return None
+        return self._coalesce(
+            (ticker, force_refresh), lambda: self._get_price(ticker, force_refresh)
+        )
+
+    def get_reference_prices(self, tickers: Iterable[str]) -> Dict[str, Optional[PriceData]]:
+        """Reference prices for several tickers, fetched concurrently.
+
+        Each distinct ticker is fetched once (up to ``quote_workers`` at a
+        time) and the results land in the price cache, so later
+        get_reference_price calls within the cache TTL are served from memory.
+        A ticker whose fetch fails maps to None.
+        """
+        unique = list(dict.fromkeys(ticker for ticker in tickers if ticker))
+        if len(unique) <= 1:
+            return {ticker: self._safe_reference_price(ticker) for ticker in unique}
+
+        workers = min(self.quote_workers, len(unique))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quotes") as pool:
+            futures = {ticker: pool.submit(self._safe_reference_price, ticker) for ticker in unique}
+        return {ticker: future.result() for ticker, future in futures.items()}
+
+    def _safe_reference_price(self, ticker: str) -> Optional[PriceData]:
+        try:
+            return self.get_reference_price(ticker)
+        except Exception:
+            self._logger.exception("Quote fetch failed for %s", ticker)
+            return None
+
+    def _coalesce(self, key: Tuple[str, bool], fetch) -> Optional[PriceData]:
+        """Run fetch() unless a fetch for key is already in flight; then wait for it.
+
+        Waiters also take over the owner's error kind, since last_error_kind
+        is per thread.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            result, self.last_error_kind, self.last_error = future.result()
+            return result
+        try:
+            result = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result((result, self.last_error_kind, self.last_error))
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _get_price(self, ticker: str, force_refresh: bool = False) -> Optional[PriceData]:
         self.last_error_kind = None
         self.last_error = None
         cached = self._get_cached_price(ticker, allow_stale=False)
@@ -1098,7 +1206,7 @@ class YFinanceAdapter(MarketDataRepo):
         start_date: datetime,
         end_date: datetime,
         intraday_interval_minutes: int = 30,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Fetch historical data from yfinance and store it."""
         if self._deterministic_guard(ticker):
             return []
@@ -1164,9 +1272,8 @@ class YFinanceAdapter(MarketDataRepo):
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    stock = self._ticker(ticker)
                     with self._suppress_yfinance_output():
-                        hist = stock.history(start=start_str, end=end_str, interval=interval)
+                        hist = self._history(ticker, start_str, end_str, interval)
                     break
                 except Exception as e:
                     if attempt == max_retries - 1:
@@ -1180,126 +1287,10 @@ class YFinanceAdapter(MarketDataRepo):
                 print(f"Warning: No data returned for {ticker} from {start_str} to {end_str}")
                 return []
 
-            # Convert to PriceData objects
-            price_data_list = []
-            for timestamp, row in hist.iterrows():
-                # Convert timestamp to UTC
-                if timestamp.tzinfo is None:
-                    timestamp = timestamp.replace(tzinfo=self.tz_eastern).astimezone(self.tz_utc)
-                else:
-                    timestamp = timestamp.astimezone(self.tz_utc)
-
-                # Calculate mid-quote
-                mid_quote = (row["High"] + row["Low"]) / 2
+            # Convert to columnar bars (a naive index is exchange-local)
+            price_data_list = bars_from_history(ticker, hist, naive_tz=EASTERN)
 
-                # Determine if market hours
-                is_market_hours = self.storage.is_market_hours(timestamp)
-
-                if interval == "1m":
-                    # For minute data, create one PriceData object
-                    # For minute data, use close as both bid and ask (no spread)
-                    bid_price = row["Close"]
-                    ask_price = row["Close"]
-                    mid_quote = row["Close"]
-
-                    price_data = PriceData(
-                        ticker=ticker,
-                        price=mid_quote,  # Use mid-quote for trading calculations
-                        source=PriceSource.LAST_TRADE,
-                        timestamp=timestamp,
-                        bid=bid_price,
-                        ask=ask_price,
-                        volume=int(row["Volume"]) if not pd.isna(row["Volume"]) else None,
-                        last_trade_price=row["Close"],
-                        last_trade_time=timestamp,
-                        is_market_hours=bool(is_market_hours),
-                        is_fresh=True,  # Historical data is considered fresh
-                        is_inline=True,  # Historical data is considered inline
-                        # OHLC data for daily bars
-                        open=row["Open"],
-                        high=row["High"],
-                        low=row["Low"],
-                        close=row["Close"],
-                    )
-                    price_data_list.append(price_data)
-                    self.storage.store_price_data(ticker, price_data)
-                else:
-                    # For daily data, create multiple intraday points to simulate intraday trading
-                    # Create configurable evaluation points per day (default: every 30 minutes)
-                    # Market hours: 9:30 AM - 4:00 PM ET (6.5 hours = 390 minutes)
-                    # Default: every 30 minutes = 13 points per day
-                    # Use the provided intraday_interval_minutes parameter
-                    # Use the provided intraday_interval_minutes parameter
-                    intraday_times = []
-
-                    # Generate times every N minutes from 9:30 AM to 4:00 PM
-                    current_hour, current_minute = 9, 30
-                    while current_hour < 16 or (current_hour == 16 and current_minute == 0):
-                        intraday_times.append((current_hour, current_minute))
-                        current_minute += intraday_interval_minutes
-                        if current_minute >= 60:
-                            current_hour += 1
-                            current_minute -= 60
-
-                    print(
-                        f"DEBUG: Generated {len(intraday_times)} intraday times: {intraday_times[:5]}..."
-                    )
-
-                    for hour, minute in intraday_times:
-                        # Create timestamp for this intraday point
-                        # Convert to Eastern time first, then set the hour/minute, then convert back to UTC
-                        et_timestamp = timestamp.astimezone(self.tz_eastern)
-                        intraday_timestamp = et_timestamp.replace(
-                            hour=hour, minute=minute, second=0, microsecond=0
-                        )
-                        intraday_timestamp = intraday_timestamp.astimezone(self.tz_utc)
-
-                        # Skip if not during market hours (weekends, holidays, outside trading hours)
-                        if not self.storage.is_market_hours(intraday_timestamp):
-                            continue
-
-                        # Simulate price movement within the day using OHLC data
-                        # Use a simple linear interpolation between open and close
-                        progress = (hour - 9.5) / 6.5  # Progress from 9:30 to 4:00
-                        progress = max(0, min(1, progress))  # Clamp between 0 and 1
-
-                        # Interpolate price between open and close
-                        simulated_price = row["Open"] + (row["Close"] - row["Open"]) * progress
-
-                        # Create realistic bid/ask spread (0.1% of price)
-                        spread = simulated_price * 0.001
-                        bid_price = simulated_price - spread / 2
-                        ask_price = simulated_price + spread / 2
-                        mid_quote = simulated_price
-
-                        # Distribute volume across intraday points
-                        intraday_volume = (
-                            int(row["Volume"] / len(intraday_times))
-                            if not pd.isna(row["Volume"])
-                            else None
-                        )
-
-                        price_data = PriceData(
-                            ticker=ticker,
-                            price=mid_quote,  # Use mid-quote for trading calculations
-                            source=PriceSource.LAST_TRADE,
-                            timestamp=intraday_timestamp,
-                            bid=bid_price,  # Realistic bid price
-                            ask=ask_price,  # Realistic ask price
-                            volume=intraday_volume,
-                            last_trade_price=simulated_price,
-                            last_trade_time=intraday_timestamp,
-                            is_market_hours=True,  # All intraday points are during market hours
-                            is_fresh=True,
-                            is_inline=True,
-                            # OHLC data for daily bars (same for all intraday points)
-                            open=row["Open"],
-                            high=row["High"],
-                            low=row["Low"],
-                            close=row["Close"],
-                        )
-                        price_data_list.append(price_data)
-                        self.storage.store_price_data(ticker, price_data)
+            self.storage.store_many(ticker, price_data_list)
 
             # Validate data quality
             validator = DataValidator()
@@ -1333,7 +1324,7 @@ class YFinanceAdapter(MarketDataRepo):
         end_date: datetime,
         native_interval: str,
         intraday_interval_minutes: int,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Fetch intraday data using a native yfinance interval in a single API call.
 
         This is dramatically faster than _fetch_chunked_minute_data for 5m/15m/30m/1h
@@ -1343,14 +1334,13 @@ class YFinanceAdapter(MarketDataRepo):
         end_str = end_date.strftime("%Y-%m-%d")
         print(f"Fetching {native_interval} data for {ticker} from {start_str} to {end_str} (single call)")
 
-        stock = self._ticker(ticker)
         hist = None
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 with self._suppress_yfinance_output():
-                    hist = stock.history(
-                        start=start_str, end=end_str, interval=native_interval, auto_adjust=False
+                    hist = self._history(
+                        ticker, start_str, end_str, native_interval, auto_adjust=False
                     )
                 if not hist.empty:
                     break
@@ -1370,37 +1360,8 @@ class YFinanceAdapter(MarketDataRepo):
             )
 
         print(f"Got {len(hist)} {native_interval} bars for {ticker}")
-        price_data_list = []
-        for timestamp, row in hist.iterrows():
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.replace(tzinfo=self.tz_utc)
-            else:
-                timestamp = timestamp.astimezone(self.tz_utc)
-
-            is_market_hours = self.storage.is_market_hours(timestamp)
-            close_price = float(row["Close"])
-
-            price_data = PriceData(
-                ticker=ticker,
-                price=close_price,
-                source=PriceSource.LAST_TRADE,
-                timestamp=timestamp,
-                bid=close_price,
-                ask=close_price,
-                volume=int(row["Volume"]) if not pd.isna(row["Volume"]) else None,
-                last_trade_price=close_price,
-                last_trade_time=timestamp,
-                is_market_hours=bool(is_market_hours),
-                is_fresh=True,
-                is_inline=True,
-                open=float(row["Open"]),
-                high=float(row["High"]),
-                low=float(row["Low"]),
-                close=close_price,
-            )
-            price_data_list.append(price_data)
-            self.storage.store_price_data(ticker, price_data)
-
+        price_data_list = bars_from_history(ticker, hist)
+        self.storage.store_many(ticker, price_data_list)
         return price_data_list
 
     def _fetch_chunked_minute_data(
@@ -1409,11 +1370,11 @@ class YFinanceAdapter(MarketDataRepo):
         start_date: datetime,
         end_date: datetime,
         intraday_interval_minutes: int = 30,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Fetch minute-by-minute data in chunks for periods >7 days."""
         print(f"Fetching chunked minute data for {ticker} from {start_date} to {end_date}")
 
-        all_price_data = []
+        chunks = []
         current_start = start_date
 
         # Process in 7-day chunks
@@ -1430,7 +1391,7 @@ class YFinanceAdapter(MarketDataRepo):
                 chunk_data = self._fetch_single_chunk(
                     ticker, current_start, current_end, intraday_interval_minutes
                 )
-                all_price_data.extend(chunk_data)
+                chunks.append(chunk_data)
 
                 print(f"  Got {len(chunk_data)} data points")
 
@@ -1441,6 +1402,7 @@ class YFinanceAdapter(MarketDataRepo):
             # Move to next chunk
             current_start = current_end
 
+        all_price_data = PriceBars.concat(ticker, chunks)
         print(f"Total chunked data points: {len(all_price_data)}")
         return all_price_data
 
@@ -1450,64 +1412,24 @@ class YFinanceAdapter(MarketDataRepo):
         start_date: datetime,
         end_date: datetime,
         intraday_interval_minutes: int = 30,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Fetch a single chunk of data - tries minute data first, falls back to daily."""
         start_str = start_date.strftime("%Y-%m-%d")
         end_str = end_date.strftime("%Y-%m-%d")
 
-        stock = self._ticker(ticker)
-
         # Try minute data first (only available for last ~7 days)
-        hist = stock.history(start=start_str, end=end_str, interval="1m")
+        hist = self._history(ticker, start_str, end_str, "1m")
 
         # If minute data is empty, fall back to daily data with synthetic intraday points
         if hist.empty:
             print(f"  No 1m data for {start_str} to {end_str}, falling back to daily data")
-            hist = stock.history(start=start_str, end=end_str, interval="1d")
+            hist = self._history(ticker, start_str, end_str, "1d")
             if hist.empty:
-                return []
+                return empty_bars(ticker)
             return self._generate_intraday_from_daily(ticker, hist, intraday_interval_minutes)
 
-        price_data_list = []
-
-        # Convert to PriceData objects
-        for timestamp, row in hist.iterrows():
-            # Convert timestamp to UTC
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.replace(tzinfo=self.tz_utc)
-            else:
-                timestamp = timestamp.astimezone(self.tz_utc)
-
-            # Check if this is during market hours
-            is_market_hours = self.storage.is_market_hours(timestamp)
-
-            # For minute data, use close as both bid and ask (no spread)
-            bid_price = row["Close"]
-            ask_price = row["Close"]
-            mid_quote = row["Close"]
-
-            price_data = PriceData(
-                ticker=ticker,
-                price=mid_quote,  # Use mid-quote for trading calculations
-                source=PriceSource.LAST_TRADE,
-                timestamp=timestamp,
-                bid=bid_price,
-                ask=ask_price,
-                volume=int(row["Volume"]) if not pd.isna(row["Volume"]) else None,
-                last_trade_price=row["Close"],
-                last_trade_time=timestamp,
-                is_market_hours=bool(is_market_hours),
-                is_fresh=True,  # Historical data is considered fresh
-                is_inline=True,  # Historical data is considered inline
-                # OHLC data for daily bars
-                open=row["Open"],
-                high=row["High"],
-                low=row["Low"],
-                close=row["Close"],
-            )
-            price_data_list.append(price_data)
-            self.storage.store_price_data(ticker, price_data)
-
+        price_data_list = bars_from_history(ticker, hist)
+        self.storage.store_many(ticker, price_data_list)
         return price_data_list
 
     def _fetch_daily_with_synthetic_intraday(
@@ -1516,14 +1438,13 @@ class YFinanceAdapter(MarketDataRepo):
         start_date: datetime,
         end_date: datetime,
         intraday_interval_minutes: int = 30,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Fetch daily data and generate synthetic intraday points for historical simulations."""
         start_str = start_date.strftime("%Y-%m-%d")
         end_str = end_date.strftime("%Y-%m-%d")
 
         print(f"Fetching daily data for {ticker} from {start_str} to {end_str}")
 
-        stock = self._ticker(ticker)
         hist = None
         max_retries = 3
         for attempt in range(max_retries):
@@ -1531,7 +1452,7 @@ class YFinanceAdapter(MarketDataRepo):
                 # auto_adjust=False: return actual closing prices, matching what Yahoo Finance
                 # displays on its web charts. Dividend-adjusted prices (the default) shift
                 # historical values downward and diverge from the web chart display.
-                hist = stock.history(start=start_str, end=end_str, interval="1d", auto_adjust=False)
+                hist = self._history(ticker, start_str, end_str, "1d", auto_adjust=False)
                 if not hist.empty:
                     break
                 if attempt < max_retries - 1:
@@ -1581,136 +1502,16 @@ class YFinanceAdapter(MarketDataRepo):
         ticker: str,
         daily_hist,
         intraday_interval_minutes: int = 30,
-    ) -> List[PriceData]:
+    ) -> Sequence[PriceData]:
         """Generate synthetic intraday data points from daily OHLC data.
 
         This creates realistic intraday price movements by interpolating between
         Open, High, Low, and Close prices throughout the trading day.
         """
-        price_data_list = []
-
-        # For daily (or larger) resolution, use a single price point per day at close.
-        # The minute-increment loop below would produce invalid times (minute > 59) for
-        # intervals >= a full trading session (390 minutes = 9:30→16:00).
-        if intraday_interval_minutes >= 390:
-            for timestamp, row in daily_hist.iterrows():
-                close_price = row["Close"]
-                volume = int(row["Volume"]) if not pd.isna(row["Volume"]) else 0
-                if timestamp.tzinfo is None:
-                    day_date = timestamp.replace(tzinfo=self.tz_utc)
-                else:
-                    day_date = timestamp.astimezone(self.tz_utc)
-                if day_date.weekday() >= 5:
-                    continue
-                et_close = day_date.astimezone(self.tz_eastern).replace(
-                    hour=16, minute=0, second=0, microsecond=0
-                )
-                utc_close = et_close.astimezone(self.tz_utc)
-                price_point = PriceData(
-                    ticker=ticker,
-                    price=float(close_price),
-                    source=PriceSource.LAST_TRADE,
-                    timestamp=utc_close,
-                    volume=volume,
-                    last_trade_price=float(close_price),
-                    last_trade_time=utc_close,
-                    is_market_hours=True,
-                    is_fresh=True,
-                    is_inline=True,
-                    open=float(row["Open"]) if not pd.isna(row["Open"]) else None,
-                    high=float(row["High"]) if not pd.isna(row["High"]) else None,
-                    low=float(row["Low"]) if not pd.isna(row["Low"]) else None,
-                    close=float(close_price),
-                )
-                price_data_list.append(price_point)
-                self.storage.store_price_data(ticker, price_point)
-            return price_data_list
-
-        # Generate intraday times (9:30 AM to 4:00 PM ET) for sub-daily intervals
-        intraday_times = []
-        total_minutes = 9 * 60 + 30  # start at 9:30
-        end_minutes = 16 * 60         # end at 16:00
-        while total_minutes <= end_minutes:
-            intraday_times.append((total_minutes // 60, total_minutes % 60))
-            total_minutes += intraday_interval_minutes
-
-        for timestamp, row in daily_hist.iterrows():
-            # Get OHLC for the day
-            open_price = row["Open"]
-            high_price = row["High"]
-            low_price = row["Low"]
-            close_price = row["Close"]
-            volume = int(row["Volume"]) if not pd.isna(row["Volume"]) else 0
-
-            # Convert timestamp to timezone-aware
-            if timestamp.tzinfo is None:
-                day_date = timestamp.replace(tzinfo=self.tz_utc)
-            else:
-                day_date = timestamp.astimezone(self.tz_utc)
-
-            # Skip weekends
-            if day_date.weekday() >= 5:
-                continue
-
-            # Generate intraday points with realistic price movement
-            # Pattern: Open -> High -> Low -> Close (simplified but realistic)
-            num_points = len(intraday_times)
-            volume_per_point = volume // num_points if num_points > 0 else 0
-
-            for i, (hour, minute) in enumerate(intraday_times):
-                # Create timestamp in Eastern time, then convert to UTC
-                et_timestamp = day_date.astimezone(self.tz_eastern)
-                intraday_timestamp = et_timestamp.replace(
-                    hour=hour, minute=minute, second=0, microsecond=0
-                )
-                intraday_timestamp = intraday_timestamp.astimezone(self.tz_utc)
-
-                # Calculate interpolated price based on position in day
-                # First quarter: Open to High
-                # Second quarter: High
-                # Third quarter: High to Low
-                # Fourth quarter: Low to Close
-                progress = i / max(num_points - 1, 1)
-
-                if progress < 0.25:
-                    # Open to High
-                    t = progress / 0.25
-                    price = open_price + t * (high_price - open_price)
-                elif progress < 0.5:
-                    # Around High
-                    t = (progress - 0.25) / 0.25
-                    price = high_price - t * (high_price - low_price) * 0.3
-                elif progress < 0.75:
-                    # High to Low
-                    t = (progress - 0.5) / 0.25
-                    price = high_price - t * (high_price - low_price)
-                else:
-                    # Low to Close
-                    t = (progress - 0.75) / 0.25
-                    price = low_price + t * (close_price - low_price)
-
-                price_data = PriceData(
-                    ticker=ticker,
-                    price=price,
-                    source=PriceSource.LAST_TRADE,
-                    timestamp=intraday_timestamp,
-                    bid=price,
-                    ask=price,
-                    volume=volume_per_point,
-                    last_trade_price=price,
-                    last_trade_time=intraday_timestamp,
-                    is_market_hours=True,
-                    is_fresh=True,
-                    is_inline=True,
-                    open=open_price,
-                    high=high_price,
-                    low=low_price,
-                    close=close_price,
-                )
-                price_data_list.append(price_data)
-                self.storage.store_price_data(ticker, price_data)
-
-        print(f"  Generated {len(price_data_list)} synthetic intraday points from {len(daily_hist)} daily bars")
+        price_data_list = bars_from_daily(ticker, daily_hist, intraday_interval_minutes)
+        self.storage.store_many(ticker, price_data_list)
+        if intraday_interval_minutes < 390:
+            print(f"  Generated {len(price_data_list)} synthetic intraday points from {len(daily_hist)} daily bars")
         return price_data_list
 
     def _get_next_trading_day(self, date) -> datetime:
@@ -0,0 +1,334 @@
+# =========================
+# backend/infrastructure/persistence/buffered_timeline_repo.py
+# =========================
+"""
+Write-behind buffer for PositionEvaluationTimeline rows.
+
+Every evaluation (live or simulated) writes one timeline row. Saving each
+row in its own transaction makes the insert the slowest part of an
+evaluation. BufferedEvaluationTimelineRepo turns save() into an enqueue and
+a background thread writes the queue out with save_many() whenever
+``batch_size`` rows are waiting or ``flush_interval`` seconds have passed.
+
+Reads flush the buffer first, so callers still see their own writes through
+the repo. The queue is bounded: when it is full, save() waits up to
+``put_timeout`` seconds and then writes the row synchronously.
+
+When a batch fails, its rows are written one at a time and the ones that
+still fail go back on the queue for the next flush; a row is only dropped
+(and logged) after ``max_attempts`` failed writes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+from weakref import WeakSet
+
+from domain.ports.evaluation_timeline_repo import EvaluationTimelineRepo
+
+logger = logging.getLogger(__name__)
+
+# Buffers still running; one exit hook per process closes them all
+_open_buffers: "WeakSet[BufferedEvaluationTimelineRepo]" = WeakSet()
+_open_buffers_lock = threading.Lock()
+_exit_hook_registered = False
+
+
+def _close_open_buffers() -> None:
+    with _open_buffers_lock:
+        buffers = list(_open_buffers)
+    for buffer in buffers:
+        buffer.close()
+
+
+def _track(buffer: "BufferedEvaluationTimelineRepo") -> None:
+    global _exit_hook_registered
+    with _open_buffers_lock:
+        _open_buffers.add(buffer)
+        if not _exit_hook_registered:
+            atexit.register(_close_open_buffers)
+            _exit_hook_registered = True
+
+
+class BufferedEvaluationTimelineRepo(EvaluationTimelineRepo):
+    """EvaluationTimelineRepo decorator that batches saves on a writer thread."""
+
+    def __init__(
+        self,
+        inner: EvaluationTimelineRepo,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        put_timeout: float = 5.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.inner = inner
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_attempts = max(1, max_attempts)
+        # Failed writes per row id, for rows waiting to be retried
+        self._attempts: Dict[str, int] = {}
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(1, max_queue))
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "retried": 0,
+            "batches": 0,
+            "backpressure_waits": 0,
+            "sync_writes": 0,
+            "max_queue_depth": 0,
+            "last_flush_seconds": 0.0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="TimelineWriter"
+        )
+        self._thread.start()
+        _track(self)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def save(self, evaluation_data: Dict[str, Any]) -> str:
+        evaluation_id = evaluation_data.get("id") or f"eval_{uuid4().hex[:16]}"
+        row = {**evaluation_data, "id": evaluation_id}
+        if self._closed:
+            return self.inner.save(row)
+
+        if self._queue.full():
+            self._count("backpressure_waits")
+            self._wake.set()
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            # Writer cannot keep up; fall back to a direct write
+            self._count("sync_writes")
+            return self.inner.save(row)
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+        if depth >= self.batch_size:
+            self._wake.set()
+        return evaluation_id
+
+    def save_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        return [self.save(row) for row in rows]
+
+    def flush(self) -> None:
+        """Write out everything queued so far (called by the writer thread and by reads).
+
+        Stops early when rows had to be re-queued; they are retried on the next flush.
+        """
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                started = time.perf_counter()
+                written, retried, failed = self._write(batch)
+                with self._stats_lock:
+                    self._stats["written"] += written
+                    self._stats["retried"] += retried
+                    self._stats["failed"] += failed
+                    self._stats["batches"] += 1
+                    self._stats["last_flush_seconds"] = time.perf_counter() - started
+                if retried:
+                    return
+
+    def close(self) -> None:
+        """Stop the writer thread and flush what is left; later saves write directly."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=30)
+        # Every pass either writes a row or uses up one of its attempts
+        while not self._queue.empty():
+            self.flush()
+        with _open_buffers_lock:
+            _open_buffers.discard(self)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Write a batch; returns (written, re-queued, dropped) row counts."""
+        try:
+            self.inner.save_many(batch)
+            for row in batch:
+                self._attempts.pop(row["id"], None)
+            return len(batch), 0, 0
+        except Exception as e:
+            logger.warning(
+                "Timeline batch of %d rows failed (%s); writing rows one by one", len(batch), e
+            )
+
+        written = retried = failed = 0
+        for row in batch:
+            try:
+                # The failed batch may have committed some rows before it gave up
+                if self.inner.get_by_id(row["id"]) is None:
+                    self.inner.save(row)
+                self._attempts.pop(row["id"], None)
+                written += 1
+                continue
+            except Exception as e:
+                error = e
+            attempts = self._attempts.pop(row["id"], 0) + 1
+            if attempts < self.max_attempts:
+                try:
+                    self._queue.put_nowait(row)
+                    self._attempts[row["id"]] = attempts
+                    retried += 1
+                    continue
+                except queue.Full:
+                    pass
+            logger.error(
+                "Dropped timeline row %s after %d failed writes: %s", row["id"], attempts, error
+            )
+            failed += 1
+        return written, retried, failed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Timeline writer flush failed: %s", e, exc_info=True)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Reads (flush first so buffered rows are visible)
+    # ------------------------------------------------------------------
+    def get_by_id(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        return self.inner.get_by_id(evaluation_id)
+
+    def list_by_position(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        position_id: str,
+        mode: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        action_filter: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.inner.list_by_position(
+            tenant_id=tenant_id,
+            portfolio_id=portfolio_id,
+            position_id=position_id,
+            mode=mode,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            action_filter=action_filter,
+        )
+
+    def list_by_portfolio(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        mode: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        action_filter: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.inner.list_by_portfolio(
+            tenant_id=tenant_id,
+            portfolio_id=portfolio_id,
+            mode=mode,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            action_filter=action_filter,
+        )
+
+    def iter_by_portfolio(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        mode: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        return self.inner.iter_by_portfolio(
+            tenant_id=tenant_id,
+            portfolio_id=portfolio_id,
+            mode=mode,
+            start_date=start_date,
+            end_date=end_date,
+            batch_size=batch_size,
+        )
+
+    def list_by_trace_id(self, trace_id: str) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.inner.list_by_trace_id(trace_id)
+
+    def list_by_simulation_run(
+        self,
+        simulation_run_id: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.inner.list_by_simulation_run(simulation_run_id, limit=limit)
+
+    def list_snapshots_by_resolution(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        resolution: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        position_id: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.inner.list_snapshots_by_resolution(
+            tenant_id=tenant_id,
+            portfolio_id=portfolio_id,
+            resolution=resolution,
+            start_date=start_date,
+            end_date=end_date,
+            position_id=position_id,
+            mode=mode,
+        )
@@ -1,7 +1,7 @@
 # =========================
 # backend/infrastructure/persistence/memory/events_repo_mem.py
 # =========================
-from typing import Dict, List, Iterable
+from typing import Dict, List, Iterable, Iterator
 from domain.entities.event import Event
 from domain.ports.events_repo import EventsRepo
 
@@ -15,5 +15,9 @@ class InMemoryEventsRepo(EventsRepo):
     def list_for_position(self, position_id: str, limit: int = 100) -> Iterable[Event]:
         return list(self._items.get(position_id, []))[-limit:]
 
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Event]:
+        # newest first, like the SQL cursor
+        return reversed(list(self._items.get(position_id, [])))
+
     def clear(self) -> None:
         self._items.clear()
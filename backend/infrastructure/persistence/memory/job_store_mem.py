@@ -0,0 +1,33 @@
+# =========================
+# backend/infrastructure/persistence/memory/job_store_mem.py
+# =========================
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional
+
+from domain.entities.background_job import BackgroundJob
+from domain.ports.job_store import JobStore
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self) -> None:
+        self._jobs: Dict[str, BackgroundJob] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: BackgroundJob) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def list_unfinished(self) -> List[BackgroundJob]:
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if not job.status.is_finished]
+        return sorted(jobs, key=lambda job: job.created_at)
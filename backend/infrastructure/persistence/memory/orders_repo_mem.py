@@ -3,9 +3,9 @@
 # =========================
 from collections import defaultdict
 from datetime import date, datetime
-from typing import Dict, Optional, Iterable
+from typing import Dict, List, Optional, Iterable, Iterator
 
-from domain.entities.order import Order
+from domain.entities.order import OPEN_ORDER_STATUSES, Order
 from domain.ports.orders_repo import OrdersRepo
 
 
@@ -18,6 +18,9 @@ class InMemoryOrdersRepo(OrdersRepo):
     def get(self, order_id: str) -> Optional[Order]:
         return self._items.get(order_id)
 
+    def get_many(self, order_ids: Iterable[str]) -> Dict[str, Order]:
+        return {oid: self._items[oid] for oid in order_ids if oid in self._items}
+
     def create(
         self,
         *,
@@ -60,9 +63,28 @@ class InMemoryOrdersRepo(OrdersRepo):
         # newest first (we rely on created_at order of inserts)
         return list(reversed([self._items[i] for i in ids]))[:limit]
 
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Order]:
+        ids = list(self._by_position.get(position_id, []))
+        return (self._items[i] for i in reversed(ids))
+
     def list_all(self) -> Iterable[Order]:
         return list(self._items.values())
 
+    def list_open_for_positions(self, position_ids: Iterable[str]) -> Dict[str, List[Order]]:
+        orders: Dict[str, List[Order]] = {}
+        for position_id in dict.fromkeys(position_ids):
+            ids = reversed(self._by_position.get(position_id, []))
+            open_orders = [
+                self._items[i] for i in ids if self._items[i].status in OPEN_ORDER_STATUSES
+            ]
+            if open_orders:
+                orders[position_id] = open_orders
+        return orders
+
+    def count_for_positions_on_day(self, position_ids: Iterable[str], day: date) -> Dict[str, int]:
+        counts = {pid: self._count_index.get((pid, day), 0) for pid in dict.fromkeys(position_ids)}
+        return {pid: count for pid, count in counts.items() if count}
+
     def clear(self) -> None:
         self._items.clear()
         self._count_index.clear()
@@ -2,7 +2,7 @@
 # backend/infrastructure/persistence/memory/positions_repo_mem.py
 # =========================
 import uuid
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, List, Optional
 
 from domain.entities.position import Position
 from domain.ports.positions_repo import PositionsRepo
@@ -45,6 +45,10 @@ class InMemoryPositionsRepo(PositionsRepo):
             f"DEBUG: Saved position {position.id}, stored anchor_price={self._items[(position.tenant_id, position.portfolio_id, position.id)].anchor_price}"
         )
 
+    def save_many(self, positions: Iterable[Position]) -> None:
+        for position in positions:
+            self._items[(position.tenant_id, position.portfolio_id, position.id)] = position
+
     def delete(self, tenant_id: str, portfolio_id: str, position_id: str) -> bool:
         """Delete a position by ID. Returns True if deleted, False if not found."""
         key = (tenant_id, portfolio_id, position_id)
@@ -2,11 +2,13 @@
 # backend/infrastructure/persistence/memory/simulation_repo_mem.py
 # =========================
 
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.simulation_result import SimulationResult
-from domain.ports.simulation_repo import SimulationRepo
+from domain.ports.simulation_repo import SimulationRepo, check_series_names
+from infrastructure.persistence.series_codec import select_rows
 
 
 class InMemorySimulationRepo(SimulationRepo):
@@ -23,6 +25,23 @@ class InMemorySimulationRepo(SimulationRepo):
         """Get a simulation result by ID."""
         return self._results.get(result_id)
 
+    def get_simulation_series(
+        self,
+        result_id: UUID,
+        series: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Get series of a result, limited to row keys and a time range."""
+        series = check_series_names(series)
+        result = self._results.get(result_id)
+        if result is None:
+            return None
+        return {
+            name: select_rows(getattr(result, name) or [], columns, start, end) for name in series
+        }
+
     def run_simulation(
         self, ticker: str, start_date: str, end_date: str, parameters: Dict[str, Any]
     ) -> SimulationResult:
@@ -3,7 +3,7 @@
 # =========================
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from domain.entities.trade import Trade
 from domain.ports.trades_repo import TradesRepo
@@ -22,7 +22,7 @@ class InMemoryTradesRepo(TradesRepo):
         # Update indexes
         if trade.position_id not in self._by_position:
             self._by_position[trade.position_id] = []
-        if trade.position_id not in self._by_order:
+        if trade.order_id not in self._by_order:
             self._by_order[trade.order_id] = []
 
         if trade.id not in self._by_position[trade.position_id]:
@@ -42,11 +42,20 @@ class InMemoryTradesRepo(TradesRepo):
         trades.sort(key=lambda t: t.executed_at, reverse=True)
         return trades[:limit]
 
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Trade]:
+        """Yield every trade for a position (newest first)."""
+        return iter(self.list_for_position(position_id, limit=len(self._items)))
+
     def list_for_order(self, order_id: str) -> List[Trade]:
         """List trades for an order (typically 1 trade per order)."""
         trade_ids = self._by_order.get(order_id, [])
         return [self._items[tid] for tid in trade_ids if tid in self._items]
 
+    def list_for_orders(self, order_ids: Iterable[str]) -> Dict[str, List[Trade]]:
+        """List trades for several orders, keyed by order ID."""
+        by_order = {oid: self.list_for_order(oid) for oid in dict.fromkeys(order_ids)}
+        return {oid: trades for oid, trades in by_order.items() if trades}
+
     def clear(self) -> None:
         """Clear all trades."""
         self._items.clear()
@@ -0,0 +1,141 @@
+# =========================
+# backend/infrastructure/persistence/position_snapshots.py
+# =========================
+"""
+Folding evaluation timeline rows into position snapshots.
+
+A snapshot summarises one position over one UTC hour, day or ISO week (see
+PositionSnapshotRepo). ``fold_rows`` turns timeline rows into partial
+snapshots and ``merge_snapshots`` combines two snapshots of the same bucket,
+so a rollup can be built incrementally in any order.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+RESOLUTIONS = ("hourly", "daily", "weekly")
+
+SNAPSHOT_FIELDS = (
+    "tenant_id",
+    "portfolio_id",
+    "position_id",
+    "symbol",
+    "mode",
+    "resolution",
+    "bucket_start",
+    "first_timestamp",
+    "last_timestamp",
+    "open_value",
+    "high_value",
+    "low_value",
+    "close_value",
+    "stock_value",
+    "cash",
+    "evaluation_count",
+    "trade_count",
+    "dividend_count",
+)
+
+# (tenant_id, portfolio_id, position_id, mode, resolution, bucket_start)
+SnapshotKey = Tuple[str, str, str, str, str, datetime]
+
+
+def bucket_start(ts: datetime, resolution: str) -> datetime:
+    """Start of the UTC hour, day or ISO week (Monday) containing ``ts``."""
+    ts = ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    if resolution == "hourly":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "weekly":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def fold_rows(rows: Iterable[Dict[str, Any]]) -> Dict[SnapshotKey, Dict[str, Any]]:
+    """Fold timeline rows into one partial snapshot per key and resolution.
+
+    Simulation-run rows are skipped: they belong to a run, not to the
+    position's history.
+    """
+    folded: Dict[SnapshotKey, Dict[str, Any]] = {}
+    for row in rows:
+        single = _row_snapshot(row)
+        if single is None:
+            continue
+        for resolution in RESOLUTIONS:
+            snap = dict(single, resolution=resolution)
+            snap["bucket_start"] = bucket_start(snap["last_timestamp"], resolution)
+            key = snapshot_key(snap)
+            folded[key] = merge_snapshots(folded[key], snap) if key in folded else snap
+    return folded
+
+
+def merge_snapshots(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two snapshots of the same bucket; order of arguments does not matter."""
+    early = a if _aware(a["first_timestamp"]) <= _aware(b["first_timestamp"]) else b
+    last = a if _aware(a["last_timestamp"]) >= _aware(b["last_timestamp"]) else b
+    merged = dict(last)
+    merged["first_timestamp"] = early["first_timestamp"]
+    merged["open_value"] = early["open_value"]
+    merged["high_value"] = max(a["high_value"], b["high_value"])
+    merged["low_value"] = min(a["low_value"], b["low_value"])
+    for count in ("evaluation_count", "trade_count", "dividend_count"):
+        merged[count] = a[count] + b[count]
+    return merged
+
+
+def snapshot_key(snap: Dict[str, Any]) -> SnapshotKey:
+    return (
+        snap["tenant_id"],
+        snap["portfolio_id"],
+        snap["position_id"],
+        snap["mode"],
+        snap["resolution"],
+        _aware(snap["bucket_start"]),
+    )
+
+
+def _row_snapshot(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    ts = row.get("timestamp")
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if not isinstance(ts, datetime) or row.get("simulation_run_id"):
+        return None
+    ts = _aware(ts)
+
+    # Same fallbacks the analytics series always used: "after" values, else "before"
+    total = row.get("position_total_value_after")
+    if not total:
+        total = row.get("position_total_value_before") or 0.0
+    stock = row.get("position_stock_value_after")
+    if stock is None:
+        stock = row.get("position_stock_value_before") or 0.0
+    cash = row.get("position_cash_after")
+    if cash is None:
+        cash = row.get("position_cash_before") or 0.0
+    action = row.get("action")
+
+    return {
+        "tenant_id": row.get("tenant_id") or "default",
+        "portfolio_id": row.get("portfolio_id") or "",
+        "position_id": row.get("position_id") or "unknown",
+        "symbol": row.get("symbol"),
+        "mode": row.get("mode") or "LIVE",
+        "first_timestamp": ts,
+        "last_timestamp": ts,
+        "open_value": float(total),
+        "high_value": float(total),
+        "low_value": float(total),
+        "close_value": float(total),
+        "stock_value": float(stock),
+        "cash": float(cash),
+        "evaluation_count": 1,
+        "trade_count": int(isinstance(action, str) and action.upper() in ("BUY", "SELL")),
+        "dividend_count": int(bool(row.get("dividend_applied"))),
+    }
+
+
+def _aware(ts: datetime) -> datetime:
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
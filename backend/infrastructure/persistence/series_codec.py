@@ -0,0 +1,169 @@
+# =========================
+# backend/infrastructure/persistence/series_codec.py
+# =========================
+"""
+Columnar, compressed encoding for simulation result time series.
+
+Simulation results carry several long lists of row dicts (time_series_data,
+trade_log, ...). Stored as JSON arrays every row repeats its keys, and a
+reader has to parse the whole array to use any of it. ``encode_series``
+turns each list into a struct-of-arrays and compresses every column on its
+own, so ``SeriesBlob`` can decompress just the columns a caller asks for.
+
+Blob layout::
+
+    b"VBS1" | uint32 header length | header JSON | zlib column chunks...
+
+The header lists, per series, the row count and each column's name, byte
+range and the row indexes where the key was absent (rows are not required
+to share a key set). Compression is zlib so the format needs nothing beyond
+the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+__all__ = ["encode_series", "SeriesBlob", "select_rows", "TIME_KEYS"]
+
+_MAGIC = b"VBS1"
+_HEADER_LEN = struct.Struct("<I")
+_LEVEL = 6
+
+# Row keys used for time-range selection, in order of preference
+TIME_KEYS = ("timestamp", "date")
+
+
+def encode_series(series: Dict[str, Optional[List[Dict[str, Any]]]]) -> bytes:
+    """Encode named lists of row dicts into one columnar blob."""
+    header: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+    offset = 0
+    for name, rows in series.items():
+        rows = rows or []
+        order: Dict[str, None] = {}
+        for row in rows:
+            order.update(dict.fromkeys(row))
+        columns = []
+        for key in order:
+            values: List[Any] = []
+            absent: List[int] = []
+            for i, row in enumerate(rows):
+                if key in row:
+                    values.append(row[key])
+                else:
+                    values.append(None)
+                    absent.append(i)
+            chunk = zlib.compress(
+                json.dumps(values, separators=(",", ":"), default=str).encode(), _LEVEL
+            )
+            columns.append({"name": key, "offset": offset, "length": len(chunk), "absent": absent})
+            chunks.append(chunk)
+            offset += len(chunk)
+        header[name] = {"rows": len(rows), "columns": columns}
+
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return b"".join([_MAGIC, _HEADER_LEN.pack(len(head)), head, *chunks])
+
+
+class SeriesBlob:
+    """Read view over an ``encode_series`` blob; columns are decoded on first use."""
+
+    def __init__(self, data: bytes) -> None:
+        data = bytes(data)
+        if data[:4] != _MAGIC:
+            raise ValueError("Not a simulation series blob")
+        (head_len,) = _HEADER_LEN.unpack_from(data, 4)
+        start = 4 + _HEADER_LEN.size
+        self._header: Dict[str, Any] = json.loads(data[start : start + head_len])
+        self._body = memoryview(data)[start + head_len :]
+        self._decoded: Dict[tuple, List[Any]] = {}
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._header)
+
+    def columns(self, name: str) -> List[str]:
+        return [c["name"] for c in self._header.get(name, {}).get("columns", [])]
+
+    def row_count(self, name: str) -> int:
+        return self._header.get(name, {}).get("rows", 0)
+
+    def column(self, name: str, key: str) -> List[Any]:
+        """Values of one column (``None`` where a row had no such key)."""
+        cached = self._decoded.get((name, key))
+        if cached is None:
+            meta = self._meta(name, key)
+            raw = self._body[meta["offset"] : meta["offset"] + meta["length"]]
+            cached = json.loads(zlib.decompress(raw))
+            self._decoded[(name, key)] = cached
+        return cached
+
+    def read(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rebuild rows of ``name``, optionally limited to some columns and a time range."""
+        available = self.columns(name)
+        keys = available if columns is None else [k for k in columns if k in available]
+        indexes: Iterable[int] = range(self.row_count(name))
+        if start is not None or end is not None:
+            time_key = next((k for k in TIME_KEYS if k in available), None)
+            if time_key is not None:
+                times = self.column(name, time_key)
+                indexes = [i for i, value in enumerate(times) if _in_range(value, start, end)]
+
+        absent = {k: set(self._meta(name, k)["absent"]) for k in keys}
+        values = {k: self.column(name, k) for k in keys}
+        return [
+            {k: values[k][i] for k in keys if i not in absent[k]}
+            for i in indexes
+        ]
+
+    def _meta(self, name: str, key: str) -> Dict[str, Any]:
+        for meta in self._header.get(name, {}).get("columns", []):
+            if meta["name"] == key:
+                return meta
+        raise KeyError(f"{name}.{key}")
+
+
+def select_rows(
+    rows: List[Dict[str, Any]],
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Same selection as ``SeriesBlob.read`` for rows that are already decoded."""
+    if start is not None or end is not None:
+        time_key = next((k for k in TIME_KEYS if any(k in row for row in rows)), None)
+        if time_key is not None:
+            rows = [row for row in rows if _in_range(row.get(time_key), start, end)]
+    if columns is None:
+        return list(rows)
+    return [{k: row[k] for k in columns if k in row} for row in rows]
+
+
+def _in_range(value: Any, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    if value is None:
+        return False
+    try:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    ts = _aware(ts)
+    if start is not None and ts < _aware(start):
+        return False
+    if end is not None and ts > _aware(end):
+        return False
+    return True
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
@@ -1,15 +1,31 @@
 # =========================
 # backend/infrastructure/persistence/sql/config_repo_sql.py
 # =========================
-"""SQL implementation of ConfigRepo."""
+"""
+SQL implementation of ConfigRepo.
+
+Reads are served from an in-process cache keyed by position (and by
+tenant/asset for commission rates). Every ``set_*`` bumps ``version`` and
+drops the affected entries; a read that raced a write is not cached. With
+``change_log`` enabled, writes are also recorded in ``config_changes``
+(migration f5a6b7c8d9e0) and each repo polls that table at most every
+``change_poll_seconds``, so a write made by another process is picked up
+within that interval. Ids skipped by a poll are re-read for
+``_GAP_RETRY_SECONDS``, since on Postgres a lower id can commit after a
+higher one was read.
+"""
 
 from __future__ import annotations
 
-from typing import Optional
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from decimal import Decimal
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from domain.ports.config_repo import ConfigRepo, ConfigScope
@@ -21,6 +37,7 @@ from domain.value_objects.configs import (
 )
 from .models import (
     CommissionRateModel,
+    ConfigChangeModel,
     TriggerConfigModel,
     GuardrailConfigModel,
     OrderPolicyConfigModel,
@@ -28,15 +45,47 @@ from .models import (
 
 __all__ = ["SQLConfigRepo"]
 
+logger = logging.getLogger(__name__)
+
+_TRIGGER = "trigger"
+_GUARDRAIL = "guardrail"
+_ORDER_POLICY = "order_policy"
+_COMMISSION = "commission"
+
+# Change-log rows older than this are pruned on write
+_CHANGE_RETENTION = timedelta(days=1)
+# How long an id missing from a poll is looked for again, and how many are tracked
+_GAP_RETRY_SECONDS = 60.0
+_MAX_GAPS = 1000
+
 
 class SQLConfigRepo(ConfigRepo):
     """SQL implementation of configuration repository."""
 
-    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        cache: bool = True,
+        change_log: bool = False,
+        change_poll_seconds: float = 1.0,
+    ) -> None:
         self._sf = session_factory
+        self._cache_enabled = cache
+        self._cache: Dict[Tuple[str, Any], Any] = {}
+        self._cache_lock = threading.Lock()
+        # Bumped on every invalidation; loads that straddle a bump are not cached
+        self.version = 0
+        self._change_log = change_log
+        self._change_poll_seconds = change_poll_seconds
+        self._change_cursor = 0
+        # Ids below the cursor not yet seen (deadline to stop retrying them)
+        self._change_gaps: Dict[int, float] = {}
+        self._next_poll = 0.0
         # Initialize default global commission rate if it doesn't exist
         # Use a separate session to avoid transaction issues
         self._ensure_default_commission_rate()
+        if change_log:
+            self._init_change_log()
 
     def _ensure_default_commission_rate(self) -> None:
         """Ensure default global commission rate exists."""
@@ -67,6 +116,13 @@ class SQLConfigRepo(ConfigRepo):
         asset_id: Optional[str] = None,
     ) -> float:
         """Get commission rate with hierarchical lookup."""
+        return self._cached(
+            _COMMISSION,
+            (tenant_id, asset_id),
+            lambda: self._load_commission_rate(tenant_id, asset_id),
+        )
+
+    def _load_commission_rate(self, tenant_id: Optional[str], asset_id: Optional[str]) -> float:
         with self._sf() as s:
             # Try TENANT_ASSET first
             if tenant_id and asset_id:
@@ -137,23 +193,18 @@ class SQLConfigRepo(ConfigRepo):
                     rate=rate,
                 )
                 s.add(new_rate)
+            self._record_change(s, _COMMISSION, None)
             s.commit()
+        self._invalidate(_COMMISSION, None)
 
     def get_trigger_config(
         self,
         position_id: str,
     ) -> Optional[TriggerConfig]:
         """Get trigger configuration for a position."""
-        with self._sf() as s:
-            row = s.scalar(
-                select(TriggerConfigModel).where(TriggerConfigModel.position_id == position_id)
-            )
-            if not row:
-                return None
-            return TriggerConfig(
-                up_threshold_pct=Decimal(str(row.up_threshold_pct)),
-                down_threshold_pct=Decimal(str(row.down_threshold_pct)),
-            )
+        return self._cached(
+            _TRIGGER, position_id, lambda: self._load_one(TriggerConfigModel, position_id)
+        )
 
     def set_trigger_config(
         self,
@@ -176,36 +227,18 @@ class SQLConfigRepo(ConfigRepo):
                     down_threshold_pct=float(config.down_threshold_pct),
                 )
                 s.add(new_config)
+            self._record_change(s, _TRIGGER, position_id)
             s.commit()
+        self._invalidate(_TRIGGER, position_id)
 
     def get_guardrail_config(
         self,
         position_id: str,
     ) -> Optional[GuardrailConfig]:
         """Get guardrail configuration for a position."""
-        with self._sf() as s:
-            row = s.scalar(
-                select(GuardrailConfigModel).where(GuardrailConfigModel.position_id == position_id)
-            )
-            if not row:
-                return None
-            return normalize_guardrail_config(
-                GuardrailConfig(
-                    min_stock_pct=Decimal(str(row.min_stock_pct)),
-                    max_stock_pct=Decimal(str(row.max_stock_pct)),
-                    max_trade_pct_of_position=(
-                        Decimal(str(row.max_trade_pct_of_position))
-                        if row.max_trade_pct_of_position is not None
-                        else None
-                    ),
-                    max_daily_notional=(
-                        Decimal(str(row.max_daily_notional))
-                        if row.max_daily_notional is not None
-                        else None
-                    ),
-                    max_orders_per_day=row.max_orders_per_day,
-                )
-            )
+        return self._cached(
+            _GUARDRAIL, position_id, lambda: self._load_one(GuardrailConfigModel, position_id)
+        )
 
     def set_guardrail_config(
         self,
@@ -247,34 +280,18 @@ class SQLConfigRepo(ConfigRepo):
                     max_orders_per_day=config.max_orders_per_day,
                 )
                 s.add(new_config)
+            self._record_change(s, _GUARDRAIL, position_id)
             s.commit()
+        self._invalidate(_GUARDRAIL, position_id)
 
     def get_order_policy_config(
         self,
         position_id: str,
     ) -> Optional[OrderPolicyConfig]:
         """Get order policy configuration for a position."""
-        with self._sf() as s:
-            row = s.scalar(
-                select(OrderPolicyConfigModel).where(
-                    OrderPolicyConfigModel.position_id == position_id
-                )
-            )
-            if not row:
-                return None
-            return OrderPolicyConfig(
-                min_qty=Decimal(str(row.min_qty)),
-                min_notional=Decimal(str(row.min_notional)),
-                lot_size=Decimal(str(row.lot_size)),
-                qty_step=Decimal(str(row.qty_step)),
-                action_below_min=row.action_below_min,
-                rebalance_ratio=Decimal(str(row.rebalance_ratio)),
-                order_sizing_strategy=row.order_sizing_strategy,
-                allow_after_hours=row.allow_after_hours,
-                commission_rate=(
-                    Decimal(str(row.commission_rate)) if row.commission_rate is not None else None
-                ),
-            )
+        return self._cached(
+            _ORDER_POLICY, position_id, lambda: self._load_one(OrderPolicyConfigModel, position_id)
+        )
 
     def set_order_policy_config(
         self,
@@ -317,4 +334,209 @@ class SQLConfigRepo(ConfigRepo):
                     ),
                 )
                 s.add(new_config)
+            self._record_change(s, _ORDER_POLICY, position_id)
             s.commit()
+        self._invalidate(_ORDER_POLICY, position_id)
+
+    # ------------------------------------------------------------------
+    # Bulk reads (one query per config kind)
+    # ------------------------------------------------------------------
+    def get_trigger_configs(self, position_ids: Iterable[str]) -> Dict[str, TriggerConfig]:
+        """Get trigger configurations for several positions."""
+        return self._cached_many(_TRIGGER, TriggerConfigModel, position_ids)
+
+    def get_guardrail_configs(self, position_ids: Iterable[str]) -> Dict[str, GuardrailConfig]:
+        """Get guardrail configurations for several positions."""
+        return self._cached_many(_GUARDRAIL, GuardrailConfigModel, position_ids)
+
+    def get_order_policy_configs(
+        self, position_ids: Iterable[str]
+    ) -> Dict[str, OrderPolicyConfig]:
+        """Get order policy configurations for several positions."""
+        return self._cached_many(_ORDER_POLICY, OrderPolicyConfigModel, position_ids)
+
+    def _load_one(self, model, position_id: str):
+        with self._sf() as s:
+            row = s.scalar(select(model).where(model.position_id == position_id))
+            return _FROM_ROW[model](row) if row else None
+
+    def _rows_for_positions(self, model, position_ids: Iterable[str]) -> List:
+        ids = list(dict.fromkeys(position_ids))
+        if not ids:
+            return []
+        with self._sf() as s:
+            return list(s.scalars(select(model).where(model.position_id.in_(ids))))
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def clear_cache(self) -> None:
+        """Drop every cached config; the next reads go to the database."""
+        with self._cache_lock:
+            self.version += 1
+            self._cache.clear()
+
+    def _cached(self, kind: str, key: Any, load: Callable[[], Any]) -> Any:
+        if not self._cache_enabled:
+            return load()
+        self._poll_changes()
+        with self._cache_lock:
+            if (kind, key) in self._cache:
+                return copy.copy(self._cache[(kind, key)])
+            version = self.version
+        value = load()
+        with self._cache_lock:
+            if self.version == version:
+                self._cache[(kind, key)] = value
+        # Callers get their own copy so editing a config cannot change the cached one
+        return copy.copy(value)
+
+    def _cached_many(self, kind: str, model, position_ids: Iterable[str]) -> Dict[str, Any]:
+        ids = list(dict.fromkeys(position_ids))
+        if not self._cache_enabled:
+            rows = self._rows_for_positions(model, ids)
+            return {row.position_id: _FROM_ROW[model](row) for row in rows}
+        self._poll_changes()
+        found: Dict[str, Any] = {}
+        with self._cache_lock:
+            missing = []
+            for pid in ids:
+                if (kind, pid) in self._cache:
+                    found[pid] = self._cache[(kind, pid)]
+                else:
+                    missing.append(pid)
+            version = self.version
+        if missing:
+            loaded = {
+                row.position_id: _FROM_ROW[model](row)
+                for row in self._rows_for_positions(model, missing)
+            }
+            with self._cache_lock:
+                if self.version == version:
+                    # Absent rows are cached too, so "no saved config" is not re-queried
+                    self._cache.update(((kind, pid), loaded.get(pid)) for pid in missing)
+            found.update(loaded)
+        return {pid: copy.copy(config) for pid, config in found.items() if config is not None}
+
+    def _invalidate(self, kind: str, key: Optional[str]) -> None:
+        with self._cache_lock:
+            self._invalidate_locked(kind, key)
+
+    def _invalidate_locked(self, kind: str, key: Optional[str]) -> None:
+        self.version += 1
+        if kind == _COMMISSION or key is None:
+            # Commission rates resolve hierarchically; any write can change any lookup
+            for cache_key in [k for k in self._cache if k[0] == kind]:
+                del self._cache[cache_key]
+        else:
+            self._cache.pop((kind, key), None)
+
+    # ------------------------------------------------------------------
+    # Cross-process change log
+    # ------------------------------------------------------------------
+    def _init_change_log(self) -> None:
+        try:
+            with self._sf() as s:
+                self._change_cursor = s.scalar(select(func.max(ConfigChangeModel.id))) or 0
+        except Exception as e:
+            logger.warning("Config change log unavailable (run the migrations): %s", e)
+        self._next_poll = time.monotonic() + self._change_poll_seconds
+
+    def _record_change(self, s: Session, kind: str, key: Optional[str]) -> None:
+        if not self._change_log:
+            return
+        now = datetime.now(timezone.utc)
+        s.add(ConfigChangeModel(kind=kind, key=key, changed_at=now))
+        s.execute(
+            delete(ConfigChangeModel).where(ConfigChangeModel.changed_at < now - _CHANGE_RETENTION)
+        )
+
+    def _poll_changes(self) -> None:
+        if not self._change_log:
+            return
+        with self._cache_lock:
+            # Only one caller per interval polls; the query itself runs unlocked
+            if time.monotonic() < self._next_poll:
+                return
+            self._next_poll = time.monotonic() + self._change_poll_seconds
+            cursor = self._change_cursor
+            gaps = list(self._change_gaps)
+        newer = ConfigChangeModel.id > cursor
+        try:
+            with self._sf() as s:
+                changes = s.execute(
+                    select(ConfigChangeModel.id, ConfigChangeModel.kind, ConfigChangeModel.key)
+                    .where(or_(newer, ConfigChangeModel.id.in_(gaps)) if gaps else newer)
+                    .order_by(ConfigChangeModel.id)
+                ).all()
+        except Exception as e:
+            # Keep serving the cache; the next poll retries
+            logger.warning("Config change log poll failed: %s", e)
+            return
+        with self._cache_lock:
+            now = time.monotonic()
+            seen = set()
+            for change_id, kind, key in changes:
+                self._invalidate_locked(kind, key)
+                self._change_gaps.pop(change_id, None)
+                seen.add(change_id)
+            top = max(seen, default=0)
+            if top > self._change_cursor:
+                # A lower id may still be uncommitted; look for it again on later polls
+                for missing in range(max(self._change_cursor + 1, top - _MAX_GAPS), top):
+                    if missing not in seen:
+                        self._change_gaps[missing] = now + _GAP_RETRY_SECONDS
+                self._change_cursor = top
+            for gap, deadline in list(self._change_gaps.items()):
+                if deadline < now:
+                    del self._change_gaps[gap]
+
+
+def _trigger_config_from_row(row: TriggerConfigModel) -> TriggerConfig:
+    return TriggerConfig(
+        up_threshold_pct=Decimal(str(row.up_threshold_pct)),
+        down_threshold_pct=Decimal(str(row.down_threshold_pct)),
+    )
+
+
+def _guardrail_config_from_row(row: GuardrailConfigModel) -> GuardrailConfig:
+    return normalize_guardrail_config(
+        GuardrailConfig(
+            min_stock_pct=Decimal(str(row.min_stock_pct)),
+            max_stock_pct=Decimal(str(row.max_stock_pct)),
+            max_trade_pct_of_position=(
+                Decimal(str(row.max_trade_pct_of_position))
+                if row.max_trade_pct_of_position is not None
+                else None
+            ),
+            max_daily_notional=(
+                Decimal(str(row.max_daily_notional))
+                if row.max_daily_notional is not None
+                else None
+            ),
+            max_orders_per_day=row.max_orders_per_day,
+        )
+    )
+
+
+def _order_policy_config_from_row(row: OrderPolicyConfigModel) -> OrderPolicyConfig:
+    return OrderPolicyConfig(
+        min_qty=Decimal(str(row.min_qty)),
+        min_notional=Decimal(str(row.min_notional)),
+        lot_size=Decimal(str(row.lot_size)),
+        qty_step=Decimal(str(row.qty_step)),
+        action_below_min=row.action_below_min,
+        rebalance_ratio=Decimal(str(row.rebalance_ratio)),
+        order_sizing_strategy=row.order_sizing_strategy,
+        allow_after_hours=row.allow_after_hours,
+        commission_rate=(
+            Decimal(str(row.commission_rate)) if row.commission_rate is not None else None
+        ),
+    )
+
+
+_FROM_ROW = {
+    TriggerConfigModel: _trigger_config_from_row,
+    GuardrailConfigModel: _guardrail_config_from_row,
+    OrderPolicyConfigModel: _order_policy_config_from_row,
+}
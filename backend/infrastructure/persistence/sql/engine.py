@@ -0,0 +1,200 @@
+# =========================
+# backend/infrastructure/persistence/sql/engine.py
+# =========================
+"""
+Process-wide SQLAlchemy engine registry.
+
+``get_engine(url)`` returns one shared engine per database URL, so every repo,
+use case and script in the process draws from the same connection pool
+instead of opening a pool per call site.
+
+Pools are QueuePools sized from the environment:
+
+- ``SQL_POOL_SIZE`` (default 5 for SQLite, 10 otherwise)
+- ``SQL_MAX_OVERFLOW`` (default 10 for SQLite, 20 otherwise)
+- ``SQL_POOL_TIMEOUT`` seconds to wait for a connection (default 30)
+- ``SQL_POOL_RECYCLE`` seconds before a server connection is replaced
+  (default 1800; not used for SQLite)
+
+SQLite file databases are switched to WAL with ``synchronous=NORMAL`` so
+readers do not block the writer (``SQLITE_JOURNAL_MODE`` overrides the
+journal mode, empty keeps the file's own). In-memory SQLite uses a single
+static connection, since each new connection would be a new database.
+
+SQLite connections run in driver autocommit, so each statement commits on its
+own. ``begin_write(session)`` opens a real ``BEGIN IMMEDIATE`` transaction on
+them for writes that must land together; ``session.commit()`` or the rollback
+on close ends it.
+
+``pool_metrics()`` reports per-engine pool occupancy, checkouts, timeouts and
+how long callers waited for a connection.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from application.helpers.latency import latency_summary
+
+__all__ = ["get_engine", "dispose_engines", "pool_metrics", "begin_write"]
+
+# Wait samples kept per pool for metrics
+_SAMPLES = 500
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds: Deque[float] = deque(maxlen=_SAMPLES)
+
+    def _do_get(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        self.checkouts += 1
+        self.wait_seconds.append(time.perf_counter() - started)
+        return conn
+
+
+def get_engine(url: str) -> Engine:
+    """Shared engine for ``url``; created with tuned pool settings on first use."""
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _create(url)
+            _engines[url] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection; the engines reconnect if used again."""
+    with _engines_lock:
+        engines = list(_engines.values())
+    for engine in engines:
+        engine.dispose()
+
+
+def pool_metrics() -> Dict[str, Any]:
+    with _engines_lock:
+        engines = dict(_engines)
+    return {
+        make_url(url).render_as_string(hide_password=True): _pool_summary(engine)
+        for url, engine in engines.items()
+    }
+
+
+def begin_write(session: Session) -> None:
+    """Start a write transaction on ``session`` that commits or rolls back as one.
+
+    A no-op off SQLite, where the session is already transactional, and when the
+    SQLite connection is already inside a transaction.
+    """
+    conn = session.connection()
+    if conn.dialect.name != "sqlite":
+        return
+    if not conn.connection.driver_connection.in_transaction:
+        # IMMEDIATE takes the write lock now, so concurrent writers queue behind us
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# ----------------------------------------------------------------------
+# Engine construction
+# ----------------------------------------------------------------------
+def _create(url: str) -> Engine:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            future=True,
+            poolclass=MeteredQueuePool,
+            pool_pre_ping=True,
+            pool_size=_env_int("SQL_POOL_SIZE", 10),
+            max_overflow=_env_int("SQL_MAX_OVERFLOW", 20),
+            pool_timeout=_env_int("SQL_POOL_TIMEOUT", 30),
+            pool_recycle=_env_int("SQL_POOL_RECYCLE", 1800),
+        )
+
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": 30,
+        "isolation_level": None,  # Autocommit mode
+    }
+    if _is_memory(parsed):
+        return create_engine(
+            url, future=True, poolclass=StaticPool, connect_args=connect_args
+        )
+
+    engine = create_engine(
+        url,
+        future=True,
+        poolclass=MeteredQueuePool,
+        pool_pre_ping=True,
+        pool_size=_env_int("SQL_POOL_SIZE", 5),
+        max_overflow=_env_int("SQL_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("SQL_POOL_TIMEOUT", 30),
+        connect_args=connect_args,
+    )
+    journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL").strip()
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        try:
+            if journal_mode:
+                cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+                if journal_mode.upper() == "WAL":
+                    cursor.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def _is_memory(parsed) -> bool:
+    database = parsed.database or ""
+    return database in ("", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _pool_summary(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_seconds": latency_summary(list(pool.wait_seconds)),
+    }
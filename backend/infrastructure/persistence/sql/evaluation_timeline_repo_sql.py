@@ -4,7 +4,7 @@
 """Simplified SQL implementation of EvaluationTimelineRepo - focused on reliability."""
 
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import uuid4
@@ -16,6 +16,8 @@ import time
 from sqlalchemy import select, and_, text, MetaData, Table
 
 from domain.ports.evaluation_timeline_repo import EvaluationTimelineRepo
+from domain.ports.position_snapshot_repo import PositionSnapshotRepo
+from infrastructure.persistence.sql.engine import begin_write
 from infrastructure.persistence.sql.models import (
     PositionEvaluationTimelineModel,
 )
@@ -24,8 +26,10 @@ from infrastructure.persistence.sql.models import (
 class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
     """Simplified SQL implementation of EvaluationTimelineRepo."""
 
-    def __init__(self, session_factory):
+    def __init__(self, session_factory, snapshots: Optional[PositionSnapshotRepo] = None):
         self.session_factory = session_factory
+        # Rollup folded forward on every successful write (see PositionSnapshotRepo)
+        self.snapshots = snapshots
         self._logger = logging.getLogger(__name__)
         self._timing_enabled = os.getenv("VB_TIMING", "").lower() in {"1", "true", "yes", "on"}
         # Cache reflected table and column names — schema is stable at runtime
@@ -46,6 +50,7 @@ class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
     def save(self, evaluation_data: Dict[str, Any]) -> str:
         """Save an evaluation timeline record - simplified and robust."""
         with self.session_factory() as session:
+            action_value = None
             try:
                 reflection_start = time.perf_counter() if self._timing_enabled else None
                 # Generate ID if not provided
@@ -59,247 +64,11 @@ class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
                         time.perf_counter() - reflection_start,
                     )
 
-                # Filter data to only include columns that exist in database
-                filtered_data = {}
-                for k, v in evaluation_data.items():
-                    if k == "id":
-                        continue
-                    if k not in actual_db_columns:
-                        continue
-
-                    # Convert types appropriately
-                    if isinstance(v, (list, dict)):
-                        filtered_data[k] = json.dumps(v, default=str) if v else None
-                    elif isinstance(v, Decimal):
-                        filtered_data[k] = float(v)
-                    elif isinstance(v, bool):
-                        filtered_data[k] = bool(v)
-                    elif v is None:
-                        filtered_data[k] = None
-                    else:
-                        # Ensure it's a plain Python value
-                        filtered_data[k] = v
-
-                # Handle action columns - they have DIFFERENT CHECK constraints!
-                # action: IN ('BUY', 'SELL', 'HOLD', 'SKIP')
-                # action_taken: IN ('NO_ACTION', 'ORDER_PROPOSED', 'ORDER_SUBMITTED', 'ORDER_EXECUTED')
-
-                # Get action value for 'action' column
-                action_value = None
-                if "action" in filtered_data:
-                    action_value = filtered_data["action"]
-                elif "action" in evaluation_data:
-                    action_value = evaluation_data["action"]
-
-                # Normalize action value - MUST be uppercase for SQLite CHECK constraint
-                if isinstance(action_value, bool):
-                    action_value = "HOLD"
-                elif action_value is None:
-                    action_value = "HOLD"
-                elif not isinstance(action_value, str):
-                    action_value = str(action_value).upper().strip()
-                else:
-                    action_value = action_value.upper().strip()
-
-                # Ensure valid constraint value for 'action' column
-                valid_actions = ["BUY", "SELL", "HOLD", "SKIP"]
-                if action_value not in valid_actions:
-                    action_value = "HOLD"
-                action_value = action_value.upper()
-
-                # Get action_taken value - has DIFFERENT valid values
-                action_taken_value = None
-                if "action_taken" in filtered_data:
-                    action_taken_value = filtered_data["action_taken"]
-                elif "action_taken" in evaluation_data:
-                    action_taken_value = evaluation_data["action_taken"]
-
-                # Normalize action_taken value
-                if isinstance(action_taken_value, bool):
-                    action_taken_value = "NO_ACTION"
-                elif action_taken_value is None:
-                    action_taken_value = "NO_ACTION"
-                elif not isinstance(action_taken_value, str):
-                    action_taken_value = str(action_taken_value).upper().strip()
-                else:
-                    action_taken_value = action_taken_value.upper().strip()
-
-                # Ensure valid constraint value for 'action_taken' column
-                valid_action_taken = [
-                    "NO_ACTION",
-                    "ORDER_PROPOSED",
-                    "ORDER_SUBMITTED",
-                    "ORDER_EXECUTED",
-                ]
-                if action_taken_value not in valid_action_taken:
-                    # Map action to action_taken if needed
-                    if action_value in ["BUY", "SELL"]:
-                        action_taken_value = "ORDER_PROPOSED"  # Default for trade actions
-                    else:
-                        action_taken_value = "NO_ACTION"  # Default for HOLD/SKIP
-                action_taken_value = action_taken_value.upper()
-
-                # Set action columns if they exist
-                if "action" in actual_db_columns:
-                    filtered_data["action"] = action_value
-                if "action_taken" in actual_db_columns:
-                    filtered_data["action_taken"] = action_taken_value
-
-                # Ensure required NOT NULL columns have values
-                # Based on schema validation: 18 NOT NULL fields (excluding PK)
-                current_time = datetime.now(timezone.utc)
-                market_price_raw_value = (
-                    filtered_data.get("market_price_raw")
-                    or filtered_data.get("effective_price")
-                    or evaluation_data.get("effective_price")
-                    or 0.0
-                )
-
-                # Get position values from evaluation_data if available
-                position_qty_before_value = (
-                    filtered_data.get("position_qty_before")
-                    or evaluation_data.get("position_qty_before")
-                    or evaluation_data.get("position_qty")
-                    or 0.0
-                )
-                position_cash_before_value = (
-                    filtered_data.get("position_cash_before")
-                    or evaluation_data.get("position_cash_before")
-                    or evaluation_data.get("position_cash")
-                    or 0.0
+                columns, params, action_value = self._build_insert(
+                    evaluation_id, evaluation_data, reflected_table, actual_db_columns
                 )
-                position_dividend_receivable_before_value = (
-                    filtered_data.get("position_dividend_receivable_before")
-                    or evaluation_data.get("position_dividend_receivable_before")
-                    or 0.0
-                )
-
-                # Calculate position_stock_value_before and position_total_value_before if not provided
-                position_stock_value_before_value = filtered_data.get("position_stock_value_before")
-                if position_stock_value_before_value is None:
-                    # Calculate from qty and price
-                    if position_qty_before_value and market_price_raw_value:
-                        position_stock_value_before_value = float(
-                            position_qty_before_value
-                        ) * float(market_price_raw_value)
-                    else:
-                        position_stock_value_before_value = 0.0
-
-                position_total_value_before_value = filtered_data.get("position_total_value_before")
-                if position_total_value_before_value is None:
-                    position_total_value_before_value = float(position_cash_before_value) + float(
-                        position_stock_value_before_value
-                    )
-
-                # Build defaults dict - all NOT NULL fields from schema validation
-                # Based on: python scripts/validate_timeline_schema.py output
-                required_defaults = {
-                    "action_taken": action_taken_value,  # NOT NULL, CHECK: IN ('NO_ACTION', 'ORDER_PROPOSED', 'ORDER_SUBMITTED', 'ORDER_EXECUTED')
-                    "allow_after_hours": filtered_data.get("allow_after_hours", True),
-                    "anchor_reset_occurred": filtered_data.get("anchor_reset_occurred", False),
-                    "dividend_declared": filtered_data.get("dividend_declared", False),  # NOT NULL - required field
-                    "evaluated_at": filtered_data.get(
-                        "evaluated_at", filtered_data.get("timestamp", current_time)
-                    ),
-                    "is_fresh": filtered_data.get("is_fresh", True),
-                    "is_inline": filtered_data.get("is_inline", True),
-                    "is_market_hours": filtered_data.get("is_market_hours", True),
-                    "market_price_raw": market_price_raw_value,
-                    "mode": filtered_data.get("mode", evaluation_data.get("mode", "LIVE")),
-                    "portfolio_id": filtered_data.get(
-                        "portfolio_id", evaluation_data.get("portfolio_id", "")
-                    ),
-                    "position_cash_before": position_cash_before_value,
-                    "position_dividend_receivable_before": position_dividend_receivable_before_value,
-                    "position_id": filtered_data.get(
-                        "position_id", evaluation_data.get("position_id", "")
-                    ),
-                    "position_qty_before": position_qty_before_value,
-                    "position_stock_value_before": position_stock_value_before_value,
-                    "position_total_value_before": position_total_value_before_value,
-                    "tenant_id": filtered_data.get(
-                        "tenant_id", evaluation_data.get("tenant_id", "default")
-                    ),
-                    "trigger_detected": filtered_data.get("trigger_detected", False),
-                }
-
-                # action is NULLABLE, but set it if provided
-                if "action" in actual_db_columns and action_value:
-                    filtered_data["action"] = action_value
-
-                # Dynamically check for other NOT NULL columns and provide defaults
-                for col in reflected_table.columns:
-                    col_name = col.name
-                    if col_name == "id":
-                        continue
-                    # Check if column is NOT NULL
-                    try:
-                        is_nullable = getattr(col, "nullable", True)
-                        if (
-                            not is_nullable
-                            and col_name not in filtered_data
-                            and col_name not in required_defaults
-                        ):
-                            # Provide a default based on column type
-                            if isinstance(
-                                col.type,
-                                (
-                                    type(reflected_table.c.timestamp.type),
-                                    type(reflected_table.c.evaluated_at.type),
-                                ),
-                            ):
-                                required_defaults[col_name] = current_time
-                            elif isinstance(
-                                col.type, type(reflected_table.c.is_market_hours.type)
-                            ):  # Boolean
-                                required_defaults[col_name] = False
-                            elif isinstance(
-                                col.type, type(reflected_table.c.market_price_raw.type)
-                            ):  # Float
-                                required_defaults[col_name] = 0.0
-                            elif isinstance(
-                                col.type, type(reflected_table.c.tenant_id.type)
-                            ):  # String
-                                required_defaults[col_name] = ""
-                    except Exception:
-                        pass  # Skip if we can't determine
-
-                # Apply defaults for missing required columns
-                for col_name, default_value in required_defaults.items():
-                    if col_name in actual_db_columns and col_name not in filtered_data:
-                        filtered_data[col_name] = default_value
-
-                # Build INSERT statement - ensure action_taken is always included (it's NOT NULL)
-                columns_set = set(filtered_data.keys())
-                # Force include action_taken if it exists in DB (it's NOT NULL)
-                if "action_taken" in actual_db_columns:
-                    columns_set.add("action_taken")
-                # action is nullable, but include it if we have a value
-                if "action" in actual_db_columns and action_value:
-                    columns_set.add("action")
-
-                columns = ["id"] + sorted([k for k in columns_set if k in actual_db_columns])
                 placeholders = [f":{col}" for col in columns]
 
-                # Build params dict
-                params = {"id": evaluation_id}
-                for k, v in filtered_data.items():
-                    if k in actual_db_columns:
-                        params[k] = v
-
-                # CRITICAL: Ensure action_taken is always in params (it's NOT NULL)
-                # action_taken has different CHECK constraint than action!
-                if "action_taken" in actual_db_columns:
-                    params["action_taken"] = action_taken_value
-                    if "action_taken" not in filtered_data:
-                        filtered_data["action_taken"] = action_taken_value
-
-                # action is nullable, but set it if we have a value
-                if "action" in actual_db_columns and action_value:
-                    params["action"] = action_value
-                    if "action" not in filtered_data:
-                        filtered_data["action"] = action_value
-
                 # Execute INSERT
                 sql = f"INSERT INTO position_evaluation_timeline ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
                 print(f"📝 Executing INSERT with {len(columns)} columns, action='{action_value}'")
@@ -323,6 +92,7 @@ class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
                             time.perf_counter() - insert_start,
                         )
                     print(f"✅✅✅ Timeline record saved successfully! ID: {evaluation_id}")
+                    self._roll_up([evaluation_data])
                     return evaluation_id
                 except Exception as insert_error:
                     print(f"❌ INSERT failed: {insert_error}")
@@ -452,6 +222,309 @@ class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
                 else:
                     raise
 
+    def save_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Insert several records in one transaction.
+
+        Rows with the same column set go out as one executemany INSERT. If the
+        batch fails, each row is retried through save() (with its fallbacks).
+        """
+        if not rows:
+            return []
+        ids = [row.get("id") or f"eval_{uuid4().hex[:16]}" for row in rows]
+        with self.session_factory() as session:
+            try:
+                reflected_table, actual_db_columns = self._get_reflected_table(session)
+                groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+                for evaluation_id, row in zip(ids, rows):
+                    columns, params, _ = self._build_insert(
+                        evaluation_id, row, reflected_table, actual_db_columns
+                    )
+                    groups.setdefault(tuple(columns), []).append(params)
+                # SQLite connections autocommit; keep the groups in one transaction so a
+                # failed batch leaves no rows behind for the per-row retry to collide with
+                begin_write(session)
+                for columns, params_list in groups.items():
+                    sql = (
+                        f"INSERT INTO position_evaluation_timeline ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(f':{col}' for col in columns)})"
+                    )
+                    session.execute(text(sql), params_list)
+                session.commit()
+                self._roll_up(rows)
+                return ids
+            except Exception as e:
+                session.rollback()
+                self._logger.warning(
+                    "Batched timeline insert of %d rows failed (%s); saving rows one by one",
+                    len(rows),
+                    e,
+                )
+        return [self.save({**row, "id": evaluation_id}) for evaluation_id, row in zip(ids, rows)]
+
+    def _roll_up(self, rows: List[Dict[str, Any]]) -> None:
+        """Fold committed rows into the snapshot rollup; a failure only costs freshness."""
+        if self.snapshots is None:
+            return
+        try:
+            self.snapshots.record(rows)
+        except Exception as e:
+            self._logger.warning(
+                "Position snapshot rollup failed for %d rows (%s); "
+                "run scripts/backfill_position_snapshots.py to repair",
+                len(rows),
+                e,
+            )
+
+    def _build_insert(
+        self,
+        evaluation_id: str,
+        evaluation_data: Dict[str, Any],
+        reflected_table: Table,
+        actual_db_columns: set,
+    ) -> Tuple[List[str], Dict[str, Any], str]:
+        """Normalise one evaluation dict into (columns, params, action) for an INSERT."""
+        # Filter data to only include columns that exist in database
+        filtered_data = {}
+        for k, v in evaluation_data.items():
+            if k == "id":
+                continue
+            if k not in actual_db_columns:
+                continue
+
+            # Convert types appropriately
+            if isinstance(v, (list, dict)):
+                filtered_data[k] = json.dumps(v, default=str) if v else None
+            elif isinstance(v, Decimal):
+                filtered_data[k] = float(v)
+            elif isinstance(v, bool):
+                filtered_data[k] = bool(v)
+            elif v is None:
+                filtered_data[k] = None
+            else:
+                # Ensure it's a plain Python value
+                filtered_data[k] = v
+
+        # Handle action columns - they have DIFFERENT CHECK constraints!
+        # action: IN ('BUY', 'SELL', 'HOLD', 'SKIP')
+        # action_taken: IN ('NO_ACTION', 'ORDER_PROPOSED', 'ORDER_SUBMITTED', 'ORDER_EXECUTED')
+
+        # Get action value for 'action' column
+        action_value = None
+        if "action" in filtered_data:
+            action_value = filtered_data["action"]
+        elif "action" in evaluation_data:
+            action_value = evaluation_data["action"]
+
+        # Normalize action value - MUST be uppercase for SQLite CHECK constraint
+        if isinstance(action_value, bool):
+            action_value = "HOLD"
+        elif action_value is None:
+            action_value = "HOLD"
+        elif not isinstance(action_value, str):
+            action_value = str(action_value).upper().strip()
+        else:
+            action_value = action_value.upper().strip()
+
+        # Ensure valid constraint value for 'action' column
+        valid_actions = ["BUY", "SELL", "HOLD", "SKIP"]
+        if action_value not in valid_actions:
+            action_value = "HOLD"
+        action_value = action_value.upper()
+
+        # Get action_taken value - has DIFFERENT valid values
+        action_taken_value = None
+        if "action_taken" in filtered_data:
+            action_taken_value = filtered_data["action_taken"]
+        elif "action_taken" in evaluation_data:
+            action_taken_value = evaluation_data["action_taken"]
+
+        # Normalize action_taken value
+        if isinstance(action_taken_value, bool):
+            action_taken_value = "NO_ACTION"
+        elif action_taken_value is None:
+            action_taken_value = "NO_ACTION"
+        elif not isinstance(action_taken_value, str):
+            action_taken_value = str(action_taken_value).upper().strip()
+        else:
+            action_taken_value = action_taken_value.upper().strip()
+
+        # Ensure valid constraint value for 'action_taken' column
+        valid_action_taken = [
+            "NO_ACTION",
+            "ORDER_PROPOSED",
+            "ORDER_SUBMITTED",
+            "ORDER_EXECUTED",
+        ]
+        if action_taken_value not in valid_action_taken:
+            # Map action to action_taken if needed
+            if action_value in ["BUY", "SELL"]:
+                action_taken_value = "ORDER_PROPOSED"  # Default for trade actions
+            else:
+                action_taken_value = "NO_ACTION"  # Default for HOLD/SKIP
+        action_taken_value = action_taken_value.upper()
+
+        # Set action columns if they exist
+        if "action" in actual_db_columns:
+            filtered_data["action"] = action_value
+        if "action_taken" in actual_db_columns:
+            filtered_data["action_taken"] = action_taken_value
+
+        # Ensure required NOT NULL columns have values
+        # Based on schema validation: 18 NOT NULL fields (excluding PK)
+        current_time = datetime.now(timezone.utc)
+        market_price_raw_value = (
+            filtered_data.get("market_price_raw")
+            or filtered_data.get("effective_price")
+            or evaluation_data.get("effective_price")
+            or 0.0
+        )
+
+        # Get position values from evaluation_data if available
+        position_qty_before_value = (
+            filtered_data.get("position_qty_before")
+            or evaluation_data.get("position_qty_before")
+            or evaluation_data.get("position_qty")
+            or 0.0
+        )
+        position_cash_before_value = (
+            filtered_data.get("position_cash_before")
+            or evaluation_data.get("position_cash_before")
+            or evaluation_data.get("position_cash")
+            or 0.0
+        )
+        position_dividend_receivable_before_value = (
+            filtered_data.get("position_dividend_receivable_before")
+            or evaluation_data.get("position_dividend_receivable_before")
+            or 0.0
+        )
+
+        # Calculate position_stock_value_before and position_total_value_before if not provided
+        position_stock_value_before_value = filtered_data.get("position_stock_value_before")
+        if position_stock_value_before_value is None:
+            # Calculate from qty and price
+            if position_qty_before_value and market_price_raw_value:
+                position_stock_value_before_value = float(
+                    position_qty_before_value
+                ) * float(market_price_raw_value)
+            else:
+                position_stock_value_before_value = 0.0
+
+        position_total_value_before_value = filtered_data.get("position_total_value_before")
+        if position_total_value_before_value is None:
+            position_total_value_before_value = float(position_cash_before_value) + float(
+                position_stock_value_before_value
+            )
+
+        # Build defaults dict - all NOT NULL fields from schema validation
+        # Based on: python scripts/validate_timeline_schema.py output
+        required_defaults = {
+            "action_taken": action_taken_value,  # NOT NULL, CHECK: IN ('NO_ACTION', 'ORDER_PROPOSED', 'ORDER_SUBMITTED', 'ORDER_EXECUTED')
+            "allow_after_hours": filtered_data.get("allow_after_hours", True),
+            "anchor_reset_occurred": filtered_data.get("anchor_reset_occurred", False),
+            "dividend_declared": filtered_data.get("dividend_declared", False),  # NOT NULL - required field
+            "evaluated_at": filtered_data.get(
+                "evaluated_at", filtered_data.get("timestamp", current_time)
+            ),
+            "is_fresh": filtered_data.get("is_fresh", True),
+            "is_inline": filtered_data.get("is_inline", True),
+            "is_market_hours": filtered_data.get("is_market_hours", True),
+            "market_price_raw": market_price_raw_value,
+            "mode": filtered_data.get("mode", evaluation_data.get("mode", "LIVE")),
+            "portfolio_id": filtered_data.get(
+                "portfolio_id", evaluation_data.get("portfolio_id", "")
+            ),
+            "position_cash_before": position_cash_before_value,
+            "position_dividend_receivable_before": position_dividend_receivable_before_value,
+            "position_id": filtered_data.get(
+                "position_id", evaluation_data.get("position_id", "")
+            ),
+            "position_qty_before": position_qty_before_value,
+            "position_stock_value_before": position_stock_value_before_value,
+            "position_total_value_before": position_total_value_before_value,
+            "tenant_id": filtered_data.get(
+                "tenant_id", evaluation_data.get("tenant_id", "default")
+            ),
+            "trigger_detected": filtered_data.get("trigger_detected", False),
+        }
+
+        # action is NULLABLE, but set it if provided
+        if "action" in actual_db_columns and action_value:
+            filtered_data["action"] = action_value
+
+        # Dynamically check for other NOT NULL columns and provide defaults
+        for col in reflected_table.columns:
+            col_name = col.name
+            if col_name == "id":
+                continue
+            # Check if column is NOT NULL
+            try:
+                is_nullable = getattr(col, "nullable", True)
+                if (
+                    not is_nullable
+                    and col_name not in filtered_data
+                    and col_name not in required_defaults
+                ):
+                    # Provide a default based on column type
+                    if isinstance(
+                        col.type,
+                        (
+                            type(reflected_table.c.timestamp.type),
+                            type(reflected_table.c.evaluated_at.type),
+                        ),
+                    ):
+                        required_defaults[col_name] = current_time
+                    elif isinstance(
+                        col.type, type(reflected_table.c.is_market_hours.type)
+                    ):  # Boolean
+                        required_defaults[col_name] = False
+                    elif isinstance(
+                        col.type, type(reflected_table.c.market_price_raw.type)
+                    ):  # Float
+                        required_defaults[col_name] = 0.0
+                    elif isinstance(
+                        col.type, type(reflected_table.c.tenant_id.type)
+                    ):  # String
+                        required_defaults[col_name] = ""
+            except Exception:
+                pass  # Skip if we can't determine
+
+        # Apply defaults for missing required columns
+        for col_name, default_value in required_defaults.items():
+            if col_name in actual_db_columns and col_name not in filtered_data:
+                filtered_data[col_name] = default_value
+
+        # Build INSERT statement - ensure action_taken is always included (it's NOT NULL)
+        columns_set = set(filtered_data.keys())
+        # Force include action_taken if it exists in DB (it's NOT NULL)
+        if "action_taken" in actual_db_columns:
+            columns_set.add("action_taken")
+        # action is nullable, but include it if we have a value
+        if "action" in actual_db_columns and action_value:
+            columns_set.add("action")
+
+        columns = ["id"] + sorted([k for k in columns_set if k in actual_db_columns])
+
+        # Build params dict
+        params = {"id": evaluation_id}
+        for k, v in filtered_data.items():
+            if k in actual_db_columns:
+                params[k] = v
+
+        # CRITICAL: Ensure action_taken is always in params (it's NOT NULL)
+        # action_taken has different CHECK constraint than action!
+        if "action_taken" in actual_db_columns:
+            params["action_taken"] = action_taken_value
+            if "action_taken" not in filtered_data:
+                filtered_data["action_taken"] = action_taken_value
+
+        # action is nullable, but set it if we have a value
+        if "action" in actual_db_columns and action_value:
+            params["action"] = action_value
+            if "action" not in filtered_data:
+                filtered_data["action"] = action_value
+
+        return columns, params, action_value
+
     def get_by_id(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
         """Get an evaluation record by ID."""
         with self.session_factory() as session:
@@ -617,6 +690,38 @@ class EvaluationTimelineRepoSQL(EvaluationTimelineRepo):
             records = session.execute(query).scalars().all()
             return [self._model_to_dict(r) for r in records]
 
+    def iter_by_portfolio(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        mode: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream evaluation records for a portfolio, oldest first, batch_size rows at a time."""
+        query = select(PositionEvaluationTimelineModel).where(
+            and_(
+                PositionEvaluationTimelineModel.tenant_id == tenant_id,
+                PositionEvaluationTimelineModel.portfolio_id == portfolio_id,
+            )
+        )
+        if mode:
+            query = query.where(PositionEvaluationTimelineModel.mode == mode)
+        if start_date:
+            query = query.where(PositionEvaluationTimelineModel.timestamp >= start_date)
+        if end_date:
+            query = query.where(PositionEvaluationTimelineModel.timestamp <= end_date)
+        query = query.order_by(PositionEvaluationTimelineModel.timestamp.asc()).execution_options(
+            yield_per=batch_size
+        )
+
+        with self.session_factory() as session:
+            for record in session.execute(query).scalars():
+                yield self._model_to_dict(record)
+                # Loaded rows are not needed again; keep the identity map small
+                session.expunge(record)
+
     def list_snapshots_by_resolution(
         self,
         tenant_id: str,
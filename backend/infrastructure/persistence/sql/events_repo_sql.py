@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable, Any
+from typing import Iterable, Iterator, Any
 from decimal import Decimal
 
 from sqlalchemy import MetaData, Table, select
@@ -33,6 +33,18 @@ def _make_json_serializable(obj: Any) -> Any:
         return obj
 
 
+def _to_entity(r: EventModel) -> Event:
+    return Event(
+        id=r.id,
+        position_id=r.position_id,
+        type=r.type,
+        inputs=r.inputs or {},
+        outputs=r.outputs or {},
+        message=r.message,
+        ts=r.ts,
+    )
+
+
 class SQLEventsRepo(EventsRepo):
     """
     SQL-backed EventsRepo implementation.
@@ -137,18 +149,20 @@ class SQLEventsRepo(EventsRepo):
                 .limit(limit)
             )
             rows: list[EventModel] = list(s.execute(stmt).scalars().all())
-            return [
-                Event(
-                    id=r.id,
-                    position_id=r.position_id,
-                    type=r.type,
-                    inputs=r.inputs or {},
-                    outputs=r.outputs or {},
-                    message=r.message,
-                    ts=r.ts,
-                )
-                for r in rows
-            ]
+            return [_to_entity(r) for r in rows]
+
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Event]:
+        stmt = (
+            select(EventModel)
+            .where(EventModel.position_id == position_id)
+            .order_by(EventModel.ts.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        with self._sf() as s:
+            for r in s.execute(stmt).scalars():
+                yield _to_entity(r)
+                # Loaded rows are not needed again; keep the identity map small
+                s.expunge(r)
 
     def clear(self) -> None:
         with self._sf() as s:
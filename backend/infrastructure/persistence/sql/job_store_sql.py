@@ -0,0 +1,87 @@
+# =========================
+# backend/infrastructure/persistence/sql/job_store_sql.py
+# =========================
+"""SQL implementation of JobStore."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from domain.entities.background_job import BackgroundJob, JobStatus
+from domain.ports.job_store import JobStore
+from .models import BackgroundJobModel
+
+__all__ = ["SQLJobStore"]
+
+_UNFINISHED = (JobStatus.queued.value, JobStatus.running.value)
+
+
+class SQLJobStore(JobStore):
+    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+        # The background_jobs table comes from migration a6b7c8d9e0f1
+        self._sf = session_factory
+
+    def save(self, job: BackgroundJob) -> None:
+        with self._sf() as s:
+            s.merge(
+                BackgroundJobModel(
+                    id=job.id,
+                    kind=job.kind,
+                    payload=job.payload,
+                    priority=job.priority,
+                    status=job.status.value,
+                    created_at=job.created_at,
+                    started_at=job.started_at,
+                    finished_at=job.finished_at,
+                    result=job.result,
+                    error=job.error,
+                    cancel_requested=job.cancel_requested,
+                )
+            )
+            s.commit()
+
+    def get(self, job_id: str) -> Optional[BackgroundJob]:
+        with self._sf() as s:
+            row = s.get(BackgroundJobModel, job_id)
+            return _to_entity(row) if row else None
+
+    def delete(self, job_id: str) -> None:
+        with self._sf() as s:
+            s.execute(delete(BackgroundJobModel).where(BackgroundJobModel.id == job_id))
+            s.commit()
+
+    def list_unfinished(self) -> List[BackgroundJob]:
+        with self._sf() as s:
+            rows = s.scalars(
+                select(BackgroundJobModel)
+                .where(BackgroundJobModel.status.in_(_UNFINISHED))
+                .order_by(BackgroundJobModel.created_at)
+            )
+            return [_to_entity(row) for row in rows]
+
+
+def _to_entity(row: BackgroundJobModel) -> BackgroundJob:
+    return BackgroundJob(
+        id=row.id,
+        kind=row.kind,
+        payload=row.payload or {},
+        priority=row.priority,
+        status=JobStatus(row.status),
+        created_at=_aware(row.created_at),
+        started_at=_aware(row.started_at),
+        finished_at=_aware(row.finished_at),
+        result=row.result,
+        error=row.error,
+        cancel_requested=row.cancel_requested,
+    )
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive datetimes for DateTime(timezone=True)
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -10,7 +10,6 @@ from sqlalchemy import (
     Integer,
     DateTime,
     UniqueConstraint,
-    create_engine,
     JSON,
     Index,
     Text,
@@ -18,10 +17,14 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     ForeignKeyConstraint,
+    LargeBinary,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+# Re-exported: callers have always imported get_engine from here
+from .engine import get_engine  # noqa: F401
+
 
 class Base(DeclarativeBase):
     pass
@@ -617,24 +620,6 @@ class PortfolioPositionModel(Base):
     )
 
 
-def get_engine(url: str) -> Engine:
-    # SQLite-specific configuration for better concurrency handling
-    if url.startswith("sqlite"):
-        return create_engine(
-            url,
-            future=True,
-            pool_pre_ping=True,
-            pool_size=1,  # Single connection for SQLite
-            connect_args={
-                "check_same_thread": False,
-                "timeout": 30,
-                "isolation_level": None,  # Autocommit mode
-            },
-        )
-    else:
-        return create_engine(url, future=True)
-
-
 def _migrate_add_missing_columns(engine: Engine) -> None:
     """Add columns that were added after initial table creation (lightweight migration)."""
     from sqlalchemy import inspect as sa_inspect, text
@@ -831,14 +816,18 @@ class SimulationResultModel(Base):
     beta: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     information_ratio: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
 
-    # Detailed data (stored as JSON)
-    trade_log: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    daily_returns: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    dividend_analysis: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    price_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    trigger_analysis: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    time_series_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
-    debug_info: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True)
+    # Detailed data. Loaded only when accessed so listing stays on the scalar columns.
+    # The series columns hold rows written before series_blob existed.
+    trade_log: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    daily_returns: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    dividend_analysis: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    price_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    trigger_analysis: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    time_series_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    debug_info: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=True, deferred=True)
+    # Columnar, compressed trade_log/daily_returns/price_data/trigger_analysis/
+    # time_series_data (see infrastructure.persistence.series_codec)
+    series_blob: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
 
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
@@ -943,6 +932,24 @@ class OrderPolicyConfigModel(Base):
     )
 
 
+class ConfigChangeModel(Base):
+    """
+    Change log of configuration writes.
+
+    Each process caching configs polls rows past its last seen id and drops
+    the matching cache entries, so a write in one process reaches the others.
+    """
+
+    __tablename__ = "config_changes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)  # trigger, guardrail, ...
+    key: Mapped[str | None] = mapped_column(String, nullable=True)  # position_id
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
 class PositionBaselineModel(Base):
     """
     Canonical PositionBaseline table.
@@ -1093,3 +1100,66 @@ class TradingExperimentModel(Base):
             name="ck_trading_experiments_status",
         ),
     )
+
+
+class BackgroundJobModel(Base):
+    """Background job state (simulations, optimization runs) for the local job queue."""
+
+    __tablename__ = "background_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=10)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    result: Mapped[Any | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (Index("ix_background_jobs_status", "status"),)
+
+
+class PositionSnapshotModel(Base):
+    """Hourly/daily/weekly rollup of position_evaluation_timeline, one row per position and bucket.
+
+    Kept current by timeline writes; built and rebuilt from the timeline by
+    scripts/backfill_position_snapshots.py.
+    """
+
+    __tablename__ = "position_snapshots"
+
+    tenant_id: Mapped[str] = mapped_column(String, primary_key=True)
+    portfolio_id: Mapped[str] = mapped_column(String, primary_key=True)
+    position_id: Mapped[str] = mapped_column(String, primary_key=True)
+    mode: Mapped[str] = mapped_column(String, primary_key=True)
+    resolution: Mapped[str] = mapped_column(String, primary_key=True)  # hourly / daily / weekly
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    symbol: Mapped[str | None] = mapped_column(String, nullable=True)
+    first_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # OHLC of position total value within the bucket; close is the last evaluation's value
+    open_value: Mapped[float] = mapped_column(Float, nullable=False)
+    high_value: Mapped[float] = mapped_column(Float, nullable=False)
+    low_value: Mapped[float] = mapped_column(Float, nullable=False)
+    close_value: Mapped[float] = mapped_column(Float, nullable=False)
+    stock_value: Mapped[float] = mapped_column(Float, nullable=False)
+    cash: Mapped[float] = mapped_column(Float, nullable=False)
+    evaluation_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trade_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dividend_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "ix_position_snapshots_portfolio",
+            "tenant_id",
+            "portfolio_id",
+            "mode",
+            "resolution",
+            "bucket_start",
+        ),
+    )
@@ -4,18 +4,49 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone, time, date
-from typing import Optional, Iterable, List, cast
+from typing import Dict, Optional, Iterable, Iterator, List, cast
 
 from sqlalchemy import desc, func, select
 from sqlalchemy.orm import Session, sessionmaker
 
-from domain.entities.order import Order
+from domain.entities.order import OPEN_ORDER_STATUSES, Order
 from domain.ports.orders_repo import OrdersRepo
 from domain.value_objects.types import OrderSide, OrderStatus
 from .models import OrderModel
 
 __all__ = ["SQLOrdersRepo"]
 
+# Bound parameters per IN (...) query; stays under SQLite's 999-variable limit
+_IN_CHUNK = 500
+
+
+def _to_entity(row: OrderModel) -> Order:
+    """Convert SQLAlchemy row to domain entity."""
+    return Order(
+        id=row.id,
+        tenant_id=row.tenant_id,
+        portfolio_id=row.portfolio_id,
+        position_id=row.position_id,
+        side=cast(OrderSide, row.side),
+        qty=row.qty,
+        status=cast(OrderStatus, row.status),
+        idempotency_key=row.idempotency_key,
+        commission_rate_snapshot=getattr(row, "commission_rate_snapshot", None),
+        commission_estimated=getattr(row, "commission_estimated", None),
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        # Broker integration fields
+        broker_order_id=getattr(row, "broker_order_id", None),
+        broker_status=getattr(row, "broker_status", None),
+        submitted_to_broker_at=getattr(row, "submitted_to_broker_at", None),
+        filled_qty=getattr(row, "filled_qty", 0.0) or 0.0,
+        avg_fill_price=getattr(row, "avg_fill_price", None),
+        total_commission=getattr(row, "total_commission", 0.0) or 0.0,
+        last_broker_update=getattr(row, "last_broker_update", None),
+        rejection_reason=getattr(row, "rejection_reason", None),
+        time_in_force=getattr(row, "time_in_force", "day") or "day",
+    )
+
 
 class SQLOrdersRepo(OrdersRepo):
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
@@ -63,30 +94,17 @@ class SQLOrdersRepo(OrdersRepo):
             row = s.get(OrderModel, order_id)
             if not row:
                 return None
-            return Order(
-                id=row.id,
-                tenant_id=row.tenant_id,
-                portfolio_id=row.portfolio_id,
-                position_id=row.position_id,
-                side=cast(OrderSide, row.side),
-                qty=row.qty,
-                status=cast(OrderStatus, row.status),
-                idempotency_key=row.idempotency_key,
-                commission_rate_snapshot=getattr(row, "commission_rate_snapshot", None),
-                commission_estimated=getattr(row, "commission_estimated", None),
-                created_at=row.created_at,
-                updated_at=row.updated_at,
-                # Broker integration fields
-                broker_order_id=getattr(row, "broker_order_id", None),
-                broker_status=getattr(row, "broker_status", None),
-                submitted_to_broker_at=getattr(row, "submitted_to_broker_at", None),
-                filled_qty=getattr(row, "filled_qty", 0.0) or 0.0,
-                avg_fill_price=getattr(row, "avg_fill_price", None),
-                total_commission=getattr(row, "total_commission", 0.0) or 0.0,
-                last_broker_update=getattr(row, "last_broker_update", None),
-                rejection_reason=getattr(row, "rejection_reason", None),
-                time_in_force=getattr(row, "time_in_force", "day") or "day",
-            )
+            return _to_entity(row)
+
+    def get_many(self, order_ids: Iterable[str]) -> Dict[str, Order]:
+        """Get several orders by ID with one IN query per chunk; missing IDs are omitted."""
+        ids = list(dict.fromkeys(order_ids))
+        orders: Dict[str, Order] = {}
+        with self._sf() as s:
+            for i in range(0, len(ids), _IN_CHUNK):
+                rows = s.scalars(select(OrderModel).where(OrderModel.id.in_(ids[i : i + _IN_CHUNK])))
+                orders.update((r.id, _to_entity(r)) for r in rows)
+        return orders
 
     def save(self, order: Order) -> None:
         with self._sf() as s:
@@ -154,6 +172,44 @@ class SQLOrdersRepo(OrdersRepo):
                 or 0
             )
 
+    def list_open_for_positions(self, position_ids: Iterable[str]) -> Dict[str, List[Order]]:
+        """Open orders per position, newest first, with one IN query per chunk."""
+        ids = list(dict.fromkeys(position_ids))
+        orders: Dict[str, List[Order]] = {}
+        with self._sf() as s:
+            for i in range(0, len(ids), _IN_CHUNK):
+                rows = s.scalars(
+                    select(OrderModel)
+                    .where(
+                        OrderModel.position_id.in_(ids[i : i + _IN_CHUNK]),
+                        OrderModel.status.in_(OPEN_ORDER_STATUSES),
+                    )
+                    .order_by(desc(OrderModel.created_at))
+                )
+                for row in rows:
+                    orders.setdefault(row.position_id, []).append(_to_entity(row))
+        return orders
+
+    def count_for_positions_on_day(self, position_ids: Iterable[str], day: date) -> Dict[str, int]:
+        """count_for_position_on_day for several positions, one grouped query per chunk."""
+        ids = list(dict.fromkeys(position_ids))
+        start = datetime.combine(day, time.min).replace(tzinfo=timezone.utc)
+        end = datetime.combine(day, time.max).replace(tzinfo=timezone.utc)
+        counts: Dict[str, int] = {}
+        with self._sf() as s:
+            for i in range(0, len(ids), _IN_CHUNK):
+                rows = s.execute(
+                    select(OrderModel.position_id, func.count(OrderModel.id))
+                    .where(
+                        OrderModel.position_id.in_(ids[i : i + _IN_CHUNK]),
+                        OrderModel.created_at >= start,
+                        OrderModel.created_at <= end,
+                    )
+                    .group_by(OrderModel.position_id)
+                )
+                counts.update((position_id, int(count)) for position_id, count in rows)
+        return counts
+
     def clear(self) -> None:
         with self._sf() as s:
             s.query(OrderModel).delete()
@@ -168,60 +224,22 @@ class SQLOrdersRepo(OrdersRepo):
                 .limit(limit)
                 .all()
             )
-            return [
-                Order(
-                    id=r.id,
-                    tenant_id=r.tenant_id,
-                    portfolio_id=r.portfolio_id,
-                    position_id=r.position_id,
-                    side=cast(OrderSide, r.side),
-                    qty=r.qty,
-                    status=cast(OrderStatus, r.status),
-                    idempotency_key=r.idempotency_key,
-                    commission_rate_snapshot=getattr(r, "commission_rate_snapshot", None),
-                    commission_estimated=getattr(r, "commission_estimated", None),
-                    created_at=r.created_at,
-                    updated_at=r.updated_at,
-                    # Broker integration fields
-                    broker_order_id=getattr(r, "broker_order_id", None),
-                    broker_status=getattr(r, "broker_status", None),
-                    submitted_to_broker_at=getattr(r, "submitted_to_broker_at", None),
-                    filled_qty=getattr(r, "filled_qty", 0.0) or 0.0,
-                    avg_fill_price=getattr(r, "avg_fill_price", None),
-                    total_commission=getattr(r, "total_commission", 0.0) or 0.0,
-                    last_broker_update=getattr(r, "last_broker_update", None),
-                    rejection_reason=getattr(r, "rejection_reason", None),
-                    time_in_force=getattr(r, "time_in_force", "day") or "day",
-                )
-                for r in rows
-            ]
+            return [_to_entity(r) for r in rows]
+
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Order]:
+        stmt = (
+            select(OrderModel)
+            .where(OrderModel.position_id == position_id)
+            .order_by(desc(OrderModel.created_at))
+            .execution_options(yield_per=batch_size)
+        )
+        with self._sf() as s:
+            for r in s.execute(stmt).scalars():
+                yield _to_entity(r)
+                # Loaded rows are not needed again; keep the identity map small
+                s.expunge(r)
 
     def list_all(self) -> Iterable[Order]:
         with self._sf() as s:
             rows: List[OrderModel] = s.query(OrderModel).all()
-            return [
-                Order(
-                    id=r.id,
-                    tenant_id=r.tenant_id,
-                    portfolio_id=r.portfolio_id,
-                    position_id=r.position_id,
-                    side=cast(OrderSide, r.side),
-                    qty=r.qty,
-                    status=cast(OrderStatus, r.status),
-                    idempotency_key=r.idempotency_key,
-                    commission_rate_snapshot=getattr(r, "commission_rate_snapshot", None),
-                    commission_estimated=getattr(r, "commission_estimated", None),
-                    created_at=r.created_at,
-                    updated_at=r.updated_at,
-                    broker_order_id=getattr(r, "broker_order_id", None),
-                    broker_status=getattr(r, "broker_status", None),
-                    submitted_to_broker_at=getattr(r, "submitted_to_broker_at", None),
-                    filled_qty=getattr(r, "filled_qty", 0.0) or 0.0,
-                    avg_fill_price=getattr(r, "avg_fill_price", None),
-                    total_commission=getattr(r, "total_commission", 0.0) or 0.0,
-                    last_broker_update=getattr(r, "last_broker_update", None),
-                    rejection_reason=getattr(r, "rejection_reason", None),
-                    time_in_force=getattr(r, "time_in_force", "day") or "day",
-                )
-                for r in rows
-            ]
+            return [_to_entity(r) for r in rows]
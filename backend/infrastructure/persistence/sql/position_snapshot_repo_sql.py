@@ -0,0 +1,216 @@
+# =========================
+# backend/infrastructure/persistence/sql/position_snapshot_repo_sql.py
+# =========================
+"""SQL implementation of PositionSnapshotRepo."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, delete, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from domain.ports.position_snapshot_repo import PositionSnapshotRepo
+from infrastructure.persistence.position_snapshots import (
+    SNAPSHOT_FIELDS,
+    SnapshotKey,
+    bucket_start,
+    fold_rows,
+    merge_snapshots,
+    snapshot_key,
+)
+from .engine import begin_write
+from .models import PositionEvaluationTimelineModel, PositionSnapshotModel
+
+__all__ = ["SQLPositionSnapshotRepo"]
+
+logger = logging.getLogger(__name__)
+
+# Timeline columns a snapshot is built from
+_TIMELINE_COLUMNS = (
+    "tenant_id",
+    "portfolio_id",
+    "position_id",
+    "symbol",
+    "mode",
+    "simulation_run_id",
+    "timestamp",
+    "action",
+    "dividend_applied",
+    "position_total_value_before",
+    "position_total_value_after",
+    "position_stock_value_before",
+    "position_stock_value_after",
+    "position_cash_before",
+    "position_cash_after",
+)
+
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+_KEY_COLUMNS = ("tenant_id", "portfolio_id", "position_id", "mode", "resolution", "bucket_start")
+
+
+def _upsert_stmt(dialect: str):
+    """INSERT of new snapshots that folds into an existing bucket like merge_snapshots.
+
+    Every SET expression reads the stored row as it was before the statement,
+    so concurrent writers serialise on the row and no count or extreme is lost.
+    """
+    table = PositionSnapshotModel.__table__
+    stmt = _UPSERT_INSERTS[dialect](table)
+    new, old = stmt.excluded, table.c
+    earlier = new.first_timestamp < old.first_timestamp
+    # Ties keep the stored row's closing values, as merge_snapshots(stored, new) does
+    later = new.last_timestamp > old.last_timestamp
+
+    def pick(condition, field):
+        return case((condition, new[field]), else_=old[field])
+
+    set_ = {field: pick(earlier, field) for field in ("first_timestamp", "open_value")}
+    set_.update(
+        {
+            field: pick(later, field)
+            for field in ("symbol", "last_timestamp", "close_value", "stock_value", "cash")
+        }
+    )
+    set_["high_value"] = pick(new.high_value > old.high_value, "high_value")
+    set_["low_value"] = pick(new.low_value < old.low_value, "low_value")
+    for count in ("evaluation_count", "trade_count", "dividend_count"):
+        set_[count] = old[count] + new[count]
+    return stmt.on_conflict_do_update(index_elements=list(_KEY_COLUMNS), set_=set_)
+
+
+def _to_dict(row: PositionSnapshotModel) -> Dict[str, Any]:
+    snap = {field: getattr(row, field) for field in SNAPSHOT_FIELDS}
+    for field in ("bucket_start", "first_timestamp", "last_timestamp"):
+        if snap[field].tzinfo is None:
+            snap[field] = snap[field].replace(tzinfo=timezone.utc)
+    return snap
+
+
+class SQLPositionSnapshotRepo(PositionSnapshotRepo):
+    def __init__(self, session_factory: sessionmaker[Session]) -> None:
+        self._sf = session_factory
+        bind: Optional[Engine] = session_factory.kw.get("bind")
+        self._dialect = bind.dialect.name if bind is not None else ""
+        # Serialises the read-merge-write fallback for dialects without an upsert,
+        # and that fallback against rebuild
+        self._merge_lock = threading.Lock()
+
+    def record(self, rows: List[Dict[str, Any]]) -> None:
+        folded = fold_rows(rows)
+        if not folded:
+            return
+        if self._dialect in _UPSERT_INSERTS:
+            with self._sf() as s:
+                s.execute(_upsert_stmt(self._dialect), list(folded.values()))
+                s.commit()
+            return
+        # A writer in another process may insert the same new bucket first; merge on retry
+        with self._merge_lock:
+            for attempt in (1, 2):
+                try:
+                    self._merge(folded)
+                    return
+                except IntegrityError:
+                    if attempt == 2:
+                        raise
+
+    def _merge(self, folded: Dict[SnapshotKey, Dict[str, Any]]) -> None:
+        with self._sf() as s:
+            stmt = select(PositionSnapshotModel).where(
+                PositionSnapshotModel.position_id.in_({k[2] for k in folded}),
+                PositionSnapshotModel.bucket_start.in_({k[5] for k in folded}),
+            )
+            existing = {snapshot_key(_to_dict(r)): r for r in s.scalars(stmt)}
+            for key, snap in folded.items():
+                row = existing.get(key)
+                if row is None:
+                    s.add(PositionSnapshotModel(**snap))
+                    continue
+                for field, value in merge_snapshots(_to_dict(row), snap).items():
+                    setattr(row, field, value)
+            s.commit()
+
+    def list_snapshots(
+        self,
+        tenant_id: str,
+        portfolio_id: str,
+        resolution: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        position_id: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        model = PositionSnapshotModel
+        stmt = select(model).where(
+            model.tenant_id == tenant_id,
+            model.portfolio_id == portfolio_id,
+            model.resolution == resolution,
+        )
+        if mode:
+            stmt = stmt.where(model.mode == mode)
+        if position_id:
+            stmt = stmt.where(model.position_id == position_id)
+        if start_date:
+            # Include the bucket that contains start_date
+            stmt = stmt.where(model.bucket_start >= bucket_start(start_date, resolution))
+        if end_date:
+            stmt = stmt.where(model.bucket_start <= end_date)
+        stmt = stmt.order_by(model.bucket_start, model.position_id)
+        with self._sf() as s:
+            return [_to_dict(r) for r in s.scalars(stmt)]
+
+    def rebuild(
+        self, tenant_id: Optional[str] = None, portfolio_id: Optional[str] = None
+    ) -> int:
+        timeline = PositionEvaluationTimelineModel
+        query = select(*(getattr(timeline, c) for c in _TIMELINE_COLUMNS))
+        wipe = delete(PositionSnapshotModel)
+        if tenant_id:
+            query = query.where(timeline.tenant_id == tenant_id)
+            wipe = wipe.where(PositionSnapshotModel.tenant_id == tenant_id)
+        if portfolio_id:
+            query = query.where(timeline.portfolio_id == portfolio_id)
+            wipe = wipe.where(PositionSnapshotModel.portfolio_id == portfolio_id)
+
+        # Wipe, read and insert in one transaction that holds off concurrent folds,
+        # so a fold cannot land between the read and the wipe and be lost, and a
+        # failure part way leaves the old rollup in place. Folds that wait on the
+        # lock apply on top of the rebuilt rows.
+        snapshots: Dict[SnapshotKey, Dict[str, Any]] = {}
+        with self._merge_lock, self._sf() as s:
+            if self._dialect == "postgresql":
+                s.execute(
+                    text(
+                        f"LOCK TABLE {PositionSnapshotModel.__tablename__} "
+                        "IN SHARE ROW EXCLUSIVE MODE"
+                    )
+                )
+            else:
+                # SQLite connections autocommit; hold the database write lock instead
+                begin_write(s)
+            s.execute(wipe)
+
+            # One pass over the timeline; the fold holds one entry per position and bucket
+            result = s.execute(query.execution_options(yield_per=5000))
+            for chunk in result.mappings().partitions():
+                for key, snap in fold_rows(chunk).items():
+                    snapshots[key] = (
+                        merge_snapshots(snapshots[key], snap) if key in snapshots else snap
+                    )
+
+            values = list(snapshots.values())
+            for i in range(0, len(values), 1000):
+                s.execute(insert(PositionSnapshotModel), values[i : i + 1000])
+            s.commit()
+        logger.info("Rebuilt %d position snapshots", len(snapshots))
+        return len(snapshots)
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import select, inspect, text
+from sqlalchemy import column, insert, inspect, select, table, text, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.expression import TableClause
 
 from domain.entities.position import Position
 from domain.ports.positions_repo import PositionsRepo
 from domain.value_objects.order_policy import OrderPolicy
 from domain.value_objects.guardrails import GuardrailPolicy
+from .engine import begin_write
 from .models import PositionModel
 
 
@@ -58,61 +63,94 @@ def _to_entity(m: PositionModel) -> Position:
     )
 
 
-def _new_row_from_entity(p: Position) -> PositionModel:
-    """Domain entity -> new SQL row (insert)."""
-    return PositionModel(
-        id=p.id,
-        tenant_id=p.tenant_id,
-        portfolio_id=p.portfolio_id,
-        asset_symbol=p.asset_symbol,
-        ticker=p.asset_symbol,  # Set ticker for backward compatibility with existing DB schema
-        qty=p.qty,
-        cash=p.cash,  # Cash lives in PositionCell (per target state model)
-        anchor_price=p.anchor_price,
-        avg_cost=p.avg_cost,
-        total_commission_paid=p.total_commission_paid,
-        total_dividends_received=p.total_dividends_received,
-        status="RUNNING",  # Default status per usage model (can be changed to PAUSED)
-        created_at=p.created_at,
-        updated_at=p.updated_at,
-        op_min_qty=p.order_policy.min_qty,
-        op_min_notional=p.order_policy.min_notional,
-        op_lot_size=p.order_policy.lot_size,
-        op_qty_step=p.order_policy.qty_step,
-        op_action_below_min=p.order_policy.action_below_min,
-        gr_min_stock_alloc_pct=p.guardrails.min_stock_alloc_pct,
-        gr_max_stock_alloc_pct=p.guardrails.max_stock_alloc_pct,
-        gr_max_orders_per_day=p.guardrails.max_orders_per_day,
+def _row_values(p: Position) -> Dict[str, Any]:
+    """Domain entity -> column values for an upsert (without ``status``)."""
+    return {
+        "id": p.id,
+        "tenant_id": p.tenant_id,
+        "portfolio_id": p.portfolio_id,
+        "asset_symbol": p.asset_symbol,
+        "ticker": p.asset_symbol,  # Set ticker for backward compatibility with existing DB schema
+        "qty": p.qty,
+        "cash": p.cash,  # Cash lives in PositionCell (per target state model)
+        "anchor_price": p.anchor_price,
+        "avg_cost": p.avg_cost,
+        "total_commission_paid": p.total_commission_paid,
+        "total_dividends_received": p.total_dividends_received,
+        "created_at": p.created_at,
+        "updated_at": p.updated_at,
+        "op_min_qty": p.order_policy.min_qty,
+        "op_min_notional": p.order_policy.min_notional,
+        "op_lot_size": p.order_policy.lot_size,
+        "op_qty_step": p.order_policy.qty_step,
+        "op_action_below_min": p.order_policy.action_below_min,
+        "gr_min_stock_alloc_pct": p.guardrails.min_stock_alloc_pct,
+        "gr_max_stock_alloc_pct": p.guardrails.max_stock_alloc_pct,
+        "gr_max_orders_per_day": p.guardrails.max_orders_per_day,
+    }
+
+
+# Columns an update may change; identity, created_at and status are kept
+_UPDATE_COLUMNS = (
+    "asset_symbol",
+    "ticker",
+    "qty",
+    "cash",
+    "anchor_price",
+    "avg_cost",
+    "total_commission_paid",
+    "total_dividends_received",
+    "updated_at",
+    "op_min_qty",
+    "op_min_notional",
+    "op_lot_size",
+    "op_qty_step",
+    "op_action_below_min",
+    "gr_min_stock_alloc_pct",
+    "gr_max_stock_alloc_pct",
+    "gr_max_orders_per_day",
+)
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def _positions_table(columns: List[str]) -> TableClause:
+    """Lightweight ``positions`` table over exactly ``columns``.
+
+    Unlike ``PositionModel.__table__`` it carries no Python-side defaults, so
+    no ``status`` value is sent to databases that predate that column.
+    """
+    model_columns = PositionModel.__table__.c
+    return table("positions", *(column(name, model_columns[name].type) for name in columns))
+
+
+def _upsert_stmt(dialect: str, positions: TableClause):
+    stmt = _UPSERT_INSERTS[dialect](positions)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={col: stmt.excluded[col] for col in _UPDATE_COLUMNS},
+        where=(positions.c.tenant_id == stmt.excluded.tenant_id)
+        & (positions.c.portfolio_id == stmt.excluded.portfolio_id),
     )
 
 
-def _apply_entity_to_row(row: PositionModel, p: Position) -> None:
-    """Apply domain entity fields onto an existing SQL row (update)."""
-    row.asset_symbol = p.asset_symbol
-    row.ticker = p.asset_symbol  # Update ticker for backward compatibility
-    row.qty = p.qty
-    row.cash = p.cash  # Update cash (cash lives in PositionCell)
-    row.anchor_price = p.anchor_price
-    row.avg_cost = p.avg_cost
-    row.total_commission_paid = p.total_commission_paid
-    row.total_dividends_received = p.total_dividends_received
-    row.updated_at = p.updated_at
-
-    row.op_min_qty = p.order_policy.min_qty
-    row.op_min_notional = p.order_policy.min_notional
-    row.op_lot_size = p.order_policy.lot_size
-    row.op_qty_step = p.order_policy.qty_step
-    row.op_action_below_min = p.order_policy.action_below_min
-
-    row.gr_min_stock_alloc_pct = p.guardrails.min_stock_alloc_pct
-    row.gr_max_stock_alloc_pct = p.guardrails.max_stock_alloc_pct
-    row.gr_max_orders_per_day = p.guardrails.max_orders_per_day
-
-
 class SQLPositionsRepo(PositionsRepo):
     def __init__(self, session_factory: sessionmaker[Session]) -> None:
         self._sf = session_factory
         self._status_column_exists: Optional[bool] = None  # Cache column existence check
+        bind: Optional[Engine] = session_factory.kw.get("bind")
+        self._dialect = bind.dialect.name if bind is not None else ""
+        # Probe the schema once up front instead of on the first hot call
+        if bind is not None:
+            self._probe_status_column(bind)
+
+    def _probe_status_column(self, engine: Engine) -> None:
+        try:
+            columns = [col["name"] for col in inspect(engine).get_columns("positions")]
+        except Exception:
+            return  # Table not there yet; probed again on first use
+        if columns:
+            self._status_column_exists = "status" in columns
 
     def _check_status_column_exists(self, session: Session) -> bool:
         """Check if the status column exists in the positions table."""
@@ -127,6 +165,8 @@ class SQLPositionsRepo(PositionsRepo):
                 self._status_column_exists = False
                 return False
 
+            if not self._dialect:
+                self._dialect = engine.dialect.name
             # Check if column exists
             inspector = inspect(engine)
             columns = [col["name"] for col in inspector.get_columns("positions")]
@@ -319,180 +359,61 @@ class SQLPositionsRepo(PositionsRepo):
     # --- Writes ---
 
     def save(self, position: Position) -> None:
+        """Insert or update one position in a single upsert statement."""
+        self.save_many([position])
+
+    def save_many(self, positions: Iterable[Position]) -> None:
+        """Insert or update several positions in one transaction.
+
+        SQLite and Postgres get ``INSERT ... ON CONFLICT (id) DO UPDATE`` sent
+        as one executemany; other dialects fall back to UPDATE-then-INSERT per
+        row. The update only touches rows of the same tenant and portfolio and
+        leaves ``status`` and ``created_at`` alone; an id that belongs to
+        another tenant or portfolio raises IntegrityError and nothing is saved.
+        """
+        rows = [_row_values(p) for p in positions]
+        if not rows:
+            return
         with self._sf() as s:
             status_exists = self._check_status_column_exists(s)
-
-            # Check if row exists using appropriate method
-            if not status_exists:
-                # Use raw SQL to check if row exists
-                check_sql = text(
-                    """
-                    SELECT id FROM positions
-                    WHERE id = :position_id AND tenant_id = :tenant_id AND portfolio_id = :portfolio_id
-                """
-                )
-                result = s.execute(
-                    check_sql,
-                    {
-                        "position_id": position.id,
-                        "tenant_id": position.tenant_id,
-                        "portfolio_id": position.portfolio_id,
-                    },
-                )
-                row_exists = result.fetchone() is not None
-            else:
-                # Normal query
-                try:
-                    stmt = select(PositionModel).where(
-                        PositionModel.id == position.id,
-                        PositionModel.tenant_id == position.tenant_id,
-                        PositionModel.portfolio_id == position.portfolio_id,
-                    )
-                    row = s.execute(stmt).scalar_one_or_none()
-                    row_exists = row is not None
-                except Exception as e:
-                    error_msg = str(e)
-                    if "no such column" in error_msg.lower() and "status" in error_msg.lower():
-                        self._status_column_exists = False
-                        return self.save(position)  # Retry
-                    raise
-
-            if not row_exists:
-                # Insert new row
-                if not status_exists:
-                    # Use raw SQL insert without status
-                    insert_sql = text(
-                        """
-                        INSERT INTO positions (
-                            id, tenant_id, portfolio_id, asset_symbol, ticker, qty, cash,
-                            anchor_price, avg_cost, op_min_qty, op_min_notional, op_lot_size,
-                            op_qty_step, op_action_below_min, gr_min_stock_alloc_pct,
-                            gr_max_stock_alloc_pct, gr_max_orders_per_day,
-                            total_commission_paid, total_dividends_received,
-                            created_at, updated_at
-                        ) VALUES (
-                            :id, :tenant_id, :portfolio_id, :asset_symbol, :ticker, :qty, :cash,
-                            :anchor_price, :avg_cost, :op_min_qty, :op_min_notional, :op_lot_size,
-                            :op_qty_step, :op_action_below_min, :gr_min_stock_alloc_pct,
-                            :gr_max_stock_alloc_pct, :gr_max_orders_per_day,
-                            :total_commission_paid, :total_dividends_received,
-                            :created_at, :updated_at
-                        )
-                    """
-                    )
-                    s.execute(
-                        insert_sql,
-                        {
-                            "id": position.id,
-                            "tenant_id": position.tenant_id,
-                            "portfolio_id": position.portfolio_id,
-                            "asset_symbol": position.asset_symbol,
-                            "ticker": position.asset_symbol,
-                            "qty": position.qty,
-                            "cash": position.cash,
-                            "anchor_price": position.anchor_price,
-                            "avg_cost": position.avg_cost,
-                            "op_min_qty": position.order_policy.min_qty,
-                            "op_min_notional": position.order_policy.min_notional,
-                            "op_lot_size": position.order_policy.lot_size,
-                            "op_qty_step": position.order_policy.qty_step,
-                            "op_action_below_min": position.order_policy.action_below_min,
-                            "gr_min_stock_alloc_pct": position.guardrails.min_stock_alloc_pct,
-                            "gr_max_stock_alloc_pct": position.guardrails.max_stock_alloc_pct,
-                            "gr_max_orders_per_day": position.guardrails.max_orders_per_day,
-                            "total_commission_paid": position.total_commission_paid,
-                            "total_dividends_received": position.total_dividends_received,
-                            "created_at": position.created_at,
-                            "updated_at": position.updated_at,
-                        },
+            if status_exists:
+                for row in rows:
+                    row["status"] = "RUNNING"  # Only used when the row is inserted
+            table = _positions_table(list(rows[0]))
+            if len(rows) > 1:
+                # SQLite connections autocommit; without this rows upserted before
+                # a conflict would stay saved
+                begin_write(s)
+            if self._dialect in _UPSERT_INSERTS:
+                stmt = _upsert_stmt(self._dialect, table).returning(table.c.id)
+                written = set(s.execute(stmt, rows).scalars())
+                skipped = [row["id"] for row in rows if row["id"] not in written]
+                if skipped:
+                    # The conflict WHERE kept another tenant's / portfolio's row;
+                    # fail like the plain INSERT would have instead of dropping it
+                    raise IntegrityError(
+                        str(stmt),
+                        None,
+                        Exception(f"position id already used by another portfolio: {skipped}"),
                     )
-                else:
-                    # Normal insert with status
-                    new_row = _new_row_from_entity(position)
-                    s.add(new_row)
             else:
-                # Update existing row
-                if not status_exists:
-                    # Use raw SQL update without status
-                    update_sql = text(
-                        """
-                        UPDATE positions SET
-                            asset_symbol = :asset_symbol, ticker = :ticker, qty = :qty, cash = :cash,
-                            anchor_price = :anchor_price, avg_cost = :avg_cost,
-                            op_min_qty = :op_min_qty, op_min_notional = :op_min_notional,
-                            op_lot_size = :op_lot_size, op_qty_step = :op_qty_step,
-                            op_action_below_min = :op_action_below_min,
-                            gr_min_stock_alloc_pct = :gr_min_stock_alloc_pct,
-                            gr_max_stock_alloc_pct = :gr_max_stock_alloc_pct,
-                            gr_max_orders_per_day = :gr_max_orders_per_day,
-                            total_commission_paid = :total_commission_paid,
-                            total_dividends_received = :total_dividends_received,
-                            updated_at = :updated_at
-                        WHERE id = :id AND tenant_id = :tenant_id AND portfolio_id = :portfolio_id
-                    """
-                    )
-                    s.execute(
-                        update_sql,
-                        {
-                            "id": position.id,
-                            "tenant_id": position.tenant_id,
-                            "portfolio_id": position.portfolio_id,
-                            "asset_symbol": position.asset_symbol,
-                            "ticker": position.asset_symbol,
-                            "qty": position.qty,
-                            "cash": position.cash,
-                            "anchor_price": position.anchor_price,
-                            "avg_cost": position.avg_cost,
-                            "op_min_qty": position.order_policy.min_qty,
-                            "op_min_notional": position.order_policy.min_notional,
-                            "op_lot_size": position.order_policy.lot_size,
-                            "op_qty_step": position.order_policy.qty_step,
-                            "op_action_below_min": position.order_policy.action_below_min,
-                            "gr_min_stock_alloc_pct": position.guardrails.min_stock_alloc_pct,
-                            "gr_max_stock_alloc_pct": position.guardrails.max_stock_alloc_pct,
-                            "gr_max_orders_per_day": position.guardrails.max_orders_per_day,
-                            "total_commission_paid": position.total_commission_paid,
-                            "total_dividends_received": position.total_dividends_received,
-                            "updated_at": position.updated_at,
-                        },
-                    )
-                else:
-                    # Normal update - get row and apply changes
-                    stmt = select(PositionModel).where(
-                        PositionModel.id == position.id,
-                        PositionModel.tenant_id == position.tenant_id,
-                        PositionModel.portfolio_id == position.portfolio_id,
-                    )
-                    row = s.execute(stmt).scalar_one_or_none()
-                    if row:
-                        _apply_entity_to_row(row, position)
+                for row in rows:
+                    self._update_or_insert(s, table, row)
+            s.commit()
 
-            # Commit with error handling for missing status column
-            try:
-                s.commit()
-            except Exception as commit_error:
-                error_msg = str(commit_error)
-                print(f"[DEBUG] Commit error in save(): {error_msg}")
-                print(f"[DEBUG] Error type: {type(commit_error)}")
-
-                # Check for status column error (various possible error messages)
-                if (
-                    ("no such column" in error_msg.lower() and "status" in error_msg.lower())
-                    or ("table positions has no column named status" in error_msg.lower())
-                    or (
-                        "status" in error_msg.lower()
-                        and ("column" in error_msg.lower() or "missing" in error_msg.lower())
-                    )
-                ):
-                    # Status column doesn't exist, rollback and retry with raw SQL
-                    print("[DEBUG] Detected missing status column, retrying with raw SQL")
-                    s.rollback()
-                    self._status_column_exists = False
-                    # Retry the entire save operation
-                    return self.save(position)
-                # Re-raise if it's not a status column error
-                print("[DEBUG] Re-raising error (not status column issue)")
-                raise
+    @staticmethod
+    def _update_or_insert(s: Session, table, row: Dict[str, Any]) -> None:
+        updated = s.execute(
+            update(table)
+            .where(
+                table.c.id == row["id"],
+                table.c.tenant_id == row["tenant_id"],
+                table.c.portfolio_id == row["portfolio_id"],
+            )
+            .values({col: row[col] for col in _UPDATE_COLUMNS})
+        )
+        if updated.rowcount == 0:
+            s.execute(insert(table).values(row))
 
     def create(
         self,
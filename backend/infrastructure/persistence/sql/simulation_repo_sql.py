@@ -2,19 +2,65 @@
 # backend/infrastructure/persistence/sql/simulation_repo_sql.py
 # =========================
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 from datetime import datetime, timezone
 
 from sqlalchemy import desc
+from sqlalchemy.orm import undefer
 
 from domain.entities.simulation_result import SimulationResult
-from domain.ports.simulation_repo import SimulationRepo
+from domain.ports.simulation_repo import SERIES_FIELDS, SimulationRepo, check_series_names
+from infrastructure.persistence.series_codec import SeriesBlob, encode_series, select_rows
 from infrastructure.persistence.sql.models import SimulationResultModel
 
+def _summary_from_model(model: SimulationResultModel) -> SimulationResult:
+    """Convert a model without touching its deferred detail columns; series are left empty."""
+    return SimulationResult(
+        id=UUID(model.id),
+        ticker=model.ticker,
+        start_date=model.start_date.isoformat(),
+        end_date=model.end_date.isoformat(),
+        total_trading_days=model.total_trading_days,
+        initial_cash=model.initial_cash,
+        algorithm_trades=model.algorithm_trades,
+        algorithm_pnl=model.algorithm_pnl,
+        algorithm_return_pct=model.algorithm_return_pct,
+        algorithm_volatility=model.algorithm_volatility,
+        algorithm_sharpe_ratio=model.algorithm_sharpe_ratio,
+        algorithm_max_drawdown=model.algorithm_max_drawdown,
+        buy_hold_pnl=model.buy_hold_pnl,
+        buy_hold_return_pct=model.buy_hold_return_pct,
+        buy_hold_volatility=model.buy_hold_volatility,
+        buy_hold_sharpe_ratio=model.buy_hold_sharpe_ratio,
+        buy_hold_max_drawdown=model.buy_hold_max_drawdown,
+        excess_return=model.excess_return,
+        alpha=model.alpha,
+        beta=model.beta,
+        information_ratio=model.information_ratio,
+        created_at=model.created_at,
+    )
+
+
+def _read_series(
+    model: SimulationResultModel,
+    names: Sequence[str],
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Decode the requested series from series_blob, or from the legacy JSON columns."""
+    if model.series_blob is not None:
+        blob = SeriesBlob(model.series_blob)
+        return {name: blob.read(name, columns, start, end) for name in names}
+    return {
+        name: select_rows(getattr(model, name) or [], columns, start, end) for name in names
+    }
+
 
 def _entity_from_model(model: SimulationResultModel) -> SimulationResult:
     """Convert SQLAlchemy model to domain entity."""
+    series = _read_series(model, SERIES_FIELDS)
     return SimulationResult(
         id=UUID(model.id),
         ticker=model.ticker,
@@ -37,12 +83,12 @@ def _entity_from_model(model: SimulationResultModel) -> SimulationResult:
         alpha=model.alpha,
         beta=model.beta,
         information_ratio=model.information_ratio,
-        trade_log=model.trade_log or [],
-        daily_returns=model.daily_returns or [],
+        trade_log=series["trade_log"],
+        daily_returns=series["daily_returns"],
         dividend_analysis=model.dividend_analysis or {},
-        price_data=model.price_data or [],
-        trigger_analysis=model.trigger_analysis or [],
-        time_series_data=model.time_series_data or [],
+        price_data=series["price_data"],
+        trigger_analysis=series["trigger_analysis"],
+        time_series_data=series["time_series_data"],
         debug_info=model.debug_info or [],
         created_at=model.created_at,
     )
@@ -72,18 +118,18 @@ def _model_from_entity(entity: SimulationResult) -> SimulationResultModel:
         alpha=entity.alpha,
         beta=entity.beta,
         information_ratio=entity.information_ratio,
-        trade_log=entity.trade_log,
-        daily_returns=entity.daily_returns,
         dividend_analysis=entity.dividend_analysis,
-        price_data=entity.price_data,
-        trigger_analysis=entity.trigger_analysis,
-        time_series_data=entity.time_series_data,
+        series_blob=_encode_entity_series(entity),
         debug_info=entity.debug_info,
         created_at=entity.created_at,
         updated_at=datetime.now(timezone.utc),
     )
 
 
+def _encode_entity_series(entity: SimulationResult) -> bytes:
+    return encode_series({name: getattr(entity, name) for name in SERIES_FIELDS})
+
+
 class SQLSimulationRepo(SimulationRepo):
     """SQL implementation of simulation repository."""
 
@@ -123,13 +169,11 @@ class SQLSimulationRepo(SimulationRepo):
                 existing.alpha = result.alpha
                 existing.beta = result.beta
                 existing.information_ratio = result.information_ratio
-                existing.trade_log = result.trade_log
-                existing.daily_returns = result.daily_returns
                 existing.dividend_analysis = result.dividend_analysis
-                existing.price_data = result.price_data
-                existing.trigger_analysis = result.trigger_analysis
-                existing.time_series_data = result.time_series_data
                 existing.debug_info = result.debug_info
+                existing.series_blob = _encode_entity_series(result)
+                for name in SERIES_FIELDS:
+                    setattr(existing, name, None)  # superseded by series_blob
                 existing.updated_at = datetime.now(timezone.utc)
             else:
                 # Create new
@@ -143,6 +187,11 @@ class SQLSimulationRepo(SimulationRepo):
         with self._sf() as session:
             model = (
                 session.query(SimulationResultModel)
+                .options(
+                    undefer(SimulationResultModel.series_blob),
+                    undefer(SimulationResultModel.dividend_analysis),
+                    undefer(SimulationResultModel.debug_info),
+                )
                 .filter(SimulationResultModel.id == str(result_id))
                 .first()
             )
@@ -162,7 +211,7 @@ class SQLSimulationRepo(SimulationRepo):
                 .all()
             )
 
-            return [_entity_from_model(model) for model in models]
+            return [_summary_from_model(model) for model in models]
 
     def get_simulations_by_ticker(self, ticker: str, limit: int = 100) -> List[SimulationResult]:
         """Get simulation results for a specific ticker."""
@@ -175,7 +224,28 @@ class SQLSimulationRepo(SimulationRepo):
                 .all()
             )
 
-            return [_entity_from_model(model) for model in models]
+            return [_summary_from_model(model) for model in models]
+
+    def get_simulation_series(
+        self,
+        result_id: UUID,
+        series: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Get some series of a result, optionally limited to columns and a time range."""
+        series = check_series_names(series)
+        with self._sf() as session:
+            model = (
+                session.query(SimulationResultModel)
+                .options(undefer(SimulationResultModel.series_blob))
+                .filter(SimulationResultModel.id == str(result_id))
+                .first()
+            )
+            if model is None:
+                return None
+            return _read_series(model, series, columns, start, end)
 
     def delete_simulation_result(self, result_id: UUID) -> bool:
         """Delete a simulation result by ID."""
@@ -3,13 +3,18 @@
 # =========================
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
 from domain.entities.trade import Trade
 from domain.ports.trades_repo import TradesRepo
 from infrastructure.persistence.sql.models import TradeModel
 
+# Bound parameters per IN (...) query; stays under SQLite's 999-variable limit
+_IN_CHUNK = 500
+
 
 def _to_entity(row: TradeModel) -> Trade:
     """Convert SQLAlchemy row to domain entity."""
@@ -98,6 +103,20 @@ class SQLTradesRepo(TradesRepo):
             )
             return [_to_entity(r) for r in rows]
 
+    def iter_for_position(self, position_id: str, batch_size: int = 1000) -> Iterator[Trade]:
+        """Yield every trade for a position (newest first) from a server-side cursor."""
+        stmt = (
+            select(TradeModel)
+            .where(TradeModel.position_id == position_id)
+            .order_by(TradeModel.executed_at.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        with self._sf() as s:
+            for r in s.execute(stmt).scalars():
+                yield _to_entity(r)
+                # Loaded rows are not needed again; keep the identity map small
+                s.expunge(r)
+
     def list_for_order(self, order_id: str) -> List[Trade]:
         """List trades for an order (typically 1 trade per order)."""
         with self._sf() as s:
@@ -109,6 +128,21 @@ class SQLTradesRepo(TradesRepo):
             )
             return [_to_entity(r) for r in rows]
 
+    def list_for_orders(self, order_ids: Iterable[str]) -> Dict[str, List[Trade]]:
+        """List trades for several orders with one IN query per chunk."""
+        ids = list(dict.fromkeys(order_ids))
+        by_order: Dict[str, List[Trade]] = {}
+        with self._sf() as s:
+            for i in range(0, len(ids), _IN_CHUNK):
+                rows = s.scalars(
+                    select(TradeModel)
+                    .where(TradeModel.order_id.in_(ids[i : i + _IN_CHUNK]))
+                    .order_by(TradeModel.executed_at.desc())
+                )
+                for r in rows:
+                    by_order.setdefault(r.order_id, []).append(_to_entity(r))
+        return by_order
+
     def clear(self) -> None:
         """Clear all trades (test helper)."""
         with self._sf() as s:
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Position Snapshot Backfill
+==========================
+Rebuilds the position_snapshots rollup (hourly/daily/weekly per position)
+from position_evaluation_timeline. Timeline writes keep the rollup current;
+run this once after the e4f5a6b7c8d9 migration to build it for existing
+history, and again to repair it after a failed fold. Timeline writers may
+keep running: their folds wait for the rebuild and apply on top of it.
+
+Usage:
+  python scripts/backfill_position_snapshots.py [--tenant-id ID] [--portfolio-id ID]
+
+Env:
+  SQL_URL  (default: sqlite:///./vb.sqlite, resolved relative to backend/)
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.persistence.sql.models import get_engine  # noqa: E402
+from infrastructure.persistence.sql.position_snapshot_repo_sql import (  # noqa: E402
+    SQLPositionSnapshotRepo,
+)
+
+
+def _resolve_sql_url(url: str) -> str:
+    """Resolve relative SQLite URLs relative to the backend/ directory."""
+    if not url.startswith("sqlite:///./"):
+        return url
+    rel_path = url[len("sqlite:///./"):]
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return f"sqlite:///{os.path.join(backend_dir, rel_path)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the position_snapshots rollup from the evaluation timeline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--tenant-id", help="Only rebuild this tenant")
+    parser.add_argument("--portfolio-id", help="Only rebuild this portfolio")
+    args = parser.parse_args()
+
+    sql_url = _resolve_sql_url(os.getenv("SQL_URL", "sqlite:///./vb.sqlite"))
+    engine = get_engine(sql_url)
+    repo = SQLPositionSnapshotRepo(sessionmaker(bind=engine, expire_on_commit=False))
+
+    started = time.perf_counter()
+    written = repo.rebuild(tenant_id=args.tenant_id, portfolio_id=args.portfolio_id)
+    print(f"Wrote {written} snapshots in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ _worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
 os.environ.setdefault("APP_PERSISTENCE", "memory")
 os.environ.setdefault("APP_EVENTS", "memory")
 os.environ.setdefault("APP_IDEMPOTENCY", "memory")
+os.environ.setdefault("BAR_CACHE_DIR", "")  # no on-disk bar cache in tests
+os.environ.setdefault("BENCHMARK_CACHE_DIR", "")  # no on-disk benchmark cache in tests
 os.environ.setdefault("SQL_URL", f"sqlite:///./vb_test_{_worker_id}.sqlite")
 os.environ.setdefault("APP_AUTO_CREATE", "1")  # Create tables for portfolio repo
 os.environ.setdefault("TICK_DETERMINISTIC", "true")
@@ -27,6 +29,7 @@ from app.di import container
 
 # Ensure database tables are created for portfolio repo
 # (Even with memory persistence, portfolio repo uses SQL)
+from infrastructure.persistence.sql.engine import dispose_engines
 from infrastructure.persistence.sql.models import get_engine, create_all
 
 sql_url = os.getenv("SQL_URL", "sqlite:///./vb_test.sqlite")
@@ -104,7 +107,9 @@ def position_id():
 def cleanup_worker_dbs():
     """Clean up per-worker SQLite files after the test session."""
     yield
-    for db_file in globmod.glob("vb_test_gw*.sqlite"):
+    dispose_engines()
+    # WAL mode leaves -wal/-shm files next to each database
+    for db_file in globmod.glob("vb_test_gw*.sqlite*"):
         try:
             os.remove(db_file)
         except OSError:
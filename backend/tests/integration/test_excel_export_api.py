@@ -0,0 +1,85 @@
+# =========================
+# backend/tests/integration/test_excel_export_api.py
+# =========================
+"""Integration tests for the streamed per-position Excel exports."""
+
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from app.di import container
+from domain.entities.event import Event
+from domain.entities.order import Order
+from domain.entities.trade import Trade
+
+
+def test_activity_export_streams_every_event(client, position_id):
+    start = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+    for i in range(130):
+        container.events.append(
+            Event(
+                id=f"evt_{position_id}_{i}",
+                position_id=position_id,
+                type="tick",
+                inputs={"price": 150 + i},
+                outputs={},
+                message=f"evaluation {i}",
+                ts=start + timedelta(seconds=i),
+            )
+        )
+
+    response = client.get(f"/v1/excel/trading/{position_id}/activity-export")
+
+    assert response.status_code == 200
+    ws = load_workbook(BytesIO(response.content))["Activity Log"]
+    # Title, Generated, blank and header rows, then all events (not the first 100)
+    messages = [row[2] for row in ws.iter_rows(min_row=5, values_only=True)]
+    assert len(messages) == 130
+    assert messages[0] == "evaluation 129"
+
+
+def test_activity_export_without_events_is_not_found(client, position_id):
+    response = client.get(f"/v1/excel/trading/{position_id}/activity-export")
+    assert response.status_code == 404
+
+
+def test_position_export_lists_repository_trades_and_orders(client, portfolio_id, position_id):
+    for i in range(3):
+        order_id = f"ord_{position_id}_{i}"
+        container.orders.save(
+            Order(
+                id=order_id,
+                tenant_id="default",
+                portfolio_id=portfolio_id,
+                position_id=position_id,
+                side="BUY",
+                qty=1.0,
+                status="filled",
+                idempotency_key=f"export-{position_id}-{i}",
+            )
+        )
+        container.trades.save(
+            Trade(
+                id=f"trd_{position_id}_{i}",
+                tenant_id="default",
+                portfolio_id=portfolio_id,
+                order_id=order_id,
+                position_id=position_id,
+                side="BUY",
+                qty=1.0,
+                price=150.0,
+                commission=0.02,
+            )
+        )
+
+    response = client.get(f"/v1/excel/positions/{position_id}/export")
+
+    assert response.status_code == 200
+    wb = load_workbook(BytesIO(response.content))
+    trade_ids = [row[0] for row in wb["Trades Analysis"].iter_rows(min_row=3, values_only=True)]
+    order_ids = [row[0] for row in wb["Orders Analysis"].iter_rows(min_row=3, values_only=True)]
+    assert sorted(trade_ids) == [f"trd_{position_id}_{i}" for i in range(3)]
+    assert sorted(order_ids) == [f"ord_{position_id}_{i}" for i in range(3)]
+    summary = {r[0]: r[1] for r in wb["Executive Summary"].iter_rows(values_only=True) if r[0]}
+    assert summary["Total Trades:"] == 3 and summary["Total Orders:"] == 3
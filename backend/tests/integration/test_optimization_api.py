@@ -174,6 +174,23 @@ class TestOptimizationAPI:
         assert "message" in data
         assert "started" in data["message"].lower()
 
+    def test_start_while_queued_is_rejected(self, client):
+        """A second start while the first run waits in the queue does not queue another."""
+        from app.di import container
+
+        config_data = self._create_test_config_data()
+        config_id = client.post("/v1/optimization/configs", json=config_data).json()["id"]
+
+        # Hold the workers so the first run stays queued
+        with container.jobs.live_trading_first():
+            first = client.post(f"/v1/optimization/configs/{config_id}/start")
+            second = client.post(f"/v1/optimization/configs/{config_id}/start")
+            status = client.get(f"/v1/optimization/configs/{config_id}").json()["status"]
+
+        assert first.status_code == 200
+        assert second.status_code == 400
+        assert status == "running"
+
     def test_start_optimization_not_found(self, client):
         """Test starting optimization for non-existent config."""
         fake_id = str(uuid4())
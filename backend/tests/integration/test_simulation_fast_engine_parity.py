@@ -0,0 +1,291 @@
+# =========================
+# backend/tests/integration/test_simulation_fast_engine_parity.py
+# =========================
+"""
+Parity tests: SimulationUnifiedUC engine="fast" vs engine="standard".
+
+The fast engine (application/helpers/simulation_kernel.py) must reproduce the
+use-case path bar for bar: same trades, same final position, same per-bar
+series and the same summary metrics. Scenarios reuse the golden-path price
+shapes plus longer random walks, dividends, anchor anomalies and guardrail
+drift.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from application.use_cases.simulation_unified_uc import SimulationUnifiedUC
+from domain.entities.dividend import Dividend
+from domain.entities.market_data import PriceData, PriceSource, SimulationData
+from infrastructure.market.market_data_storage import MarketDataStorage
+from infrastructure.persistence.memory.events_repo_mem import InMemoryEventsRepo
+from infrastructure.persistence.memory.positions_repo_mem import InMemoryPositionsRepo
+from infrastructure.time.clock import Clock
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _config(**overrides):
+    config = {
+        "trigger_threshold_pct": 0.03,
+        "rebalance_ratio": 1.6667,
+        "commission_rate": 0.001,
+        "min_notional": 100.0,
+        "allow_after_hours": True,
+        "guardrails": {"min_stock_alloc_pct": 0.30, "max_stock_alloc_pct": 0.70},
+    }
+    guardrails = overrides.pop("guardrails", None)
+    config.update(overrides)
+    if guardrails:
+        config["guardrails"] = {**config["guardrails"], **guardrails}
+    return config
+
+
+def _sim_data(prices, bars_per_day=13):
+    """One bar per 30 minutes, bars_per_day bars per calendar day."""
+    price_data = []
+    for i, price in enumerate(prices):
+        day, slot = divmod(i, bars_per_day)
+        ts = START + timedelta(days=day, minutes=30 * slot)
+        price_data.append(
+            PriceData(
+                ticker="TEST",
+                price=price,
+                source=PriceSource.LAST_TRADE,
+                timestamp=ts,
+                volume=1000 + i,
+                is_market_hours=True,
+                open=price,
+                high=price * 1.001,
+                low=price * 0.999,
+                close=price,
+            )
+        )
+    return SimulationData(
+        ticker="TEST",
+        start_date=price_data[0].timestamp,
+        end_date=price_data[-1].timestamp,
+        price_data=price_data,
+        daily_summaries=[],
+        volatility_data=[],
+        total_trading_days=len({p.timestamp.date() for p in price_data}),
+        market_hours_data=price_data,
+        after_hours_data=[],
+    )
+
+
+def _random_walk(n, seed, vol=0.01, start=100.0):
+    rng = random.Random(seed)
+    prices = [start]
+    for _ in range(n - 1):
+        prices.append(round(prices[-1] * math.exp(rng.gauss(0, vol)), 4))
+    return prices
+
+
+def _uc():
+    return SimulationUnifiedUC(
+        market_data=MarketDataStorage(),
+        positions=InMemoryPositionsRepo(),
+        events=InMemoryEventsRepo(),
+        clock=Clock(),
+    )
+
+
+def _run(engine, sim_data, config, dividends=None, lightweight=False, initial_cash=10000.0):
+    return _uc().run_simulation_with_data(
+        ticker="TEST",
+        start_date=sim_data.start_date,
+        end_date=sim_data.end_date,
+        historical_data=sim_data.price_data,
+        sim_data=sim_data,
+        dividend_history=dividends or [],
+        initial_cash=initial_cash,
+        position_config=config,
+        lightweight=lightweight,
+        engine=engine,
+    )
+
+
+def _approx_rows(rows):
+    return [
+        {k: pytest.approx(v, rel=1e-12, abs=1e-12) if isinstance(v, float) else v for k, v in row.items()}
+        for row in rows
+    ]
+
+
+def _assert_parity(standard, fast):
+    assert fast.algorithm_trades == standard.algorithm_trades
+    assert fast.trade_log == standard.trade_log
+    assert fast.daily_returns == standard.daily_returns
+    assert fast.dividend_events == standard.dividend_events
+    assert fast.total_dividends_received == standard.total_dividends_received
+    assert fast.algorithm_pnl == standard.algorithm_pnl
+    assert fast.algorithm_return_pct == standard.algorithm_return_pct
+    assert fast.algorithm_max_drawdown == standard.algorithm_max_drawdown
+    assert fast.algorithm_volatility == pytest.approx(standard.algorithm_volatility, rel=1e-9)
+    assert fast.algorithm_sharpe_ratio == pytest.approx(standard.algorithm_sharpe_ratio, rel=1e-9)
+    assert fast.buy_hold_pnl == standard.buy_hold_pnl
+    assert fast.buy_hold_return_pct == standard.buy_hold_return_pct
+    assert fast.buy_hold_max_drawdown == standard.buy_hold_max_drawdown
+    assert fast.buy_hold_volatility == pytest.approx(standard.buy_hold_volatility, rel=1e-9)
+    assert fast.return_stats == pytest.approx(standard.return_stats, rel=1e-9)
+
+
+GOLDEN_SCENARIOS = {
+    "oscillation": [100, 98, 96.9, 98, 100, 98, 96.5, 99, 101, 104, 100, 97],
+    "trending_down": [100 - 1.5 * i for i in range(30)],
+    "rally": [100 * (1.012**i) for i in range(40)],
+    "guardrails": [100, 90, 80, 72, 65, 60, 66, 75, 85, 95, 100],
+    "profitability": [100, 96, 100, 96, 100, 96, 100, 104, 100, 104, 100],
+}
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN_SCENARIOS))
+def test_golden_scenarios_match_standard_engine(name):
+    sim_data = _sim_data([float(p) for p in GOLDEN_SCENARIOS[name]], bars_per_day=3)
+    config = _config()
+
+    standard = _run("standard", sim_data, config)
+    fast = _run("fast", sim_data, config)
+
+    _assert_parity(standard, fast)
+    assert fast.time_series_data == _approx_rows(standard.time_series_data)
+    assert fast.trigger_analysis == _approx_rows(standard.trigger_analysis)
+    assert fast.debug_info == standard.debug_info
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_random_walk_matches_standard_engine(seed):
+    sim_data = _sim_data(_random_walk(600, seed))
+    config = _config(commission_rate=0.0001, guardrails={"max_trade_pct_of_position": 0.5})
+
+    standard = _run("standard", sim_data, config)
+    fast = _run("fast", sim_data, config)
+
+    assert standard.algorithm_trades > 0
+    _assert_parity(standard, fast)
+    assert fast.time_series_data == _approx_rows(standard.time_series_data)
+    assert fast.trigger_analysis == _approx_rows(standard.trigger_analysis)
+
+
+def test_lightweight_mode_matches_and_skips_series():
+    sim_data = _sim_data(_random_walk(400, 3, vol=0.02))
+    config = _config()
+
+    standard = _run("standard", sim_data, config, lightweight=True)
+    fast = _run("fast", sim_data, config, lightweight=True)
+
+    _assert_parity(standard, fast)
+    assert fast.time_series_data == []
+    assert fast.trigger_analysis == []
+    # Metrics-only runs keep no per-bar rows; the statistics are streamed
+    assert standard.daily_returns == []
+    assert standard.return_stats["returns"] == len(sim_data.price_data) - 2
+    assert standard.return_stats["trades"] == standard.algorithm_trades
+
+
+def test_dividends_and_anchor_anomaly_match_standard_engine():
+    prices = _random_walk(200, 11)
+    prices[120] = prices[119] * 1.8  # >50% jump resets the anchor
+    sim_data = _sim_data(prices)
+    day = sim_data.price_data[40].timestamp
+    dividends = [
+        Dividend(
+            id="div1",
+            ticker="TEST",
+            ex_date=day,
+            pay_date=day + timedelta(days=14),
+            dps=Decimal("0.82"),
+        ),
+        # Duplicate announcement is processed once
+        Dividend(
+            id="div1-dup",
+            ticker="TEST",
+            ex_date=day,
+            pay_date=day + timedelta(days=14),
+            dps=Decimal("0.82"),
+        ),
+        Dividend(
+            id="div2",
+            ticker="TEST",
+            ex_date=sim_data.price_data[150].timestamp,
+            pay_date=sim_data.price_data[150].timestamp + timedelta(days=14),
+            dps=Decimal("0.5"),
+            withholding_tax_rate=0.15,
+        ),
+    ]
+    config = _config()
+
+    standard = _run("standard", sim_data, config, dividends=dividends)
+    fast = _run("fast", sim_data, config, dividends=dividends)
+
+    assert len(standard.dividend_events) == 2
+    _assert_parity(standard, fast)
+    assert fast.time_series_data == _approx_rows(standard.time_series_data)
+
+
+def test_blocked_orders_match_standard_engine():
+    # Large min_notional and tight per-trade cap: most triggers are skipped or capped
+    sim_data = _sim_data(_random_walk(300, 5, vol=0.015))
+    config = _config(min_notional=2500.0, guardrails={"max_trade_pct_of_position": 0.05})
+
+    standard = _run("standard", sim_data, config)
+    fast = _run("fast", sim_data, config)
+
+    _assert_parity(standard, fast)
+    assert fast.trigger_analysis == _approx_rows(standard.trigger_analysis)
+
+
+def test_unknown_engine_rejected():
+    sim_data = _sim_data([100.0, 101.0])
+    with pytest.raises(ValueError):
+        _run("turbo", sim_data, _config())
+
+
+def test_grid_matches_per_config_runs():
+    prices = _random_walk(400, 17, vol=0.012)
+    prices[250] = prices[249] * 1.7
+    sim_data = _sim_data(prices)
+    day = sim_data.price_data[60].timestamp
+    dividends = [
+        Dividend(
+            id="div1",
+            ticker="TEST",
+            ex_date=day,
+            pay_date=day + timedelta(days=14),
+            dps=Decimal("0.6"),
+        )
+    ]
+    configs = [
+        _config(
+            trigger_threshold_pct=threshold,
+            rebalance_ratio=ratio,
+            guardrails={"min_stock_alloc_pct": low, "max_trade_pct_of_position": 0.5},
+        )
+        for threshold in (0.01, 0.03, 0.06)
+        for ratio in (0.8, 1.6667)
+        for low in (0.2, 0.45)
+    ]
+
+    grid = list(
+        _uc().iter_simulation_grid(
+            ticker="TEST",
+            start_date=sim_data.start_date,
+            end_date=sim_data.end_date,
+            sim_data=sim_data,
+            dividend_history=dividends,
+            initial_cash=10000.0,
+            position_configs=configs,
+        )
+    )
+
+    assert [index for index, _, _ in grid] == list(range(len(configs)))
+    for index, result, error in grid:
+        assert error is None
+        standard = _run("standard", sim_data, configs[index], dividends=dividends, lightweight=True)
+        _assert_parity(standard, result)
+        assert result.time_series_data == []
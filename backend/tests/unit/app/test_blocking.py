@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+from fastapi import Depends, FastAPI, Query
+from fastapi.testclient import TestClient
+
+from app.blocking import (
+    InFlightMiddleware,
+    Lane,
+    LoopLagMonitor,
+    _in_flight,
+    _lanes,
+    blocking,
+    get_lane,
+    shutdown_lanes,
+)
+
+
+def _dep() -> str:
+    return "dep"
+
+
+def test_blocking_handler_runs_off_loop_with_fastapi_params():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    @blocking("test-params")
+    def get_item(item_id: int, q: str = Query("x"), d: str = Depends(_dep)) -> dict:
+        return {"item_id": item_id, "q": q, "d": d, "thread": threading.current_thread().name}
+
+    body = TestClient(app).get("/items/7", params={"q": "y"}).json()
+
+    assert body["item_id"] == 7
+    assert body["q"] == "y"
+    assert body["d"] == "dep"
+    assert body["thread"].startswith("blocking-test-params")
+
+
+def test_lane_limits_concurrency_and_counts_failures():
+    lane = Lane("test-limit", limit=2)
+    running = 0
+    peak = 0
+    guard = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with guard:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with guard:
+            running -= 1
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        await asyncio.gather(*(lane.run(work) for _ in range(6)))
+        try:
+            await lane.run(fail)
+        except ValueError:
+            pass
+
+    asyncio.run(main())
+    lane.shutdown()
+
+    metrics = lane.metrics()
+    assert peak == 2
+    assert metrics["completed"] == 6
+    assert metrics["failed"] == 1
+    assert metrics["active"] == 0 and metrics["waiting"] == 0
+    assert metrics["wait_seconds"]["max"] > 0
+
+
+def test_lag_monitor_blames_requests_still_on_the_loop():
+    monitor = LoopLagMonitor(threshold=0.1)
+    _in_flight[1] = {"route": "GET /slow", "started": 0.0, "offloaded": 0}
+    _in_flight[2] = {"route": "GET /export", "started": 0.0, "offloaded": 1}
+    try:
+        monitor.record(0.01)
+        monitor.record(0.5)
+    finally:
+        _in_flight.pop(1)
+        _in_flight.pop(2)
+
+    metrics = monitor.metrics()
+    assert metrics["stalls"] == 1
+    assert metrics["max_lag_seconds"] == 0.5
+    assert metrics["suspect_routes"] == {"GET /slow": 1}
+
+
+def test_in_flight_middleware_marks_offloaded_requests():
+    app = FastAPI()
+    app.add_middleware(InFlightMiddleware)
+    seen = {}
+
+    @app.get("/sync")
+    @blocking("test-inflight")
+    def sync_route() -> dict:
+        seen["records"] = [dict(r) for r in _in_flight.values()]
+        return {}
+
+    TestClient(app).get("/sync")
+
+    record = next(r for r in seen["records"] if r["route"] == "GET /sync")
+    assert record["offloaded"] == 1
+    assert not any(r["route"] == "GET /sync" for r in _in_flight.values())
+
+
+def test_shutdown_lanes_stops_their_threads_and_later_lanes_start_fresh():
+    lane = get_lane("test-shutdown")
+    assert asyncio.run(lane.run(lambda: 1)) == 1
+
+    def alive():
+        return any(t.name.startswith("blocking-test-shutdown") for t in threading.enumerate())
+
+    shutdown_lanes()
+    deadline = time.monotonic() + 2.0
+    while alive() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not alive()
+    assert _lanes == {}
+    assert get_lane("test-shutdown") is not lane
+    shutdown_lanes()
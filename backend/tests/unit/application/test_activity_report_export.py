@@ -490,6 +490,39 @@ class TestMergeToActivityLog:
         assert "BUY" in first_trade["description"]
         assert first_trade["related_trade_id"] == "trade-001"
 
+    def test_trade_entries_carry_order_status_from_one_batch_fetch(
+        self,
+        mock_trades_repo,
+        mock_events_repo,
+        mock_timeline_repo,
+        mock_positions_repo,
+        sample_trades,
+    ):
+        """Test that the orders behind trades are fetched with a single get_many call."""
+        orders_repo = MagicMock()
+        orders_repo.get_many.return_value = {
+            "order-001": MagicMock(status="filled", broker_order_id="BRK-1"),
+        }
+        service = ActivityReportExportService(
+            trades_repo=mock_trades_repo,
+            events_repo=mock_events_repo,
+            timeline_repo=mock_timeline_repo,
+            positions_repo=mock_positions_repo,
+            orders_repo=orders_repo,
+        )
+
+        orders = service._fetch_orders(sample_trades)
+        activity_log = service._merge_to_activity_log(
+            trades=sample_trades, events=[], timeline=[], orders=orders
+        )
+
+        orders_repo.get_many.assert_called_once_with({"order-001", "order-002"})
+        orders_repo.get.assert_not_called()
+        details = {e["details"]["order_id"]: e["details"] for e in activity_log}
+        assert details["order-001"]["order_status"] == "filled"
+        assert details["order-001"]["broker_order_id"] == "BRK-1"
+        assert details["order-002"]["order_status"] is None
+
     def test_events_are_converted_to_activity_entries(
         self,
         service,
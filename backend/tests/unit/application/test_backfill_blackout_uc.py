@@ -0,0 +1,119 @@
+# =========================
+# backend/tests/unit/application/test_backfill_blackout_uc.py
+# =========================
+"""Unit tests for bulk blackout detection and per-ticker backfill fetches."""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from application.use_cases.backfill_blackout_uc import BackfillBlackoutUC, detect_gaps
+from infrastructure.persistence.sql.engine import get_engine
+from infrastructure.persistence.sql.evaluation_timeline_repo_sql import EvaluationTimelineRepoSQL
+from infrastructure.persistence.sql.models import PositionEvaluationTimelineModel
+
+NOW = datetime.now(timezone.utc)
+
+
+def _tick(position_id, days_ago):
+    return {
+        "tenant_id": "default",
+        "portfolio_id": "pf",
+        "position_id": position_id,
+        "symbol": "X",
+        "timestamp": NOW - timedelta(days=days_ago),
+        "mode": "LIVE",
+        "evaluation_type": "PRICE_UPDATE",
+        "dividend_applied": False,
+        "anchor_updated": False,
+        "trigger_fired": False,
+        "action": "HOLD",
+        "effective_price": 100.0,
+    }
+
+
+def _position(pid, symbol):
+    return SimpleNamespace(
+        id=pid, asset_symbol=symbol, qty=10.0, cash=100.0, anchor_price=100.0,
+        tenant_id="default", portfolio_id="pf", withholding_tax_rate=0.1,
+    )
+
+
+class _Recorder:
+    def __init__(self):
+        self.saved = []
+
+    def save(self, item):
+        self.saved.append(item)
+
+
+class _Dividends:
+    def __init__(self, *days_ago):
+        self.calls = []
+        self.days_ago = days_ago
+
+    def get_dividend_history(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        return [
+            SimpleNamespace(ex_date=NOW - timedelta(days=d), pay_date=None, dps=Decimal("1"))
+            for d in self.days_ago
+        ]
+
+
+def test_detect_gaps_flags_weekday_gaps_and_trailing_gap():
+    now = datetime(2024, 3, 15, 12, tzinfo=timezone.utc)  # Friday
+    rows = [
+        ("a", "2024-03-01"),  # Fri -> Mon: weekend only
+        ("a", "2024-03-04"),
+        ("a", "2024-03-05"),  # Tue -> Fri: gap
+        ("a", "2024-03-08"),  # Fri -> today: trailing gap
+        ("b", "2024-03-14"),  # yesterday: no gap
+    ]
+    gaps = detect_gaps(rows, now)
+    assert [(pid, start.date(), end) for pid, start, end in gaps] == [
+        ("a", date(2024, 3, 5), datetime(2024, 3, 8, tzinfo=timezone.utc)),
+        ("a", date(2024, 3, 8), now),
+    ]
+
+
+def test_backfill_all_positions_queries_once_and_fetches_once_per_ticker(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'timeline.sqlite'}"
+    engine = get_engine(url)
+    PositionEvaluationTimelineModel.__table__.create(engine)
+    timeline = EvaluationTimelineRepoSQL(sessionmaker(bind=engine, expire_on_commit=False))
+    # p1: one gap 20 -> 10 days ago, then daily ticks; p2: silent for the last 7 days
+    ticks = [_tick("p1", 20)] + [_tick("p1", d) for d in range(11)]
+    timeline.save_many(ticks + [_tick("p2", 7), _tick("p3", 0)])
+    monkeypatch.setenv("SQL_URL", url)
+
+    positions = [_position("p1", "AAPL"), _position("p2", "AAPL"), _position("p3", "MSFT")]
+    positions_repo, dividends = _Recorder(), _Dividends(15, 5)
+    uc = BackfillBlackoutUC(positions_repo, _Recorder(), dividends, config_repo=None)
+    monkeypatch.setattr(uc, "_list_all_positions", lambda: positions)
+    price_calls = []
+    monkeypatch.setattr(
+        uc, "_fetch_daily_prices", lambda t, s, e: price_calls.append((t, s, e)) or []
+    )
+
+    selects = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *a: selects.append(statement)
+        if "position_evaluation_timeline" in statement
+        else None,
+    )
+    results = {r.position_id: r for r in uc.backfill_all_positions()}
+
+    assert len(selects) == 1
+    assert [len(results[p].blackouts) for p in ("p1", "p2", "p3")] == [1, 1, 0]
+    # Both AAPL positions share one price and one dividend fetch over the union window
+    assert [c[0] for c in price_calls] == ["AAPL"] and [c[0] for c in dividends.calls] == ["AAPL"]
+    assert price_calls[0][1].date() == (NOW - timedelta(days=20)).date()
+    # Each position only gets the dividend whose ex-date falls inside its own gap
+    assert [len(results[p].dividends_applied) for p in ("p1", "p2")] == [1, 1]
+    assert positions[0].cash == 109.0 and positions[1].cash == 109.0
+    engine.dispose()
@@ -0,0 +1,121 @@
+# =========================
+# backend/tests/unit/application/test_benchmark_series_service.py
+# =========================
+"""Unit tests for the day-granular benchmark close cache."""
+
+from datetime import date, datetime, timedelta, timezone
+
+from application.services.benchmark_series_service import (
+    BenchmarkSeriesService,
+    benchmark_result,
+)
+from domain.entities.market_data import PriceData, PriceSource
+
+TODAY = date(2024, 3, 15)  # a Friday
+
+
+class RecordingMarketData:
+    """Daily bars on weekdays up to ``last_day``; records every fetch window."""
+
+    def __init__(self, last_day=TODAY, scale=1.0):
+        self.last_day = last_day
+        self.scale = scale  # adjustment factor applied to every close
+        self.calls = []
+
+    def fetch_historical_data(self, ticker, start_date, end_date, intraday_interval_minutes=30):
+        self.calls.append((ticker, start_date.date(), end_date.date()))
+        bars = []
+        day = start_date.date()
+        while day < end_date.date() and day <= self.last_day:
+            if day.weekday() < 5:
+                ts = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+                close = (100.0 + (day - date(2024, 1, 1)).days) * self.scale
+                bars.append(PriceData(ticker, close, PriceSource.LAST_TRADE, ts, close=close))
+            day += timedelta(days=1)
+        return bars
+
+
+def _service(market, tmp_path, today=TODAY):
+    return BenchmarkSeriesService(
+        lambda: market, cache_dir=str(tmp_path), live_ttl=3600, today=lambda: today
+    )
+
+
+def test_repeat_requests_are_served_from_cache_and_new_days_are_appended(tmp_path):
+    market = RecordingMarketData()
+    service = _service(market, tmp_path)
+
+    first = service.closes("spy", date(2024, 3, 1), TODAY)
+    assert service.closes("SPY", date(2024, 3, 4), TODAY) == {
+        d: c for d, c in first.items() if d >= "2024-03-04"
+    }
+    assert list(first)[0] == "2024-03-01" and list(first)[-1] == "2024-03-15"
+    assert len(market.calls) == 1
+
+    # Next day, fresh process: finished days come from disk, only the tail (plus
+    # the last cached close, to check it was not re-adjusted) is fetched
+    market = RecordingMarketData(last_day=date(2024, 3, 18))
+    later = _service(market, tmp_path, today=date(2024, 3, 18))
+    closes = later.closes("SPY", date(2024, 3, 1), date(2024, 3, 18))
+    assert market.calls == [("SPY", date(2024, 3, 14), date(2024, 3, 19))]
+    assert "2024-03-18" in closes and closes["2024-03-01"] == first["2024-03-01"]
+
+    # An earlier start only fetches the missing head and the first cached close
+    later.closes("SPY", date(2024, 2, 26), date(2024, 3, 18))
+    assert market.calls[-1] == ("SPY", date(2024, 2, 26), date(2024, 3, 2))
+
+
+def test_adjustment_after_caching_drops_the_series_and_refetches_the_window(tmp_path):
+    market = RecordingMarketData()
+    _service(market, tmp_path).closes("SPY", date(2024, 3, 1), TODAY)
+
+    # A 2:1 split on the 18th halves every earlier adjusted close
+    market = RecordingMarketData(last_day=date(2024, 3, 18), scale=0.5)
+    later = _service(market, tmp_path, today=date(2024, 3, 18))
+    closes = later.closes("SPY", date(2024, 3, 1), date(2024, 3, 18))
+
+    assert market.calls == [
+        ("SPY", date(2024, 3, 14), date(2024, 3, 19)),
+        ("SPY", date(2024, 3, 1), date(2024, 3, 15)),
+    ]
+    assert closes["2024-03-01"] == (100.0 + 60) * 0.5
+    assert closes["2024-03-18"] == (100.0 + 77) * 0.5
+    assert len(closes) == 12
+
+    # The rewritten disk cache holds only the new scale
+    fresh = RecordingMarketData(last_day=date(2024, 3, 18), scale=0.5)
+    assert _service(fresh, tmp_path, today=date(2024, 3, 18)).closes(
+        "SPY", date(2024, 3, 1), date(2024, 3, 15)
+    ) == {d: c for d, c in closes.items() if d <= "2024-03-15"}
+    assert fresh.calls == []
+
+
+def test_empty_fetch_keeps_coverage_and_closes_many_runs_each_ticker(tmp_path):
+    market = RecordingMarketData(last_day=date(2023, 12, 31))
+    service = _service(market, tmp_path)
+
+    assert service.closes("QQQ", date(2024, 3, 1), TODAY) == {}
+    assert service.closes("QQQ", date(2024, 3, 1), TODAY) == {}
+    # Nothing was cached, so the window is fetched again rather than trusted as empty
+    assert len(market.calls) == 2
+
+    market.last_day = TODAY
+    result = service.closes_many(["spy", "QQQ", "SPY"], date(2024, 3, 11), TODAY)
+    assert sorted(result) == ["QQQ", "SPY"]
+    assert len(result["SPY"]) == 5
+
+
+def test_benchmark_result_normalizes_and_carries_last_close_forward():
+    closes = {"2024-03-13": 50.0, "2024-03-14": 55.0, "2024-03-15": 60.0}
+
+    result = benchmark_result(closes, "2024-03-15", "2024-03-14")
+    assert result["return_pct"] == 9.09
+    assert [p["value"] for p in result["series"]] == [100.0, 60.0 / 55.0 * 100]
+    assert len(result["raw_series"]) == 3
+
+    today = benchmark_result(closes, "2024-03-16", "2024-03-16")
+    assert today["series"] == [
+        {"date": "2024-03-15", "value": 100.0},
+        {"date": "2024-03-16", "value": 100.0},
+    ]
+    assert benchmark_result({"2024-03-15": 60.0}, "2024-03-15", "2024-03-15") is None
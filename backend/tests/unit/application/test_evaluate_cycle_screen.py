@@ -0,0 +1,120 @@
+# =========================
+# backend/tests/unit/application/test_evaluate_cycle_screen.py
+# =========================
+"""Tests for the per-cycle shared quote and bulk trigger screen in EvaluatePositionUC."""
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from application.dto.position_context import PositionContext
+from application.use_cases.evaluate_position_uc import EvaluatePositionUC
+from domain.entities.market_data import PriceData, PriceSource
+from domain.entities.position import Position
+from domain.value_objects.configs import GuardrailConfig, TriggerConfig
+
+NOW = datetime(2025, 1, 15, 14, 30, tzinfo=timezone.utc)
+
+
+def _context(position_id, ticker, anchor, qty=10.0, cash=1000.0):
+    position = Position(
+        id=position_id,
+        tenant_id="default",
+        portfolio_id="pf",
+        asset_symbol=ticker,
+        qty=qty,
+        cash=cash,
+        anchor_price=anchor,
+    )
+    return PositionContext(
+        position_id=position_id,
+        ticker=ticker,
+        portfolio_id="pf",
+        position=position,
+        trigger_config=TriggerConfig(
+            up_threshold_pct=Decimal("3"), down_threshold_pct=Decimal("3")
+        ),
+        guardrail_config=GuardrailConfig(
+            min_stock_pct=Decimal("0.25"), max_stock_pct=Decimal("0.75")
+        ),
+    )
+
+
+def _uc(prices):
+    market_data = MagicMock()
+    market_data.get_reference_price.side_effect = lambda ticker: PriceData(
+        ticker, prices[ticker], PriceSource.LAST_TRADE, NOW
+    )
+    market_data.validate_price.return_value = {"valid": True, "warnings": [], "rejections": []}
+    clock = MagicMock()
+    clock.now.return_value = NOW
+    return EvaluatePositionUC(
+        positions=MagicMock(),
+        events=MagicMock(),
+        market_data=market_data,
+        clock=clock,
+        trigger_config_provider=MagicMock(),
+        guardrail_config_provider=MagicMock(),
+        config_repo=MagicMock(),
+        evaluation_timeline_repo=MagicMock(),
+    )
+
+
+def test_prepare_cycle_fetches_each_ticker_once_and_screens_in_bulk():
+    uc = _uc({"AAPL": 101.0, "MSFT": 100.0})
+    contexts = [
+        _context("hold", "AAPL", anchor=100.0),  # +1%
+        _context("edge", "AAPL", anchor=98.0),  # +3.06%, crosses the up threshold
+        _context("drift", "AAPL", anchor=100.0, qty=100.0, cash=10.0),  # ~99% stock
+        _context("anomaly", "MSFT", anchor=300.0),
+        _context("unconfigured", "MSFT", anchor=100.0),
+    ]
+    contexts[-1].guardrail_config = None
+
+    assert uc.prepare_cycle(contexts) == 1
+    assert uc.market_data.get_reference_price.call_count == 2
+    assert [c.quiet for c in contexts] == [True, False, False, False, False]
+    assert contexts[0].quote is contexts[1].quote is contexts[2].quote
+
+
+def test_quiet_position_skips_rebalance_lookups_but_still_records_its_evaluation():
+    uc = _uc({"AAPL": 101.0})
+    contexts = [_context("p1", "AAPL", anchor=100.0), _context("p2", "AAPL", anchor=100.5)]
+    uc.prepare_cycle(contexts)
+
+    for context in contexts:
+        result = uc.evaluate_with_market_data(
+            "default", "pf", context.position_id, source="worker", context=context
+        )
+        assert result["trigger_detected"] is False
+        assert result["order_proposal"] is None
+
+    assert uc.market_data.get_reference_price.call_count == 1
+    assert uc.market_data.validate_price.call_count == 1
+    uc.config_repo.get_commission_rate.assert_not_called()
+    assert uc.evaluation_timeline_repo.save.call_count == 2
+
+
+def test_recheck_sizes_the_order_on_reloaded_rows_without_writing_again():
+    uc = _uc({"AAPL": 90.0})
+    uc.config_repo.get_commission_rate.return_value = 0.0
+    context = _context("p1", "AAPL", anchor=100.0)
+    context.open_orders = []
+
+    result = uc.evaluate_with_market_data("default", "pf", "p1", source="worker", context=context)
+    assert result["trigger_detected"] is True
+    assert result["order_proposal"]["side"] == "BUY"
+    writes = (len(uc.events.method_calls), len(uc.evaluation_timeline_repo.method_calls))
+
+    # Another run bought and left an order working since the bulk load
+    context.position = replace(context.position, qty=15.0, cash=550.0)
+    context.open_orders = [SimpleNamespace(id="o1", status="working")]
+    proposal = uc.recheck_order_proposal("default", "pf", "p1", result, context=context)
+
+    assert proposal["side"] == "BUY"
+    assert proposal["trimmed_qty"] != result["order_proposal"]["trimmed_qty"]
+    assert proposal["validation"]["valid"] is False
+    assert any("Pending order" in r for r in proposal["validation"]["rejections"])
+    assert (len(uc.events.method_calls), len(uc.evaluation_timeline_repo.method_calls)) == writes
@@ -57,18 +57,28 @@ class FakeTrade:
 class FakeOrdersRepo:
     def __init__(self, orders: Optional[Dict[str, FakeOrder]] = None):
         self._orders = orders or {}
+        self.calls = 0
 
     def get(self, order_id: str):
         return self._orders.get(order_id)
 
+    def get_many(self, order_ids):
+        self.calls += 1
+        return {oid: self._orders[oid] for oid in order_ids if oid in self._orders}
+
 
 class FakeTradesRepo:
     def __init__(self, trades_by_order: Optional[Dict[str, List[FakeTrade]]] = None):
         self._trades_by_order = trades_by_order or {}
+        self.calls = 0
 
     def list_for_order(self, order_id: str) -> List[FakeTrade]:
         return self._trades_by_order.get(order_id, [])
 
+    def list_for_orders(self, order_ids) -> Dict[str, List[FakeTrade]]:
+        self.calls += 1
+        return {oid: self._trades_by_order[oid] for oid in order_ids if oid in self._trades_by_order}
+
 
 # ────────────────── Fixtures ──────────────────
 
@@ -351,6 +361,20 @@ class TestEnrichWithOrders:
         assert row.order_id == "ord_missing"
         assert row.order_status is None  # Not found, gracefully handled
 
+    def test_enrich_fetches_in_one_batch_per_repo(self):
+        orders = {f"ord_{i}": FakeOrder(id=f"ord_{i}", filled_qty=1.0) for i in range(50)}
+        trades = {oid: [FakeTrade(id=f"trd_{oid}", order_id=oid)] for oid in orders}
+        orders_repo = FakeOrdersRepo(orders)
+        trades_repo = FakeTradesRepo(trades)
+        svc = ExplainabilityTimelineService(orders_repo=orders_repo, trades_repo=trades_repo)
+
+        records = [_live_record(action="BUY", order_id=oid) for oid in orders]
+        rows = svc.enrich_with_orders(svc.build_from_live_timeline(records))
+
+        assert orders_repo.calls == 1
+        assert trades_repo.calls == 1
+        assert all(row.execution_status == "FILLED" for row in rows)
+
 
 # ────────────────── Tests: Filtering ──────────────────
 
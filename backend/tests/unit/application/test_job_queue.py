@@ -0,0 +1,176 @@
+# =========================
+# backend/tests/unit/application/test_job_queue.py
+# =========================
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from application.services.job_queue import JobQueue
+from domain.entities.background_job import BackgroundJob, JobPriority, JobStatus
+from infrastructure.persistence.memory.job_store_mem import InMemoryJobStore
+from infrastructure.persistence.sql.job_store_sql import SQLJobStore
+from infrastructure.persistence.sql.models import BackgroundJobModel
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+def _finished(jobs, *job_ids):
+    return lambda: all(jobs.get(job_id).status.is_finished for job_id in job_ids)
+
+
+def test_runs_higher_priority_jobs_first():
+    jobs = JobQueue(InMemoryJobStore(), workers=1)
+    order = []
+    jobs.register("record", lambda job: order.append(job.payload["name"]))
+
+    # Hold the only worker while everything is queued
+    with jobs.live_trading_first():
+        low = jobs.submit("record", {"name": "low"}, priority=JobPriority.LOW)
+        first = jobs.submit("record", {"name": "normal-1"})
+        second = jobs.submit("record", {"name": "normal-2"})
+        high = jobs.submit("record", {"name": "high"}, priority=JobPriority.HIGH)
+        time.sleep(0.05)
+        assert order == []
+        assert jobs.metrics()["paused_for_live_trading"] is True
+
+    _wait_for(_finished(jobs, low.id, first.id, second.id, high.id))
+    assert order == ["high", "normal-1", "normal-2", "low"]
+    jobs.stop()
+
+
+def test_result_and_failure_are_recorded():
+    jobs = JobQueue(InMemoryJobStore(), workers=2)
+    jobs.register("square", lambda job: job.payload["x"] ** 2)
+    jobs.register("boom", lambda job: 1 / 0)
+
+    ok = jobs.submit("square", {"x": 7})
+    bad = jobs.submit("boom", {})
+    _wait_for(_finished(jobs, ok.id, bad.id))
+
+    assert jobs.get(ok.id).status == JobStatus.completed
+    assert jobs.get(ok.id).result == 49
+    assert jobs.get(bad.id).status == JobStatus.failed
+    assert "division" in jobs.get(bad.id).error
+
+    metrics = jobs.metrics()
+    assert metrics["counts"] == {"submitted": 2, "completed": 1, "failed": 1}
+    assert metrics["queue_depth"] == 0 and metrics["running"] == 0
+    assert metrics["run_seconds"]["max"] >= 0.0
+    jobs.stop()
+
+
+class OutageStore(InMemoryJobStore):
+    """Fails to store finished jobs while ``down`` is set."""
+
+    down = False
+
+    def save(self, job):
+        if self.down and job.status.is_finished:
+            raise RuntimeError("database unavailable")
+        super().save(job)
+
+
+def test_worker_survives_when_a_result_cannot_be_stored():
+    store = OutageStore()
+    jobs = JobQueue(store, workers=1)
+
+    def go_down(job):
+        store.down = True
+
+    jobs.register("outage", go_down)
+    jobs.register("square", lambda job: job.payload["x"] ** 2)
+
+    jobs.submit("outage", {})
+    _wait_for(lambda: jobs.metrics()["counts"].get("failed") == 1)
+    store.down = False
+
+    # The single worker is still alive to run the next job
+    later = jobs.submit("square", {"x": 3})
+    _wait_for(_finished(jobs, later.id))
+    assert jobs.get(later.id).result == 9
+    jobs.stop()
+
+
+def test_cancel_queued_and_running_jobs():
+    jobs = JobQueue(InMemoryJobStore(), workers=1)
+    release = threading.Event()
+    ran = []
+
+    def handler(job):
+        ran.append(job.id)
+        release.wait(5)
+        return "done"
+
+    jobs.register("slow", handler)
+    running = jobs.submit("slow", {})
+    _wait_for(lambda: jobs.get(running.id).status == JobStatus.running)
+    queued = jobs.submit("slow", {})
+
+    assert jobs.cancel(queued.id).status == JobStatus.cancelled
+    assert jobs.cancel(running.id).cancel_requested is True
+    release.set()
+
+    _wait_for(_finished(jobs, running.id))
+    assert jobs.get(running.id).status == JobStatus.cancelled
+    assert jobs.get(running.id).result is None
+    time.sleep(0.05)
+    assert ran == [running.id]
+    jobs.stop()
+
+
+def test_restart_requeues_queued_jobs_and_fails_interrupted_ones(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.sqlite'}")
+    BackgroundJobModel.__table__.create(engine)
+    store = SQLJobStore(sessionmaker(bind=engine, expire_on_commit=False))
+
+    # State left behind by a previous process
+    queued = BackgroundJob.new("echo", {"value": [1, 2]})
+    interrupted = BackgroundJob.new("echo", {"value": 3})
+    interrupted.status = JobStatus.running
+    store.save(queued)
+    store.save(interrupted)
+
+    jobs = JobQueue(store, workers=1)
+    jobs.register("echo", lambda job: {"echo": job.payload["value"]})
+    jobs.start()
+    _wait_for(_finished(jobs, queued.id))
+
+    restored = store.get(queued.id)
+    assert restored.status == JobStatus.completed
+    assert restored.result == {"echo": [1, 2]}
+    assert restored.started_at.tzinfo is not None
+    assert store.get(interrupted.id).status == JobStatus.failed
+    assert store.list_unfinished() == []
+    jobs.stop()
+
+
+def test_abandoned_jobs_are_handed_to_their_kind_hook(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.sqlite'}")
+    BackgroundJobModel.__table__.create(engine)
+    store = SQLJobStore(sessionmaker(bind=engine, expire_on_commit=False))
+    interrupted = BackgroundJob.new("echo", {"value": 1})
+    interrupted.status = JobStatus.running
+    store.save(interrupted)
+
+    abandoned = []
+    jobs = JobQueue(store, workers=1)
+    jobs.register("echo", lambda job: job.payload["value"], on_abandoned=abandoned.append)
+    with jobs.live_trading_first():
+        jobs.start()
+        queued = jobs.submit("echo", {"value": 2})
+        jobs.cancel(queued.id)
+    finished = jobs.submit("echo", {"value": 3})
+    _wait_for(_finished(jobs, finished.id))
+
+    # Interrupted by the restart, then cancelled before it started; never a finished run
+    assert [job.id for job in abandoned] == [interrupted.id, queued.id]
+    jobs.stop()
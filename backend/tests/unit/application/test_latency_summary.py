@@ -0,0 +1,18 @@
+# =========================
+# backend/tests/unit/application/test_latency_summary.py
+# =========================
+"""Tests for the shared latency percentile summary."""
+
+from collections import deque
+
+from application.helpers.latency import latency_summary
+
+
+def test_empty_samples_summarise_to_zeros():
+    assert latency_summary([]) == {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+
+def test_percentiles_are_taken_from_sorted_samples():
+    samples = deque(i / 1000 for i in range(100, 0, -1))
+
+    assert latency_summary(samples) == {"p50": 0.051, "p95": 0.095, "max": 0.1}
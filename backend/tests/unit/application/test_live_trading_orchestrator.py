@@ -0,0 +1,410 @@
+# =========================
+# backend/tests/unit/application/test_live_trading_orchestrator.py
+# =========================
+import threading
+import time
+from collections import Counter
+from dataclasses import replace
+from decimal import Decimal
+
+from application.dto.orders import CreateOrderRequest, FillOrderRequest
+from application.dto.position_context import PositionContext
+from application.orchestrators.live_trading import LiveTradingOrchestrator
+from application.ports.market_data import IMarketDataProvider
+from application.ports.repos import IPositionRepository
+from application.use_cases.execute_order_uc import ExecuteOrderUC
+from application.use_cases.submit_order_uc import SubmitOrderUC
+from domain.entities.order import Order
+from domain.entities.portfolio import Portfolio
+from domain.value_objects.configs import GuardrailConfig, TriggerConfig
+from domain.value_objects.position_state import PositionState
+from infrastructure.adapters.position_repo_adapter import PositionRepoAdapter
+from infrastructure.persistence.memory.config_repo_mem import InMemoryConfigRepo
+from infrastructure.persistence.memory.events_repo_mem import InMemoryEventsRepo
+from infrastructure.persistence.memory.idempotency_repo_mem import InMemoryIdempotencyRepo
+from infrastructure.persistence.memory.orders_repo_mem import InMemoryOrdersRepo
+from infrastructure.persistence.memory.positions_repo_mem import InMemoryPositionsRepo
+from infrastructure.persistence.memory.trades_repo_mem import InMemoryTradesRepo
+from infrastructure.time.clock import Clock
+
+
+class FakePositionRepo(IPositionRepository):
+    def __init__(self, tickers_by_id):
+        self.tickers_by_id = tickers_by_id
+
+    def get_active_positions_for_trading(self):
+        return list(self.tickers_by_id)
+
+    def load_position_state(self, position_id):
+        return PositionState(
+            ticker=self.tickers_by_id[position_id],
+            qty=Decimal("0"),
+            cash=Decimal("0"),
+            dividend_receivable=Decimal("0"),
+        )
+
+
+class RecordingMarketData(IMarketDataProvider):
+    def __init__(self):
+        self.prefetched = []
+
+    def get_latest_quote(self, ticker):
+        raise AssertionError("not expected")
+
+    def prefetch_quotes(self, tickers):
+        self.prefetched.append(list(tickers))
+
+
+def test_run_cycle_prefetches_each_ticker_once():
+    market_data = RecordingMarketData()
+    repo = FakePositionRepo({"p1": "AAPL", "p2": "MSFT", "p3": "AAPL"})
+    orchestrator = LiveTradingOrchestrator(
+        market_data=market_data, order_service=None, position_repo=repo
+    )
+
+    orchestrator.run_cycle()
+
+    assert market_data.prefetched == [["AAPL", "MSFT"]]
+
+
+def test_prefetch_failure_does_not_stop_cycle():
+    class FailingMarketData(RecordingMarketData):
+        def prefetch_quotes(self, tickers):
+            raise RuntimeError("offline")
+
+    repo = FakePositionRepo({"p1": "AAPL"})
+    orchestrator = LiveTradingOrchestrator(
+        market_data=FailingMarketData(), order_service=None, position_repo=repo
+    )
+
+    orchestrator.run_cycle()  # does not raise
+
+
+class CountingPositions(InMemoryPositionsRepo):
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    def get(self, tenant_id, portfolio_id, position_id):
+        self.calls["get"] += 1
+        return super().get(tenant_id, portfolio_id, position_id)
+
+    def list_all(self, tenant_id, portfolio_id):
+        self.calls["list_all"] += 1
+        return super().list_all(tenant_id, portfolio_id)
+
+
+class CountingPortfolios:
+    def __init__(self, portfolios):
+        self.portfolios = portfolios
+        self.calls = Counter()
+
+    def list_all(self, tenant_id, user_id=None):
+        self.calls["list_all"] += 1
+        return list(self.portfolios)
+
+    def get(self, tenant_id, portfolio_id):
+        self.calls["get"] += 1
+        return next((p for p in self.portfolios if p.id == portfolio_id), None)
+
+
+class RecordingEvaluateUC:
+    def __init__(self):
+        self.contexts = []
+
+    def evaluate_with_market_data(self, tenant_id, portfolio_id, position_id, source, context):
+        self.contexts.append(context)
+        return {"trigger_detected": False, "order_proposal": None}
+
+
+def _cycle(num_positions):
+    portfolios = [
+        Portfolio(id="pf_running", tenant_id="default", name="Running"),
+        Portfolio(id="pf_paused", tenant_id="default", name="Paused", trading_state="PAUSED"),
+    ]
+    positions = CountingPositions()
+    configs = InMemoryConfigRepo()
+    for i in range(num_positions):
+        position = positions.create("default", "pf_running", f"T{i % 3}", qty=1, anchor_price=10)
+        configs.set_trigger_config(
+            position.id, TriggerConfig(up_threshold_pct=Decimal(i), down_threshold_pct=Decimal(-i))
+        )
+    positions.create("default", "pf_running", "NOANCHOR", qty=1)
+    positions.create("default", "pf_paused", "PAUSED", qty=1, anchor_price=10)
+
+    portfolio_repo = CountingPortfolios(portfolios)
+    evaluate_uc = RecordingEvaluateUC()
+    market_data = RecordingMarketData()
+    orchestrator = LiveTradingOrchestrator(
+        market_data=market_data,
+        order_service=None,
+        position_repo=PositionRepoAdapter(
+            positions, portfolio_repo=portfolio_repo, config_repo=configs
+        ),
+        portfolio_repo=portfolio_repo,
+        evaluate_position_uc=evaluate_uc,
+    )
+    orchestrator.run_cycle()
+    return positions.calls + portfolio_repo.calls, evaluate_uc.contexts, market_data.prefetched
+
+
+def test_cycle_loads_position_contexts_once():
+    calls, contexts, prefetched = _cycle(6)
+
+    assert len(contexts) == 6
+    assert all(c.portfolio_id == "pf_running" and c.position.id == c.position_id for c in contexts)
+    assert all(c.trading_hours_policy == "OPEN_ONLY" for c in contexts)
+    assert [c.trigger_config.up_threshold_pct for c in contexts] == list(range(6))
+    assert prefetched == [["T0", "T1", "T2"]]
+    assert calls == {"list_all": 2}
+
+
+def test_cycle_repo_calls_do_not_grow_with_positions():
+    small, _, _ = _cycle(2)
+    large, contexts, _ = _cycle(40)
+
+    assert len(contexts) == 40
+    assert large == small
+
+
+class CountingOrders(InMemoryOrdersRepo):
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    def list_for_position(self, position_id, limit=100):
+        self.calls["list_for_position"] += 1
+        return super().list_for_position(position_id, limit)
+
+    def count_for_position_on_day(self, position_id, day):
+        self.calls["count_for_position_on_day"] += 1
+        return super().count_for_position_on_day(position_id, day)
+
+
+def _order(order_id, position_id, status):
+    return Order(
+        id=order_id,
+        tenant_id="default",
+        portfolio_id="pf",
+        position_id=position_id,
+        side="BUY",
+        qty=1.0,
+        status=status,
+    )
+
+
+def _order_context():
+    portfolio = Portfolio(id="pf", tenant_id="default", name="Running")
+    positions = CountingPositions()
+    orders = CountingOrders()
+    configs = InMemoryConfigRepo()
+    busy = positions.create("default", "pf", "AAA", qty=10, anchor_price=10)
+    idle = positions.create("default", "pf", "BBB", qty=10, anchor_price=10)
+    idle.cash = 1000.0
+    configs.set_guardrail_config(
+        idle.id, GuardrailConfig(min_stock_pct=Decimal("0"), max_stock_pct=Decimal("1"))
+    )
+    orders.save(_order("o1", busy.id, "working"))
+    orders.save(_order("o2", idle.id, "filled"))
+
+    adapter = PositionRepoAdapter(
+        positions,
+        portfolio_repo=CountingPortfolios([portfolio]),
+        config_repo=configs,
+        orders_repo=orders,
+    )
+    contexts = {c.ticker: c for c in adapter.get_trading_contexts()}
+    positions.calls.clear()
+    return positions, orders, contexts
+
+
+def test_contexts_preload_open_orders_and_todays_count():
+    _, orders, contexts = _order_context()
+
+    assert [o.id for o in contexts["AAA"].open_orders] == ["o1"]
+    assert contexts["BBB"].open_orders == []
+    assert contexts["BBB"].order_count_on(Clock().now().date()) == 1
+    assert not orders.calls
+
+
+def test_submit_and_execute_reuse_the_cycle_context():
+    positions, orders, contexts = _order_context()
+    context = contexts["BBB"]
+    configs = InMemoryConfigRepo()
+
+    def no_provider(*_):
+        raise AssertionError("configs come from the context")
+
+    submit = SubmitOrderUC(
+        positions=positions,
+        orders=orders,
+        idempotency=InMemoryIdempotencyRepo(),
+        events=InMemoryEventsRepo(),
+        config_repo=configs,
+        clock=Clock(),
+        guardrail_config_provider=no_provider,
+    )
+    response = submit.execute(
+        "default", "pf", context.position_id, CreateOrderRequest(side="BUY", qty=20.0),
+        idempotency_key="k1", context=context,
+    )
+    assert context.orders_today == 2 and context.open_orders[0].id == response.order_id
+
+    execute = ExecuteOrderUC(
+        positions=positions,
+        orders=orders,
+        trades=InMemoryTradesRepo(),
+        events=InMemoryEventsRepo(),
+        guardrail_config_provider=no_provider,
+    )
+    fill = execute.execute(response.order_id, FillOrderRequest(qty=20.0, price=10.0), context)
+
+    assert fill.status == "filled" and context.position.qty == 30
+    assert positions.calls == {} and orders.calls == {}
+
+
+class RecordingOrderService:
+    def __init__(self):
+        self.submitted = []
+
+    def submit_live_order(self, **kwargs):
+        self.submitted.append(kwargs)
+        return "o_new"
+
+
+class TriggeringEvaluateUC:
+    """Proposes a BUY on every evaluation; records the position qty and open orders it saw."""
+
+    def __init__(self):
+        self.seen = []
+        self.evaluations = 0
+
+    def evaluate_with_market_data(self, tenant_id, portfolio_id, position_id, source, context):
+        self.evaluations += 1
+        self.seen.append((context.position.qty, [o.id for o in context.open_orders]))
+        return {
+            "trigger_detected": True,
+            "order_proposal": {"side": "BUY", "trimmed_qty": 1, "validation": {"valid": True}},
+        }
+
+    def recheck_order_proposal(
+        self, tenant_id, portfolio_id, position_id, evaluation_result, context
+    ):
+        self.seen.append((context.position.qty, [o.id for o in context.open_orders]))
+        return evaluation_result["order_proposal"]
+
+
+def test_submit_after_the_cycle_load_is_seen_before_placing_an_order():
+    positions, orders, contexts = _order_context()
+    context = contexts["BBB"]
+    assert context.open_orders == []
+
+    # Another run submits and fills part of an order after the bulk load
+    orders.save(_order("o3", context.position_id, "working"))
+    positions.save_many([replace(context.position, qty=12.0)])
+
+    evaluate_uc = TriggeringEvaluateUC()
+    order_service = RecordingOrderService()
+    orchestrator = LiveTradingOrchestrator(
+        market_data=RecordingMarketData(),
+        order_service=order_service,
+        position_repo=PositionRepoAdapter(positions, orders_repo=orders),
+        evaluate_position_uc=evaluate_uc,
+        orders_repo=orders,
+    )
+    assert orchestrator.run_cycle_for_position(context.position_id, context=context)
+
+    # The proposal is rechecked on the reloaded rows, without a second evaluation,
+    # and the pending order blocks it
+    assert evaluate_uc.evaluations == 1
+    assert evaluate_uc.seen == [(10, []), (12.0, ["o3"])]
+    assert order_service.submitted == []
+    assert context.position.qty == 12.0 and context.order_count_on(Clock().now().date()) == 2
+
+
+class ContextRepo(FakePositionRepo):
+    def get_trading_contexts(self):
+        return [
+            PositionContext(position_id=pid, ticker=ticker, portfolio_id="pf")
+            for pid, ticker in self.tickers_by_id.items()
+        ]
+
+
+class SlowEvaluateUC:
+    """Sleeps like an I/O-bound evaluation and tracks overlap per position."""
+
+    def __init__(self, delay=0.02, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.active = Counter()
+        self.max_active = Counter()
+        self._lock = threading.Lock()
+
+    def evaluate_with_market_data(self, tenant_id, portfolio_id, position_id, source, context):
+        with self._lock:
+            self.active[position_id] += 1
+            self.max_active[position_id] = max(
+                self.max_active[position_id], self.active[position_id]
+            )
+        time.sleep(self.delay)
+        with self._lock:
+            self.active[position_id] -= 1
+        if position_id in self.fail:
+            raise RuntimeError("boom")
+        return {"trigger_detected": False, "order_proposal": None}
+
+
+def _orchestrator(num_positions, max_workers, evaluate_uc):
+    repo = ContextRepo({f"p{i}": f"T{i}" for i in range(num_positions)})
+    return LiveTradingOrchestrator(
+        market_data=RecordingMarketData(),
+        order_service=None,
+        position_repo=repo,
+        evaluate_position_uc=evaluate_uc,
+        max_workers=max_workers,
+    )
+
+
+def test_parallel_cycle_reports_metrics():
+    orchestrator = _orchestrator(100, 16, SlowEvaluateUC(delay=0.02))
+
+    metrics = orchestrator.run_cycle()
+
+    # Sequential would take 100 * 20ms
+    assert metrics["duration_seconds"] < 1.0
+    assert metrics["positions"] == 100 and metrics["errors"] == 0
+    assert metrics["workers"] == 16
+    assert 0.02 <= metrics["position_seconds"]["p50"] <= metrics["position_seconds"]["max"]
+    assert orchestrator.last_cycle_metrics is metrics
+
+
+def test_failing_position_is_isolated():
+    evaluate_uc = SlowEvaluateUC(delay=0.0, fail={"p3"})
+    orchestrator = _orchestrator(8, 4, evaluate_uc)
+
+    metrics = orchestrator.run_cycle()
+
+    assert metrics["positions"] == 8 and metrics["errors"] == 1
+    assert set(evaluate_uc.max_active) == {f"p{i}" for i in range(8)}
+
+
+def test_runs_for_one_position_never_overlap():
+    evaluate_uc = SlowEvaluateUC(delay=0.02)
+    orchestrator = _orchestrator(1, 4, evaluate_uc)
+
+    threads = [threading.Thread(target=orchestrator.run_cycle_for_position, args=("p0",))]
+    threads += [threading.Thread(target=orchestrator.run_cycle) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert evaluate_uc.max_active == {"p0": 1}
+
+
+def test_position_locks_are_dropped_once_no_run_holds_them():
+    orchestrator = _orchestrator(20, 4, SlowEvaluateUC(delay=0.0))
+
+    orchestrator.run_cycle()
+
+    assert len(orchestrator._position_locks) == 0
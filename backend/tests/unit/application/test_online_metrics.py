@@ -0,0 +1,91 @@
+# =========================
+# backend/tests/unit/application/test_online_metrics.py
+# =========================
+"""Tests for the streaming OnlineMetrics accumulator."""
+
+import statistics
+
+import numpy as np
+import pytest
+
+from application.helpers.online_metrics import OnlineMetrics
+
+
+def _values(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    return 10000.0 * np.cumprod(1 + rng.normal(0.0003, 0.01, n))
+
+
+def _reference(values):
+    """The list-based definitions the simulation and optimizer used before."""
+    returns = [
+        0.0 if values[i - 1] <= 0 else values[i] / values[i - 1] - 1
+        for i in range(1, len(values))
+    ]
+    peak, max_dd = values[0], 0.0
+    for value in values:
+        peak = max(peak, value)
+        max_dd = max(max_dd, (peak - value) / peak)
+    downside = [r for r in returns if r < 0]
+    gains = sum(r for r in returns if r > 0)
+    losses = sum(r for r in returns if r < 0)
+    std = statistics.stdev(returns)
+    return {
+        "volatility": std * 252**0.5,
+        "sharpe_ratio": statistics.mean(returns) * 252 / (std * 252**0.5),
+        "sortino_ratio": statistics.mean(returns) * 252 / (statistics.stdev(downside) * 252**0.5),
+        "max_drawdown": max_dd * 100,
+        "win_rate": sum(r > 0 for r in returns) / len(returns),
+        "profit_factor": gains / abs(losses),
+    }
+
+
+def test_streaming_matches_list_based_definitions():
+    values = _values().tolist()
+    metrics = OnlineMetrics()
+    for value in values:
+        metrics.update(value)
+    metrics.record_trade(1.5)
+    metrics.record_trade(0.25)
+
+    summary = metrics.summary()
+    expected = _reference(values)
+    assert summary["max_drawdown"] == expected["max_drawdown"]
+    for key in ("volatility", "sharpe_ratio", "sortino_ratio", "win_rate", "profit_factor"):
+        assert summary[key] == pytest.approx(expected[key], rel=1e-9)
+    assert summary["returns"] == len(values) - 1
+    assert (summary["trades"], summary["total_commission"]) == (2, 1.75)
+    assert metrics.last_value == values[-1] and metrics.first_value == values[0]
+    assert not hasattr(metrics, "__dict__")
+
+
+def test_block_updates_match_scalar_updates():
+    values = _values(seed=8)
+    scalar = OnlineMetrics()
+    for value in values.tolist():
+        scalar.update(value)
+
+    blocks = OnlineMetrics()
+    for block in np.array_split(values, 7):
+        blocks.update_many(block)
+
+    assert blocks.values == scalar.values and blocks.last_return == scalar.last_return
+    assert blocks.max_drawdown_pct == scalar.max_drawdown_pct
+    for key, value in scalar.summary().items():
+        assert blocks.summary()[key] == pytest.approx(value, rel=1e-9), key
+
+
+def test_flat_and_short_series_have_zero_spread():
+    flat = OnlineMetrics()
+    flat.update_many(np.full(50, 100.0))
+    growth = OnlineMetrics()
+    for value in 100.0 * 1.01 ** np.arange(20):
+        growth.update(float(value))
+    single = OnlineMetrics()
+    single.update(100.0)
+
+    assert flat.volatility == flat.sharpe_ratio == flat.max_drawdown_pct == 0.0
+    assert flat.profit_factor == 0.0
+    assert growth.sortino_ratio == 0.0  # no losing steps
+    assert growth.profit_factor == float("inf") and growth.win_rate == 1.0
+    assert single.summary()["returns"] == 0 and single.volatility == 0.0
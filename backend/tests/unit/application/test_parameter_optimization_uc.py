@@ -207,6 +207,181 @@ class TestParameterOptimizationUC:
             config.id, OptimizationStatus.COMPLETED.value
         )
 
+    @pytest.mark.parametrize(
+        "max_workers,grid_batch_size", [(2, 0), (1, 3), (2, 3)], ids=["pool", "grid", "pool+grid"]
+    )
+    def test_process_combinations_pool_and_grid(self, max_workers, grid_batch_size):
+        """Pool and grid-batch modes match in-process per-combination results."""
+        import math
+        import random
+        from datetime import timedelta
+        from unittest.mock import patch
+
+        from application.use_cases.simulation_unified_uc import SimulationUnifiedUC
+        from domain.entities.market_data import PriceData, PriceSource, SimulationData
+        from infrastructure.market.market_data_storage import MarketDataStorage
+        from infrastructure.persistence.memory.events_repo_mem import InMemoryEventsRepo
+        from infrastructure.persistence.memory.positions_repo_mem import InMemoryPositionsRepo
+        from infrastructure.time.clock import Clock
+
+
+        rng = random.Random(3)
+        start = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+        price, price_data = 100.0, []
+        for i in range(260):
+            price = round(price * math.exp(rng.gauss(0, 0.01)), 4)
+            price_data.append(
+                PriceData(
+                    ticker="AAPL",
+                    price=price,
+                    source=PriceSource.LAST_TRADE,
+                    timestamp=start + timedelta(days=i // 13, minutes=30 * (i % 13)),
+                    volume=1000,
+                    is_market_hours=True,
+                )
+            )
+        sim_data = SimulationData(
+            ticker="AAPL",
+            start_date=price_data[0].timestamp,
+            end_date=price_data[-1].timestamp,
+            price_data=price_data,
+            daily_summaries=[],
+            volatility_data=[],
+            total_trading_days=20,
+            market_hours_data=price_data,
+            after_hours_data=[],
+        )
+        prefetched = (price_data, sim_data, [], MarketDataStorage())
+
+        config = self._create_test_config()
+        combinations = [
+            ParameterCombination(
+                parameters={"trigger_threshold": t},
+                combination_id=f"combo_{i}",
+                created_at=datetime.now(timezone.utc),
+            )
+            for i, t in enumerate([0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.07])
+        ]
+
+        def run(max_workers, grid_batch_size):
+            results = [
+                OptimizationResult(
+                    id=uuid4(),
+                    config_id=config.id,
+                    parameter_combination=c,
+                    metrics={},
+                )
+                for c in combinations
+            ]
+            result_repo = Mock()
+            result_repo.get_by_config.return_value = results
+            uc = ParameterOptimizationUC(
+                config_repo=Mock(),
+                result_repo=result_repo,
+                heatmap_repo=Mock(),
+                simulation_uc=SimulationUnifiedUC(
+                    market_data=MarketDataStorage(),
+                    positions=InMemoryPositionsRepo(),
+                    events=InMemoryEventsRepo(),
+                    clock=Clock(),
+                ),
+                max_workers=max_workers,
+                grid_batch_size=grid_batch_size,
+            )
+            with patch.object(uc, "_prefetch_market_data", return_value=prefetched):
+                uc._process_parameter_combinations(config, combinations)
+            saved = [r for call in result_repo.batch_update_results.call_args_list for r in call[0][0]]
+            return results, saved
+
+        sequential, _ = run(1, 0)
+        parallel, saved = run(max_workers, grid_batch_size)
+
+        # Every combination is flushed exactly once, in batches
+        assert sorted(r.parameter_combination.combination_id for r in saved) == sorted(
+            c.combination_id for c in combinations
+        )
+        for seq, par in zip(sequential, parallel):
+            assert par.status == OptimizationResultStatus.COMPLETED
+            assert par.metrics == pytest.approx(seq.metrics, rel=1e-9)
+            assert par.simulation_result["trade_log"] == seq.simulation_result["trade_log"]
+
+    def test_run_stops_between_batches_once_cancel_is_requested(self):
+        """A stop request ends the run after the current batch and cancels the config."""
+        from unittest.mock import patch
+
+        config = self._create_test_config()
+        combinations = [
+            ParameterCombination(
+                parameters={"trigger_threshold": 0.01 * (i + 1)},
+                combination_id=f"combo_{i}",
+                created_at=datetime.now(timezone.utc),
+            )
+            for i in range(6)
+        ]
+        self.mock_result_repo.get_by_config.return_value = [
+            OptimizationResult(
+                id=uuid4(), config_id=config.id, parameter_combination=c, metrics={}
+            )
+            for c in combinations
+        ]
+        uc = ParameterOptimizationUC(
+            config_repo=self.mock_config_repo,
+            result_repo=self.mock_result_repo,
+            heatmap_repo=self.mock_heatmap_repo,
+            simulation_uc=self.mock_simulation_uc,
+            grid_batch_size=2,
+        )
+        batches = []
+
+        def evaluate(inputs, parameter_sets):
+            batches.append(len(parameter_sets))
+            return [
+                {"metrics": {}, "simulation_result": {}, "execution_time": 0.0, "error": None}
+                for _ in parameter_sets
+            ]
+
+        with (
+            patch.object(uc, "_prefetch_market_data", return_value=([], Mock(), [], Mock())),
+            patch.object(uc, "_evaluate_parameter_sets", side_effect=evaluate),
+        ):
+            uc._process_parameter_combinations(
+                config, combinations, should_stop=lambda: len(batches) >= 2
+            )
+
+        assert batches == [2, 2]
+        calls = self.mock_result_repo.batch_update_results.call_args_list
+        assert sum(len(call[0][0]) for call in calls) == 4
+        self.mock_config_repo.update_status.assert_called_once_with(
+            config.id, OptimizationStatus.CANCELLED.value
+        )
+
+    def test_grid_outcomes_missing_from_a_short_grid_are_reported_as_errors(self):
+        """A grid that ends early still yields one timed outcome per parameter set."""
+        uc = ParameterOptimizationUC(
+            config_repo=self.mock_config_repo,
+            result_repo=self.mock_result_repo,
+            heatmap_repo=self.mock_heatmap_repo,
+            simulation_uc=self.mock_simulation_uc,
+            grid_batch_size=3,
+        )
+        self.mock_simulation_uc.iter_simulation_grid.return_value = iter(
+            [(0, None, RuntimeError("bad config"))]
+        )
+        inputs = dict.fromkeys(
+            ["ticker", "start_date", "end_date", "sim_data", "dividend_history", "initial_cash"]
+        )
+
+        outcomes = uc._evaluate_grid(
+            inputs, [{"trigger_threshold": t} for t in (0.01, 0.02, 0.03)]
+        )
+
+        assert [o["error"] for o in outcomes] == [
+            "bad config",
+            "No result from the simulation grid",
+            "No result from the simulation grid",
+        ]
+        assert all(o["execution_time"] >= 0 for o in outcomes)
+
     def test_run_optimization_config_not_found(self):
         """Test running optimization for non-existent config."""
         # Setup
@@ -229,6 +404,27 @@ class TestParameterOptimizationUC:
         with pytest.raises(ValueError, match="Cannot start optimization in status"):
             self.uc.run_optimization(config_id)
 
+    def test_claim_rejects_a_second_start_and_stale_claimed_runs_are_skipped(self):
+        """A claimed config is RUNNING; a queued run only proceeds while it still is."""
+        config_id = uuid4()
+        config = self._create_test_config()
+        config.status = OptimizationStatus.DRAFT
+        self.mock_config_repo.get_by_id.return_value = config
+
+        self.uc.claim_run(config_id)
+        assert config.status == OptimizationStatus.RUNNING
+        self.mock_config_repo.update_status.assert_called_once_with(
+            config_id, OptimizationStatus.RUNNING.value
+        )
+        with pytest.raises(ValueError, match="Cannot start optimization in status"):
+            self.uc.claim_run(config_id)
+
+        # Reset to DRAFT before the queued job ran
+        config.status = OptimizationStatus.DRAFT
+        self.uc.run_optimization(config_id, claimed=True)
+        self.mock_result_repo.bulk_save_results.assert_not_called()
+        assert self.mock_config_repo.update_status.call_count == 1
+
     def test_get_optimization_progress(self):
         """Test getting optimization progress."""
         # Setup
@@ -0,0 +1,210 @@
+# =========================
+# backend/tests/unit/application/test_position_excel_streaming.py
+# =========================
+"""Unit tests for the streamed position, activity and comprehensive exports."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from types import SimpleNamespace
+
+from openpyxl import load_workbook
+
+from application.services.comprehensive_excel_export_service import (
+    ComprehensiveExcelExportService,
+    transactions_from_trades,
+)
+from application.services.excel_template_service import (
+    ACTIVITY_LOG_HEADERS,
+    TRADE_HEADERS,
+    ExcelTemplateService,
+)
+from domain.entities.trade import Trade
+
+START = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _workbook(chunks):
+    return load_workbook(BytesIO(b"".join(chunks)))
+
+
+def _once(rows):
+    """A single-pass iterator that records how far it was read."""
+    state = SimpleNamespace(read=0)
+
+    def gen():
+        for row in rows:
+            state.read += 1
+            yield row
+
+    return gen(), state
+
+
+def test_trading_audit_stream_counts_rows_into_a_trailing_summary():
+    trades, trades_read = _once(
+        {
+            "id": f"trd_{i}",
+            "order_id": f"ord_{i}",
+            "position_id": "pos1",
+            "side": "BUY",
+            "qty": 2.0,
+            "price": 100.0 + i,
+            "commission": 0.1,
+            "status": "executed",
+            "executed_at": START + timedelta(minutes=i),
+        }
+        for i in range(250)
+    )
+    positions = [{"id": "pos1", "ticker": "AAPL", "shares": 10.0, "cash_balance": 500.0}]
+
+    chunks = ExcelTemplateService().stream_trading_audit_report(positions, trades, [], "Audit")
+    # Nothing is read before the file is consumed
+    assert trades_read.read == 0
+    wb = _workbook(chunks)
+
+    assert wb.sheetnames == [
+        "Positions Analysis",
+        "Trades Analysis",
+        "Orders Analysis",
+        "Executive Summary",
+    ]
+    trades_ws = wb["Trades Analysis"]
+    assert [c.value for c in trades_ws[2]] == TRADE_HEADERS
+    assert trades_ws.max_row == 2 + 250
+    assert trades_ws.cell(row=3, column=9).value == START.isoformat()
+    assert wb["Orders Analysis"].cell(row=3, column=1).value == "No orders data available."
+
+    summary = wb["Executive Summary"]
+    assert summary["A1"].value == "Audit"
+    counts = {r[0]: r[1] for r in summary.iter_rows(min_row=4, values_only=True) if r[0]}
+    assert counts["Total Positions:"] == 1
+    assert counts["Total Trades:"] == 250
+    assert counts["Total Orders:"] == 0
+
+
+def test_activity_log_stream_keeps_title_and_json_columns():
+    events = (
+        {
+            "ts": (START + timedelta(seconds=i)).isoformat(),
+            "type": "tick",
+            "message": f"evaluation {i}",
+            "inputs": {"price": 150 + i} if i % 2 else {},
+            "outputs": {"action": "HOLD"},
+        }
+        for i in range(150)
+    )
+
+    wb = _workbook(ExcelTemplateService().stream_activity_log_report(events, "pos1", "AAPL"))
+    ws = wb["Activity Log"]
+
+    assert ws["A1"].value == "Activity Log - AAPL (Position: pos1)"
+    assert ws["A2"].value.startswith("Generated: ")
+    assert [c.value for c in ws[4]] == ACTIVITY_LOG_HEADERS
+    assert ws[4][0].font.bold
+    assert ws.max_row == 4 + 150
+    assert ws["C5"].value == "evaluation 0"
+    assert ws["D5"].value == ""
+    assert ws["D6"].value == '{\n  "price": 151\n}'
+
+
+def test_comprehensive_stream_uses_trades_and_summarizes_last():
+    market_data = [
+        {
+            "date_time": f"2025-03-0{d} 16:00:00",
+            "date": f"2025-03-0{d}",
+            "time": "16:00:00",
+            "open": 100.0,
+            "close": 100.0 + d,
+            "close_prev": 100.0,
+            "high": 110.0,
+            "low": 95.0,
+            "volume": 1000,
+            "bid": 100.0,
+            "ask": 101.0,
+            "dividend_rate": 0.0,
+            "dividend_value": 0.0,
+        }
+        for d in range(1, 5)
+    ]
+    trades = [
+        Trade(
+            id=f"trd_{i}",
+            tenant_id="t1",
+            portfolio_id="p1",
+            order_id=f"ord_{i}",
+            position_id="pos1",
+            side="SELL",
+            qty=2.0,
+            price=101.0,
+            commission=2.0,
+            executed_at=START - timedelta(days=i),
+        )
+        for i in range(3)
+    ]
+    position = SimpleNamespace(ticker="AAPL", anchorPrice=100.0, units=10.0, cashAmount=500.0)
+
+    chunks = ComprehensiveExcelExportService().stream_position_comprehensive_data(
+        position, market_data, transactions_from_trades(iter(trades))
+    )
+    wb = _workbook(chunks)
+
+    assert wb.sheetnames == [
+        "Market Data",
+        "Position Data",
+        "Algorithm Data",
+        "Transaction Data",
+        "Additional Data",
+        "Summary",
+    ]
+    transactions = list(wb["Transaction Data"].iter_rows(min_row=2, values_only=True))
+    assert len(transactions) == 3
+    assert transactions[0][:6] == ("2025-03-03 14:30:00", "SELL", 2, 101, 202, 2)
+    assert wb["Position Data"].max_row == 5
+    # 6.0 commission spread over four data points
+    assert wb["Additional Data"].cell(row=2, column=4).value == 1.5
+
+    summary = {r[0]: r[1] for r in wb["Summary"].iter_rows(values_only=True) if r[0]}
+    assert summary["Comprehensive Data Export - AAPL"] is None
+    assert summary["Market Data Points"] == 4
+    assert summary["Transaction Records"] == 3
+    assert summary["Units"] == "10.00"
+
+
+def test_comprehensive_stream_falls_back_to_demo_transactions_without_trades(monkeypatch):
+    def randint(low, high):
+        # random.randint rejects float bounds on Python 3.12
+        assert isinstance(low, int) and isinstance(high, int)
+        return high
+
+    monkeypatch.setattr(random, "randint", randint)
+    monkeypatch.setattr(random, "choice", lambda seq: seq[0])
+    monkeypatch.setattr(random, "random", lambda: 0.5)
+    market_data = [
+        {
+            "date_time": "2025-03-03 16:00:00",
+            "date": "2025-03-03",
+            "time": "16:00:00",
+            "open": 100.0,
+            "close": 101.0,
+            "close_prev": 100.0,
+            "high": 102.0,
+            "low": 99.0,
+            "volume": 1000,
+            "bid": 100.9,
+            "ask": 101.1,
+            "dividend_rate": 0.0,
+            "dividend_value": 0.0,
+        }
+    ]
+    position = SimpleNamespace(ticker="AAPL", anchorPrice=100.0, units=10.0, cashAmount=500.0)
+
+    wb = _workbook(
+        ComprehensiveExcelExportService().stream_position_comprehensive_data(
+            position, market_data, transactions_from_trades(iter([]))
+        )
+    )
+
+    transactions = list(wb["Transaction Data"].iter_rows(min_row=2, values_only=True))
+    assert len(transactions) == 5
+    # Quantity is capped at half of the float unit count
+    assert {row[1:3] for row in transactions} == {("BUY", 5)}
@@ -0,0 +1,105 @@
+# =========================
+# backend/tests/unit/application/test_timeline_excel_export.py
+# =========================
+"""Unit tests for the streaming xlsx writer and TimelineExcelExportService."""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import MagicMock
+
+from openpyxl import load_workbook
+
+from application.services.streaming_xlsx import XlsxSheet, stream_xlsx, xlsx_bytes
+from application.services.timeline_excel_export_service import (
+    COMPACT_COLUMNS,
+    TimelineExcelExportService,
+)
+
+
+def _timeline(n=6):
+    start = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        rows.append(
+            {
+                "timestamp": start + timedelta(minutes=5 * i),
+                "mode": "LIVE",
+                "symbol": "AAPL",
+                "position_id": "pos_1",
+                "effective_price": Decimal("150.25") + i,
+                "action": "BUY" if i == 2 else ("SELL" if i == 4 else "HOLD"),
+                "commission_value": 1.5 if i in (2, 4) else None,
+                "dividend_applied": i == 5,
+                "dividend_net_value": 3.0 if i == 5 else None,
+                "portfolio_total_value_before": [1000, 1200, 1100, 1080, 1150, 1190][i],
+                "trigger_fired": i in (2, 4),
+            }
+        )
+    return rows
+
+
+def test_stream_xlsx_yields_chunks_that_open_as_a_workbook():
+    rows = ([i, f"row <{i}> & more", i % 2 == 0, None] for i in range(5000))
+    chunks = list(
+        stream_xlsx(
+            [XlsxSheet("Data", rows, header=["n", "text", "even", "empty"])],
+            chunk_size=8 * 1024,
+        )
+    )
+    assert len(chunks) > 1
+
+    wb = load_workbook(BytesIO(b"".join(chunks)))
+    ws = wb["Data"]
+    assert [c.value for c in ws[1]] == ["n", "text", "even", "empty"]
+    assert ws[1][0].font.bold
+    assert ws.max_row == 5001
+    assert [c.value for c in ws[3]][:3] == [1, "row <1> & more", False]
+
+
+def test_empty_workbook_still_opens():
+    wb = load_workbook(BytesIO(xlsx_bytes([])))
+    assert wb.sheetnames == ["Sheet1"]
+
+
+def test_timeline_export_streams_all_sheets_from_repo_cursor():
+    repo = MagicMock()
+    repo.iter_by_portfolio.side_effect = lambda **kwargs: iter(_timeline())
+    service = TimelineExcelExportService(repo)
+
+    data = service.export_portfolio_timeline(tenant_id="t1", portfolio_id="p1", mode="LIVE")
+    wb = load_workbook(BytesIO(data))
+
+    assert wb.sheetnames == ["Timeline", "Timeline_Verbose", "Trades", "Dividends", "Summary"]
+    assert repo.iter_by_portfolio.call_count == 2
+    repo.list_by_portfolio.assert_not_called()
+
+    timeline = wb["Timeline"]
+    assert [c.value for c in timeline[1]] == COMPACT_COLUMNS
+    assert timeline.max_row == 7
+    assert timeline.cell(row=2, column=1).value == "2025-03-03T14:30:00+00:00"
+    assert timeline.cell(row=2, column=5).value == 150.25
+
+    assert [r[2] for r in wb["Trades"].iter_rows(min_row=2, values_only=True)] == ["BUY", "SELL"]
+    assert wb["Dividends"].max_row == 2
+
+    summary = {r[0]: r[1] for r in wb["Summary"].iter_rows(min_row=2, values_only=True)}
+    assert summary["Total Evaluations"] == 6
+    assert summary["Total Trades"] == 2
+    assert summary["Total Commission Paid"] == "$3.00"
+    assert summary["Total Dividends Received"] == "$3.00"
+    assert summary["Initial Value"] == "$1000.00"
+    assert summary["Final Value"] == "$1190.00"
+    assert summary["Max Drawdown %"] == "-10.00%"
+
+
+def test_timeline_export_without_rows_has_placeholder_summary():
+    repo = MagicMock()
+    repo.iter_by_portfolio.side_effect = lambda **kwargs: iter([])
+
+    wb = load_workbook(
+        BytesIO(TimelineExcelExportService(repo).export_portfolio_timeline("t1", "p1"))
+    )
+
+    assert wb["Timeline"].max_row == 1
+    assert wb["Summary"]["A1"].value == "No data available"
@@ -0,0 +1,93 @@
+# =========================
+# backend/tests/unit/domain/test_price_series.py
+# =========================
+import pickle
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from domain.entities.market_data import PriceData, PriceSource
+from domain.entities.price_series import PriceSeries
+from infrastructure.market.market_data_storage import MarketDataStorage
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _points():
+    quote = PriceData(
+        ticker="AAPL",
+        price=101.5,
+        source=PriceSource.MID_QUOTE,
+        timestamp=START + timedelta(minutes=1),
+        bid=101.4,
+        ask=101.6,
+        last_trade_price=101.45,
+        last_trade_time=START,
+        is_market_hours=False,
+        is_fresh=False,
+        is_inline=False,
+    )
+    bar = PriceData(
+        ticker="AAPL",
+        price=102.0,
+        source=PriceSource.LAST_TRADE,
+        timestamp=START + timedelta(days=1),
+        volume=1200,
+        open=101.0,
+        high=103.0,
+        low=100.5,
+        close=102.0,
+    )
+    return [quote, bar]
+
+
+class TestPriceSeries:
+    def test_price_data_is_slotted(self):
+        point = _points()[0]
+        assert not hasattr(point, "__dict__")
+        with pytest.raises(AttributeError):
+            point.extra = 1
+
+    def test_round_trips_every_field_through_the_columns(self):
+        points = _points()
+        series = PriceSeries.from_points("AAPL", points)
+
+        assert list(series) == points
+        assert series[-1] == points[-1]
+        assert series.prices.dtype == np.float64 and series.timestamps.dtype == np.int64
+        assert series.is_market_hours.tolist() == [False, True]
+        assert series.datetimes() == [p.timestamp for p in points]
+        assert pickle.loads(pickle.dumps(series))[0] == points[0]
+
+    def test_slices_share_columns_and_masks_copy(self):
+        series = PriceSeries.from_points("AAPL", _points() * 3)
+
+        head = series[:2]
+        assert isinstance(head, PriceSeries) and len(head) == 2
+        assert np.shares_memory(head.prices, series.prices)
+
+        market = series.take(series.is_market_hours)
+        assert len(market) == 3 and not np.shares_memory(market.prices, series.prices)
+        assert PriceSeries.concat("AAPL", [head, market]).prices.tolist() == [
+            101.5,
+            102.0,
+            102.0,
+            102.0,
+            102.0,
+        ]
+
+    def test_storage_hands_out_price_series(self):
+        points = _points()
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", points)
+        storage.store_price_data("AAPL", points[0])  # out of order, re-sorted on read
+
+        sim_data = storage.get_simulation_data(
+            "AAPL", START, START + timedelta(days=2), include_after_hours=True
+        )
+        assert isinstance(sim_data.price_data, PriceSeries)
+        assert list(sim_data.price_data) == [points[0], points[0], points[1]]
+        assert list(sim_data.market_hours_data) == [points[1]]
+        assert sim_data.total_trading_days == 1
+        assert [s.close_price for s in sim_data.daily_summaries] == [101.5, 102.0]
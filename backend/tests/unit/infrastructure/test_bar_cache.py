@@ -0,0 +1,170 @@
+# =========================
+# backend/tests/unit/infrastructure/test_bar_cache.py
+# =========================
+import pytest
+from datetime import date, timedelta
+
+import pandas as pd
+
+from infrastructure.market.bar_cache import HistoricalBarCache
+
+
+def _daily_frame(start: str, end: str) -> pd.DataFrame:
+    """yfinance-style daily frame: weekday bars at midnight New York time."""
+    days = [d for d in pd.date_range(start, end, freq="D", inclusive="left") if d.weekday() < 5]
+    index = pd.DatetimeIndex(days).tz_localize("America/New_York")
+    closes = [100.0 + d.day for d in days]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": [c + 1 for c in closes],
+            "Low": [c - 1 for c in closes],
+            "Close": closes,
+            "Volume": [1000.0] * len(days),
+            "Dividends": [0.0] * len(days),
+        },
+        index=index,
+    )
+
+
+class FakeHistory:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+        # Set after a split / dividend: the provider rescales every bar it returns
+        self.scale = 1.0
+
+    def __call__(self, start: str, end: str) -> pd.DataFrame:
+        self.calls.append((start, end))
+        if self.fail:
+            raise ConnectionError("offline")
+        frame = _daily_frame(start, end)
+        frame[["Open", "High", "Low", "Close"]] *= self.scale
+        return frame
+
+
+class TestHistoricalBarCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return HistoricalBarCache(str(tmp_path))
+
+    def test_miss_then_hit(self, cache):
+        fetch = FakeHistory()
+        first = cache.history("AAPL", "2024-01-02", "2024-02-10", "1d", fetch)
+        second = cache.history("AAPL", "2024-01-02", "2024-02-10", "1d", fetch)
+
+        assert fetch.calls == [("2024-01-02", "2024-02-10")]
+        pd.testing.assert_frame_equal(first, second)
+        expected = _daily_frame("2024-01-02", "2024-02-10")[["Open", "High", "Low", "Close", "Volume"]]
+        pd.testing.assert_frame_equal(first, expected, check_freq=False)
+        assert str(first.index.tz) == "America/New_York"
+
+    def test_only_missing_ranges_are_fetched(self, cache):
+        fetch = FakeHistory()
+        cache.history("AAPL", "2024-03-01", "2024-03-15", "1d", fetch)
+        fetch.calls.clear()
+
+        result = cache.history("AAPL", "2024-02-20", "2024-03-25", "1d", fetch)
+
+        # The tail also re-reads the cached reference bar (Mar 14) to check adjustments
+        assert fetch.calls == [("2024-02-20", "2024-03-01"), ("2024-03-14", "2024-03-25")]
+        assert result.index[0].date() == date(2024, 2, 20)
+        assert result.index[-1].date() == date(2024, 3, 22)
+        assert result.index.is_monotonic_increasing
+        assert not result.index.duplicated().any()
+
+    def test_offline_serves_cached_bars(self, cache, tmp_path):
+        cache.history("AAPL", "2024-01-02", "2024-01-31", "1d", FakeHistory())
+
+        offline = HistoricalBarCache(str(tmp_path))
+        fetch = FakeHistory(fail=True)
+        result = offline.history("AAPL", "2024-01-10", "2024-02-05", "1d", fetch)
+
+        assert len(fetch.calls) == 1  # attempted the missing tail only
+        assert result.index[0].date() == date(2024, 1, 10)
+        assert result.index[-1].date() == date(2024, 1, 30)
+
+    def test_offline_without_cached_bars_raises(self, cache):
+        with pytest.raises(ConnectionError):
+            cache.history("MSFT", "2024-01-02", "2024-01-31", "1d", FakeHistory(fail=True))
+
+    def test_keys_separate_interval_and_adjustment(self, cache):
+        fetch = FakeHistory()
+        cache.history("AAPL", "2024-01-02", "2024-01-12", "1d", fetch)
+        cache.history("AAPL", "2024-01-02", "2024-01-12", "1d", fetch, auto_adjust=False)
+        cache.history("AAPL", "2024-01-02", "2024-01-12", "1h", fetch)
+        cache.history("MSFT", "2024-01-02", "2024-01-12", "1d", fetch)
+
+        assert len(fetch.calls) == 4
+
+    def test_today_is_never_marked_complete(self, cache):
+        fetch = FakeHistory()
+        today = date.today()
+        start = (today - timedelta(days=10)).isoformat()
+        end = (today + timedelta(days=1)).isoformat()
+
+        cache.history("AAPL", start, end, "1d", fetch)
+        fetch.calls.clear()
+        cache.history("AAPL", start, end, "1d", fetch)
+
+        assert len(fetch.calls) == 1
+        assert fetch.calls[0][1] == end
+
+    def test_empty_weekday_answer_is_not_recorded(self, cache):
+        calls = []
+
+        def empty(start, end):
+            calls.append((start, end))
+            return _daily_frame(start, end).iloc[0:0]
+
+        assert cache.history("AAPL", "2024-01-02", "2024-01-05", "1d", empty).empty
+        cache.history("AAPL", "2024-01-02", "2024-01-05", "1d", empty)
+
+        assert len(calls) == 2
+
+    def test_adjustment_after_caching_refetches_the_whole_request(self, cache):
+        fetch = FakeHistory()
+        cache.history("AAPL", "2024-01-02", "2024-02-01", "1d", fetch)
+
+        fetch.scale = 0.5  # 2:1 split after January was cached
+        fetch.calls.clear()
+        result = cache.history("AAPL", "2024-01-02", "2024-03-01", "1d", fetch)
+
+        # February plus the reference day (Jan 31) showed the rescale
+        assert fetch.calls == [("2024-01-31", "2024-03-01"), ("2024-01-02", "2024-03-01")]
+        expected = _daily_frame("2024-01-02", "2024-03-01")["Close"] * 0.5
+        assert result["Close"].tolist() == expected.tolist()
+
+        # The cache now holds the new scale only
+        fetch.calls.clear()
+        again = cache.history("AAPL", "2024-01-02", "2024-03-01", "1d", fetch)
+        assert fetch.calls == []
+        pd.testing.assert_frame_equal(again, result)
+
+    def test_reference_is_probed_when_no_missing_range_touches_it(self, cache):
+        fetch = FakeHistory()
+        cache.history("AAPL", "2024-03-01", "2024-04-01", "1d", fetch)
+
+        fetch.calls.clear()
+        cache.history("AAPL", "2024-01-02", "2024-04-01", "1d", fetch)
+        # Unchanged close on the probe (Mar 29): only Jan-Feb is added
+        assert fetch.calls == [("2024-03-29", "2024-03-30"), ("2024-01-02", "2024-03-01")]
+
+        fetch.scale = 0.98  # dividend-adjusted history
+        fetch.calls.clear()
+        result = cache.history("AAPL", "2023-12-01", "2024-04-01", "1d", fetch)
+        assert fetch.calls[-1] == ("2023-12-01", "2024-04-01")
+        assert result["Close"].iloc[-1] == pytest.approx((100.0 + 29) * 0.98)
+
+    def test_failed_probe_keeps_the_cache_and_stores_nothing(self, cache):
+        fetch = FakeHistory()
+        cache.history("AAPL", "2024-03-01", "2024-04-01", "1d", fetch)
+
+        fetch.fail = True
+        result = cache.history("AAPL", "2024-01-02", "2024-04-01", "1d", fetch)
+        assert result.index[0].date() == date(2024, 3, 1)
+
+        fetch.fail = False
+        fetch.calls.clear()
+        cache.history("AAPL", "2024-01-02", "2024-04-01", "1d", fetch)
+        assert fetch.calls == [("2024-03-29", "2024-03-30"), ("2024-01-02", "2024-03-01")]
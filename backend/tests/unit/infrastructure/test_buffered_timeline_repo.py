@@ -0,0 +1,233 @@
+# =========================
+# backend/tests/unit/infrastructure/test_buffered_timeline_repo.py
+# =========================
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.persistence.buffered_timeline_repo import BufferedEvaluationTimelineRepo
+from infrastructure.persistence.sql.engine import get_engine
+from infrastructure.persistence.sql.evaluation_timeline_repo_sql import EvaluationTimelineRepoSQL
+from infrastructure.persistence.sql.models import PositionEvaluationTimelineModel
+
+START = datetime(2024, 1, 2, 15, 0, tzinfo=timezone.utc)
+
+
+def _row(i, action="HOLD"):
+    return {
+        "tenant_id": "default",
+        "portfolio_id": "pf",
+        "position_id": "pos",
+        "symbol": "AAPL",
+        "timestamp": START + timedelta(minutes=i),
+        "mode": "LIVE",
+        "evaluation_type": "PRICE_UPDATE",
+        "dividend_applied": False,
+        "anchor_updated": False,
+        "trigger_fired": action != "HOLD",
+        "action": action,
+        "effective_price": 100.0 + i,
+        "position_qty_before": 1.0,
+    }
+
+
+class RecordingRepo(EvaluationTimelineRepoSQL):
+    """Keeps rows in memory and records how they were written."""
+
+    def __init__(self, gate=None):
+        self.rows = {}
+        self.batches = []
+        self.single_saves = 0
+        self.gate = gate
+
+    def save(self, evaluation_data):
+        self.single_saves += 1
+        self.rows[evaluation_data["id"]] = evaluation_data
+        return evaluation_data["id"]
+
+    def save_many(self, rows):
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(len(rows))
+        for row in rows:
+            self.rows[row["id"]] = row
+        return [row["id"] for row in rows]
+
+    def get_by_id(self, evaluation_id):
+        return self.rows.get(evaluation_id)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_sql_save_many_inserts_batch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timeline.sqlite'}")
+    PositionEvaluationTimelineModel.__table__.create(engine)
+    repo = EvaluationTimelineRepoSQL(sessionmaker(bind=engine, expire_on_commit=False))
+
+    ids = repo.save_many([_row(i, "BUY" if i % 2 else "hold") for i in range(5)])
+
+    rows = repo.list_by_position("default", "pf", "pos")
+    assert sorted(r["id"] for r in rows) == sorted(ids)
+    assert {r["action"] for r in rows} == {"BUY", "HOLD"}
+    assert repo.get_by_id(ids[2])["effective_price"] == 102.0
+
+
+def test_sql_save_many_retries_a_failed_batch_row_by_row_without_duplicates(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'timeline.sqlite'}")
+    PositionEvaluationTimelineModel.__table__.create(engine)
+    rolled_up = []
+    repo = EvaluationTimelineRepoSQL(
+        sessionmaker(bind=engine, expire_on_commit=False),
+        snapshots=type("Recorder", (), {"record": lambda self, rows: rolled_up.extend(rows)})(),
+    )
+    failed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def fail_second_group(conn, cursor, statement, parameters, context, executemany):
+        # The row with a trace id forms the second INSERT group
+        if statement.startswith("INSERT") and "trace_id" in statement and not failed:
+            failed.append(statement)
+            raise RuntimeError("connection dropped")
+
+    rows = [_row(0), _row(1), {**_row(2), "trace_id": "trace_1"}]
+    ids = repo.save_many(rows)
+
+    assert failed
+    assert sorted(r["id"] for r in repo.list_by_position("default", "pf", "pos")) == sorted(ids)
+    assert len(rolled_up) == 3
+    engine.dispose()
+
+
+def test_sql_iter_by_portfolio_streams_oldest_first(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timeline.sqlite'}")
+    PositionEvaluationTimelineModel.__table__.create(engine)
+    repo = EvaluationTimelineRepoSQL(sessionmaker(bind=engine, expire_on_commit=False))
+    repo.save_many([_row(i) for i in (3, 0, 4, 1, 2)])
+
+    rows = repo.iter_by_portfolio("default", "pf", start_date=START + timedelta(seconds=30), batch_size=2)
+
+    assert [r["effective_price"] for r in rows] == [101.0, 102.0, 103.0, 104.0]
+
+def test_buffer_flushes_by_size_and_on_read():
+    inner = RecordingRepo()
+    repo = BufferedEvaluationTimelineRepo(inner, batch_size=5, flush_interval=60)
+
+    ids = [repo.save(_row(i)) for i in range(12)]
+
+    assert _wait_for(lambda: sum(inner.batches) >= 10)
+    assert repo.get_by_id(ids[-1])["id"] == ids[-1]
+    assert set(inner.rows) == set(ids)
+    assert inner.single_saves == 0
+    metrics = repo.metrics()
+    assert metrics["enqueued"] == metrics["written"] == 12
+    assert metrics["queue_depth"] == 0
+    repo.close()
+
+
+def test_buffer_flushes_on_interval_and_close():
+    inner = RecordingRepo()
+    repo = BufferedEvaluationTimelineRepo(inner, batch_size=100, flush_interval=0.05)
+
+    first = repo.save(_row(0))
+    assert _wait_for(lambda: first in inner.rows)
+
+    repo.save(_row(1))
+    repo.close()
+    assert len(inner.rows) == 2
+
+    # After close, saves go straight through
+    repo.save(_row(2))
+    assert inner.single_saves == 1
+
+
+def test_full_queue_falls_back_to_direct_write():
+    gate = threading.Event()
+    inner = RecordingRepo(gate=gate)
+    repo = BufferedEvaluationTimelineRepo(
+        inner, batch_size=1, flush_interval=60, max_queue=1, put_timeout=0.01
+    )
+
+    repo.save(_row(0))  # writer picks this up and blocks on the gate
+    assert _wait_for(lambda: repo.metrics()["queue_depth"] == 0)
+    repo.save(_row(1))  # fills the queue
+    repo.save(_row(2))  # no room: written directly
+
+    metrics = repo.metrics()
+    assert metrics["backpressure_waits"] == 1
+    assert metrics["sync_writes"] == 1
+    assert inner.single_saves == 1
+
+    gate.set()
+    repo.close()
+    assert len(inner.rows) == 3
+
+
+class FlakyRepo(RecordingRepo):
+    """Fails every batch, and single saves until ``failures`` is used up or for ``broken`` ids."""
+
+    def __init__(self, failures=0, broken=()):
+        super().__init__()
+        self.failures = failures
+        self.broken = set(broken)
+
+    def save_many(self, rows):
+        raise RuntimeError("database unavailable")
+
+    def save(self, evaluation_data):
+        if evaluation_data["id"] in self.broken or self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        return super().save(evaluation_data)
+
+
+def test_failed_batch_is_requeued_and_written_on_a_later_flush():
+    inner = FlakyRepo(failures=2)
+    repo = BufferedEvaluationTimelineRepo(inner, batch_size=10, flush_interval=60)
+    ids = [repo.save(_row(i)) for i in range(3)]
+
+    repo.flush()  # the first two rows fail and go back on the queue
+    assert set(inner.rows) == {ids[2]}
+    assert repo.metrics()["queue_depth"] == 2
+
+    repo.flush()
+    assert set(inner.rows) == set(ids)
+    metrics = repo.metrics()
+    assert (metrics["written"], metrics["retried"], metrics["failed"]) == (3, 2, 0)
+    repo.close()
+
+
+def test_row_is_dropped_only_after_max_attempts():
+    inner = FlakyRepo(broken={"eval_bad"})
+    repo = BufferedEvaluationTimelineRepo(inner, batch_size=10, flush_interval=60, max_attempts=3)
+    repo.save({**_row(0), "id": "eval_bad"})
+    good = repo.save(_row(1))
+
+    repo.close()
+
+    assert set(inner.rows) == {good}
+    metrics = repo.metrics()
+    assert (metrics["retried"], metrics["failed"], metrics["queue_depth"]) == (2, 1, 0)
+
+
+def test_exit_hook_is_registered_once_per_process(monkeypatch):
+    from infrastructure.persistence import buffered_timeline_repo as module
+
+    registered = []
+    monkeypatch.setattr(module, "_exit_hook_registered", False)
+    monkeypatch.setattr(module.atexit, "register", registered.append)
+
+    repos = [BufferedEvaluationTimelineRepo(RecordingRepo(), flush_interval=60) for _ in range(3)]
+    assert registered == [module._close_open_buffers]
+    assert set(repos) <= set(module._open_buffers)
+
+    for repo in repos:
+        repo.close()
+    assert not set(repos) & set(module._open_buffers)
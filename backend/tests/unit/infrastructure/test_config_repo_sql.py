@@ -4,8 +4,9 @@
 """Unit tests for SQLConfigRepo."""
 
 import pytest
+from datetime import datetime, timezone
 from decimal import Decimal
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from domain.ports.config_repo import ConfigScope
@@ -13,6 +14,7 @@ from domain.value_objects.configs import TriggerConfig, GuardrailConfig, OrderPo
 from infrastructure.persistence.sql.config_repo_sql import SQLConfigRepo
 from infrastructure.persistence.sql.models import (
     CommissionRateModel,
+    ConfigChangeModel,
     TriggerConfigModel,
     GuardrailConfigModel,
     OrderPolicyConfigModel,
@@ -30,6 +32,7 @@ def sql_engine():
     # This avoids conflicts with other tables that might have duplicate indexes
     with engine.begin() as conn:
         CommissionRateModel.__table__.create(conn, checkfirst=True)
+        ConfigChangeModel.__table__.create(conn, checkfirst=True)
         TriggerConfigModel.__table__.create(conn, checkfirst=True)
         GuardrailConfigModel.__table__.create(conn, checkfirst=True)
         OrderPolicyConfigModel.__table__.create(conn, checkfirst=True)
@@ -42,6 +45,7 @@ def sql_engine():
         GuardrailConfigModel.__table__.drop(conn, checkfirst=True)
         TriggerConfigModel.__table__.drop(conn, checkfirst=True)
         CommissionRateModel.__table__.drop(conn, checkfirst=True)
+        ConfigChangeModel.__table__.drop(conn, checkfirst=True)
 
 
 @pytest.fixture
@@ -406,3 +410,116 @@ class TestSQLConfigRepo_Integration:
         assert result is not None
         assert result.up_threshold_pct == Decimal("3.0")
         assert result.down_threshold_pct == Decimal("3.0")
+
+
+class TestSQLConfigRepo_BulkReads:
+    """Test reading configs for several positions at once."""
+
+    def test_bulk_reads_match_single_reads(self, config_repo):
+        for i in range(3):
+            config_repo.set_trigger_config(
+                f"pos_{i}",
+                TriggerConfig(up_threshold_pct=Decimal(i + 1), down_threshold_pct=Decimal(-i - 1)),
+            )
+        config_repo.set_guardrail_config(
+            "pos_1", GuardrailConfig(min_stock_pct=Decimal("0.3"), max_stock_pct=Decimal("0.7"))
+        )
+        config_repo.set_order_policy_config("pos_2", OrderPolicyConfig(min_notional=Decimal("5")))
+
+        ids = ["pos_0", "pos_1", "pos_2", "pos_missing"]
+        triggers = config_repo.get_trigger_configs(ids)
+        assert set(triggers) == {"pos_0", "pos_1", "pos_2"}
+        assert triggers["pos_1"] == config_repo.get_trigger_config("pos_1")
+        assert config_repo.get_guardrail_configs(ids) == {
+            "pos_1": config_repo.get_guardrail_config("pos_1")
+        }
+        assert config_repo.get_order_policy_configs(ids) == {
+            "pos_2": config_repo.get_order_policy_config("pos_2")
+        }
+        assert config_repo.get_trigger_configs([]) == {}
+
+
+class TestSQLConfigRepo_Cache:
+    """Test the in-process config cache and its invalidation."""
+
+    @staticmethod
+    def _count_queries(engine):
+        statements = []
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        return statements
+
+    def test_repeat_reads_are_served_from_memory_until_a_write(self, sql_engine, config_repo):
+        config_repo.set_trigger_config(
+            "pos1", TriggerConfig(up_threshold_pct=Decimal("3"), down_threshold_pct=Decimal("3"))
+        )
+        queries = self._count_queries(sql_engine)
+
+        for _ in range(3):
+            assert config_repo.get_trigger_config("pos1").up_threshold_pct == Decimal("3")
+            assert config_repo.get_guardrail_config("pos1") is None
+            assert config_repo.get_commission_rate("T1", "AAPL") == 0.0001
+        assert config_repo.get_trigger_configs(["pos1", "pos2"]).keys() == {"pos1"}
+        assert config_repo.get_trigger_config("pos2") is None
+        reads = len(queries)
+
+        version = config_repo.version
+        config_repo.set_trigger_config(
+            "pos1", TriggerConfig(up_threshold_pct=Decimal("5"), down_threshold_pct=Decimal("5"))
+        )
+        config_repo.set_commission_rate(0.002, ConfigScope.TENANT, tenant_id="T1")
+        assert config_repo.version == version + 2
+        assert config_repo.get_trigger_config("pos1").up_threshold_pct == Decimal("5")
+        assert config_repo.get_commission_rate("T1", "AAPL") == 0.002
+        assert reads <= 6
+
+    def test_editing_a_returned_config_does_not_change_the_cache(self, config_repo):
+        config_repo.set_trigger_config(
+            "pos1", TriggerConfig(up_threshold_pct=Decimal("3"), down_threshold_pct=Decimal("3"))
+        )
+
+        config_repo.get_trigger_config("pos1").up_threshold_pct = Decimal("9")
+        config_repo.get_trigger_configs(["pos1"])["pos1"].down_threshold_pct = Decimal("9")
+
+        cached = config_repo.get_trigger_config("pos1")
+        assert (cached.up_threshold_pct, cached.down_threshold_pct) == (Decimal("3"), Decimal("3"))
+
+    def test_change_log_invalidates_other_processes(self, session_factory):
+        writer = SQLConfigRepo(session_factory, change_log=True, change_poll_seconds=0)
+        reader = SQLConfigRepo(session_factory, change_log=True, change_poll_seconds=0)
+        unlogged = SQLConfigRepo(session_factory)
+
+        assert reader.get_trigger_config("pos1") is None
+        assert unlogged.get_trigger_config("pos1") is None
+        writer.set_trigger_config(
+            "pos1", TriggerConfig(up_threshold_pct=Decimal("4"), down_threshold_pct=Decimal("4"))
+        )
+
+        assert reader.get_trigger_config("pos1").up_threshold_pct == Decimal("4")
+        # Without the change log only local writes invalidate
+        assert unlogged.get_trigger_config("pos1") is None
+
+    def test_change_committed_below_the_cursor_is_still_picked_up(self, session_factory):
+        reader = SQLConfigRepo(session_factory, change_log=True, change_poll_seconds=0)
+        unlogged = SQLConfigRepo(session_factory)
+        assert reader.get_trigger_config("pos1") is None
+
+        def log_change(change_id, key):
+            with session_factory() as s:
+                s.add(
+                    ConfigChangeModel(
+                        id=change_id, kind="trigger", key=key, changed_at=datetime.now(timezone.utc)
+                    )
+                )
+                s.commit()
+
+        # Id 2 commits and is read while id 1 is still in flight
+        log_change(2, "pos2")
+        assert reader.get_trigger_config("pos1") is None
+        unlogged.set_trigger_config(
+            "pos1", TriggerConfig(up_threshold_pct=Decimal("4"), down_threshold_pct=Decimal("4"))
+        )
+        log_change(1, "pos1")
+
+        assert reader.get_trigger_config("pos1").up_threshold_pct == Decimal("4")
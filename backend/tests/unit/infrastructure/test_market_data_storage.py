@@ -0,0 +1,118 @@
+# =========================
+# backend/tests/unit/infrastructure/test_market_data_storage.py
+# =========================
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain.entities.market_data import PriceData, PriceSource
+from infrastructure.market.market_data_storage import MarketDataStorage
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _point(minute: int, price: float = 100.0, market: bool = True) -> PriceData:
+    return PriceData(
+        ticker="AAPL",
+        price=price,
+        source=PriceSource.LAST_TRADE,
+        timestamp=START + timedelta(minutes=minute),
+        volume=1000 + minute,
+        is_market_hours=market,
+        open=price,
+        close=price,
+    )
+
+
+def _series(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    price = 100.0
+    points = []
+    for minute in range(n):
+        price *= math.exp(rng.gauss(0, 0.001))
+        points.append(_point(minute, price, market=minute % 7 != 0))
+    return points
+
+
+class TestMarketDataStorage:
+    def test_store_many_matches_single_stores(self):
+        points = _series(500)
+        bulk = MarketDataStorage()
+        bulk.store_many("AAPL", points)
+        single = MarketDataStorage()
+        for point in points:
+            single.store_price_data("AAPL", point)
+
+        start, end = points[100].timestamp, points[300].timestamp
+        assert bulk.get_historical_data("AAPL", start, end) == single.get_historical_data(
+            "AAPL", start, end
+        )
+        assert bulk.get_price("AAPL") is points[-1]
+        assert single.get_price("AAPL") is points[-1]
+        assert bulk.get_volatility("AAPL", 60) == pytest.approx(single.get_volatility("AAPL", 60))
+
+    def test_range_query_is_inclusive_and_sorted(self):
+        points = _series(200)
+        shuffled = points[:]
+        random.Random(1).shuffle(shuffled)
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", shuffled[:120])
+        for point in shuffled[120:]:
+            storage.store_price_data("AAPL", point)
+
+        result = storage.get_historical_data("AAPL", points[10].timestamp, points[50].timestamp)
+        assert result == points[10:51]
+
+        market = storage.get_historical_data(
+            "AAPL", points[10].timestamp, points[50].timestamp, market_hours_only=True
+        )
+        assert market == [p for p in points[10:51] if p.is_market_hours]
+
+    def test_naive_bounds_are_utc_and_unknown_ticker_is_empty(self):
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", _series(30))
+
+        naive_start = (START + timedelta(minutes=5)).replace(tzinfo=None)
+        naive_end = (START + timedelta(minutes=9)).replace(tzinfo=None)
+        assert len(storage.get_historical_data("AAPL", naive_start, naive_end)) == 5
+        assert storage.get_historical_data("MSFT", START, START + timedelta(days=1)) == []
+        assert storage.get_trading_day_data("MSFT") == []
+        assert storage.get_volatility("MSFT") == 0.0
+
+    def test_get_volatility_uses_chronological_returns(self):
+        points = _series(120)
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", points)
+
+        since = points[-1].timestamp - timedelta(minutes=60)
+        window = [p.price for p in points if p.timestamp >= since and p.is_market_hours]
+        returns = [(b - a) / a for a, b in zip(window, window[1:])]
+        mean = sum(returns) / len(returns)
+        std = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+
+        assert storage.get_volatility("AAPL", 60) == pytest.approx(std * (252 * 390 / 60) ** 0.5)
+
+    def test_get_trading_day_data_keeps_last_days(self):
+        storage = MarketDataStorage()
+        points = [_point(day * 24 * 60 + slot, market=slot < 3) for day in range(6) for slot in range(4)]
+        storage.store_many("AAPL", points)
+
+        result = storage.get_trading_day_data("AAPL", days=2)
+        last_two = {points[-1].timestamp.date(), points[-5].timestamp.date()}
+        assert {p.timestamp.date() for p in result} == last_two
+        assert all(p.is_market_hours for p in result)
+        assert len(storage.get_trading_day_data("AAPL", days=2, include_after_hours=True)) == 8
+
+    def test_get_columns(self):
+        points = _series(50)
+        points[3].open = None
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", points)
+
+        columns = storage.get_columns("AAPL", points[2].timestamp, points[9].timestamp)
+        assert columns["price"].tolist() == [p.price for p in points[2:10]]
+        assert math.isnan(columns["open"][1])
+        assert columns["timestamp"][1] - columns["timestamp"][0] == 60_000_000_000
+        assert storage.get_columns("MSFT")["price"].size == 0
@@ -0,0 +1,156 @@
+# =========================
+# backend/tests/unit/infrastructure/test_order_trade_batch_reads.py
+# =========================
+"""Unit tests for the batched order/trade reads used by explainability enrichment."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from domain.entities.order import Order
+from domain.entities.trade import Trade
+from infrastructure.persistence.memory.trades_repo_mem import InMemoryTradesRepo
+from infrastructure.persistence.sql import orders_repo_sql, trades_repo_sql
+from infrastructure.persistence.sql.models import OrderModel, TradeModel
+from infrastructure.persistence.sql.orders_repo_sql import SQLOrdersRepo
+from infrastructure.persistence.sql.trades_repo_sql import SQLTradesRepo
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    # Tables only: OrderModel declares ix_orders_broker_order_id twice
+    with engine.begin() as conn:
+        conn.execute(CreateTable(OrderModel.__table__))
+        conn.execute(CreateTable(TradeModel.__table__))
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _order(i):
+    return Order(
+        id=f"ord_{i}",
+        tenant_id="t1",
+        portfolio_id="p1",
+        position_id="pos1",
+        side="BUY",
+        qty=1.0,
+        idempotency_key=f"key_{i}",
+    )
+
+
+def _trade(i, order_id):
+    return Trade(
+        id=f"trd_{i}",
+        tenant_id="t1",
+        portfolio_id="p1",
+        order_id=order_id,
+        position_id="pos1",
+        side="BUY",
+        qty=1.0,
+        price=100.0,
+        commission=0.1,
+    )
+
+
+def _count_selects(engine):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before)
+    return statements
+
+
+def test_get_many_and_list_for_orders_chunk_in_queries(session_factory, monkeypatch):
+    monkeypatch.setattr(orders_repo_sql, "_IN_CHUNK", 4)
+    monkeypatch.setattr(trades_repo_sql, "_IN_CHUNK", 4)
+    orders, trades = SQLOrdersRepo(session_factory), SQLTradesRepo(session_factory)
+    for i in range(10):
+        orders.save(_order(i))
+    trades.save(_trade("a", "ord_1"))
+    trades.save(_trade("b", "ord_1"))
+    trades.save(_trade("c", "ord_7"))
+
+    selects = _count_selects(session_factory.kw["bind"])
+    ids = [f"ord_{i}" for i in range(10)] + ["ord_missing", "ord_1"]
+    found = orders.get_many(ids)
+    by_order = trades.list_for_orders(found)
+
+    assert sorted(found) == [f"ord_{i}" for i in range(10)]
+    assert found["ord_3"].idempotency_key == "key_3"
+    assert {oid: sorted(t.id for t in ts) for oid, ts in by_order.items()} == {
+        "ord_1": ["trd_a", "trd_b"],
+        "ord_7": ["trd_c"],
+    }
+    # 11 unique order IDs -> 3 chunks; 10 found orders -> 3 chunks
+    assert len(selects) == 6
+    assert orders.get_many([]) == {}
+
+
+def test_memory_trades_repo_keeps_every_trade_of_an_order():
+    repo = InMemoryTradesRepo()
+    repo.save(_trade("a", "ord_1"))
+    repo.save(_trade("b", "ord_1"))
+
+    assert [t.id for t in repo.list_for_orders(["ord_1", "ord_2"])["ord_1"]] == ["trd_a", "trd_b"]
+    assert "ord_2" not in repo.list_for_orders(["ord_2"])
+
+
+def test_open_orders_and_day_counts_for_many_positions(session_factory):
+    orders = SQLOrdersRepo(session_factory)
+    for i, (position_id, status) in enumerate(
+        [("pos1", "working"), ("pos1", "filled"), ("pos2", "filled"), ("pos2", "pending")]
+    ):
+        orders.save(
+            Order(
+                id=f"ord_{i}",
+                tenant_id="t1",
+                portfolio_id="p1",
+                position_id=position_id,
+                side="BUY",
+                qty=1.0,
+                status=status,
+                idempotency_key=f"key_{i}",
+            )
+        )
+    today = orders.get("ord_0").created_at.date()
+
+    selects = _count_selects(session_factory.kw["bind"])
+    open_orders = orders.list_open_for_positions(["pos1", "pos2", "pos3"])
+    counts = orders.count_for_positions_on_day(["pos1", "pos2", "pos3"], today)
+
+    assert {pid: [o.id for o in os] for pid, os in open_orders.items()} == {
+        "pos1": ["ord_0"],
+        "pos2": ["ord_3"],
+    }
+    assert counts == {"pos1": 2, "pos2": 2}
+    assert counts["pos1"] == orders.count_for_position_on_day("pos1", today)
+    assert len(selects) == 3
+
+
+def test_position_cursors_yield_every_row_newest_first(session_factory):
+    orders, trades = SQLOrdersRepo(session_factory), SQLTradesRepo(session_factory)
+    start = datetime(2025, 3, 3, 14, 30, tzinfo=timezone.utc)
+    memory = InMemoryTradesRepo()
+    for i in range(7):
+        order = _order(i)
+        order.created_at = start + timedelta(minutes=i)
+        orders.save(order)
+        trade = _trade(i, order.id)
+        trade.executed_at = start + timedelta(minutes=i)
+        trades.save(trade)
+        memory.save(trade)
+
+    newest_first = [f"trd_{i}" for i in reversed(range(7))]
+    assert [t.id for t in trades.iter_for_position("pos1", batch_size=2)] == newest_first
+    assert [t.id for t in memory.iter_for_position("pos1")] == newest_first
+    assert [o.id for o in orders.iter_for_position("pos1", batch_size=3)] == [
+        f"ord_{i}" for i in reversed(range(7))
+    ]
+    assert list(trades.iter_for_position("pos_missing")) == []
@@ -0,0 +1,199 @@
+# =========================
+# backend/tests/unit/infrastructure/test_position_snapshot_repo.py
+# =========================
+"""Unit tests for the position snapshot rollup and its timeline write hook."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.persistence.position_snapshots import bucket_start
+from infrastructure.persistence.sql.engine import get_engine
+from infrastructure.persistence.sql.evaluation_timeline_repo_sql import EvaluationTimelineRepoSQL
+from infrastructure.persistence.sql.models import (
+    PositionEvaluationTimelineModel,
+    PositionSnapshotModel,
+)
+from infrastructure.persistence.sql import position_snapshot_repo_sql as snapshot_repo_sql
+from infrastructure.persistence.sql.position_snapshot_repo_sql import SQLPositionSnapshotRepo
+
+# A Wednesday
+START = datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc)
+
+
+def _row(minutes, total, action="HOLD", position_id="pos", dividend=False):
+    return {
+        "tenant_id": "default",
+        "portfolio_id": "pf",
+        "position_id": position_id,
+        "symbol": "AAPL",
+        "timestamp": START + timedelta(minutes=minutes),
+        "mode": "LIVE",
+        "evaluation_type": "PRICE_UPDATE",
+        "dividend_applied": dividend,
+        "anchor_updated": False,
+        "trigger_fired": action != "HOLD",
+        "action": action,
+        "effective_price": 100.0,
+        "position_qty_before": 1.0,
+        "position_cash_before": 50.0,
+        "position_stock_value_before": total - 50.0,
+        "position_total_value_before": total,
+    }
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # The production engine: SQLite connections in driver autocommit
+    engine = get_engine(f"sqlite:///{tmp_path / 'timeline.sqlite'}")
+    PositionEvaluationTimelineModel.__table__.create(engine)
+    PositionSnapshotModel.__table__.create(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def test_bucket_start_truncates_to_hour_day_and_monday():
+    ts = datetime(2024, 1, 3, 14, 45, tzinfo=timezone.utc)
+    assert bucket_start(ts, "hourly") == datetime(2024, 1, 3, 14, tzinfo=timezone.utc)
+    assert bucket_start(ts, "daily") == datetime(2024, 1, 3, tzinfo=timezone.utc)
+    assert bucket_start(ts, "weekly") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_record_folds_batches_incrementally_in_any_order(session_factory):
+    repo = SQLPositionSnapshotRepo(session_factory)
+
+    repo.record([_row(10, 120.0, "BUY"), _row(0, 100.0)])
+    repo.record([_row(5, 90.0), _row(20, 110.0, dividend=True)])
+
+    (daily,) = repo.list_snapshots("default", "pf", "daily", mode="LIVE")
+    assert daily["bucket_start"] == datetime(2024, 1, 3, tzinfo=timezone.utc)
+    assert (daily["open_value"], daily["high_value"], daily["low_value"], daily["close_value"]) == (
+        100.0,
+        120.0,
+        90.0,
+        110.0,
+    )
+    assert daily["stock_value"] == 60.0 and daily["cash"] == 50.0
+    assert daily["last_timestamp"] == START + timedelta(minutes=20)
+    assert (daily["evaluation_count"], daily["trade_count"], daily["dividend_count"]) == (4, 1, 1)
+
+    (hourly,) = repo.list_snapshots("default", "pf", "hourly")  # 14:30-14:50 is one hour
+    assert hourly["evaluation_count"] == 4
+    assert len(repo.list_snapshots("default", "pf", "weekly")) == 1
+
+
+def test_timeline_writes_roll_up_and_rebuild_matches(session_factory):
+    snapshots = SQLPositionSnapshotRepo(session_factory)
+    timeline = EvaluationTimelineRepoSQL(session_factory, snapshots=snapshots)
+
+    timeline.save_many([_row(i * 60, 100.0 + i, position_id=f"pos{i % 2}") for i in range(30)])
+    timeline.save({**_row(31 * 60, 130.0, "SELL", position_id="pos1"), "simulation_run_id": None})
+    live = {
+        res: snapshots.list_snapshots("default", "pf", res) for res in ("hourly", "daily", "weekly")
+    }
+
+    assert snapshots.rebuild() == sum(len(v) for v in live.values())
+    for res, before in live.items():
+        assert snapshots.list_snapshots("default", "pf", res) == before
+
+    window = snapshots.list_snapshots(
+        "default",
+        "pf",
+        "daily",
+        start_date=START + timedelta(days=1, hours=3),
+        end_date=START + timedelta(days=1, hours=4),
+        position_id="pos1",
+    )
+    assert [s["bucket_start"].day for s in window] == [4]
+
+
+def test_simulation_run_rows_are_not_rolled_up(session_factory):
+    repo = SQLPositionSnapshotRepo(session_factory)
+    repo.record([{**_row(0, 100.0), "simulation_run_id": "run_1"}])
+    assert repo.list_snapshots("default", "pf", "daily") == []
+
+
+def test_concurrent_records_into_one_bucket_lose_nothing(session_factory):
+    repo = SQLPositionSnapshotRepo(session_factory)
+    barrier = threading.Barrier(8)
+
+    def write(worker):
+        barrier.wait()
+        for i in range(10):
+            repo.record([_row(worker * 10 + i, 100.0 + worker * 10 + i)])
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    (daily,) = repo.list_snapshots("default", "pf", "daily")
+    assert daily["evaluation_count"] == 80
+    assert (daily["open_value"], daily["high_value"], daily["low_value"]) == (100.0, 179.0, 100.0)
+    assert daily["close_value"] == 179.0
+    assert daily["last_timestamp"] == START + timedelta(minutes=79)
+
+
+def test_rebuild_rolls_up_history_written_before_the_rollup(session_factory):
+    # History written before the rollup existed; building the repo leaves it alone
+    timeline = EvaluationTimelineRepoSQL(session_factory)
+    timeline.save_many([_row(i * 60, 100.0 + i) for i in range(30)])
+    repo = SQLPositionSnapshotRepo(session_factory)
+    assert repo.list_snapshots("default", "pf", "daily") == []
+
+    assert repo.rebuild(tenant_id="default") == 30 + 2 + 1
+    assert [d["evaluation_count"] for d in repo.list_snapshots("default", "pf", "daily")] == [10, 20]
+
+    # Later folds land on top of the rebuilt rows
+    repo.record([_row(31 * 60, 130.0)])
+    daily = repo.list_snapshots("default", "pf", "daily")
+    assert [d["evaluation_count"] for d in daily] == [10, 21]
+
+
+def test_fold_waiting_on_a_rebuild_is_applied_after_it(session_factory, monkeypatch):
+    timeline = EvaluationTimelineRepoSQL(session_factory)
+    timeline.save_many([_row(i, 100.0) for i in range(5)])
+    repo = SQLPositionSnapshotRepo(session_factory)
+    other = SQLPositionSnapshotRepo(session_factory)  # another process's writer
+    folded = threading.Event()
+    fold_rows = snapshot_repo_sql.fold_rows
+
+    def write():
+        other.record([_row(10, 90.0)])
+        folded.set()
+
+    writer = threading.Thread(target=write)
+
+    def fold_while_another_writer_records(rows):
+        if writer.ident is None:
+            writer.start()
+            # The writer cannot commit while the rebuild transaction is open
+            assert not folded.wait(0.2)
+        return fold_rows(rows)
+
+    monkeypatch.setattr(snapshot_repo_sql, "fold_rows", fold_while_another_writer_records)
+    repo.rebuild()
+    assert folded.wait(5)
+
+    (daily,) = repo.list_snapshots("default", "pf", "daily")
+    assert daily["evaluation_count"] == 6 and daily["low_value"] == 90.0
+
+
+def test_rebuild_that_fails_part_way_keeps_the_previous_rollup(session_factory, monkeypatch):
+    repo = SQLPositionSnapshotRepo(session_factory)
+    EvaluationTimelineRepoSQL(session_factory, snapshots=repo).save_many(
+        [_row(i, 100.0) for i in range(5)]
+    )
+    before = repo.list_snapshots("default", "pf", "daily")
+
+    def fail(rows):
+        raise RuntimeError("fold failed")
+
+    monkeypatch.setattr(snapshot_repo_sql, "fold_rows", fail)
+    with pytest.raises(RuntimeError):
+        repo.rebuild()
+
+    assert repo.list_snapshots("default", "pf", "daily") == before
@@ -0,0 +1,133 @@
+# =========================
+# backend/tests/unit/infrastructure/test_positions_repo_sql.py
+# =========================
+"""Unit tests for the upsert-based SQLPositionsRepo writes."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from domain.entities.position import Position
+from infrastructure.persistence.sql import positions_repo_sql
+from infrastructure.persistence.sql.engine import get_engine
+from infrastructure.persistence.sql.models import PositionModel
+from infrastructure.persistence.sql.positions_repo_sql import SQLPositionsRepo
+
+T0 = datetime(2025, 1, 15, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    with engine.begin() as conn:
+        conn.execute(CreateTable(PositionModel.__table__))
+    yield engine
+    engine.dispose()
+
+
+def _position(pid, qty=10.0, tenant_id="t1"):
+    return Position(
+        id=pid,
+        tenant_id=tenant_id,
+        portfolio_id="pf",
+        asset_symbol="AAPL",
+        qty=qty,
+        cash=500.0,
+        anchor_price=100.0,
+        created_at=T0,
+        updated_at=T0,
+    )
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, stmt, params, ctx, many: statements.append(stmt),
+    )
+    return statements
+
+
+def test_save_is_one_upsert_that_keeps_status_and_created_at(engine, monkeypatch):
+    repo = SQLPositionsRepo(sessionmaker(bind=engine, expire_on_commit=False))
+    # The schema probe ran at construction; saves never inspect again
+    monkeypatch.setattr(positions_repo_sql, "inspect", None)
+
+    statements = _count_statements(engine)
+    repo.save(_position("pos1"))
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE positions SET status = 'PAUSED'"))
+
+    updated = _position("pos1", qty=25.0)
+    updated.created_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    updated.updated_at = datetime(2025, 1, 16, tzinfo=timezone.utc)
+    statements.clear()
+    repo.save(updated)
+
+    assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+    stored = repo.get("t1", "pf", "pos1")
+    assert stored.qty == 25.0 and stored.cash == 500.0
+    assert stored.created_at.replace(tzinfo=timezone.utc) == T0
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT status FROM positions")).scalar() == "PAUSED"
+
+
+def test_save_many_upserts_in_one_statement(engine):
+    repo = SQLPositionsRepo(sessionmaker(bind=engine, expire_on_commit=False))
+    repo.save(_position("pos1"))
+
+    statements = _count_statements(engine)
+    repo.save_many([_position("pos1", qty=1.0), _position("pos2", qty=2.0)])
+
+    assert sum("ON CONFLICT" in s for s in statements) == 1
+    assert {p.id: p.qty for p in repo.list_all("t1", "pf")} == {"pos1": 1.0, "pos2": 2.0}
+
+
+def test_save_rejects_an_id_owned_by_another_tenant(engine):
+    repo = SQLPositionsRepo(sessionmaker(bind=engine, expire_on_commit=False))
+    repo.save(_position("pos1"))
+
+    with pytest.raises(IntegrityError):
+        repo.save(_position("pos1", qty=99.0, tenant_id="other"))
+    # The whole batch is rolled back, including rows that did upsert
+    with pytest.raises(IntegrityError):
+        repo.save_many([_position("pos2"), _position("pos1", tenant_id="other")])
+
+    assert repo.get("other", "pf", "pos1") is None
+    assert [(p.id, p.qty) for p in repo.list_all("t1", "pf")] == [("pos1", 10.0)]
+
+
+def test_conflicting_batch_saves_nothing_on_the_autocommit_engine(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'positions.sqlite'}")
+    PositionModel.__table__.create(engine)
+    repo = SQLPositionsRepo(sessionmaker(bind=engine, expire_on_commit=False))
+    repo.save(_position("a"))
+
+    with pytest.raises(IntegrityError):
+        repo.save_many([_position("b", tenant_id="t2"), _position("a", tenant_id="t2")])
+
+    assert repo.get("t2", "pf", "b") is None
+    assert [p.id for p in repo.list_all("t1", "pf")] == ["a"]
+    engine.dispose()
+
+
+def test_save_without_status_column_and_without_upsert_dialect(engine):
+    # Older databases predate the status column (and its check constraint)
+    ddl = str(CreateTable(PositionModel.__table__).compile(engine))
+    ddl = ddl.replace("status VARCHAR, ", "").split(", \n\tCONSTRAINT ck_positions_status")[0]
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE positions"))
+        conn.execute(text(ddl + "\n)"))
+    repo = SQLPositionsRepo(sessionmaker(bind=engine, expire_on_commit=False))
+    assert repo._status_column_exists is False
+
+    repo.save(_position("pos1"))
+    repo._dialect = "mssql"  # UPDATE, then INSERT only for new rows
+    repo.save_many([_position("pos1", qty=3.0), _position("pos2", qty=4.0)])
+
+    assert {p.id: p.qty for p in repo.list_all("t1", "pf")} == {"pos1": 3.0, "pos2": 4.0}
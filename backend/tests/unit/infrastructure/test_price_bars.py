@@ -0,0 +1,94 @@
+# =========================
+# backend/tests/unit/infrastructure/test_price_bars.py
+# =========================
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from infrastructure.market.market_data_storage import MarketDataStorage
+from infrastructure.market.price_bars import (
+    PriceBars,
+    bars_from_daily,
+    bars_from_history,
+    market_hours_mask,
+)
+
+
+def _minute_frame(start: str, n: int) -> pd.DataFrame:
+    index = pd.date_range(start, periods=n, freq="1min", tz="America/New_York")
+    close = 100 + np.arange(n) * 0.01
+    frame = pd.DataFrame(
+        {"Open": close, "High": close + 0.1, "Low": close - 0.1, "Close": close, "Volume": 100.0},
+        index=index,
+    )
+    frame.iloc[2, frame.columns.get_loc("Volume")] = np.nan
+    return frame
+
+
+def _daily_frame(n: int) -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=n).tz_localize("America/New_York")
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+        index=index,
+    )
+
+
+class TestPriceBars:
+    def test_market_hours_mask_matches_storage(self):
+        storage = MarketDataStorage()
+        index = pd.date_range("2024-03-08 12:00", "2024-03-11 22:00", freq="7min", tz="UTC")
+
+        expected = [storage.is_market_hours(ts.to_pydatetime()) for ts in index]
+        assert market_hours_mask(index).tolist() == expected
+
+    def test_bars_from_history_builds_price_data_lazily(self):
+        frame = _minute_frame("2024-03-08 09:25", 10)
+        bars = bars_from_history("AAPL", frame)
+
+        assert len(bars) == 10
+        point = bars[1]
+        # Views are built on access and not kept
+        assert bars[1] == point and bars[1] is not point
+        assert point.timestamp == datetime(2024, 3, 8, 14, 26, tzinfo=timezone.utc)
+        assert point.price == point.bid == point.ask == point.close == pytest.approx(100.01)
+        assert point.volume == 100
+        assert bars[2].volume is None
+        assert [p.is_market_hours for p in bars] == [False] * 5 + [True] * 5
+
+    def test_bars_from_daily_shapes(self):
+        frame = _daily_frame(5)
+
+        closes = bars_from_daily("AAPL", frame, interval_minutes=1440)
+        assert [p.price for p in closes] == frame["Close"].tolist()
+        assert closes[0].timestamp == datetime(2024, 1, 1, 21, 0, tzinfo=timezone.utc)
+        assert closes[0].bid is None
+
+        intraday = bars_from_daily("AAPL", frame, interval_minutes=30)
+        assert len(intraday) == 5 * 14
+        day = intraday[:14]
+        assert day[0].timestamp == datetime(2024, 1, 1, 14, 30, tzinfo=timezone.utc)
+        assert day[-1].timestamp == datetime(2024, 1, 1, 21, 0, tzinfo=timezone.utc)
+        assert day[0].price == frame["Open"].iloc[0]
+        assert day[-1].price == frame["Close"].iloc[0]
+        assert all(p.volume == 1000 // 14 for p in day)
+
+    def test_store_many_ingests_columns(self):
+        first = bars_from_history("AAPL", _minute_frame("2024-03-08 10:00", 30))
+        second = bars_from_history("AAPL", _minute_frame("2024-03-08 09:30", 30))
+        bars = PriceBars.concat("AAPL", [first, second])
+
+        storage = MarketDataStorage()
+        storage.store_many("AAPL", bars)
+
+        result = storage.get_historical_data(
+            "AAPL",
+            datetime(2024, 3, 8, 14, 0, tzinfo=timezone.utc),
+            datetime(2024, 3, 8, 16, 0, tzinfo=timezone.utc),
+        )
+        assert len(result) == 60
+        assert result[30] == first[0]
+        assert [p.timestamp for p in result] == sorted(p.timestamp for p in bars)
+        assert storage.get_price("AAPL").timestamp == bars[-1].timestamp
@@ -0,0 +1,64 @@
+# =========================
+# backend/tests/unit/infrastructure/test_series_codec.py
+# =========================
+"""Unit tests for the columnar simulation series encoding."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from infrastructure.persistence.series_codec import SeriesBlob, encode_series, select_rows
+
+
+def _bars(n):
+    return [
+        {
+            "timestamp": datetime(2024, 1, 2, 14, 30 + i, tzinfo=timezone.utc).isoformat(),
+            "price": 100.0 + i,
+            "volume": 1000 * i,
+        }
+        for i in range(n)
+    ]
+
+
+def test_round_trip_preserves_rows_including_missing_keys():
+    trades = [
+        {"timestamp": "2024-01-02T14:31:00+00:00", "side": "BUY", "qty": 3},
+        {"timestamp": "2024-01-02T14:35:00+00:00", "side": "SELL", "qty": 1, "note": None},
+    ]
+    blob = SeriesBlob(encode_series({"price_data": _bars(5), "trade_log": trades, "daily_returns": []}))
+
+    assert blob.names == ["price_data", "trade_log", "daily_returns"]
+    assert blob.read("price_data") == _bars(5)
+    assert blob.read("trade_log") == trades
+    assert blob.read("daily_returns") == []
+    assert blob.read("missing") == []
+
+
+def test_read_decodes_only_requested_columns_and_range():
+    blob = SeriesBlob(encode_series({"price_data": _bars(10)}))
+
+    rows = blob.read(
+        "price_data",
+        columns=["timestamp", "price", "unknown"],
+        start=datetime(2024, 1, 2, 14, 33, tzinfo=timezone.utc),
+        end=datetime(2024, 1, 2, 14, 35),  # naive bounds are treated as UTC
+    )
+
+    assert [row["price"] for row in rows] == [103.0, 104.0, 105.0]
+    assert set(rows[0]) == {"timestamp", "price"}
+    assert ("price_data", "volume") not in blob._decoded
+
+
+def test_select_rows_matches_blob_read():
+    bars = _bars(6)
+    start = datetime(2024, 1, 2, 14, 32, tzinfo=timezone.utc)
+    expected = SeriesBlob(encode_series({"p": bars})).read("p", ["price"], start=start)
+
+    assert select_rows(bars, ["price"], start=start) == expected
+    assert select_rows(bars) == bars
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        SeriesBlob(b'[{"a": 1}]')
@@ -0,0 +1,45 @@
+# =========================
+# backend/tests/unit/infrastructure/test_sql_engine.py
+# =========================
+"""Unit tests for the shared engine registry and its pool metrics."""
+
+from sqlalchemy import text
+
+from infrastructure.persistence.sql import engine as engine_registry
+from infrastructure.persistence.sql.engine import get_engine, pool_metrics
+from infrastructure.persistence.sql.models import get_engine as models_get_engine
+
+
+def test_one_engine_per_url_with_wal_and_metrics(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shared.sqlite'}"
+    engine = get_engine(url)
+    try:
+        assert models_get_engine(url) is engine
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        with engine.connect():
+            pass
+
+        stats = pool_metrics()[url]
+        assert stats["pool"] == "MeteredQueuePool"
+        assert stats["checkouts"] == 2 and stats["checked_out"] == 0
+        assert stats["timeouts"] == 0
+        assert set(stats["wait_seconds"]) == {"p50", "p95", "max"}
+    finally:
+        engine.dispose()
+        engine_registry._engines.pop(url, None)
+
+
+def test_in_memory_sqlite_shares_one_connection():
+    url = "sqlite:///:memory:"
+    engine = get_engine(url)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+    finally:
+        engine.dispose()
+        engine_registry._engines.pop(url, None)
@@ -0,0 +1,126 @@
+# =========================
+# backend/tests/unit/infrastructure/test_yfinance_quotes.py
+# =========================
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from domain.entities.market_data import PriceData, PriceSource
+from infrastructure.market.yfinance_adapter import YFinanceAdapter
+
+
+class SlowQuotes:
+    """Stands in for the network fetch; records calls per ticker."""
+
+    def __init__(self, adapter, delay=0.2, fail=()):
+        self.adapter = adapter
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, force_refresh=False):
+        with self._lock:
+            self.calls[ticker] += 1
+        time.sleep(self.delay)
+        if ticker in self.fail:
+            raise RuntimeError("provider down")
+        price_data = PriceData(
+            ticker=ticker,
+            price=100.0,
+            source=PriceSource.LAST_TRADE,
+            timestamp=datetime.now(timezone.utc),
+        )
+        self.adapter.storage.store_price_data(ticker, price_data)
+        return price_data
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    monkeypatch.delenv("TICK_DETERMINISTIC", raising=False)
+    return YFinanceAdapter(quote_workers=8)
+
+
+def test_reference_prices_fetch_distinct_tickers_concurrently(adapter):
+    fetch = adapter._fetch_price_uncached = SlowQuotes(adapter)
+
+    started = time.monotonic()
+    prices = adapter.get_reference_prices(["AAPL", "MSFT", "AAPL", "SPY", "MSFT"])
+    elapsed = time.monotonic() - started
+
+    assert list(prices) == ["AAPL", "MSFT", "SPY"]
+    assert all(p.price == 100.0 for p in prices.values())
+    assert fetch.calls == {"AAPL": 1, "MSFT": 1, "SPY": 1}
+    assert elapsed < 0.5
+
+    # Warm cache: per-ticker calls do not fetch again
+    assert adapter.get_reference_price("MSFT").ticker == "MSFT"
+    assert fetch.calls["MSFT"] == 1
+
+
+def test_concurrent_calls_for_one_ticker_share_a_fetch(adapter):
+    fetch = adapter._fetch_price_uncached = SlowQuotes(adapter)
+    results = []
+
+    def worker():
+        results.append(adapter.get_price("AAPL"))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == {"AAPL": 1}
+    assert len(results) == 6 and len({id(r) for r in results}) == 1
+
+
+def test_failed_ticker_maps_to_none(adapter):
+    adapter._fetch_price_uncached = SlowQuotes(adapter, delay=0.0, fail={"BAD"})
+
+    prices = adapter.get_reference_prices(["AAPL", "BAD"])
+
+    assert prices["AAPL"].price == 100.0
+    assert prices["BAD"] is None
+
+
+def test_error_kind_is_per_thread_and_shared_with_joined_callers(adapter):
+    def fetch(ticker, force_refresh=False):
+        time.sleep(0.1)
+        if ticker == "BAD":
+            return None  # no data: "not_found"
+        return PriceData(ticker, 100.0, PriceSource.LAST_TRADE, datetime.now(timezone.utc))
+
+    adapter._fetch_price_uncached = fetch
+    kinds = {}
+
+    def worker(name, ticker):
+        adapter.get_price(ticker)
+        kinds[name] = adapter.last_error_kind
+
+    threads = [
+        threading.Thread(target=worker, args=(name, ticker))
+        for name, ticker in [("bad1", "BAD"), ("bad2", "BAD"), ("good", "AAPL")]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert kinds == {"bad1": "not_found", "bad2": "not_found", "good": None}
+    assert adapter.last_error_kind is None  # untouched on this thread
+
+
+def test_forced_refresh_does_not_join_a_plain_fetch(adapter):
+    fetch = adapter._fetch_price_uncached = SlowQuotes(adapter)
+    plain = threading.Thread(target=adapter.get_price, args=("AAPL",))
+    plain.start()
+    time.sleep(0.05)
+    adapter.clear_cache("AAPL")
+    adapter.get_price("AAPL", force_refresh=True)
+    plain.join()
+
+    assert fetch.calls == {"AAPL": 2}